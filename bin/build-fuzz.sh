@@ -72,13 +72,25 @@ if [ ! -e "${DIR_BUILD}/ntf/.complete" ]; then
     touch "${DIR_BUILD}/ntf/.complete"
 fi
 
-export FUZZER_FLAG="fuzzer"
 CMAKE_OPTIONS=(
     -DCMAKE_INSTALL_PREFIX="${DIR_INSTALL}"
     -DCMAKE_MODULE_PATH="${DIR_THIRDPARTY}/bde-tools/cmake;${DIR_THIRDPARTY}/bde-tools/BdeBuildSystem"
     -DCMAKE_PREFIX_PATH="${DIR_INSTALL}"
     -DCMAKE_TOOLCHAIN_FILE="${TOOLCHAIN_PATH}")
 
+if [ "${1:-}" = "--broker-coverage" ]; then
+    # Build a broker exporting its edge coverage to the coverage-guided
+    # protocol fuzzer ('blazingmq.dev.fuzztest.coverage'), instead of the
+    # libFuzzer targets.
+    unset FUZZER_FLAG
+    export COVERAGE_FLAG="trace-pc-guard"
+    CMAKE_OPTIONS+=(-DINSTALL_TARGETS=bmqbrkr -DBMQ_FUZZ_COVERAGE=ON)
+    BUILD_TARGET="bmqbrkr"
+else
+    export FUZZER_FLAG="fuzzer"
+    BUILD_TARGET="fuzztests"
+fi
+
 PKG_CONFIG_PATH="${DIR_INSTALL}/lib64/pkgconfig:${DIR_INSTALL}/lib/pkgconfig:$(pkg-config --variable pc_path pkg-config)" \
     cmake --preset fuzz-tests -B "${DIR_BUILD}/blazingmq" -S "${DIR_ROOT}" "${CMAKE_OPTIONS[@]}"
-cmake --build "${DIR_BUILD}/blazingmq" --parallel 16 --target fuzztests
+cmake --build "${DIR_BUILD}/blazingmq" --parallel 16 --target "${BUILD_TARGET}"
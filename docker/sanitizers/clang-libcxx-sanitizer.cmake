@@ -136,6 +136,10 @@ if(DEFINED ENV{FUZZER_FLAG})
   string(APPEND TOOLCHAIN_DEBUG_FLAGS "-fsanitize=$ENV{FUZZER_FLAG} ")
 endif()
 
+if(DEFINED ENV{COVERAGE_FLAG})
+  string(APPEND TOOLCHAIN_DEBUG_FLAGS "-fsanitize-coverage=$ENV{COVERAGE_FLAG} ")
+endif()
+
 # Set the final configuration variables, as understood by CMake.
 set_build_type(DEBUG)
 
@@ -19,6 +19,7 @@
 // parsing scheme for the 'bmqstoragetool' application.
 
 // bmqstoragetool
+#include <m_bmqstoragetool_batchprocessor.h>
 #include <m_bmqstoragetool_commandprocessorfactory.h>
 #include <m_bmqstoragetool_parameters.h>
 
@@ -188,6 +189,20 @@ parseArgs(CommandLineArguments& arguments, int argc, const char* argv[])
          "limit of queues to display in CSL file summary",
          balcl::TypeInfo(&arguments.d_cslSummaryQueuesLimit),
          balcl::OccurrenceInfo(50)},
+        {"batch",
+         "batch",
+         "path to a .bmq_journal file, or '*'-ended file path pattern "
+         "matching journal files, to process together with the other ones "
+         "on a thread pool, outputting one JSON line per journal file "
+         "(requires --print-mode=json-line)",
+         balcl::TypeInfo(&arguments.d_batch),
+         balcl::OccurrenceInfo::e_OPTIONAL},
+        {"threads",
+         "threads",
+         "number of threads processing journal files in batch mode (0: one "
+         "per CPU)",
+         balcl::TypeInfo(&arguments.d_threads),
+         balcl::OccurrenceInfo(0)},
         {"h|help",
          "help",
          "print usage)",
@@ -231,6 +246,12 @@ int main(int argc, const char* argv[])
         return rc_ARGUMENTS_PARSING_FAILED;  // RETURN
     }
 
+    // Process several journal files in batch mode
+    if (!arguments.d_batch.empty()) {
+        BatchProcessor(arguments, bsl::cout, allocator).process();
+        return rc_SUCCESS;  // RETURN
+    }
+
     // Create parameters
     Parameters parameters(arguments, allocator);
 
@@ -398,3 +398,52 @@ def test_queueop_journalop_summary_json(storagetool, journal_file):
         assert json_res["TotalRecordsNumber"] == "9"
         assert "JournalFileDetails" in json_res
         assert "DataFileDetails" not in json_res
+
+
+def test_batch_json(storagetool, journal_file, journal_path, tmp_path):
+    """
+    This test:
+     - checks that storage tool can process journal files given by path or pattern in batch mode, and output one JSON line per journal file, with the same result as for the file alone.
+     - checks that an invalid journal file is reported in its JSON line.
+    """
+    res = subprocess.run(
+        [
+            storagetool,
+            "--journal-file",
+            journal_file,
+            "--summary",
+            "--print-mode=json-line",
+        ],
+        capture_output=True,
+        check=True,
+    )
+    assert res.returncode == EX_OK
+    expected = json.loads(res.stdout)
+
+    invalid_file = tmp_path / "invalid.bmq_journal"
+    invalid_file.write_bytes(b"\0" * 64)
+    res = subprocess.run(
+        [
+            storagetool,
+            "--batch",
+            journal_path,
+            "--batch",
+            journal_file,
+            "--batch",
+            invalid_file,
+            "--summary",
+            "--print-mode=json-line",
+            "--threads=2",
+        ],
+        capture_output=True,
+        check=True,
+    )
+    assert res.returncode == EX_OK
+    lines = [json.loads(line) for line in res.stdout.splitlines()]
+    # Journal files are deduplicated and sorted by path
+    assert [line["JournalFile"] for line in lines] == sorted(
+        [str(journal_file), str(invalid_file)]
+    )
+    by_file = {line["JournalFile"]: line for line in lines}
+    assert by_file[str(journal_file)]["Result"] == expected
+    assert "Error" in by_file[str(invalid_file)]
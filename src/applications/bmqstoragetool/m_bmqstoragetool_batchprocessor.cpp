@@ -0,0 +1,246 @@
+// Copyright 2026 Bloomberg Finance L.P.
+// SPDX-License-Identifier: Apache-2.0
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+// bmqstoragetool
+#include <m_bmqstoragetool_batchprocessor.h>
+#include <m_bmqstoragetool_commandprocessorfactory.h>
+#include <m_bmqstoragetool_filemanager.h>
+
+// BMQ
+#include <bmqu_memoutstream.h>
+
+// BDE
+#include <bdlf_bind.h>
+#include <bdlmt_fixedthreadpool.h>
+#include <bsl_algorithm.h>
+#include <bsl_cstddef.h>
+#include <bsl_exception.h>
+#include <bsl_vector.h>
+#include <bslma_default.h>
+#include <bslma_managedptr.h>
+#include <bslmt_threadattributes.h>
+#include <bslmt_threadutil.h>
+#include <bsls_assert.h>
+
+namespace BloombergLP {
+namespace m_bmqstoragetool {
+
+namespace {
+
+/// Print the specified `value` into the specified `stream` as a JSON string.
+void printJsonString(bsl::ostream& stream, const bslstl::StringRef& value)
+{
+    static const char k_HEX_DIGITS[] = "0123456789abcdef";
+
+    stream << '"';
+    for (bsl::size_t i = 0; i < value.length(); ++i) {
+        const unsigned char c = static_cast<unsigned char>(value[i]);
+        switch (c) {
+        case '"': {
+            stream << "\\\"";
+        } break;
+        case '\\': {
+            stream << "\\\\";
+        } break;
+        case '\n': {
+            stream << "\\n";
+        } break;
+        case '\t': {
+            stream << "\\t";
+        } break;
+        default: {
+            if (c < 0x20) {
+                stream << "\\u00" << k_HEX_DIGITS[c >> 4]
+                       << k_HEX_DIGITS[c & 0x0F];
+            }
+            else {
+                stream << value[i];
+            }
+        }
+        }
+    }
+    stream << '"';
+}
+
+}  // close unnamed namespace
+
+// ====================
+// class BatchProcessor
+// ====================
+
+// CLASS METHODS
+
+void BatchProcessor::printResultLine(bsl::ostream&            stream,
+                                     const bslstl::StringRef& journalFile,
+                                     const bslstl::StringRef& result,
+                                     const bslstl::StringRef& error)
+{
+    stream << "{\"JournalFile\":";
+    printJsonString(stream, journalFile);
+    if (error.isEmpty()) {
+        // The output of the JSON line printer is one record per line: join
+        // them.  Newlines between JSON tokens are whitespace, and are
+        // removed; newlines in strings are escaped.
+        stream << ",\"Result\":";
+        bool inString = false;
+        bool escaped  = false;
+        for (bsl::size_t i = 0; i < result.length(); ++i) {
+            const char c = result[i];
+            if (c == '\n') {
+                if (inString) {
+                    stream << "\\n";
+                }
+                escaped = false;
+                continue;  // CONTINUE
+            }
+            if (inString) {
+                if (escaped) {
+                    escaped = false;
+                }
+                else if (c == '\\') {
+                    escaped = true;
+                }
+                else if (c == '"') {
+                    inString = false;
+                }
+            }
+            else if (c == '"') {
+                inString = true;
+            }
+            stream << c;
+        }
+    }
+    else {
+        stream << ",\"Error\":";
+        printJsonString(stream, error);
+    }
+    stream << "}\n";
+}
+
+// CREATORS
+
+BatchProcessor::BatchProcessor(const CommandLineArguments& arguments,
+                               bsl::ostream&               ostream,
+                               bslma::Allocator*           allocator)
+: d_arguments(arguments)
+, d_ostream(ostream)
+, d_allocator_p(bslma::Default::allocator(allocator))
+{
+    // NOTHING
+}
+
+// PRIVATE ACCESSORS
+
+void BatchProcessor::processFile(bsl::string*       result,
+                                 const bsl::string& journalFile) const
+{
+    // executed by *ANY* thread of the pool
+
+    // PRECONDITIONS
+    BSLS_ASSERT(result);
+
+    bmqu::MemOutStream output(d_allocator_p);
+    bmqu::MemOutStream error(d_allocator_p);
+    try {
+        Parameters parameters(d_arguments, d_allocator_p);
+
+        bslma::ManagedPtr<FileManager> fileManager(
+            new (*d_allocator_p) FileManagerImpl(journalFile,
+                                                 bsl::string(),
+                                                 d_arguments.d_cslFile,
+                                                 d_arguments.d_cslFromBegin,
+                                                 d_allocator_p),
+            d_allocator_p);
+        if (!d_arguments.d_cslFile.empty()) {
+            fileManager->fillQueueMapFromCslFile(&parameters.d_queueMap);
+            parameters.validateQueueNames();
+        }
+
+        // The printer completes the output when the processor is destroyed,
+        // at the end of this scope.
+        bslma::ManagedPtr<CommandProcessor> processor =
+            CommandProcessorFactory::createCommandProcessor(&parameters,
+                                                            fileManager,
+                                                            output,
+                                                            d_allocator_p);
+        if (processor) {
+            processor->process();
+        }
+        else {
+            error << "Failed to create processor";
+        }
+    }
+    catch (const bsl::exception& e) {
+        error << e.what();
+    }
+
+    bmqu::MemOutStream line(d_allocator_p);
+    printResultLine(line, journalFile, output.str(), error.str());
+
+    result->assign(line.str().data(), line.str().length());
+}
+
+// MANIPULATORS
+
+void BatchProcessor::process()
+{
+    const bsl::vector<bsl::string>& journalFiles = d_arguments.d_batch;
+    if (journalFiles.empty()) {
+        return;  // RETURN
+    }
+
+    const int numFiles   = static_cast<int>(journalFiles.size());
+    int       numThreads = d_arguments.d_threads;
+    if (numThreads <= 0) {
+        numThreads = bsl::max(
+            1,
+            static_cast<int>(bslmt::ThreadUtil::hardwareConcurrency()));
+    }
+    numThreads = bsl::min(numThreads, numFiles);
+
+    bsl::vector<bsl::string> results(journalFiles.size(),
+                                     bsl::string(d_allocator_p),
+                                     d_allocator_p);
+
+    bdlmt::FixedThreadPool threadPool(
+        bslmt::ThreadAttributes().setThreadName("bmqStorageTool"),
+        numThreads,
+        numFiles,  // maxNumPendingJobs
+        d_allocator_p);
+    if (threadPool.start() == 0) {
+        for (int i = 0; i < numFiles; ++i) {
+            threadPool.enqueueJob(
+                bdlf::BindUtil::bind(&BatchProcessor::processFile,
+                                     this,
+                                     &results[i],
+                                     journalFiles[i]));
+        }
+        threadPool.drain();
+    }
+    else {
+        // Process the files in this thread.
+        for (int i = 0; i < numFiles; ++i) {
+            processFile(&results[i], journalFiles[i]);
+        }
+    }
+
+    for (int i = 0; i < numFiles; ++i) {
+        d_ostream << results[i];
+    }
+    d_ostream.flush();
+}
+
+}  // close package namespace
+}  // close enterprise namespace
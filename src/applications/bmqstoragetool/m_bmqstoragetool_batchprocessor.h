@@ -0,0 +1,107 @@
+// Copyright 2026 Bloomberg Finance L.P.
+// SPDX-License-Identifier: Apache-2.0
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef INCLUDED_M_BMQSTORAGETOOL_BATCHPROCESSOR
+#define INCLUDED_M_BMQSTORAGETOOL_BATCHPROCESSOR
+
+//@PURPOSE: Provide a processor of several journal files on a thread pool.
+//
+//@CLASSES:
+//  m_bmqstoragetool::BatchProcessor: batch mode command processor.
+//
+//@DESCRIPTION: 'BatchProcessor' runs the command described by the specified
+// arguments on each journal file of the batch mode ('--batch'), on a thread
+// pool, e.g. on the journal files of all the partitions of a cluster node.
+// Each file is processed by its own 'FileManager' and 'CommandProcessor',
+// which write into their own buffer, so that processors share no state.
+//
+// Once all files are processed, one JSON line is output per journal file, in
+// the order of the journal files, with either the JSON output of the command
+// for this file or the reason it could not be processed (see
+// 'printResultLine'):
+//..
+//  {"JournalFile":"<path>","Result":{...}}
+//  {"JournalFile":"<path>","Error":"<error description>"}
+//..
+
+// bmqstoragetool
+#include <m_bmqstoragetool_commandprocessor.h>
+#include <m_bmqstoragetool_parameters.h>
+
+// BDE
+#include <bsl_ostream.h>
+#include <bsl_string.h>
+#include <bslma_allocator.h>
+#include <bsls_keyword.h>
+
+namespace BloombergLP {
+namespace m_bmqstoragetool {
+
+// ====================
+// class BatchProcessor
+// ====================
+
+class BatchProcessor : public CommandProcessor {
+  private:
+    // PRIVATE DATA
+
+    /// Validated arguments, with the journal files to process.
+    const CommandLineArguments& d_arguments;
+
+    /// Reference to output stream.
+    bsl::ostream& d_ostream;
+
+    /// Pointer to allocator that is used inside the class.
+    bslma::Allocator* d_allocator_p;
+
+    // PRIVATE ACCESSORS
+
+    /// Process the specified `journalFile`, and load into the specified
+    /// `result` the JSON line to output for it.
+    void processFile(bsl::string* result, const bsl::string& journalFile) const;
+
+  public:
+    // CLASS METHODS
+
+    /// Print into the specified `stream` the JSON line reporting the
+    /// specified `journalFile`: with the specified `result`, the JSON output
+    /// of the command for this file, if the specified `error` is empty, and
+    /// with `error` otherwise.  The newlines of `result` are removed between
+    /// JSON tokens and escaped in strings, so that the line ends with its
+    /// only newline.
+    static void printResultLine(bsl::ostream&            stream,
+                                const bslstl::StringRef& journalFile,
+                                const bslstl::StringRef& result,
+                                const bslstl::StringRef& error);
+
+    // CREATORS
+
+    /// Constructor using the specified `arguments`, `ostream` and
+    /// `allocator`.  The behavior is undefined unless `arguments` have been
+    /// validated and outlive this object.
+    BatchProcessor(const CommandLineArguments& arguments,
+                   bsl::ostream&               ostream,
+                   bslma::Allocator*           allocator);
+
+    // MANIPULATORS
+
+    /// Process the journal files of the batch and output the results.
+    void process() BSLS_KEYWORD_OVERRIDE;
+};
+
+}  // close package namespace
+}  // close enterprise namespace
+
+#endif
@@ -0,0 +1,146 @@
+// Copyright 2026 Bloomberg Finance L.P.
+// SPDX-License-Identifier: Apache-2.0
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+// bmqstoragetool
+#include <m_bmqstoragetool_batchprocessor.h>
+
+// BMQ
+#include <bmqu_memoutstream.h>
+
+// TEST DRIVER
+#include <bmqtst_testhelper.h>
+
+// CONVENIENCE
+using namespace BloombergLP;
+using namespace m_bmqstoragetool;
+using namespace bsl;
+
+// ============================================================================
+//                                    TESTS
+// ----------------------------------------------------------------------------
+
+static void test1_resultLineTest()
+// ------------------------------------------------------------------------
+// RESULT LINE TEST
+//
+// Concerns:
+//   The JSON line output of the printer, one record per line, is joined
+//   into one JSON line holding the result of the journal file.
+//
+// Testing:
+//   BatchProcessor::printResultLine()
+// ------------------------------------------------------------------------
+{
+    bmqtst::TestHelper::printTestName("RESULT LINE TEST");
+
+    bmqu::MemOutStream stream(bmqtst::TestHelperUtil::allocator());
+
+    BatchProcessor::printResultLine(stream,
+                                    "/tmp/test.bmq_journal",
+                                    "{\"Records\": [\n"
+                                    "{\"RecordType\": \"MESSAGE\"},\n"
+                                    "{\"RecordType\": \"CONFIRM\"}\n"
+                                    "],\n"
+                                    "\"MessageRecords\": \"1\"\n"
+                                    "}\n",
+                                    "");
+    BMQTST_ASSERT_EQ(stream.str(),
+                     "{\"JournalFile\":\"/tmp/test.bmq_journal\","
+                     "\"Result\":{\"Records\": ["
+                     "{\"RecordType\": \"MESSAGE\"},"
+                     "{\"RecordType\": \"CONFIRM\"}"
+                     "],"
+                     "\"MessageRecords\": \"1\""
+                     "}}\n");
+}
+
+static void test2_newlineInStringTest()
+// ------------------------------------------------------------------------
+// NEWLINE IN STRING TEST
+//
+// Concerns:
+//   Newlines in the strings of the result are escaped rather than
+//   removed, escaped quotes and backslashes in strings being taken into
+//   account.
+//
+// Testing:
+//   BatchProcessor::printResultLine()
+// ------------------------------------------------------------------------
+{
+    bmqtst::TestHelper::printTestName("NEWLINE IN STRING TEST");
+
+    bmqu::MemOutStream stream(bmqtst::TestHelperUtil::allocator());
+
+    BatchProcessor::printResultLine(stream,
+                                    "journal",
+                                    "{\"a\": \"x\ny\",\n"
+                                    "\"b\": \"\\\"\ny\\\\\",\n"
+                                    "\"c\": \"\"\n"
+                                    "}\n",
+                                    "");
+    BMQTST_ASSERT_EQ(stream.str(),
+                     "{\"JournalFile\":\"journal\","
+                     "\"Result\":{\"a\": \"x\\ny\","
+                     "\"b\": \"\\\"\\ny\\\\\","
+                     "\"c\": \"\""
+                     "}}\n");
+}
+
+static void test3_errorLineTest()
+// ------------------------------------------------------------------------
+// ERROR LINE TEST
+//
+// Concerns:
+//   A journal file which could not be processed is reported with its
+//   error, as a JSON string, and without its partial result.
+//
+// Testing:
+//   BatchProcessor::printResultLine()
+// ------------------------------------------------------------------------
+{
+    bmqtst::TestHelper::printTestName("ERROR LINE TEST");
+
+    bmqu::MemOutStream stream(bmqtst::TestHelperUtil::allocator());
+
+    BatchProcessor::printResultLine(stream,
+                                    "dir\\\"journal\"",
+                                    "{\"Records\": [\n",
+                                    "Invalid \"file\"\n\tat\x01");
+    BMQTST_ASSERT_EQ(stream.str(),
+                     "{\"JournalFile\":\"dir\\\\\\\"journal\\\"\","
+                     "\"Error\":\"Invalid \\\"file\\\"\\n\\tat\\u0001\"}\n");
+}
+
+// ============================================================================
+//                                 MAIN PROGRAM
+// ----------------------------------------------------------------------------
+
+int main(int argc, char* argv[])
+{
+    TEST_PROLOG(bmqtst::TestHelper::e_DEFAULT);
+
+    switch (_testCase) {
+    case 0:
+    case 1: test1_resultLineTest(); break;
+    case 2: test2_newlineInStringTest(); break;
+    case 3: test3_errorLineTest(); break;
+    default: {
+        cerr << "WARNING: CASE '" << _testCase << "' NOT FOUND." << endl;
+        bmqtst::TestHelperUtil::testStatus() = -1;
+    } break;
+    }
+
+    TEST_EPILOG(bmqtst::TestHelper::e_CHECK_DEF_GBL_ALLOC);
+}
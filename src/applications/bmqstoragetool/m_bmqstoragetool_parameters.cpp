@@ -37,6 +37,7 @@
 #include <bdls_filesystemutil.h>
 #include <bdls_pathutil.h>
 #include <bdlt_timeunitratio.h>
+#include <bsl_algorithm.h>
 #include <bsl_cctype.h>  // bsl::isxdigit
 #include <bsl_cstddef.h>
 #include <bsl_cstring.h>
@@ -133,6 +134,8 @@ CommandLineArguments::CommandLineArguments(bslma::Allocator* allocator)
 , d_partiallyConfirmed(false)
 , d_minRecordsPerQueue(0)
 , d_cslSummaryQueuesLimit(0)
+, d_batch(allocator)
+, d_threads(0)
 , d_allocator_p(bslma::Default::allocator(allocator))
 {
     // NOTHING
@@ -152,7 +155,8 @@ bool CommandLineArguments::validate(bsl::string* error_p)
 
     if (validMode) {
         if (!d_cslFile.empty() &&
-            (d_journalPath.empty() && d_journalFile.empty())) {
+            (d_journalPath.empty() && d_journalFile.empty() &&
+             d_batch.empty())) {
             validateCslModeArgs(ss);
         }
         else {
@@ -264,7 +268,10 @@ void CommandLineArguments::validateJournalModeArgs(bsl::ostream& stream)
     }
 
     // Validate journal file and path
-    if (d_journalPath.empty() && d_journalFile.empty()) {
+    if (!d_batch.empty()) {
+        validateBatchModeArgs(stream);
+    }
+    else if (d_journalPath.empty() && d_journalFile.empty()) {
         stream << "Neither journal path nor journal file is specified\n";
     }
     else if (!d_journalPath.empty()) {
@@ -402,6 +409,46 @@ void CommandLineArguments::validateJournalModeArgs(bsl::ostream& stream)
         stream << "Dump limit must be positive value greater than zero.\n";
 }
 
+void CommandLineArguments::validateBatchModeArgs(bsl::ostream& stream)
+{
+    if (!d_journalPath.empty() || !d_journalFile.empty() ||
+        !d_dataFile.empty()) {
+        stream << "--batch can't be combined with --journal-path, "
+                  "--journal-file and --data-file, journal files to process "
+                  "are specified by --batch\n";
+    }
+    if (d_printMode != k_JSON_LINE_MODE) {
+        stream << "--batch requires --print-mode=json-line, as one JSON line "
+                  "is output per journal file\n";
+    }
+    if (d_threads < 0) {
+        stream << "--threads: " << d_threads << " cannot be negative\n";
+    }
+
+    // Resolve patterns into journal files
+    bsl::vector<bsl::string> journalFiles(d_allocator_p);
+    bsl::vector<bsl::string> result(d_allocator_p);
+    bsl::vector<bsl::string>::const_iterator cit = d_batch.cbegin();
+    for (; cit != d_batch.cend(); ++cit) {
+        result.clear();
+        bdls::FilesystemUtil::findMatchingPaths(&result, cit->c_str());
+        const bsl::size_t numJournalFiles = journalFiles.size();
+        bsl::vector<bsl::string>::const_iterator it = result.cbegin();
+        for (; it != result.cend(); ++it) {
+            if (it->ends_with(".bmq_journal")) {
+                journalFiles.push_back(*it);
+            }
+        }
+        if (journalFiles.size() == numJournalFiles) {
+            stream << "--batch: no journal file matches " << *cit << "\n";
+        }
+    }
+    bsl::sort(journalFiles.begin(), journalFiles.end());
+    journalFiles.erase(bsl::unique(journalFiles.begin(), journalFiles.end()),
+                       journalFiles.end());
+    d_batch.swap(journalFiles);
+}
+
 bool CommandLineArguments::validateRangeArgs(bsl::ostream& error) const
 {
     if (d_timestampLt < 0 || d_timestampGt < 0 ||
@@ -598,7 +645,8 @@ Parameters::Parameters(const CommandLineArguments& arguments,
 {
     // Determine processing mode: process Journal or CSL file
     if (!arguments.d_cslFile.empty() &&
-        (arguments.d_journalPath.empty() && arguments.d_journalFile.empty())) {
+        (arguments.d_journalPath.empty() && arguments.d_journalFile.empty() &&
+         arguments.d_batch.empty())) {
         d_cslMode = true;
     }
 
@@ -108,6 +108,12 @@ class CommandLineArguments {
     bsls::Types::Int64 d_minRecordsPerQueue;
     /// Limit number of queues to display in CSL file summary
     int d_cslSummaryQueuesLimit;
+    /// Journal files, or '*'-ended patterns matching journal files, to
+    /// process in batch mode.  Patterns are resolved by `validate`.
+    bsl::vector<bsl::string> d_batch;
+    /// Number of threads processing journal files in batch mode, or 0 for
+    /// one thread per CPU
+    int d_threads;
 
     // CREATORS
 
@@ -133,6 +139,11 @@ class CommandLineArguments {
     /// specified `stream`.
     void validateJournalModeArgs(bsl::ostream& stream);
 
+    /// Validate batch mode arguments, and resolve the patterns of journal
+    /// files to process into sorted, unique file paths. Write validation error
+    /// into the specified `stream`.
+    void validateBatchModeArgs(bsl::ostream& stream);
+
     // PRIVATE ACCESSORS
 
     /// Validate CSL mode arguments. Write validation error into the specified
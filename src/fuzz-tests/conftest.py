@@ -17,25 +17,52 @@
 Pytest fixtures for fuzz testing the BlazingMQ broker.
 """
 
+import os
 import queue
 import subprocess
+import time
 from dataclasses import dataclass
+from pathlib import Path
 from threading import Thread
 
 import pytest
 
+from blazingmq.dev.fuzztest.metrics import BrokerSampler, FuzzMetrics
 from blazingmq.dev.paths import paths
 from blazingmq.dev.processtools import stop_broker
 
 BROKER_DEFAULT_PORT = 30114
 BROKER_TERMINATE_TIMEOUT = 10
 BROKER_TIME_LIMIT = 60 * 60  # 1 hour
+BROKER_START_TIMEOUT = 30
 
 
 @dataclass
 class BrokerInfo:
     host: str
     port: int
+    pid_file: Path
+    log_dir: Path
+
+    def log_file(self, timeout: float = BROKER_START_TIMEOUT) -> Path:
+        """
+        Return the log file of the broker, named after its start time and
+        pid, waiting up to 'timeout' seconds for the broker to create it.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                pid = int(self.pid_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                pid = None
+            if pid is not None:
+                # Timestamps sort in chronological order.
+                logs = sorted(self.log_dir.glob(f"logs.*.{pid}"))
+                if logs:
+                    return logs[-1]
+            if time.monotonic() > deadline:
+                pytest.fail(f"The broker log file was not found in '{self.log_dir}'")
+            time.sleep(0.1)
 
 
 def _run_broker(result_queue, broker_dir, broker_cmd, time_limit):
@@ -75,6 +102,10 @@ def broker():
             "Build with: cmake --build --preset default"
         )
 
+    # A stale pid file would be taken for the pid of an exited broker.
+    pid_file = broker_dir / "bmqbrkr.pid"
+    pid_file.unlink(missing_ok=True)
+
     result_queue = queue.Queue()
     broker_thread = Thread(
         target=_run_broker,
@@ -82,10 +113,31 @@ def broker():
     )
     broker_thread.start()
 
-    yield BrokerInfo(host="localhost", port=BROKER_DEFAULT_PORT)
+    yield BrokerInfo(
+        host="localhost",
+        port=BROKER_DEFAULT_PORT,
+        pid_file=pid_file,
+        # See 'run' and 'etc/bmqbrkrcfg.json'.
+        log_dir=broker_dir / "localBMQ" / "logs",
+    )
 
     stop_broker(broker_dir, BROKER_TERMINATE_TIMEOUT)
     broker_thread.join(timeout=BROKER_TERMINATE_TIMEOUT)
 
     rc = result_queue.get()
     assert rc == 0, f"Broker exited with non-zero return code: {rc}"
+
+
+@pytest.fixture
+def metrics(request, broker, tmp_path):
+    """
+    Record the throughput of the fuzz test and the health of the broker, in
+    the directory named by BLAZINGMQ_FUZZ_METRICS if set, or in the
+    temporary directory of the test.
+    """
+    directory = Path(os.environ.get("BLAZINGMQ_FUZZ_METRICS", tmp_path))
+    with FuzzMetrics(
+        directory / f"{request.node.name}.csv",
+        broker=BrokerSampler(pid_file=broker.pid_file),
+    ) as recorder:
+        yield recorder
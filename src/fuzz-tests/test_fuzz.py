@@ -17,34 +17,161 @@
 Fuzz tests for the BlazingMQ broker protocol.
 
 Each test fuzzes a single request type by mutating messages and sending them
-to the broker to verify it handles malformed input without crashing.
+to the broker to verify it handles malformed input without crashing.  The
+crashing inputs of the corpus directory named by 'BLAZINGMQ_FUZZ_CORPUS'
+('corpus' next to this file by default) are replayed as regression tests.
 """
 
+import os
+from pathlib import Path
+
 import pytest
 
 from blazingmq.dev import fuzztest
-from blazingmq.dev.fuzztest.put_message_properties import fuzz_properties
+from blazingmq.dev.fuzztest.cluster import (
+    ClusterNode,
+    cluster_requests,
+    fuzz_cluster,
+    is_finding,
+)
+from blazingmq.dev.fuzztest.corpus import CRASHES, MINIMIZED, CorpusDir, replay
+from blazingmq.dev.fuzztest.parallel import fuzz_parallel
+from blazingmq.dev.fuzztest.prerender import fuzz_prerendered
+from blazingmq.dev.fuzztest.put_message_properties import (
+    fuzz_properties,
+    fuzz_put_grammar,
+)
+from blazingmq.dev.fuzztest.schema_models import (
+    MESSAGE_TYPES,
+    fuzz_schema,
+    schema_models,
+)
+from blazingmq.dev.fuzztest.stateful import fuzz_stateful
+from blazingmq.dev.reserveport import reserve_port
+
+
+@pytest.mark.fuzztest
+@pytest.mark.parametrize("request_name", fuzztest.REQUESTS)
+def test_fuzz_request(broker, metrics, request_name):
+    fuzztest.fuzz(
+        broker.host,
+        broker.port,
+        request=request_name,
+        liveness=fuzztest.LivenessMonitor(pid_file=broker.pid_file),
+        metrics=metrics,
+    )
+
+
+@pytest.mark.fuzztest
+@pytest.mark.parametrize(
+    "model",
+    [model.name for type_name in MESSAGE_TYPES for model in schema_models(type_name)],
+)
+def test_fuzz_schema_model(broker, model):
+    fuzz_schema(
+        broker.host,
+        broker.port,
+        model=model,
+        liveness=fuzztest.LivenessMonitor(pid_file=broker.pid_file),
+    )
+
+
+@pytest.mark.fuzztest
+@pytest.mark.parametrize("request_name", fuzztest.REQUESTS)
+def test_fuzz_prerendered(broker, metrics, request_name):
+    liveness = fuzztest.LivenessMonitor(pid_file=broker.pid_file)
+    try:
+        report = fuzz_prerendered(
+            broker.host,
+            broker.port,
+            request=request_name,
+            liveness=liveness,
+            metrics=metrics,
+        )
+    finally:
+        liveness.close()
+    assert not report.crashed, report.crash_case
+    assert not report.errors
+
+
+CORPUS_DIR = Path(
+    os.environ.get("BLAZINGMQ_FUZZ_CORPUS", Path(__file__).parent / "corpus")
+)
 
-REQUESTS = [
-    "authentication",
-    "negotiation",
-    "open_queue",
-    "configure_stream",
-    "configure_queue_stream",
-    "put",
-    "confirm",
-    "close_queue",
-    "disconnect",
-    "negotiation_bypass_authentication",
-]
+
+@pytest.mark.fuzztest
+@pytest.mark.parametrize(
+    "stored", CorpusDir(CORPUS_DIR).inputs([CRASHES, MINIMIZED]), ids=str
+)
+def test_fuzz_regression(broker, stored):
+    liveness = fuzztest.LivenessMonitor(pid_file=broker.pid_file)
+    try:
+        crashed = replay(broker.host, broker.port, stored.messages, liveness.is_running)
+    finally:
+        liveness.close()
+    assert not crashed, f"{stored} crashes the broker"
+
+
+@pytest.mark.fuzztest
+def test_fuzz_properties(broker, metrics):
+    fuzz_properties(broker.host, broker.port, metrics=metrics)
+
+
+@pytest.mark.fuzztest
+def test_fuzz_put_grammar(broker):
+    liveness = fuzztest.LivenessMonitor(pid_file=broker.pid_file)
+    try:
+        report = fuzz_put_grammar(
+            broker.host, broker.port, duration=60, liveness=liveness
+        )
+    finally:
+        liveness.close()
+    assert not report.crashed
+
+
+@pytest.mark.fuzztest
+def test_fuzz_parallel(tmp_path):
+    report = fuzz_parallel(work_dir=tmp_path)
+    assert not report.findings, [finding.test_case for finding in report.findings]
 
 
 @pytest.mark.fuzztest
-@pytest.mark.parametrize("request_name", REQUESTS)
-def test_fuzz_request(broker, request_name):
-    fuzztest.fuzz(broker.host, broker.port, request=request_name)
+@pytest.mark.parametrize("seed", range(4))
+def test_fuzz_stateful(broker, tmp_path, seed):
+    liveness = fuzztest.LivenessMonitor(pid_file=broker.pid_file)
+    try:
+        report = fuzz_stateful(
+            broker.host,
+            broker.port,
+            seed=seed,
+            duration=30,
+            liveness=liveness,
+            log_file=broker.log_file(),
+            work_dir=tmp_path,
+        )
+    finally:
+        liveness.close()
+    assert not report.failed, report.interleaving(last=64)
 
 
 @pytest.mark.fuzztest
-def test_fuzz_properties(broker):
-    fuzz_properties(broker.host, broker.port)
+@pytest.mark.parametrize("request_name", cluster_requests())
+def test_fuzz_cluster(tmp_path, request_name):
+    with reserve_port() as port, reserve_port() as peer_port:
+        node = ClusterNode("fuzz", port.port, peer_port.port, tmp_path)
+        node.start()
+        liveness = fuzztest.LivenessMonitor(pid=node.pid)
+        try:
+            fuzz_cluster(
+                "localhost",
+                node.port,
+                node.cluster_name,
+                node.peer_id,
+                request_name,
+                liveness=liveness,
+            )
+            returncode = node.poll()
+        finally:
+            liveness.close()
+            node.stop()
+    assert not is_finding(returncode), f"see {node.log_path}"
@@ -32,6 +32,7 @@ from blazingmq.dev.it.data import data_metrics as dt
 from blazingmq.dev.it.process.admin import AdminClient
 from blazingmq.dev.it.process.broker import Broker
 from blazingmq.dev.it.process.client import Client
+from blazingmq.util import fastjson
 
 pytestmark = order(1)
 
@@ -82,8 +83,8 @@ def extract_stats(admin_response: str) -> dict:
     - Next layer is a 'dict' containing "stats" field with 'str' text
     - The last layer is another 'dict' containing the stats itself
     """
-    d1 = json.loads(admin_response)
-    d2 = json.loads(d1["stats"])
+    d1 = fastjson.loads(admin_response)
+    d2 = fastjson.loads(d1["stats"])
     return d2
 
 
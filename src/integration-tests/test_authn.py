@@ -28,11 +28,11 @@ All tests use the built-in authenticators:
 This approach tests all authentication scenarios without needing external plugins.
 """
 
-import threading
 import pytest
 
 import blazingmq.dev.it.testconstants as tc
 from blazingmq.dev.it.process.rawclient import RawClient
+from blazingmq.dev.it.process.stress import Step, StressDriver
 from blazingmq.dev.it.process.admin import AdminClient
 from blazingmq.dev.it.process.proc import ProcessExitError
 
@@ -131,28 +131,18 @@ def test_authenticate_concurrent(
     domain_urls: tc.DomainUrls,  # pylint: disable=unused-argument
 ) -> None:
     """Test concurrent authentication with BasicAuthenticator."""
-    num_threads = 8
-    results = [None] * num_threads
-    threads = []
-
-    def auth_worker(idx):
-        client = RawClient()
-        client.open_channel(*single_node.admin_endpoint)
-        auth_resp = client.authenticate("Basic", f"user{idx}:password{idx}")
-        results[idx] = auth_resp["authenticationResponse"]["status"]["code"]
-        client.negotiate()
-        client.stop()
-
-    for i in range(num_threads):
-        t = threading.Thread(target=auth_worker, args=(i,))
-        threads.append(t)
-        t.start()
-
-    for t in threads:
-        t.join()
+    num_clients = 8
+    driver = StressDriver(
+        *single_node.admin_endpoint,
+        script=(Step.AUTHENTICATE, Step.NEGOTIATE),
+        credentials=lambda idx: ("Basic", f"user{idx}:password{idx}"),
+    )
+    report = driver.run(num_clients)
 
     # Assert all authentications succeeded
-    assert all(code == 0 for code in results), f"Some authentications failed: {results}"
+    assert report.succeeded == num_clients, (
+        f"Some authentications failed: {report.errors}"
+    )
 
 
 # ==============================================================================
@@ -30,6 +30,7 @@ from blazingmq.dev.it.fixtures import (
     test_logger,
 )
 from blazingmq.dev.it.cluster_util import (
+    run_storage_tool_batch,
     stop_cluster_and_compare_journal_files,
 )
 
@@ -277,6 +278,69 @@ def test_sync_after_missed_records(
     stop_cluster_and_compare_journal_files(leader.name, replica.name, cluster)
 
 
+@tweak.cluster.queue_operations.shutdown_timeout_ms(100)
+def test_storage_tool_batch_summaries(
+    fsm_multi_cluster: Cluster,
+    domain_urls: tc.DomainUrls,
+) -> None:
+    """
+    Test the summaries of the journal files of all the partitions of the leader and a replica, computed by one run of the storage tool in batch mode.
+    - start cluster
+    - put 2 messages with confirms, and 3 more messages
+    - stop cluster
+    - check that the leader and the replica journal files hold the 5 messages, 3 of them outstanding
+    """
+    cluster: Cluster = fsm_multi_cluster
+    uri_priority = domain_urls.uri_priority
+
+    leader = cluster.last_known_leader
+    proxy = next(cluster.proxy_cycle())
+
+    # Create producer and consumer
+    producer = proxy.create_client("producer")
+    producer.open(uri_priority, flags=["write,ack"], succeed=True)
+
+    consumer = proxy.create_client("consumer")
+    consumer.open(uri_priority, flags=["read"], succeed=True)
+
+    replica = cluster.nodes(exclude=leader)[0]
+
+    # Put 2 messages with confirms
+    for i in range(1, 3):
+        producer.post(uri_priority, [f"msg{i}"], succeed=True, wait_ack=True)
+
+        consumer.wait_push_event()
+        consumer.confirm(uri_priority, "*", succeed=True)
+
+    # Put 3 more messages w/o confirm
+    for i in range(3, 6):
+        producer.post(uri_priority, [f"msg{i}"], succeed=True, wait_ack=True)
+
+    stop_cluster_and_compare_journal_files(leader.name, replica.name, cluster)
+
+    journal_files = {
+        node.name: sorted(
+            glob.glob(
+                str(cluster.work_dir.joinpath(node.name, "storage")) + "/*journal*"
+            )
+        )
+        for node in (leader, replica)
+    }
+    summaries = run_storage_tool_batch(
+        [path for paths in journal_files.values() for path in paths], "summary"
+    )
+
+    for name, paths in journal_files.items():
+        total = sum(int(summaries[path]["TotalMessagesNumber"]) for path in paths)
+        outstanding = sum(
+            int(summaries[path]["OutstandingMessagesNumber"]) for path in paths
+        )
+        assert (total, outstanding) == (5, 3), (
+            f"Unexpected journal summaries of {name}: {total} messages, "
+            f"{outstanding} outstanding"
+        )
+
+
 @tweak.cluster.queue_operations.shutdown_timeout_ms(100)
 def test_sync_if_leader_missed_records(
     fsm_multi_cluster: Cluster,
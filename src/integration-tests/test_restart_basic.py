@@ -19,8 +19,6 @@ in the middle of things.  Note that this test does not test the HA
 functionality (i.e., no PUTs/CONFIRMs etc are retransmitted).
 """
 
-import re
-
 import blazingmq.dev.it.testconstants as tc
 from blazingmq.dev.it.fixtures import (
     Cluster,
@@ -95,19 +93,9 @@ def test_migrate_domain_to_another_cluster(
     # successfully apply the queue creation event.
     @attempt(3, 5)
     def wait_replication():
-        for node in cluster.nodes():
-            node.command(f"CLUSTERS CLUSTER {node.cluster_name} STORAGE SUMMARY")
-
-        for node in cluster.nodes():
-            assert node.outputs_regex(
-                r"\w{10}\s+0\s+0\s+\d+\s+B\s+" + re.escape(uri_fanout),
-                timeout=1,
-            )
-            # Above regex is to match line:
-            # C1E2A44527    0      0      68  B      bmq://bmq.test.mmap.fanout/qqq
-            # where columns are: QueueKey, PartitionId, NumMsgs, NumBytes,
-            # QueueUri respectively. Since we opened only 1 queue, we know that
-            # it will be assigned to partitionId 0.
+        # Since we opened only 1 queue, we know that it will be assigned to
+        # partitionId 0.
+        ensure_message_at_storage_layer(cluster, 0, uri_fanout, 0)
 
     cluster.config.domains.clear()
     cluster.deploy_domains()
@@ -17,8 +17,11 @@
 Testing rollover of CSL file.
 """
 
+import pytest
+
 import blazingmq.dev.it.testconstants as tc
 from blazingmq.dev.it.fixtures import Cluster, start_cluster
+from blazingmq.dev.it.process.results import CommandError
 
 
 # We have to make sure that wait_ready is True (i.e. primary node is elected)
@@ -68,12 +71,14 @@ def test_command_storage_partition_summary_partitionid(
     leader = cluster.last_known_leader
 
     invalid_partition_id = -1
-    res = leader.get_storage_partition_summary(invalid_partition_id, succeed=False)
-    assert res != 0, "Summary for invalid partition -1 should fail"
+    with pytest.raises(CommandError):
+        leader.get_storage_partition_summary(invalid_partition_id)
 
     for partition_id in range(num_partitions):
-        res = leader.get_storage_partition_summary(partition_id, succeed=True)
-        assert res == 0, f"Summary for partition {partition_id} should succeed"
+        summary = leader.get_storage_partition_summary(partition_id)
+        assert summary.partition_id == partition_id, (
+            f"Summary for partition {partition_id} should succeed"
+        )
 
-    res = leader.get_storage_partition_summary(num_partitions, succeed=False)
-    assert res != 0, f"Summary for invalid partition {num_partitions} should fail"
+    with pytest.raises(CommandError):
+        leader.get_storage_partition_summary(num_partitions)
@@ -20,13 +20,29 @@ Public functions:
 o 'fuzz': launch fuzzing session with the given 'host':'port' of a BlazingMQ
           Broker instance.  If the optionally specified 'request' string is
           provided, fuzz only the request with the given name.
+o 'make_session': build the fuzzing session run by 'fuzz', e.g. to fuzz a
+                  range of its mutations only.
+o 'count_mutations': return the number of mutations of a request.
+o 'make_workflows': return the sequences of requests sent to the broker.
+
+Public types (see 'fast_connection'):
+o 'FastConnection': a connection which never waits for the broker.
+o 'LivenessMonitor': detect crashes by watching the broker process.
+
+Public types (see 'metrics'):
+o 'FuzzMetrics': record the throughput of a session and the broker health.
+
+Public constants:
+o 'REQUESTS': the names of the requests that can be fuzzed.
 """
 
 from enum import IntEnum
 from typing import List, Optional, Tuple
 
 import boofuzz
-from blazingmq.schemas import broker
+from blazingmq.dev.fuzztest.fast_connection import FastConnection, LivenessMonitor
+from blazingmq.dev.fuzztest.metrics import FuzzMetrics
+from blazingmq.schemas import broker, protocol
 
 # =============================================================================
 #                                  CONSTANTS
@@ -183,7 +199,7 @@ def wrap_event(
     )
     event_desc = boofuzz.Bytes(
         name="event_desc",
-        default_value=bytes([0x40 + event_type, 0x02, type_specific, 0x00]),
+        default_value=protocol.event_descriptor(event_type, type_specific),
         size=NumBytes.WORD,
     )
 
@@ -218,7 +234,7 @@ def wrap_event_wrong(
     )
     event_desc = boofuzz.Bytes(
         name="event_desc",
-        default_value=bytes([0x40 + event_type, 0x02, type_specific, 0x00]),
+        default_value=protocol.event_descriptor(event_type, type_specific),
         size=NumBytes.WORD,
     )
 
@@ -280,7 +296,7 @@ def make_put_message() -> BoofuzzSequence:
         boofuzz.BitField(name="options_size", width=3 * NumBits.BYTE),
         boofuzz.BitField(
             name="header_words",
-            default_value=9,
+            default_value=protocol.PUT_HEADER_SIZE // protocol.WORD_SIZE,
             width=NumBits.BYTE,
             endian=">",
             full_range=True,
@@ -372,22 +388,65 @@ def make_control_message(schema: broker.SchemaDescription) -> BoofuzzSequence:
 # =============================================================================
 
 
-def fuzz(host: str, port: int, request: Optional[str] = None) -> None:
+REQUESTS = (
+    "authentication",
+    "negotiation",
+    "open_queue",
+    "configure_stream",
+    "configure_queue_stream",
+    "put",
+    "confirm",
+    "close_queue",
+    "disconnect",
+    "negotiation_bypass_authentication",
+)
+
+
+def fuzz(
+    host: str,
+    port: int,
+    request: Optional[str] = None,
+    index_start: int = 1,
+    index_end: Optional[int] = None,
+    liveness: Optional[LivenessMonitor] = None,
+    metrics: Optional[FuzzMetrics] = None,
+) -> None:
     """
     Launch a fuzzing session with the specified 'host' and 'port' of the
-    launched BlazingMQ Broker instance.
+    launched BlazingMQ Broker instance.  Only the mutations with an index in
+    the specified range ['index_start', 'index_end'] are run, all of them by
+    default.  If the optionally specified 'liveness' monitor of the broker
+    process is provided, use the fast path of 'make_session'.  If the
+    optionally specified 'metrics' are provided, record the session in them.
     """
 
-    session = boofuzz.Session(
-        target=boofuzz.Target(
-            connection=boofuzz.TCPSocketConnection(host, port, recv_timeout=0.05)
-        ),
-        receive_data_after_each_request=True,
-        receive_data_after_fuzz=True,
-        web_port=None,
-        fuzz_loggers=[FuzzLoggerLimited()],
-        fuzz_db_keep_only_n_pass_cases=1,
-    )
+    make_session(
+        host,
+        port,
+        request,
+        liveness=liveness,
+        metrics=metrics,
+        index_start=index_start,
+        index_end=index_end,
+    ).fuzz(max_depth=1)
+
+
+def count_mutations(request: Optional[str] = None) -> int:
+    """
+    Return the number of mutations run by 'fuzz' for the specified
+    'request', or for all requests if 'request' is 'None'.
+    """
+
+    session = make_session("localhost", 0, request, db_filename=":memory:")
+    return session.num_mutations(max_depth=1)
+
+
+def make_workflows() -> List[List[Tuple[boofuzz.Request, str]]]:
+    """
+    Return the sequences of requests sent on a connection to the broker, as
+    pairs of a request and its name in 'REQUESTS'.  Each request of a
+    sequence is sent after all the requests preceding it.
+    """
 
     authentication = boofuzz.Request(
         "Authentication", children=(make_authentication_message())
@@ -443,6 +502,48 @@ def fuzz(host: str, port: int, request: Optional[str] = None) -> None:
         (negotiation_bypass_authentication, "negotiation_bypass_authentication")
     ]
 
+    return [base_workflow, authn_bypass_workflow]
+
+
+def make_session(
+    host: str,
+    port: int,
+    request: Optional[str] = None,
+    liveness: Optional[LivenessMonitor] = None,
+    workflows: Optional[List[List[Tuple[boofuzz.Request, str]]]] = None,
+    metrics: Optional[FuzzMetrics] = None,
+    **session_options,
+) -> boofuzz.Session:
+    """
+    Return a fuzzing session targeting the specified 'host' and 'port',
+    fuzzing only the specified 'request' if it is not 'None'.  The requests
+    are sent as in the specified 'workflows', 'make_workflows()' by default
+    (see 'schema_models.make_schema_workflows').  If the specified 'liveness'
+    monitor is provided, the session never waits for responses
+    ('FastConnection'), and detects crashes through the monitor.  If the
+    specified 'metrics' are provided, the session is recorded in them.  The
+    specified 'session_options' are passed to 'boofuzz.Session', overriding
+    the defaults.
+    """
+
+    if liveness is None:
+        connection = boofuzz.TCPSocketConnection(host, port, recv_timeout=0.05)
+        monitors = []
+    else:
+        connection = FastConnection(host, port, recv_timeout=0.05)
+        monitors = [liveness]
+
+    options = dict(
+        target=boofuzz.Target(connection=connection, monitors=monitors),
+        receive_data_after_each_request=True,
+        receive_data_after_fuzz=True,
+        web_port=None,
+        fuzz_loggers=[FuzzLoggerLimited()] + ([] if metrics is None else [metrics]),
+        fuzz_db_keep_only_n_pass_cases=1,
+    )
+    options.update(session_options)
+    session = boofuzz.Session(**options)
+
     def attach_fuzz_sequence(
         sequence: List[Tuple[boofuzz.Request, str]],
         *,
@@ -463,7 +564,9 @@ def fuzz(host: str, port: int, request: Optional[str] = None) -> None:
                 session.connect(prev, req)
             prev = req
 
-    attach_fuzz_sequence(base_workflow, fuzz_filter=request)
-    attach_fuzz_sequence(authn_bypass_workflow, fuzz_filter=request)
+    if workflows is None:
+        workflows = make_workflows()
+    for workflow in workflows:
+        attach_fuzz_sequence(workflow, fuzz_filter=request)
 
-    session.fuzz(max_depth=1)
+    return session
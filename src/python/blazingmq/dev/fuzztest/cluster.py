@@ -0,0 +1,522 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Fuzzing of the cluster (inter-broker) protocol.
+
+The other fuzzers of this package talk to the broker as a client would.
+Here, the fuzzer impersonates a peer node of the cluster of the broker:
+'ClusterNode' deploys a broker whose cluster has a second node, the fake
+peer, which is never started.  The fuzzer connects to the broker, negotiates
+with the identity of the fake peer (a 'ClientIdentity' of type
+'E_TCPBROKER', with the name of the cluster and the id of the peer), so that
+the broker handles the connection as a cluster member, then sends:
+
+o 'ELECTOR' events, carrying an 'ElectorMessage' encoded in BER: one request
+  per selection, with the term, the selection and its content fuzzed;
+o 'STORAGE' and 'PARTITION_SYNC' events, carrying a storage message of each
+  'StorageMessageType': a 'StorageHeader', a journal record and, for 'DATA',
+  a data record, with every field fuzzed;
+o 'REPLICATION_RECEIPT' events, carrying a receipt.
+
+The storage events are sent after a leader heartbeat of the peer, which is
+not fuzzed, so that they reach a node following the peer.
+
+The broker accepts a single connection per peer, and only once it noticed
+that the previous one is closed: the session sleeps for
+'PEER_RECONNECT_DELAY' between two test cases.  A node whose storage
+diverges from the replicated one terminates on purpose, with one of the
+'DELIBERATE_EXIT_CODES' (see 'is_finding').
+
+Public types:
+o 'ClusterNode': a broker deployed with a fake peer in its cluster.
+
+Public functions:
+o 'elector_selections': the selections of 'ElectorMessage'.
+o 'cluster_requests': the names of the requests that can be fuzzed.
+o 'peer_identity_schema': the 'ClientIdentity' of the fake peer.
+o 'make_elector_message': the boofuzz primitives of an elector message.
+o 'make_storage_message': the boofuzz primitives of a storage message.
+o 'make_replication_receipt': the boofuzz primitives of a receipt.
+o 'make_cluster_workflows': the sequences of requests sent as the peer.
+o 'fuzz_cluster': launch a fuzzing session as the peer.
+o 'is_finding': whether an exit code of the node is a finding.
+
+See also: mqba_sessionnegotiator.cpp, mqbnet_elector.h, bmqp_protocol.h,
+          mqbs_filestoreprotocol.h
+"""
+
+import copy
+import functools
+import struct
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import boofuzz
+
+import blazingmq.dev.configurator as cfg
+from blazingmq.dev.configurator.configurator import Configurator
+from blazingmq.dev.fuzztest import (
+    BoofuzzSequence,
+    NumBits,
+    NumBytes,
+    disable_fuzzing,
+    make_control_message,
+    make_session,
+    wrap_event,
+)
+from blazingmq.dev.fuzztest.fast_connection import LivenessMonitor
+from blazingmq.dev.fuzztest.metrics import FuzzMetrics
+from blazingmq.dev.fuzztest.parallel import FuzzBroker, add_fuzz_domain
+from blazingmq.schemas import ber, broker
+
+# =============================================================================
+#                                  CONSTANTS
+# =============================================================================
+
+
+# The term of the elector messages; larger than the one of a fresh node, so
+# that the node follows the peer.
+ELECTOR_TERM = 1000
+
+PEER_RECONNECT_DELAY = 0.1  # seconds between two test cases
+
+# mqbu::ExitCode of the deliberate terminations of a node whose storage
+# diverged: RECOVERY_FAILURE, STORAGE_OUT_OF_SYNC, UNSUPPORTED_SCENARIO.
+DELIBERATE_EXIT_CODES = frozenset({9, 10, 11})
+
+# The event types carrying storage messages.
+STORAGE_EVENT_TYPES = (broker.EventType.STORAGE, broker.EventType.PARTITION_SYNC)
+
+# BER identifiers, see 'ber'.
+_BER_SEQUENCE = bytes([ber.CONSTRUCTED | ber.UNIVERSAL_SEQUENCE, 0x80])
+_BER_TERM = bytes([ber.CONTEXT_SPECIFIC | 0])
+_BER_CHOICE = bytes([ber.CONTEXT_SPECIFIC | ber.CONSTRUCTED | 1, 0x80])
+
+_STORAGE_PROTOCOL_VERSION = 1
+_STORAGE_HEADER_WORDS = 3
+_MESSAGE_WORDS_HIGH_BITS = 3  # bits of the message words in the flags byte
+
+# mqbs::RecordType of the journal record of each storage message type.
+_RECORD_TYPES = {
+    broker.StorageMessageType.DATA: 1,  # MESSAGE
+    broker.StorageMessageType.QLIST: 4,  # QUEUE_OP
+    broker.StorageMessageType.CONFIRM: 2,
+    broker.StorageMessageType.DELETION: 3,
+    broker.StorageMessageType.JOURNAL_OP: 5,
+    broker.StorageMessageType.QUEUE_OP: 4,
+}
+_RECORD_TYPE_OFFSET = 12
+_JOURNAL_RECORD_SIZE = 60
+_RECORD_HEADER_SIZE = 20
+_RECORD_MAGIC = 0x2A724563  # mqbs::RecordHeader::k_MAGIC
+
+# A DATA record: mqbs::DataHeader, 3 header words and 6 message words,
+# followed by the application data, padded to a double word.
+_DATA_RECORD = struct.pack(">III", 3 << 29 | 6, 0, 0) + b"AppData" + b"\x05" * 5
+
+
+# =============================================================================
+#                                   MESSAGES
+# =============================================================================
+
+
+def peer_identity_schema(cluster_name: str, peer_id: int) -> broker.SchemaDescription:
+    """
+    Return the negotiation message of the node with the specified 'peer_id'
+    of the cluster with the specified 'cluster_name'.
+    """
+
+    schema = copy.deepcopy(broker.CLIENT_IDENTITY_SCHEMA)
+    identity = schema["clientIdentity"]
+    identity["clientType"] = "E_TCPBROKER"
+    identity["clusterName"] = cluster_name
+    identity["clusterNodeId"] = peer_id
+    return schema
+
+
+def make_elector_message(selection: str, term: int = ELECTOR_TERM) -> BoofuzzSequence:
+    """
+    Constructs boofuzz structures representing an ElectorMessage with the
+    specified 'selection' and 'term', encoded in BER as by 'ber.encode'.
+
+    See also: bmqp_ctrlmsg::ElectorMessage
+    """
+
+    schema = ber.control_schema()
+    choice = schema.complex_types["ElectorMessageChoice"]
+    element = next(e for e in choice.elements if e.name == selection)
+
+    # The term is an unsigned long: its content is prefixed with a zero
+    # byte, so that terms with the high bit set are not negative.
+    term_length = boofuzz.Size(
+        name="term_length", block_name="term", length=NumBytes.BYTE
+    )
+    term_value = boofuzz.Block(
+        "term",
+        children=[
+            boofuzz.Static(default_value=b"\x00"),
+            boofuzz.QWord(
+                name="term_value",
+                default_value=term,
+                endian=">",
+                output_format="binary",
+            ),
+        ],
+    )
+
+    fields: BoofuzzSequence = []
+    for field in schema.complex_types[element.type].elements:
+        if field.type != "boolean":
+            raise NotImplementedError(
+                f"Not implemented conversion of elector field of type {field.type}"
+            )
+        fields += [
+            boofuzz.Static(default_value=bytes([ber.CONTEXT_SPECIFIC | field.id, 1])),
+            boofuzz.Byte(name=field.name, default_value=1, full_range=True),
+        ]
+
+    selection_tag = boofuzz.BitField(
+        name="selection",
+        default_value=ber.CONTEXT_SPECIFIC | ber.CONSTRUCTED | element.id,
+        width=NumBits.BYTE,
+        full_range=True,
+    )
+
+    return (
+        [boofuzz.Static(default_value=_BER_SEQUENCE + _BER_TERM), term_length]
+        + [term_value, boofuzz.Static(default_value=_BER_CHOICE), selection_tag]
+        + [boofuzz.Static(default_value=b"\x80")]
+        + fields
+        + [boofuzz.Static(default_value=3 * ber.END_OF_CONTENTS)]
+    )
+
+
+def make_storage_message(
+    message_type: broker.StorageMessageType,
+    flags: int = 0,
+    partition_id: int = 0,
+) -> BoofuzzSequence:
+    """
+    Constructs boofuzz structures representing a storage message of the
+    specified 'message_type', with the specified 'flags', for the specified
+    'partition_id'.
+
+    See also: bmqp::StorageHeader, mqbs::RecordHeader
+    """
+
+    # The flags are stored in the first 5 bits of the first byte, and the
+    # high order bits of the message words in the next 3 (considered to be 0
+    # for small messages), as in 'make_put_message'.
+    flags_and_words = boofuzz.BitField(
+        name="flags",
+        default_value=flags << _MESSAGE_WORDS_HIGH_BITS,
+        width=NumBits.BYTE,
+        full_range=True,
+    )
+    message_words = boofuzz.Size(
+        name="message_words",
+        block_name="storage_message",
+        offset=NumBytes.BYTE,
+        length=3 * NumBytes.BYTE,
+        endian=">",
+        inclusive=True,
+        math=lambda x: x // NumBytes.WORD,
+    )
+
+    journal_record = [
+        boofuzz.Word(
+            name="record_type",
+            default_value=_RECORD_TYPES[message_type] << _RECORD_TYPE_OFFSET,
+            endian=">",
+            output_format="binary",
+        ),
+        boofuzz.Word(
+            name="sequence_number_upper",
+            default_value=0,
+            endian=">",
+            output_format="binary",
+        ),
+        boofuzz.DWord(
+            name="sequence_number_lower",
+            default_value=1,
+            endian=">",
+            output_format="binary",
+        ),
+        boofuzz.DWord(
+            name="primary_lease_id",
+            default_value=1,
+            endian=">",
+            output_format="binary",
+        ),
+        boofuzz.QWord(
+            name="timestamp", default_value=0, endian=">", output_format="binary"
+        ),
+        boofuzz.Bytes(
+            name="record_body",
+            default_value=bytes(
+                _JOURNAL_RECORD_SIZE - _RECORD_HEADER_SIZE - NumBytes.WORD
+            ),
+            size=_JOURNAL_RECORD_SIZE - _RECORD_HEADER_SIZE - NumBytes.WORD,
+        ),
+        boofuzz.DWord(
+            name="magic",
+            default_value=_RECORD_MAGIC,
+            endian=">",
+            output_format="binary",
+        ),
+    ]
+    if message_type == broker.StorageMessageType.DATA:
+        journal_record.append(boofuzz.Bytes(name="data", default_value=_DATA_RECORD))
+
+    message_components = [
+        boofuzz.BitField(
+            name="header_words",
+            default_value=_STORAGE_PROTOCOL_VERSION << 4 | _STORAGE_HEADER_WORDS,
+            width=NumBits.BYTE,
+            full_range=True,
+        ),
+        boofuzz.Byte(name="message_type", default_value=message_type, full_range=True),
+        boofuzz.Word(
+            name="partition_id",
+            default_value=partition_id,
+            endian=">",
+            output_format="binary",
+        ),
+        boofuzz.DWord(
+            name="journal_offset_words",
+            default_value=0,
+            endian=">",
+            output_format="binary",
+        ),
+    ] + journal_record
+
+    message = boofuzz.Block(name="storage_message", children=message_components)
+    return [flags_and_words, message_words, message]
+
+
+def make_replication_receipt(partition_id: int = 0) -> BoofuzzSequence:
+    """
+    Constructs boofuzz structures representing a ReplicationReceipt for the
+    specified 'partition_id'.
+
+    See also: bmqp::ReplicationReceipt
+    """
+
+    return [
+        boofuzz.DWord(
+            name="partition_id",
+            default_value=partition_id,
+            endian=">",
+            output_format="binary",
+        ),
+        boofuzz.DWord(
+            name="sequence_number_upper",
+            default_value=0,
+            endian=">",
+            output_format="binary",
+        ),
+        boofuzz.DWord(
+            name="sequence_number_lower",
+            default_value=1,
+            endian=">",
+            output_format="binary",
+        ),
+        boofuzz.DWord(
+            name="primary_lease_id",
+            default_value=1,
+            endian=">",
+            output_format="binary",
+        ),
+    ]
+
+
+# =============================================================================
+#                                    NODE
+# =============================================================================
+
+
+class ClusterNode(FuzzBroker):
+    """
+    A broker deployed in 'work_dir / name' and listening on the specified
+    'port', whose cluster has a second node, the fake peer, declared on the
+    specified 'peer_port' but never started.  The specified 'env' variables
+    are added to the environment of the broker.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        port: int,
+        peer_port: int,
+        work_dir: Path,
+        env: Optional[Dict[str, str]] = None,
+    ):
+        self.peer_port = peer_port
+        self.cluster_name = f"{name}Cluster"
+        self.peer_id = 0
+        super().__init__(name, port, work_dir, env)
+
+    def _configure(self, configurator: Configurator) -> cfg.Broker:
+        node = configurator.broker(
+            tcp_host="localhost", tcp_port=self.port, name=self.name, data_center="fuzz"
+        )
+        peer = configurator.broker(
+            tcp_host="localhost",
+            tcp_port=self.peer_port,
+            name=f"{self.name}Peer",
+            data_center="fuzz",
+        )
+        self.peer_id = peer.id
+        cluster = configurator.cluster(name=self.cluster_name, nodes=[node, peer])
+        add_fuzz_domain(cluster)
+        return node
+
+
+# =============================================================================
+#                                PUBLIC INTERFACE
+# =============================================================================
+
+
+@functools.lru_cache(maxsize=None)
+def elector_selections() -> Tuple[str, ...]:
+    """
+    Return the selections of 'ElectorMessage', read from the control message
+    schema on first use.
+    """
+
+    choice = ber.control_schema().complex_types["ElectorMessageChoice"]
+    return tuple(element.name for element in choice.elements)
+
+
+@functools.lru_cache(maxsize=None)
+def cluster_requests() -> Tuple[str, ...]:
+    """
+    Return the names of the requests that can be fuzzed, in the order of the
+    workflows of 'make_cluster_workflows'.
+    """
+
+    return (
+        tuple(f"elector.{selection}" for selection in elector_selections())
+        + tuple(
+            f"{event_type.name.lower()}.{message_type.name.lower()}"
+            for event_type in STORAGE_EVENT_TYPES
+            for message_type in broker.StorageMessageType
+        )
+        + ("replication_receipt",)
+    )
+
+
+def make_cluster_workflows(
+    cluster_name: str, peer_id: int
+) -> List[List[Tuple[boofuzz.Request, str]]]:
+    """
+    Return the sequences of requests sent by the node with the specified
+    'peer_id' of the cluster with the specified 'cluster_name', as pairs of a
+    request and its name in 'cluster_requests()'.  The negotiation, and the
+    leader heartbeat sent before the storage events, are not fuzzed.
+    """
+
+    negotiation = boofuzz.Request(
+        "PeerNegotiation",
+        children=make_control_message(peer_identity_schema(cluster_name, peer_id)),
+    )
+    heartbeat = boofuzz.Request(
+        "PeerLeaderHeartbeat",
+        children=wrap_event(
+            make_elector_message("leaderHeartbeat"),
+            broker.EventType.ELECTOR,
+            broker.TypeSpecific.ENCODING_BER,
+        ),
+    )
+    disable_fuzzing(negotiation)
+    disable_fuzzing(heartbeat)
+    heads = [(negotiation, "peer_negotiation"), (heartbeat, "peer_leader_heartbeat")]
+
+    workflows = []
+    for selection in elector_selections():
+        request = boofuzz.Request(
+            f"Elector.{selection}",
+            children=wrap_event(
+                make_elector_message(selection),
+                broker.EventType.ELECTOR,
+                broker.TypeSpecific.ENCODING_BER,
+            ),
+        )
+        workflows.append(heads[:1] + [(request, f"elector.{selection}")])
+
+    for event_type in STORAGE_EVENT_TYPES:
+        for message_type in broker.StorageMessageType:
+            name = f"{event_type.name.lower()}.{message_type.name.lower()}"
+            request = boofuzz.Request(
+                name,
+                children=wrap_event(
+                    make_storage_message(message_type),
+                    event_type,
+                    broker.TypeSpecific.EMPTY,
+                    add_padding=False,
+                ),
+            )
+            workflows.append(heads + [(request, name)])
+
+    receipt = boofuzz.Request(
+        "ReplicationReceipt",
+        children=wrap_event(
+            make_replication_receipt(),
+            broker.EventType.REPLICATION_RECEIPT,
+            broker.TypeSpecific.EMPTY,
+            add_padding=False,
+        ),
+    )
+    workflows.append(heads + [(receipt, "replication_receipt")])
+    return workflows
+
+
+def fuzz_cluster(
+    host: str,
+    port: int,
+    cluster_name: str,
+    peer_id: int,
+    request: Optional[str] = None,
+    liveness: Optional[LivenessMonitor] = None,
+    metrics: Optional[FuzzMetrics] = None,
+) -> None:
+    """
+    Launch a fuzzing session with the specified 'host' and 'port' of a node
+    of the cluster with the specified 'cluster_name', impersonating its peer
+    with the specified 'peer_id' (see 'ClusterNode').  If the optionally
+    specified 'request' name is provided, fuzz only this request.  The
+    optionally specified 'liveness' and 'metrics' are used as by 'fuzz'.
+    """
+
+    make_session(
+        host,
+        port,
+        request,
+        liveness=liveness,
+        workflows=make_cluster_workflows(cluster_name, peer_id),
+        metrics=metrics,
+        sleep_time=PEER_RECONNECT_DELAY,
+    ).fuzz(max_depth=1)
+
+
+def is_finding(returncode: Optional[int]) -> bool:
+    """
+    Return whether a node which exited with the specified 'returncode', or
+    is still running if it is 'None', failed while being fuzzed, i.e. it
+    exited with neither success nor one of the 'DELIBERATE_EXIT_CODES'.
+    """
+
+    return returncode not in (None, 0) and returncode not in DELIBERATE_EXIT_CODES
@@ -0,0 +1,504 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Persistent fuzzing corpus, regression replay and crash minimization.
+
+A corpus directory keeps the inputs worth running again, per request:
+
+    <corpus>/state.json                   mutations of each request already run
+    <corpus>/<request>/queue/<sha1>       inputs which reached new coverage
+    <corpus>/<request>/crashes/<sha1>     inputs after which the broker exited
+    <corpus>/<request>/minimized/<sha1>   minimized crashing inputs
+
+An input is the sequence of messages sent on one connection.  As a mutated
+message cannot be split by its event header, each message is stored prefixed
+by its size, as a 32-bit big-endian integer.  Files are named after the SHA-1
+of their contents, so that an input is stored once.
+
+'fuzz_parallel' skips the mutations recorded in 'state.json', and
+'fuzz_coverage' starts from the inputs of the queue, so that repeat runs do
+not explore the same space again.
+
+Public types:
+o 'CorpusInput': an input stored in a corpus directory.
+o 'CorpusDir': a corpus directory.
+
+Public functions:
+o 'encode_input': return the stored form of an input.
+o 'decode_input': return the messages of a stored input.
+o 'replay': send an input to a broker and return whether it exited.
+o 'ddmin': return a minimal subsequence satisfying a predicate.
+o 'minimize': shrink a crashing input.
+o 'minimize_crash': shrink a crashing input against a local broker.
+o 'minimize_crashes': minimize the crashing inputs of a corpus directory.
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from blazingmq.schemas.protocol import EVENT_HEADER_SIZE
+
+if TYPE_CHECKING:
+    from blazingmq.dev.fuzztest.parallel import FuzzBroker
+
+logger = logging.getLogger(__name__)
+
+QUEUE = "queue"
+CRASHES = "crashes"
+MINIMIZED = "minimized"
+KINDS = (QUEUE, CRASHES, MINIMIZED)
+
+STATE_FILE = "state.json"
+
+CONNECT_TIMEOUT = 10.0  # seconds, the broker may still be starting
+SETTLE_TIME = 1.0  # seconds to wait for the broker to close the connection
+EXIT_GRACE_TIME = 0.2  # seconds to wait for the broker to exit afterwards
+
+T = TypeVar("T")
+
+
+# =============================================================================
+#                                   INPUTS
+# =============================================================================
+
+
+def encode_input(messages: Sequence[bytes]) -> bytes:
+    """
+    Return the stored form of the input made of the specified 'messages'.
+    """
+    return b"".join(struct.pack(">I", len(message)) + message for message in messages)
+
+
+def decode_input(data: bytes) -> Tuple[bytes, ...]:
+    """
+    Return the messages of the input stored as the specified 'data'.  Raise
+    'ValueError' if 'data' is truncated.
+    """
+    messages = []
+    offset = 0
+    while offset < len(data):
+        if offset + 4 > len(data):
+            raise ValueError(f"truncated message size at offset {offset}")
+        (size,) = struct.unpack_from(">I", data, offset)
+        offset += 4
+        if offset + size > len(data):
+            raise ValueError(f"truncated message at offset {offset}")
+        messages.append(data[offset : offset + size])
+        offset += size
+    return tuple(messages)
+
+
+@dataclass(frozen=True)
+class CorpusInput:
+    request: str
+    kind: str
+    path: Path
+
+    @property
+    def messages(self) -> Tuple[bytes, ...]:
+        return decode_input(self.path.read_bytes())
+
+    def __str__(self) -> str:
+        return f"{self.request}/{self.kind}/{self.path.name}"
+
+
+def _merge(ranges: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Return the specified inclusive 'ranges' merged, in ascending order.
+    """
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class CorpusDir:
+    """
+    The corpus directory at the specified 'path', created on first write.
+    Safe to use from several threads.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path / STATE_FILE, encoding="utf-8") as file:
+                self._state: Dict[str, dict] = json.load(file)
+        except FileNotFoundError:
+            self._state = {}
+
+    # Inputs
+
+    def add(self, kind: str, request: str, messages: Sequence[bytes]) -> Path:
+        """
+        Store the input made of the specified 'messages' of the specified
+        'request' as an input of the specified 'kind', unless already stored,
+        and return its path.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"unknown corpus kind '{kind}'")
+        data = encode_input(messages)
+        directory = self.path / request / kind
+        path = directory / hashlib.sha1(data).hexdigest()
+        if not path.exists():
+            directory.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        return path
+
+    def inputs(
+        self, kinds: Iterable[str] = KINDS, request: Optional[str] = None
+    ) -> List[CorpusInput]:
+        """
+        Return the stored inputs of the specified 'kinds', of the specified
+        'request' or of all requests if 'None', sorted by path.
+        """
+        if not self.path.is_dir():
+            return []
+        kinds = tuple(kinds)
+        requests = (
+            [request]
+            if request is not None
+            else sorted(entry.name for entry in self.path.iterdir() if entry.is_dir())
+        )
+        return [
+            CorpusInput(name, kind, path)
+            for name in requests
+            for kind in kinds
+            if (self.path / name / kind).is_dir()
+            for path in sorted((self.path / name / kind).iterdir())
+        ]
+
+    # Explored mutations
+
+    def explored(self, request: str, num_mutations: int) -> List[Tuple[int, int]]:
+        """
+        Return the ranges of mutations of the specified 'request' already
+        run.  The mutations are forgotten when their number is not the
+        specified 'num_mutations', i.e. when the fuzzed messages changed.
+        """
+        with self._lock:
+            state = self._state.get(request)
+            if state is None or state["mutations"] != num_mutations:
+                return []
+            return [tuple(pair) for pair in state["explored"]]
+
+    def unexplored(self, request: str, num_mutations: int) -> List[Tuple[int, int]]:
+        """
+        Return the ranges of the mutations of the specified 'request', among
+        the specified 'num_mutations', not run yet.
+        """
+        ranges = []
+        next_index = 1
+        for start, end in self.explored(request, num_mutations):
+            if start > next_index:
+                ranges.append((next_index, start - 1))
+            next_index = end + 1
+        if next_index <= num_mutations:
+            ranges.append((next_index, num_mutations))
+        return ranges
+
+    def mark_explored(
+        self, request: str, num_mutations: int, start: int, end: int
+    ) -> None:
+        """
+        Record that the mutations of the specified 'request' in the range
+        ['start', 'end'] have been run, among its specified 'num_mutations'.
+        The state is saved immediately, so that an interrupted run resumes
+        where it stopped.
+        """
+        if start > end:
+            return
+        with self._lock:
+            state = self._state.get(request)
+            if state is None or state["mutations"] != num_mutations:
+                state = {"mutations": num_mutations, "explored": []}
+            explored = _merge(
+                [tuple(pair) for pair in state["explored"]] + [(start, end)]
+            )
+            self._state[request] = {
+                "mutations": num_mutations,
+                "explored": [list(pair) for pair in explored],
+            }
+            self._save_state()
+
+    def _save_state(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path / f"{STATE_FILE}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self._state, file, indent=4, sort_keys=True)
+        os.replace(temp_path, self.path / STATE_FILE)
+
+
+# =============================================================================
+#                                   REPLAY
+# =============================================================================
+
+
+def _connect(address: Tuple[str, int], connect_timeout: float) -> socket.socket:
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            return socket.create_connection(address, timeout=1)
+        except ConnectionRefusedError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.1)
+
+
+def replay(
+    host: str,
+    port: int,
+    messages: Sequence[bytes],
+    running: Callable[[], bool],
+    *,
+    connect_timeout: float = CONNECT_TIMEOUT,
+    settle_time: float = SETTLE_TIME,
+) -> bool:
+    """
+    Send the specified 'messages' on a new connection to the broker at the
+    specified 'host' and 'port', and return whether the broker exited, as
+    reported by the specified 'running'.  Once all the messages are sent,
+    wait up to 'settle_time' seconds for the broker to close the connection,
+    then a little more for it to exit.  Raise 'ConnectionRefusedError' if
+    the broker does not accept the connection within 'connect_timeout'.
+    """
+
+    with _connect((host, port), connect_timeout) as sock:
+        try:
+            for message in messages:
+                sock.sendall(message)
+            sock.shutdown(socket.SHUT_WR)
+            deadline = time.monotonic() + settle_time
+            while time.monotonic() < deadline:
+                sock.settimeout(max(deadline - time.monotonic(), 0.001))
+                if not sock.recv(65536):
+                    break
+        except OSError:
+            # Reset by the broker, on a malformed message or as it crashed.
+            pass
+
+    deadline = time.monotonic() + EXIT_GRACE_TIME
+    while running():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+# =============================================================================
+#                                MINIMIZATION
+# =============================================================================
+
+
+def ddmin(items: Sequence[T], test: Callable[[List[T]], bool]) -> List[T]:
+    """
+    Return a 1-minimal subsequence of the specified 'items' for which the
+    specified 'test' holds, i.e. from which no single item can be removed,
+    using Zeller's delta debugging.  'test' must hold for 'items', and is
+    never called twice with the same subsequence.
+    """
+
+    items = list(items)
+    tested: Dict[tuple, bool] = {}
+
+    def check(candidate: List[T]) -> bool:
+        key = tuple(candidate)
+        if key not in tested:
+            tested[key] = test(candidate)
+        return tested[key]
+
+    granularity = 2
+    while len(items) >= 2:
+        size = -(-len(items) // granularity)
+        chunks = [items[start : start + size] for start in range(0, len(items), size)]
+        for chunk in chunks:
+            if check(chunk):
+                items, granularity = chunk, 2
+                break
+        else:
+            for index in range(len(chunks)):
+                complement = [
+                    item
+                    for other in chunks[:index] + chunks[index + 1 :]
+                    for item in other
+                ]
+                if check(complement):
+                    items, granularity = complement, max(granularity - 1, 2)
+                    break
+            else:
+                if granularity >= len(items):
+                    break
+                granularity = min(granularity * 2, len(items))
+    return items
+
+
+def _with_length(header: bytes, body: bytes) -> bytes:
+    """
+    Return the event made of the specified 'header' and 'body', with the
+    event length of 'header' fixed up, keeping its fragment bit.
+    """
+    data = bytearray(header + body)
+    fragment = data[0] & 0x80
+    struct.pack_into(">I", data, 0, len(data))
+    data[0] |= fragment
+    return bytes(data)
+
+
+def minimize(
+    messages: Sequence[bytes],
+    crashes: Callable[[Tuple[bytes, ...]], bool],
+) -> Tuple[bytes, ...]:
+    """
+    Return a minimal input, for which the specified 'crashes' holds, derived
+    from the crashing input made of the specified 'messages'.  The last
+    message is taken to be the crashing one: first, the messages before it
+    not needed to reproduce the crash are dropped, then the bytes of the
+    last message.  If the length in the event header of the last message
+    matches its size, only the bytes after the header are dropped, and the
+    length is fixed up, so that the broker still parses the whole event.
+    """
+
+    *prefix, last = messages
+    if prefix:
+        if crashes((last,)):
+            prefix = []
+        else:
+            prefix = ddmin(prefix, lambda kept: crashes(tuple(kept) + (last,)))
+    prefix = tuple(prefix)
+
+    header = last[:EVENT_HEADER_SIZE]
+    if len(last) > EVENT_HEADER_SIZE and struct.unpack_from(">I", last)[
+        0
+    ] & 0x7FFFFFFF == len(last):
+
+        def rebuild(body: Sequence[int]) -> bytes:
+            return _with_length(header, bytes(body))
+
+        if crashes(prefix + (rebuild(b""),)):
+            return prefix + (rebuild(b""),)
+        body = ddmin(
+            last[EVENT_HEADER_SIZE:], lambda kept: crashes(prefix + (rebuild(kept),))
+        )
+        return prefix + (rebuild(body),)
+
+    data = ddmin(last, lambda kept: crashes(prefix + (bytes(kept),)))
+    return prefix + (bytes(data),)
+
+
+def minimize_crash(
+    messages: Sequence[bytes],
+    broker: "FuzzBroker",
+    settle_time: float = SETTLE_TIME,
+) -> Tuple[bytes, ...]:
+    """
+    Return a minimal input derived from the specified crashing 'messages',
+    replaying each candidate against the specified local 'broker', which is
+    restarted after each crash.  Raise 'ValueError' if 'messages' do not
+    crash the broker.
+    """
+
+    attempts = 0
+
+    def crashes(candidate: Tuple[bytes, ...]) -> bool:
+        nonlocal attempts
+        attempts += 1
+        if broker.poll() is not None:
+            broker.restart()
+        crashed = replay(
+            "localhost",
+            broker.port,
+            candidate,
+            lambda: broker.poll() is None,
+            settle_time=settle_time,
+        )
+        if crashed:
+            broker.restart()
+        return crashed
+
+    if not crashes(tuple(messages)):
+        raise ValueError("the input does not crash the broker")
+    minimized = minimize(messages, crashes)
+    logger.info(
+        "minimized input from %d to %d bytes in %d attempts",
+        sum(map(len, messages)),
+        sum(map(len, minimized)),
+        attempts,
+    )
+    return minimized
+
+
+def minimize_crashes(
+    corpus: CorpusDir,
+    request: Optional[str] = None,
+    work_dir: Optional[Path] = None,
+) -> List[Path]:
+    """
+    Minimize the crashing inputs of the specified 'request' (of all
+    requests if 'None') in the specified 'corpus', against a broker deployed
+    in the specified 'work_dir' (by default, a temporary directory, removed
+    afterwards), and store them as minimized inputs.  Inputs which do not
+    crash the broker again, e.g. the other inputs sent before it was found
+    to have exited, are skipped.  Return the paths of the minimized inputs.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from blazingmq.dev.fuzztest.parallel import FuzzBroker
+    from blazingmq.dev.reserveport import reserve_port
+
+    paths = []
+    with contextlib.ExitStack() as stack:
+        if work_dir is None:
+            work_dir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        port = stack.enter_context(reserve_port()).port
+        broker = FuzzBroker("minimize", port, work_dir)
+        stack.callback(broker.stop)
+        broker.start()
+
+        for crash in corpus.inputs([CRASHES], request):
+            try:
+                minimized = minimize_crash(crash.messages, broker)
+            except ValueError:
+                logger.info("%s does not crash the broker, skipping", crash)
+                continue
+            path = corpus.add(MINIMIZED, crash.request, minimized)
+            logger.warning("%s minimized to %s", crash, path)
+            paths.append(path)
+
+    return paths
@@ -0,0 +1,566 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Coverage-guided fuzzing of the BlazingMQ broker protocol.
+
+The broker is built with SanitizerCoverage ('bin/build-fuzz.sh
+--broker-coverage'), and counts the edges it hits in a shared memory bitmap
+(see 's_bmqfuzz_coverage.cpp') created by 'CoverageMap'.  An input is the
+sequence of messages sent on one connection: the default rendering of the
+requests of a workflow, up to the mutated one.  After running an input, the
+fuzzer reads the bitmap, and keeps the inputs reaching new edges, or known
+edges a new number of times, in a corpus.  Inputs are then picked from the
+corpus to be mutated, preferring the ones which found the most new coverage
+and have been mutated the least, rather than mutating the seeds blindly as
+'fuzz' does.  With a corpus directory (see 'corpus'), the inputs kept by
+previous runs are run as seeds, and the new ones are saved.
+
+Public types:
+o 'CoverageMap': the shared memory edge bitmap of a broker.
+o 'CorpusEntry': an input of the corpus.
+o 'Corpus': the inputs reaching new coverage.
+o 'CoverageCrash': an input after which the broker exited.
+o 'CoverageReport': the outcome of a coverage-guided run.
+o 'CoverageFuzzer': mutate the inputs of a corpus, guided by coverage.
+
+Public functions:
+o 'mutate': return a random mutation of a message.
+o 'fuzz_coverage': fuzz a broker built with coverage instrumentation.
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import random
+import select
+import socket
+import struct
+import time
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from blazingmq.dev.fuzztest import REQUESTS, make_workflows
+from blazingmq.dev.fuzztest.corpus import CRASHES, QUEUE, CorpusDir
+from blazingmq.dev.fuzztest.parallel import FuzzBroker, temporary_work_dir
+from blazingmq.dev.reserveport import reserve_port
+from blazingmq.schemas.protocol import EVENT_HEADER_SIZE, WORD_SIZE
+
+logger = logging.getLogger(__name__)
+
+SHM_ENV = "BMQ_FUZZ_COVERAGE_SHM"
+SIZE_ENV = "BMQ_FUZZ_COVERAGE_SIZE"
+MAP_SIZE = 1 << 16
+
+RECV_TIMEOUT = 0.05  # seconds, as for 'fuzz'
+MAX_MESSAGE_SIZE = 1 << 16
+
+# Probability that the event length of a mutated message is fixed up, so that
+# the broker parses the event past its header.
+FIX_LENGTH_PROBABILITY = 0.75
+
+
+def _hit_class(count: int) -> int:
+    """
+    Return the AFL-style class of an edge hit count: an edge hit 4 times is
+    not new if it has been hit 5 times before, but is if it has only been
+    hit once.
+    """
+    if count <= 2:
+        return count
+    if count == 3:
+        return 4
+    for hit_class, limit in ((8, 8), (16, 16), (32, 32), (64, 128)):
+        if count < limit:
+            return hit_class
+    return 128
+
+
+_HIT_CLASSES = bytes(_hit_class(count) for count in range(256))
+
+_INTERESTING_8 = (0, 1, 0x7F, 0x80, 0xFF)
+_INTERESTING_32 = (
+    0,
+    1,
+    EVENT_HEADER_SIZE,
+    0x7FFF,
+    0xFFFF,
+    0x7FFFFFFF,
+    0x80000000,
+    0xFFFFFFFF,
+)
+
+
+def _popcount(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+# =============================================================================
+#                                  COVERAGE
+# =============================================================================
+
+
+class CoverageMap:
+    """
+    A shared memory bitmap of 'size' bytes, in which an instrumented broker
+    counts the edges it hits.  The broker attaches to the bitmap named in the
+    environment variables returned by 'env'.
+    """
+
+    def __init__(self, size: int = MAP_SIZE):
+        if size <= 0 or size & (size - 1):
+            raise ValueError(f"coverage map size must be a power of 2, got {size}")
+        self.size = size
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._zeros = bytes(size)
+
+    @property
+    def env(self) -> Dict[str, str]:
+        return {SHM_ENV: self._shm.name, SIZE_ENV: str(self.size)}
+
+    def reset(self) -> None:
+        self._shm.buf[: self.size] = self._zeros
+
+    def read(self) -> int:
+        """
+        Return the edges hit since the last 'reset', as a bitset of their
+        hit count classes.
+        """
+        return int.from_bytes(
+            bytes(self._shm.buf[: self.size]).translate(_HIT_CLASSES), "little"
+        )
+
+    def close(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "CoverageMap":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+# =============================================================================
+#                                   CORPUS
+# =============================================================================
+
+
+@dataclass
+class CorpusEntry:
+    request: str
+    messages: Tuple[bytes, ...]  # sent in order on one connection
+    new_bits: int  # coverage first reached by this entry
+    fuzzed: int = 0  # times the entry has been mutated
+    found: int = 0  # entries added to the corpus by mutating this entry
+
+    @property
+    def weight(self) -> float:
+        """
+        The likelihood of the entry to be picked for mutation.
+        """
+        return (1 + self.found) * self.new_bits.bit_length() / (1 + self.fuzzed)
+
+
+class Corpus:
+    """
+    The inputs which reached new coverage, and the coverage reached so far.
+    """
+
+    def __init__(self):
+        self.entries: List[CorpusEntry] = []
+        self.seen = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def edges(self) -> int:
+        """
+        The number of distinct (edge, hit count class) pairs reached.
+        """
+        return _popcount(self.seen)
+
+    def new_bits(self, bits: int) -> int:
+        return bits & ~self.seen
+
+    def add(
+        self, request: str, messages: Tuple[bytes, ...], bits: int
+    ) -> Optional[CorpusEntry]:
+        """
+        Add the input made of the specified 'messages' to the corpus if the
+        specified coverage 'bits' it reached are new, and return its entry.
+        """
+        new = self.new_bits(bits)
+        if not new:
+            return None
+        self.seen |= bits
+        entry = CorpusEntry(request, messages, new_bits=_popcount(new))
+        self.entries.append(entry)
+        return entry
+
+    def choose(self, rng: random.Random) -> CorpusEntry:
+        return rng.choices(
+            self.entries, weights=[entry.weight for entry in self.entries]
+        )[0]
+
+
+# =============================================================================
+#                                  MUTATIONS
+# =============================================================================
+
+
+def mutate(
+    message: bytes,
+    rng: random.Random,
+    splice: Optional[bytes] = None,
+) -> bytes:
+    """
+    Return a random mutation of the specified 'message', stacking 1 to 8
+    byte-level mutations, possibly crossing it over with the specified
+    'splice' message.  Most of the time, the length in the event header is
+    fixed up to match the mutated message.
+    """
+
+    data = bytearray(message)
+    for _ in range(1 << rng.randrange(4)):
+        operation = rng.randrange(8 if splice else 7)
+        if not data:
+            data.append(rng.randrange(256))
+        elif operation == 0:
+            position = rng.randrange(len(data) * 8)
+            data[position // 8] ^= 1 << (position % 8)
+        elif operation == 1:
+            data[rng.randrange(len(data))] = rng.choice(_INTERESTING_8)
+        elif operation == 2 and len(data) >= WORD_SIZE:
+            # Protocol fields are word aligned.
+            offset = rng.randrange(len(data) // WORD_SIZE) * WORD_SIZE
+            struct.pack_into(">I", data, offset, rng.choice(_INTERESTING_32))
+        elif operation == 3:
+            data[rng.randrange(len(data))] = rng.randrange(256)
+        elif operation == 4:
+            start = rng.randrange(len(data))
+            del data[start : start + rng.randint(1, 32)]
+        elif operation == 5:
+            start = rng.randrange(len(data))
+            block = data[start : start + rng.randint(1, 32)]
+            position = rng.randrange(len(data) + 1)
+            data[position:position] = block
+        elif operation == 6:
+            position = rng.randrange(len(data) + 1)
+            data[position:position] = bytes(
+                rng.randrange(256) for _ in range(rng.randint(1, 16))
+            )
+        elif operation == 7:
+            cut = rng.randrange(len(data) + 1)
+            data[cut:] = splice[rng.randrange(len(splice) + 1) :]
+
+    del data[MAX_MESSAGE_SIZE:]
+    if len(data) >= EVENT_HEADER_SIZE and rng.random() < FIX_LENGTH_PROBABILITY:
+        # Keep the fragment bit, set the 31 bits of the length.
+        fragment = data[0] & 0x80
+        struct.pack_into(">I", data, 0, len(data))
+        data[0] |= fragment
+    return bytes(data)
+
+
+# =============================================================================
+#                                   FUZZER
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class CoverageCrash:
+    request: str
+    messages: Tuple[bytes, ...]
+    returncode: Optional[int]
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha1(b"".join(self.messages)).hexdigest()
+
+
+@dataclass
+class CoverageReport:
+    executions: int = 0
+    duration: float = 0.0  # seconds
+    corpus: int = 0
+    edges: int = 0
+    crashes: List[CoverageCrash] = field(default_factory=list)
+
+    @property
+    def executions_per_sec(self) -> float:
+        return self.executions / self.duration if self.duration else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "executions": self.executions,
+            "duration": self.duration,
+            "executionsPerSec": self.executions_per_sec,
+            "corpus": self.corpus,
+            "edges": self.edges,
+            "crashes": [
+                {
+                    "request": crash.request,
+                    "returncode": crash.returncode,
+                    "digest": crash.digest,
+                }
+                for crash in self.crashes
+            ],
+        }
+
+
+class CoverageFuzzer:
+    """
+    Fuzz the specified 'request' (all of them if 'None') of the broker at
+    'host':'port', whose edge coverage is counted in the specified
+    'coverage' map.  'poll' returns the exit code of the broker, or 'None'
+    if it is running; 'restart' restarts it after a crash.  Without
+    'restart', the run stops at the first crash.  The inputs of the
+    specified 'seeds', pairs of a request and its messages, are run after
+    the default seeds, e.g. to resume from the corpus of a previous run.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        coverage: CoverageMap,
+        request: Optional[str] = None,
+        *,
+        rng: Optional[random.Random] = None,
+        poll: Callable[[], Optional[int]] = lambda: None,
+        restart: Optional[Callable[[], None]] = None,
+        recv_timeout: float = RECV_TIMEOUT,
+        seeds: Iterable[Tuple[str, Tuple[bytes, ...]]] = (),
+    ):
+        if request is not None and request not in REQUESTS:
+            raise ValueError(f"unknown request '{request}'")
+        self.corpus = Corpus()
+        self._address = (host, port)
+        self._coverage = coverage
+        self._rng = rng or random.Random()
+        self._poll = poll
+        self._restart = restart
+        self._recv_timeout = recv_timeout
+        self._seeds = [
+            (name, tuple(req.render() for req, _ in workflow[: index + 1]))
+            for workflow in make_workflows()
+            for index, (_, name) in enumerate(workflow)
+            if request is None or name == request
+        ]
+        self._seeds.extend(
+            (name, tuple(messages))
+            for name, messages in seeds
+            if request is None or name == request
+        )
+
+    def execute(self, messages: Tuple[bytes, ...]) -> Optional[int]:
+        """
+        Send the specified 'messages' on a new connection, and return the
+        coverage they reached, or 'None' if the broker could not be reached.
+        """
+        self._coverage.reset()
+        try:
+            with socket.create_connection(self._address, timeout=1) as sock:
+                for message in messages:
+                    sock.sendall(message)
+                    self._drain(sock)
+        except ConnectionRefusedError:
+            return None
+        except OSError:
+            # The broker may close the connection on a malformed message.
+            pass
+        return self._coverage.read()
+
+    def _drain(self, sock: socket.socket) -> None:
+        """
+        Read the responses of the broker until it is silent for
+        'recv_timeout'.
+        """
+        while select.select([sock], [], [], self._recv_timeout)[0]:
+            if not sock.recv(65536):
+                raise ConnectionResetError("closed by the broker")
+
+    def _run_input(
+        self, request: str, messages: Tuple[bytes, ...], report: CoverageReport
+    ) -> Tuple[Optional[CorpusEntry], bool]:
+        """
+        Run an input, add it to the corpus if it reaches new coverage, and
+        return its entry and whether the broker is still running.
+        """
+        bits = self.execute(messages)
+        report.executions += 1
+        returncode = self._poll()
+        if bits is None or returncode is not None:
+            crash = CoverageCrash(request, messages, returncode)
+            report.crashes.append(crash)
+            logger.warning(
+                "broker exited with code %s on %s input %s",
+                returncode,
+                request,
+                crash.digest,
+            )
+            if self._restart is None:
+                return None, False
+            self._restart()
+            return None, True
+
+        if self.corpus.new_bits(bits):
+            # Only keep the coverage reached again by a second run, rather
+            # than the work of the broker threads racing with the input.
+            stable = self.execute(messages)
+            report.executions += 1
+            if stable is not None:
+                bits &= stable
+        return self.corpus.add(request, messages, bits), True
+
+    def run(
+        self,
+        iterations: Optional[int] = None,
+        duration: Optional[float] = None,
+    ) -> CoverageReport:
+        """
+        Run the seeds, then mutate the corpus for the specified number of
+        'iterations', or 'duration' seconds, whichever comes first.  Raise
+        'RuntimeError' if the broker does not report any coverage.
+        """
+        report = CoverageReport()
+        start = time.monotonic()
+        deadline = None if duration is None else start + duration
+
+        for request, messages in self._seeds:
+            _, running = self._run_input(request, messages, report)
+            if not running:
+                break
+        if not self.corpus.seen and not report.crashes:
+            raise RuntimeError(
+                "no coverage reported by the broker, build it with "
+                "'bin/build-fuzz.sh --broker-coverage'"
+            )
+
+        iteration = 0
+        while self.corpus and (iterations is None or iteration < iterations):
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            if report.crashes and self._restart is None:
+                break
+            iteration += 1
+
+            parent = self.corpus.choose(self._rng)
+            parent.fuzzed += 1
+            others = [
+                entry
+                for entry in self.corpus.entries
+                if entry.request == parent.request and entry is not parent
+            ]
+            splice = self._rng.choice(others).messages[-1] if others else None
+            messages = parent.messages[:-1] + (
+                mutate(parent.messages[-1], self._rng, splice),
+            )
+            entry, running = self._run_input(parent.request, messages, report)
+            if entry is not None:
+                parent.found += 1
+            if not running:
+                break
+
+        report.duration = time.monotonic() - start
+        report.corpus = len(self.corpus)
+        report.edges = self.corpus.edges
+        return report
+
+
+def fuzz_coverage(
+    request: Optional[str] = None,
+    iterations: Optional[int] = None,
+    duration: Optional[float] = None,
+    work_dir: Optional[Path] = None,
+    seed: Optional[int] = None,
+    corpus_dir: Optional[Path] = None,
+) -> CoverageReport:
+    """
+    Deploy a broker built with coverage instrumentation in the specified
+    'work_dir', and fuzz the specified 'request' (all of them if 'None') for
+    the specified number of 'iterations' or 'duration' seconds.  Restart the
+    broker after each crash.  The crashing inputs are saved in
+    'work_dir / "crashes"', as the bytes sent on the connection, and the
+    report in 'report.json'.  By default, 'work_dir' is a temporary
+    directory, removed afterwards unless there were crashes.  If the
+    optionally specified 'corpus_dir' is provided, start from its queue, and
+    save the corpus and the crashing inputs in it.
+    """
+
+    corpus = None if corpus_dir is None else CorpusDir(corpus_dir)
+    report: Optional[CoverageReport] = None
+
+    with contextlib.ExitStack() as stack:
+        if work_dir is None:
+            work_dir = temporary_work_dir(
+                stack, lambda: report is not None and bool(report.crashes)
+            )
+        coverage = stack.enter_context(CoverageMap())
+        port = stack.enter_context(reserve_port()).port
+        broker = FuzzBroker("coverage", port, work_dir, env=coverage.env)
+        stack.callback(broker.stop)
+        broker.start()
+
+        fuzzer = CoverageFuzzer(
+            "localhost",
+            port,
+            coverage,
+            request,
+            rng=random.Random(seed),
+            poll=broker.poll,
+            restart=broker.restart,
+            seeds=(
+                []
+                if corpus is None
+                else [
+                    (stored.request, stored.messages)
+                    for stored in corpus.inputs([QUEUE], request)
+                ]
+            ),
+        )
+        report = fuzzer.run(iterations, duration)
+
+        if corpus is not None:
+            for entry in fuzzer.corpus.entries:
+                corpus.add(QUEUE, entry.request, entry.messages)
+            for crash in report.crashes:
+                corpus.add(CRASHES, crash.request, crash.messages)
+
+        crash_dir = work_dir / "crashes"
+        for crash in report.crashes:
+            crash_dir.mkdir(exist_ok=True)
+            (crash_dir / f"{crash.request}-{crash.digest}.bin").write_bytes(
+                b"".join(crash.messages)
+            )
+        with open(work_dir / "report.json", "w", encoding="utf-8") as file:
+            json.dump(report.to_dict(), file, indent=4)
+
+        logger.info(
+            "ran %d inputs in %.1fs (%.0f/s): %d edges, %d corpus entries, %d crashes",
+            report.executions,
+            report.duration,
+            report.executions_per_sec,
+            report.edges,
+            report.corpus,
+            len(report.crashes),
+        )
+
+    return report
@@ -0,0 +1,185 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Fast path for fuzzing sessions, which never wait for the broker.
+
+By default, boofuzz waits up to 'recv_timeout' for a response after each
+request of a test case, which caps a session to a few test cases per second.
+With these types, requests are sent back to back, and a crash of the broker
+is detected by watching its process rather than by reading its responses.
+"""
+
+import errno
+import os
+import select
+import socket
+from collections import deque
+from pathlib import Path
+from typing import Deque, List, Optional, Union
+
+import boofuzz
+from boofuzz import exception
+
+# Number of test cases whose messages are kept by 'FastConnection'.
+HISTORY_SIZE = 4
+
+
+class FastConnection(boofuzz.TCPSocketConnection):
+    """TCPSocketConnection whose 'recv' never blocks.
+
+    'recv' returns the data already received from the broker, if any, so that
+    responses do not pile up in the socket buffer.  Before closing, pending
+    responses are drained and the connection is half-closed, so that the
+    broker reads all the requests of the test case before seeing the end of
+    the connection, rather than a reset.
+
+    As the exit of the broker is only detected after the fact, the messages
+    sent on the connections of the last 'HISTORY_SIZE' test cases are kept
+    in 'history', oldest first, so that the inputs which may have crashed
+    the broker can be saved.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.history: Deque[List[bytes]] = deque(maxlen=HISTORY_SIZE)
+
+    def open(self):
+        super().open()
+        self.history.append([])
+
+    def send(self, data):
+        num_sent = super().send(data)
+        if self.history:
+            self.history[-1].append(bytes(data[:num_sent]))
+        return num_sent
+
+    def recv(self, max_bytes):
+        try:
+            return self._sock.recv(max_bytes, socket.MSG_DONTWAIT)
+        except BlockingIOError:
+            return b""
+        except OSError as e:
+            if e.errno == errno.ECONNABORTED:
+                raise exception.BoofuzzTargetConnectionAborted(
+                    socket_errno=e.errno, socket_errmsg=e.strerror
+                ) from e
+            if e.errno in (errno.ECONNRESET, errno.ENETRESET, errno.ETIMEDOUT):
+                raise exception.BoofuzzTargetConnectionReset() from e
+            raise
+
+    def close(self):
+        try:
+            while self._sock.recv(65536, socket.MSG_DONTWAIT):
+                pass
+        except OSError:
+            pass
+        try:
+            self._sock.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+        super().close()
+
+
+class LivenessMonitor(boofuzz.monitors.BaseMonitor):
+    """Monitor reporting a crash when the broker process has exited.
+
+    The broker is identified by the specified 'pid', or by the pid written in
+    the specified 'pid_file', which is read again whenever boofuzz probes the
+    monitor (e.g. after a restart).  On Linux, the process is watched through
+    a pidfd, which becomes readable when it exits, even before it is reaped;
+    elsewhere, by sending it signal 0.  Checking the process does not block.
+    """
+
+    def __init__(
+        self,
+        pid: Optional[int] = None,
+        pid_file: Optional[Union[str, Path]] = None,
+    ):
+        if (pid is None) == (pid_file is None):
+            raise ValueError("exactly one of 'pid' and 'pid_file' is required")
+        super().__init__()
+        self._pid = pid
+        self._pid_file = None if pid_file is None else Path(pid_file)
+        self._watched: Optional[int] = None
+        self._pidfd: Optional[int] = None
+
+        # Index and name of the test case after which the exit was detected.
+        self.exit_index: Optional[int] = None
+        self.exit_case: Optional[str] = None
+
+    def _watch(self) -> None:
+        pid = self._pid
+        if self._pid_file is not None:
+            try:
+                pid = int(self._pid_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                pid = None
+        if pid == self._watched:
+            return
+
+        self._close_pidfd()
+        self._watched = pid
+        self.exit_index = self.exit_case = None
+        if pid is not None and hasattr(os, "pidfd_open"):
+            try:
+                self._pidfd = os.pidfd_open(pid)
+            except OSError:
+                # Already exited, or no pidfd support: fall back to signal 0.
+                pass
+
+    def _close_pidfd(self) -> None:
+        if self._pidfd is not None:
+            os.close(self._pidfd)
+            self._pidfd = None
+
+    def is_running(self) -> bool:
+        """
+        Return whether the broker is running.  A broker whose pid is not known
+        yet is assumed to be running.
+        """
+        if self._watched is None:
+            self._watch()
+        if self._watched is None:
+            return True
+        if self._pidfd is not None:
+            return not select.select([self._pidfd], [], [], 0)[0]
+        try:
+            os.kill(self._watched, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def alive(self):
+        # Called by boofuzz when the session starts and after restarts: this
+        # is about the monitor, not the broker, which may still be down.
+        self._watch()
+        return True
+
+    def post_send(self, target=None, fuzz_data_logger=None, session=None):
+        if self.is_running():
+            return True
+        if self.exit_index is None and session is not None:
+            self.exit_index = session.total_mutant_index
+            self.exit_case = session.current_test_case_name
+        return False
+
+    def get_crash_synopsis(self):
+        return f"broker (pid {self._watched}) has exited"
+
+    def close(self) -> None:
+        self._close_pidfd()
@@ -0,0 +1,311 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Throughput and broker health metrics of fuzzing sessions.
+
+'FuzzMetrics' is a boofuzz fuzz logger: added to the 'fuzz_loggers' of a
+session (see the 'metrics' argument of 'make_session'), it counts the test
+cases run and the bytes sent.  Drivers which do not use boofuzz report them
+with 'FuzzMetrics.add'.  Every 'interval' seconds, a background thread
+records a sample of these counters, of the reconnections of the connection
+being watched ('PersistentConnection.reconnects'), and of the resident
+memory and CPU usage of the broker process, through psutil.  Samples are
+written as they are taken to a CSV file, or to a JSON lines file if its name
+ends with '.json' or '.jsonl', so that campaigns can be plotted and compared.
+When the metrics are closed, a summary (totals, rates, peak memory, and the
+time until the broker exited, if it did) is logged, and written next to the
+samples.
+
+Public types:
+o 'BrokerSampler': sample the memory and CPU usage of the broker.
+o 'MetricsSample': a sample of the time series.
+o 'FuzzMetrics': record the time series of a fuzzing session.
+"""
+
+import csv
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any, Dict, List, NamedTuple, Optional, Union
+
+import boofuzz
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+#                                  CONSTANTS
+# =============================================================================
+
+
+DEFAULT_INTERVAL = 1.0  # seconds between two samples
+
+_JSON_SUFFIXES = (".json", ".jsonl")
+
+
+# =============================================================================
+#                                   BROKER
+# =============================================================================
+
+
+class BrokerSampler:
+    """
+    Sample the resident memory and CPU usage of the broker process with the
+    specified 'pid', or whose pid is written in the specified 'pid_file'
+    (read again when the broker is restarted).
+    """
+
+    def __init__(
+        self, pid: Optional[int] = None, pid_file: Union[str, Path, None] = None
+    ) -> None:
+        if (pid is None) == (pid_file is None):
+            raise ValueError("exactly one of 'pid' and 'pid_file' is required")
+        self._pid = pid
+        self._pid_file = None if pid_file is None else Path(pid_file)
+        self._process: Optional[psutil.Process] = None
+        self.exited = False
+
+    def _find(self) -> Optional[psutil.Process]:
+        pid = self._pid
+        if self._pid_file is not None:
+            try:
+                pid = int(self._pid_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                return self._process
+        if self._process is None or self._process.pid != pid:
+            try:
+                self._process = psutil.Process(pid)
+                # The first call only sets the start of the measure.
+                self._process.cpu_percent(interval=None)
+                self.exited = False
+            except psutil.NoSuchProcess:
+                self._process = None
+                self.exited = True
+        return self._process
+
+    def sample(self) -> Optional[Dict[str, float]]:
+        """
+        Return the resident memory of the broker, in bytes, and its CPU usage
+        since the previous sample, in percent of one core, or 'None' if the
+        broker is not known yet or has exited.
+        """
+
+        process = self._find()
+        if process is None:
+            return None
+        try:
+            with process.oneshot():
+                if process.status() == psutil.STATUS_ZOMBIE:
+                    raise psutil.NoSuchProcess(process.pid)
+                return {
+                    "broker_rss": process.memory_info().rss,
+                    "broker_cpu": process.cpu_percent(interval=None),
+                }
+        except psutil.NoSuchProcess:
+            self.exited = True
+            return None
+
+
+# =============================================================================
+#                                  METRICS
+# =============================================================================
+
+
+class MetricsSample(NamedTuple):
+    elapsed: float  # seconds since the start
+    cases: int
+    cases_per_sec: float  # since the previous sample
+    bytes_sent: int
+    reconnects: int
+    broker_rss: Optional[int] = None  # bytes
+    broker_cpu: Optional[float] = None  # percent of one core
+
+
+class FuzzMetrics(boofuzz.IFuzzLogger):
+    """
+    Record the time series of a fuzzing session to the specified 'path', if
+    provided, every 'interval' seconds, sampling the broker through the
+    specified 'broker' sampler if provided.  The reconnections are read from
+    'connection', if set, e.g. to a 'PersistentConnection'.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        interval: float = DEFAULT_INTERVAL,
+        broker: Optional[BrokerSampler] = None,
+    ) -> None:
+        self.path = path
+        self.interval = interval
+        self.broker = broker
+        self.connection: Any = None
+        self.cases = 0
+        self.bytes_sent = 0
+        self.samples: List[MetricsSample] = []
+        self.time_to_crash: Optional[float] = None
+        self._reconnects = 0
+        self._start = time.monotonic()
+        self._file: Optional[IO[str]] = None
+        self._writer: Any = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "FuzzMetrics":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def reconnects(self) -> int:
+        return self._reconnects + getattr(self.connection, "reconnects", 0)
+
+    @property
+    def duration(self) -> float:
+        return time.monotonic() - self._start
+
+    def add(self, cases: int = 0, bytes_sent: int = 0, reconnects: int = 0) -> None:
+        """Count the specified 'cases', 'bytes_sent' and 'reconnects'."""
+
+        self.cases += cases
+        self.bytes_sent += bytes_sent
+        self._reconnects += reconnects
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+
+        self._start = time.monotonic()
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("w", encoding="utf-8", newline="")
+            if self.path.suffix not in _JSON_SUFFIXES:
+                self._writer = csv.writer(self._file)
+                self._writer.writerow(MetricsSample._fields)
+        self.sample()
+        self._thread = threading.Thread(
+            target=self._run, name="fuzz-metrics", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> MetricsSample:
+        """Take a sample, and write it to 'path' if provided."""
+
+        elapsed = self.duration
+        cases = self.cases
+        rate = 0.0
+        if self.samples and elapsed > self.samples[-1].elapsed:
+            previous = self.samples[-1]
+            rate = (cases - previous.cases) / (elapsed - previous.elapsed)
+
+        broker: Dict[str, float] = {}
+        if self.broker is not None:
+            broker = self.broker.sample() or {}
+            if self.broker.exited and self.time_to_crash is None:
+                self.time_to_crash = elapsed
+        sample = MetricsSample(
+            elapsed, cases, rate, self.bytes_sent, self.reconnects, **broker
+        )
+        self.samples.append(sample)
+
+        if self._file is not None:
+            if self._writer is not None:
+                self._writer.writerow(sample)
+            else:
+                self._file.write(json.dumps(sample._asdict()) + "\n")
+            self._file.flush()
+        return sample
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the totals and rates of the session so far."""
+
+        duration = self.duration
+        rss = [s.broker_rss for s in self.samples if s.broker_rss is not None]
+        cpu = [s.broker_cpu for s in self.samples[1:] if s.broker_cpu is not None]
+        return {
+            "duration": duration,
+            "cases": self.cases,
+            "cases_per_sec": self.cases / duration if duration else 0.0,
+            "bytes_sent": self.bytes_sent,
+            "bytes_per_sec": self.bytes_sent / duration if duration else 0.0,
+            "reconnects": self.reconnects,
+            "peak_broker_rss": max(rss, default=None),
+            "mean_broker_cpu": sum(cpu) / len(cpu) if cpu else None,
+            "time_to_crash": self.time_to_crash,
+        }
+
+    def close(self) -> Dict[str, Any]:
+        """
+        Stop sampling, take a last sample, log the summary and write it next
+        to 'path' if provided, with the '.summary.json' suffix.  Return the
+        summary.
+        """
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.sample()
+        summary = self.summary()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self.path.with_suffix(".summary.json").write_text(
+                json.dumps(summary, indent=1), encoding="utf-8"
+            )
+        logger.info("fuzzing session metrics: %s", summary)
+        return summary
+
+    # boofuzz.IFuzzLogger
+
+    def open_test_case(self, test_case_id, name, index, *args, **kwargs):
+        self.cases += 1
+
+    def log_send(self, data):
+        self.bytes_sent += len(data)
+
+    def open_test_step(self, description):
+        pass
+
+    def log_check(self, description):
+        pass
+
+    def log_recv(self, data):
+        pass
+
+    def log_pass(self, description=""):
+        pass
+
+    def log_fail(self, description=""):
+        pass
+
+    def log_info(self, description):
+        pass
+
+    def log_error(self, description):
+        pass
+
+    def close_test_case(self):
+        pass
+
+    def close_test(self):
+        pass
@@ -0,0 +1,587 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Parallel fuzzing of a pool of BlazingMQ brokers.
+
+Each broker of the pool is a standalone broker deployed with 'Configurator'
+and 'LocalSite' in a directory of its own, and listening on a port reserved
+with 'reserve_port'.  The requests to fuzz, and the range of mutation indices
+of each request, are split into shards.  One thread per broker takes shards
+from a shared queue and runs them in a process pool, so that fuzzing
+throughput scales with the number of cores rather than being capped by one
+session on one socket.
+
+A shard during which the broker exits is a crash finding: the broker is
+restarted, the rest of the shard is queued again, and the findings of all
+the brokers are merged into a single report.
+
+With a corpus directory (see 'corpus'), the mutations already run by previous
+runs are skipped, and the inputs sent last before each crash are saved.
+
+Public types:
+o 'Shard': a range of mutations of one request.
+o 'ShardResult': the outcome of running a shard.
+o 'Finding': a crash of a broker while running a shard.
+o 'FuzzReport': the merged outcome of a parallel fuzzing run.
+o 'FuzzBroker': a standalone broker deployed for fuzzing.
+
+Public functions:
+o 'make_shards': split the mutations of requests into shards.
+o 'run_shard': run the mutations of a shard against a broker.
+o 'temporary_work_dir': create a work directory kept only if needed.
+o 'fuzz_parallel': fuzz requests on a pool of brokers.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import boofuzz
+
+import blazingmq.dev.configurator as cfg
+from blazingmq.dev.configurator.configurator import Configurator
+from blazingmq.dev.configurator.localsite import LocalSite
+from blazingmq.dev.fuzztest import (
+    REQUESTS,
+    FastConnection,
+    FuzzLoggerLimited,
+    LivenessMonitor,
+    count_mutations,
+    make_session,
+)
+from blazingmq.dev.fuzztest.corpus import CRASHES, CorpusDir
+from blazingmq.dev.reserveport import reserve_port
+from blazingmq.schemas import broker as broker_schemas
+from blazingmq.schemas import mqbconf
+
+logger = logging.getLogger(__name__)
+
+# The domain of the queue opened by the fuzzed requests.
+FUZZ_DOMAIN = broker_schemas.OPEN_QUEUE_SCHEMA["openQueue"]["handleParameters"][
+    "uri"
+].split("/")[2]
+
+BROKER_START_TIMEOUT = 30
+BROKER_TERMINATE_TIMEOUT = 10
+
+# Number of shards per broker when the shard size is not specified, so that
+# the brokers finishing early can take over the work of slower ones.
+SHARDS_PER_BROKER = 4
+
+
+# =============================================================================
+#                                   SHARDS
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class Shard:
+    request: str
+    index_start: int
+    index_end: int
+
+    def __str__(self) -> str:
+        return f"{self.request}[{self.index_start}:{self.index_end}]"
+
+
+@dataclass(frozen=True)
+class ShardResult:
+    shard: Shard
+    num_cases: int
+    last_index: int
+    last_case: str
+    error: Optional[str] = None
+    # The inputs sent last when the broker was found to have exited.
+    inputs: Tuple[Tuple[bytes, ...], ...] = ()
+
+
+def make_shards(
+    requests: Iterable[str],
+    num_brokers: int,
+    shard_size: Optional[int] = None,
+    num_mutations: Callable[[str], int] = count_mutations,
+    ranges: Optional[Callable[[str, int], List[Tuple[int, int]]]] = None,
+) -> List[Shard]:
+    """
+    Return shards covering all the mutations of the specified 'requests',
+    each holding at most 'shard_size' mutations.  If 'shard_size' is not
+    specified, split the mutations into about 'SHARDS_PER_BROKER' shards per
+    broker for the specified 'num_brokers'.  If the optionally specified
+    'ranges' is provided, only cover the ranges of mutations it returns for
+    a request and its number of mutations.  The largest shards come first.
+    """
+
+    to_run = {}
+    for request in requests:
+        count = num_mutations(request)
+        to_run[request] = [(1, count)] if ranges is None else ranges(request, count)
+    if shard_size is None:
+        total = sum(
+            end - start + 1 for pairs in to_run.values() for start, end in pairs
+        )
+        shard_size = max(1, -(-total // (num_brokers * SHARDS_PER_BROKER)))
+
+    shards = [
+        Shard(request, start, min(start + shard_size - 1, end))
+        for request, pairs in to_run.items()
+        for first, end in pairs
+        for start in range(first, end + 1, shard_size)
+    ]
+    shards.sort(key=lambda shard: shard.index_start - shard.index_end)
+    return shards
+
+
+def run_shard(
+    host: str, port: int, shard: Shard, pid: Optional[int] = None
+) -> ShardResult:
+    """
+    Run the mutations of the specified 'shard' against the broker at the
+    specified 'host' and 'port'.  Stop at the first mutation after which the
+    broker cannot be reached.  If the optionally specified 'pid' of the
+    broker is provided, do not wait for responses, and detect the exit of
+    the broker by watching its process.
+    """
+
+    liveness = None if pid is None else LivenessMonitor(pid=pid)
+    options = {}
+    if liveness is not None:
+        # Keep hold of the connection, to save the inputs sent last.
+        connection = FastConnection(host, port, recv_timeout=0.05)
+        options["target"] = boofuzz.Target(connection=connection, monitors=[liveness])
+    session = make_session(
+        host,
+        port,
+        shard.request,
+        liveness=liveness,
+        index_start=shard.index_start,
+        index_end=shard.index_end,
+        restart_threshold=1,
+        restart_sleep_time=0,
+        fuzz_loggers=[FuzzLoggerLimited()],
+        # Findings are merged into the report, not into per-process databases.
+        db_filename=":memory:",
+        **options,
+    )
+
+    error = None
+    try:
+        session.fuzz(max_depth=1)
+    except boofuzz.exception.BoofuzzError as exc:
+        error = f"{type(exc).__name__}: {exc}"
+
+    num_cases = getattr(session, "num_cases_actually_fuzzed", 0)
+    last_index = session.total_mutant_index
+    last_case = getattr(session, "current_test_case_name", "")
+    inputs: Tuple[Tuple[bytes, ...], ...] = ()
+    if liveness is not None:
+        liveness.close()
+        if liveness.exit_index is not None:
+            # The cases after the exit was detected only failed to connect.
+            last_index, last_case = liveness.exit_index, liveness.exit_case
+            error = error or f"broker exited at mutation {last_index}"
+            inputs = tuple(tuple(sent) for sent in connection.history if sent)
+    if error is None and num_cases < shard.index_end - shard.index_start + 1:
+        # boofuzz ends the session quietly when the target cannot be reached.
+        error = f"broker unreachable at mutation {last_index}"
+
+    return ShardResult(
+        shard=shard,
+        num_cases=num_cases,
+        last_index=last_index,
+        last_case=last_case,
+        error=error,
+        inputs=inputs,
+    )
+
+
+# =============================================================================
+#                                   REPORT
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class Finding:
+    request: str
+    broker: str
+    returncode: Optional[int]
+    index: int
+    test_case: str
+    shard: str
+    error: Optional[str]
+    log: str
+
+
+@dataclass
+class FuzzReport:
+    duration: float = 0.0
+    num_cases: int = 0
+    num_shards: int = 0
+    findings: List[Finding] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    def add_finding(self, finding: Finding) -> None:
+        """
+        Add the specified 'finding', unless a finding for the same test case
+        has already been reported by another broker.
+        """
+        for other in self.findings:
+            if (other.request, other.test_case) == (finding.request, finding.test_case):
+                return
+        self.findings.append(finding)
+        self.findings.sort(key=lambda finding: (finding.request, finding.index))
+
+    def to_dict(self) -> dict:
+        return {
+            "duration": self.duration,
+            "numCases": self.num_cases,
+            "numShards": self.num_shards,
+            "findings": [asdict(finding) for finding in self.findings],
+            "errors": self.errors,
+        }
+
+    def save(self, path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=4)
+
+
+# =============================================================================
+#                                   BROKERS
+# =============================================================================
+
+
+def add_fuzz_domain(cluster: cfg.Cluster) -> None:
+    """
+    Add the domain of the queue opened by the fuzzed requests, with in-memory
+    storage, to the specified 'cluster'.
+    """
+    domain = cluster.priority_domain(FUZZ_DOMAIN)
+    storage = domain.definition.parameters.storage.config
+    storage.in_memory = mqbconf.InMemoryStorage()
+    storage.file_backed = None
+
+
+class FuzzBroker:
+    """
+    A standalone broker, answering for the fuzzed domain, deployed in
+    'work_dir / name' and listening on the specified 'port'.  The specified
+    'env' variables are added to the environment of the broker.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        port: int,
+        work_dir: Path,
+        env: Optional[Dict[str, str]] = None,
+    ):
+        self.name = name
+        self.port = port
+        self.env = dict(os.environ, **(env or {}))
+        self.site_dir = work_dir / name
+        self.log_path = work_dir / f"{name}.log"
+        self.restarts = 0
+        self._process: Optional[subprocess.Popen] = None
+
+        configurator = Configurator()
+        partition_config = configurator.proto.cluster.partition_config
+        partition_config.max_data_file_size = 67108864  # 64MiB
+        partition_config.max_journal_file_size = 16777216  # 16MiB
+        partition_config.max_cslfile_size = 16777216  # 16MiB
+        partition_config.max_qlist_file_size = 2097152  # 2MiB
+
+        broker = self._configure(configurator)
+        configurator.deploy(broker, LocalSite(self.site_dir))
+
+    def _configure(self, configurator: Configurator) -> cfg.Broker:
+        """
+        Add the broker, its cluster and the fuzzed domain to the specified
+        'configurator', and return the broker.
+        """
+        broker = configurator.broker(
+            tcp_host="localhost", tcp_port=self.port, name=self.name, data_center="fuzz"
+        )
+        cluster = configurator.cluster(name=f"{self.name}Cluster", nodes=[broker])
+        add_fuzz_domain(cluster)
+        return broker
+
+    def start(self) -> None:
+        """
+        Start the broker and wait until it accepts connections.
+        """
+        assert self._process is None
+
+        with open(self.log_path, "a", encoding="utf-8") as log:
+            # The broker outlives this call; 'stop' waits for it.
+            self._process = subprocess.Popen(  # pylint: disable=consider-using-with
+                [str(self.site_dir / "run")],
+                cwd=self.site_dir,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                env=self.env,
+            )
+
+        deadline = time.monotonic() + BROKER_START_TIMEOUT
+        while True:
+            if self._process.poll() is not None:
+                raise RuntimeError(
+                    f"{self.name} exited with code {self._process.returncode} "
+                    f"on startup, see {self.log_path}"
+                )
+            try:
+                with socket.create_connection(("localhost", self.port), timeout=1):
+                    return
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(
+                        f"{self.name} not listening on port {self.port} after "
+                        f"{BROKER_START_TIMEOUT}s, see {self.log_path}"
+                    ) from None
+                time.sleep(0.1)
+
+    @property
+    def pid(self) -> Optional[int]:
+        return None if self._process is None else self._process.pid
+
+    def poll(self) -> Optional[int]:
+        """
+        Return the exit code of the broker, or 'None' if it is running.
+        """
+        assert self._process is not None
+        return self._process.poll()
+
+    def stop(self) -> Optional[int]:
+        """
+        Stop the broker, and return its exit code.
+        """
+        if self._process is None:
+            return None
+
+        process, self._process = self._process, None
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=BROKER_TERMINATE_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        return process.wait()
+
+    def restart(self) -> None:
+        self.stop()
+        self.restarts += 1
+        self.start()
+
+
+# =============================================================================
+#                                 ORCHESTRATION
+# =============================================================================
+
+
+def _drain(
+    shards: "queue.Queue[Shard]",
+    broker: FuzzBroker,
+    executor: Executor,
+    report: FuzzReport,
+    lock: threading.Lock,
+    *,
+    corpus: Optional[CorpusDir] = None,
+    counts: Optional[Dict[str, int]] = None,
+) -> None:
+    """
+    Run the shards of the specified 'shards' queue against the specified
+    'broker' in the specified 'executor' until the queue is empty, and
+    record their outcome in the specified 'report'.  If the optionally
+    specified 'corpus' is provided, record the mutations run, among the
+    specified 'counts' of mutations of each request, and the crashing
+    inputs in it.
+    """
+
+    while True:
+        try:
+            shard = shards.get_nowait()
+        except queue.Empty:
+            return
+
+        try:
+            result = executor.submit(
+                run_shard, "localhost", broker.port, shard, broker.pid
+            ).result()
+        except Exception as exc:  # pylint: disable=broad-except
+            with lock:
+                report.errors.append(f"{broker.name}: {shard}: {exc!r}")
+            continue
+
+        returncode = broker.poll()
+        if corpus is not None:
+            assert counts is not None
+            if returncode is not None:
+                corpus.mark_explored(
+                    shard.request,
+                    counts[shard.request],
+                    shard.index_start,
+                    result.last_index,
+                )
+                for messages in result.inputs:
+                    corpus.add(CRASHES, shard.request, messages)
+            elif result.error is None:
+                corpus.mark_explored(
+                    shard.request,
+                    counts[shard.request],
+                    shard.index_start,
+                    shard.index_end,
+                )
+
+        with lock:
+            report.num_cases += result.num_cases
+            if returncode is not None:
+                report.add_finding(
+                    Finding(
+                        request=shard.request,
+                        broker=broker.name,
+                        returncode=returncode,
+                        index=result.last_index,
+                        test_case=result.last_case,
+                        shard=str(shard),
+                        error=result.error,
+                        log=str(broker.log_path),
+                    )
+                )
+            elif result.error is not None:
+                report.errors.append(f"{broker.name}: {shard}: {result.error}")
+
+        if returncode is not None:
+            logger.warning(
+                "%s exited with code %s while running %s, restarting",
+                broker.name,
+                returncode,
+                shard,
+            )
+            if result.last_index < shard.index_end:
+                shards.put(Shard(shard.request, result.last_index + 1, shard.index_end))
+            try:
+                broker.restart()
+            except RuntimeError as exc:
+                # Leave the remaining shards to the other brokers.
+                with lock:
+                    report.errors.append(f"{broker.name}: {exc}")
+                return
+
+
+def temporary_work_dir(stack: contextlib.ExitStack, keep: Callable[[], bool]) -> Path:
+    """
+    Return a new temporary directory, removed when the specified 'stack'
+    exits unless 'keep' then returns True, e.g. because findings refer to
+    the files in it.
+    """
+
+    path = Path(tempfile.mkdtemp(prefix="bmqfuzz-"))
+
+    def cleanup() -> None:
+        if keep():
+            logger.warning("keeping the work directory %s", path)
+        else:
+            shutil.rmtree(path, ignore_errors=True)
+
+    stack.callback(cleanup)
+    return path
+
+
+def fuzz_parallel(
+    requests: Sequence[str] = REQUESTS,
+    num_brokers: Optional[int] = None,
+    work_dir: Optional[Path] = None,
+    shard_size: Optional[int] = None,
+    corpus_dir: Optional[Path] = None,
+) -> FuzzReport:
+    """
+    Fuzz the specified 'requests' on a pool of 'num_brokers' brokers (by
+    default, one per core) deployed in the specified 'work_dir', splitting
+    their mutations into shards of at most 'shard_size' mutations.  If the
+    optionally specified 'corpus_dir' is provided, skip the mutations already
+    run according to it, and save the crashing inputs in it.  Return the
+    merged report, also saved as 'report.json' in 'work_dir'.  By default,
+    'work_dir' is a temporary directory, removed afterwards unless there are
+    findings, as they refer to the broker logs in it.
+    """
+
+    num_brokers = num_brokers or os.cpu_count() or 1
+    corpus = None if corpus_dir is None else CorpusDir(corpus_dir)
+    counts = {request: count_mutations(request) for request in requests}
+    shards: "queue.Queue[Shard]" = queue.Queue()
+    all_shards = make_shards(
+        requests,
+        num_brokers,
+        shard_size,
+        num_mutations=counts.__getitem__,
+        ranges=None if corpus is None else corpus.unexplored,
+    )
+    for shard in all_shards:
+        shards.put(shard)
+
+    report = FuzzReport(num_shards=len(all_shards))
+    lock = threading.Lock()
+
+    with contextlib.ExitStack() as stack:
+        if work_dir is None:
+            work_dir = temporary_work_dir(stack, lambda: bool(report.findings))
+
+        brokers = []
+        for index in range(num_brokers):
+            port = stack.enter_context(reserve_port()).port
+            broker = FuzzBroker(f"fuzz{index}", port, work_dir)
+            stack.callback(broker.stop)
+            broker.start()
+            brokers.append(broker)
+
+        executor = stack.enter_context(ProcessPoolExecutor(max_workers=num_brokers))
+        start = time.monotonic()
+        threads = [
+            threading.Thread(
+                target=_drain,
+                args=(shards, broker, executor, report, lock),
+                kwargs={"corpus": corpus, "counts": counts},
+                name=f"fuzz-{broker.name}",
+            )
+            for broker in brokers
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        report.duration = time.monotonic() - start
+
+        report.save(work_dir / "report.json")
+        logger.info(
+            "fuzzed %d cases in %d shards on %d brokers in %.1fs: %d findings",
+            report.num_cases,
+            report.num_shards,
+            num_brokers,
+            report.duration,
+            len(report.findings),
+        )
+
+    return report
@@ -34,13 +34,15 @@ class PersistentConnection(boofuzz.TCPSocketConnection):
     Boofuzz's Session calls open()/close() around each mutation.  close() is
     a no-op so the connection persists.  If the broker RSTs the connection
     (e.g. after a heartbeat timeout), send() catches the error, reconnects,
-    replays the handshake, and retries the send.
+    replays the handshake, and retries the send.  'reconnects' counts these
+    reconnections (see 'metrics.FuzzMetrics').
     """
 
     def __init__(self, host, port, setup_steps=None, **kwargs):
         super().__init__(host, port, **kwargs)
         self._setup_steps = setup_steps or []
         self._connected = False
+        self.reconnects = 0
 
     def open(self):
         if not self._connected:
@@ -57,6 +59,7 @@ class PersistentConnection(boofuzz.TCPSocketConnection):
         except OSError:
             logger.info("Connection lost — reconnecting and replaying handshake")
             self._connected = False
+            self.reconnects += 1
             try:
                 super().close()
             except OSError:
@@ -0,0 +1,364 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Send boofuzz mutations rendered ahead of time by worker processes.
+
+Rendering a boofuzz test case walks the whole request tree, encoding every
+block and recomputing every 'Size' and 'Checksum', in pure Python: this, not
+the network, bounds 'fuzz' once the session no longer waits for responses
+('FastConnection').  'fuzz_prerendered' runs the same mutations as 'fuzz',
+in the same order, but splits their range into contiguous shards rendered by
+worker processes.  Each worker puts batches of rendered test cases on a
+bounded queue, which the sender drains shard after shard, sending each case
+on a new connection, so that the sender never waits on rendering once the
+queues are full.
+
+Public types:
+o 'RenderedCase': a test case, as the messages sent on its connection.
+o 'PrerenderReport': the outcome of 'fuzz_prerendered'.
+
+Public functions:
+o 'iter_cases': render the mutations run by 'fuzz', in order.
+o 'fuzz_prerendered': send the mutations run by 'fuzz', rendered by worker
+                      processes.
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+import select
+import socket
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Deque, Iterator, List, NamedTuple, Optional, Tuple
+
+import boofuzz
+from blazingmq.dev.fuzztest import make_session, make_workflows
+from blazingmq.dev.fuzztest.corpus import CONNECT_TIMEOUT, CRASHES, CorpusDir
+from blazingmq.dev.fuzztest.fast_connection import HISTORY_SIZE, LivenessMonitor
+from blazingmq.dev.fuzztest.metrics import FuzzMetrics
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+#                                  CONSTANTS
+# =============================================================================
+
+
+DEFAULT_BATCH_SIZE = 256  # test cases per batch
+DEFAULT_QUEUE_SIZE = 8  # batches rendered ahead by each worker
+WORKER_POLL_INTERVAL = 0.5  # seconds between checks of a silent worker
+
+Workflows = List[List[Tuple[boofuzz.Request, str]]]
+
+
+# =============================================================================
+#                                  RENDERING
+# =============================================================================
+
+
+class RenderedCase(NamedTuple):
+    index: int  # as 'index_start' and 'index_end' of 'fuzz'
+    request: str  # name of the fuzzed request in 'REQUESTS'
+    name: str  # boofuzz test case name
+    messages: Tuple[bytes, ...]
+
+
+def _make_session(
+    request: Optional[str], workflows: Workflows, **session_options
+) -> boofuzz.Session:
+    return make_session(
+        "localhost",
+        0,
+        request,
+        workflows=workflows,
+        fuzz_loggers=[],
+        db_filename=":memory:",
+        **session_options,
+    )
+
+
+def iter_cases(
+    request: Optional[str] = None,
+    index_start: int = 1,
+    index_end: Optional[int] = None,
+    workflows_factory: Callable[[], Workflows] = make_workflows,
+) -> Iterator[RenderedCase]:
+    """
+    Render the mutations run by 'fuzz' for the specified 'request', or for
+    all requests if 'request' is 'None', from the mutation at 'index_start'
+    to the one at 'index_end', included, or to the last one if 'index_end'
+    is 'None'.  The requests are sent as in the workflows returned by the
+    specified 'workflows_factory'.  Mutations before 'index_start' are
+    generated but not rendered.
+    """
+
+    workflows = workflows_factory()
+    names = {req.name: name for workflow in workflows for req, name in workflow}
+    session = _make_session(request, workflows)
+    # pylint: disable=protected-access; boofuzz has no public mutation iterator
+    for context in session._generate_mutations_indefinitely(max_depth=1):
+        index = session.total_mutant_index
+        if index < index_start:
+            continue
+        if index_end is not None and index > index_end:
+            return
+        nodes = [session.nodes[edge.dst] for edge in context.message_path]
+        yield RenderedCase(
+            index=index,
+            request=names[nodes[-1].name],
+            name=session._test_case_name(context),
+            messages=tuple(node.render(context) for node in nodes),
+        )
+
+
+def _render_shard(
+    out: "multiprocessing.Queue[Optional[List[RenderedCase]]]",
+    request: Optional[str],
+    index_start: int,
+    index_end: int,
+    batch_size: int,
+    workflows_factory: Callable[[], Workflows],
+) -> None:
+    """
+    Put the mutations from 'index_start' to 'index_end' on the specified
+    'out' queue, in batches of 'batch_size' test cases, followed by 'None'.
+    """
+
+    batch: List[RenderedCase] = []
+    for case in iter_cases(request, index_start, index_end, workflows_factory):
+        batch.append(case)
+        if len(batch) == batch_size:
+            out.put(batch)
+            batch = []
+    if batch:
+        out.put(batch)
+    out.put(None)
+
+
+def _batches(
+    process: multiprocessing.Process,
+    out: "multiprocessing.Queue[Optional[List[RenderedCase]]]",
+    errors: List[str],
+) -> Iterator[List[RenderedCase]]:
+    """
+    Yield the batches put on the specified 'out' queue by the specified
+    'process', until it puts 'None' or exits.  If it exits without putting
+    'None', yield the batches it put before, and append an error to the
+    specified 'errors'.
+    """
+
+    while True:
+        try:
+            batch = out.get(timeout=WORKER_POLL_INTERVAL)
+        except queue.Empty:
+            if process.is_alive():
+                continue
+            break
+        if batch is None:
+            return
+        yield batch
+
+    # The process may have put batches between the last 'get' and its exit.
+    while True:
+        try:
+            batch = out.get_nowait()
+        except queue.Empty:
+            break
+        if batch is None:
+            return
+        yield batch
+    errors.append(f"{process.name} exited before rendering all its cases")
+
+
+# =============================================================================
+#                                   SENDING
+# =============================================================================
+
+
+@dataclass
+class PrerenderReport:
+    cases: int = 0
+    bytes: int = 0
+    duration: float = 0.0  # seconds
+    crashed: bool = False
+    # The test case after which the broker was found to have exited.
+    crash_index: Optional[int] = None
+    crash_case: Optional[str] = None
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def cases_per_sec(self) -> float:
+        return self.cases / self.duration if self.duration else 0.0
+
+
+def _send_case(
+    address: Tuple[str, int], messages: Tuple[bytes, ...], connect_timeout: float
+) -> None:
+    """
+    Send the specified 'messages' on a new connection to the specified
+    'address', as 'FastConnection' does: without waiting for the responses,
+    and half-closing the connection once they are sent.  Retry for up to
+    'connect_timeout' seconds while the broker refuses the connection.
+    """
+
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection(address, timeout=1)
+            break
+        except ConnectionRefusedError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.1)
+    with sock:
+        for message in messages:
+            sock.sendall(message)
+        while select.select([sock], [], [], 0)[0] and sock.recv(65536):
+            pass
+        sock.shutdown(socket.SHUT_WR)
+
+
+def fuzz_prerendered(
+    host: str,
+    port: int,
+    request: Optional[str] = None,
+    index_start: int = 1,
+    index_end: Optional[int] = None,
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    liveness: Optional[LivenessMonitor] = None,
+    metrics: Optional[FuzzMetrics] = None,
+    corpus_dir: Optional[Path] = None,
+    workflows_factory: Callable[[], Workflows] = make_workflows,
+) -> PrerenderReport:
+    """
+    Send the mutations run by 'fuzz' for the specified 'request', or for all
+    requests if 'request' is 'None', from 'index_start' to 'index_end', to
+    the broker at the specified 'host' and 'port'.  The mutations are
+    rendered by the specified number of 'workers' processes, one per CPU by
+    default, each rendering up to 'queue_size' batches of 'batch_size' test
+    cases ahead of the sender.  The requests are sent as in the workflows
+    returned by the specified 'workflows_factory', which must be picklable.
+    If the specified 'liveness' monitor is provided, stop when the broker
+    exits and, if 'corpus_dir' is also provided, save the last test cases
+    sent in it.  Count the test cases sent in the specified 'metrics' if
+    provided.
+    """
+
+    if index_end is None:
+        session = _make_session(request, workflows_factory())
+        index_end = session.num_mutations(max_depth=1)
+    total = max(index_end - index_start + 1, 0)
+    workers = max(1, min(workers or os.cpu_count() or 1, total))
+    shard_size = -(-total // workers)
+
+    shards = []
+    for start in range(index_start, index_end + 1, shard_size):
+        out: "multiprocessing.Queue[Optional[List[RenderedCase]]]" = (
+            multiprocessing.Queue(queue_size)
+        )
+        process = multiprocessing.Process(
+            target=_render_shard,
+            args=(
+                out,
+                request,
+                start,
+                min(start + shard_size - 1, index_end),
+                batch_size,
+                workflows_factory,
+            ),
+            name=f"prerender-{start}",
+            daemon=True,
+        )
+        process.start()
+        shards.append((process, out))
+
+    address = (host, port)
+    connect_timeout = CONNECT_TIMEOUT  # the broker may still be starting
+    recent: Deque[RenderedCase] = deque(maxlen=HISTORY_SIZE)
+    report = PrerenderReport()
+    start_time = time.monotonic()
+    try:
+        for process, out in shards:
+            for batch in _batches(process, out, report.errors):
+                for case in batch:
+                    recent.append(case)
+                    try:
+                        _send_case(address, case.messages, connect_timeout)
+                    except OSError as exc:
+                        # Closed by the broker on an invalid message, or the
+                        # broker exited.
+                        if liveness is None and isinstance(exc, ConnectionRefusedError):
+                            report.errors.append(
+                                f"broker unreachable at mutation {case.index}"
+                            )
+                            return report
+                    connect_timeout = 0
+                    size = sum(map(len, case.messages))
+                    report.cases += 1
+                    report.bytes += size
+                    if metrics is not None:
+                        metrics.add(cases=1, bytes_sent=size)
+                    if liveness is not None and not liveness.is_running():
+                        report.crashed = True
+                        report.crash_index, report.crash_case = case.index, case.name
+                        return report
+            process.join()
+            if process.exitcode:
+                report.errors.append(
+                    f"{process.name} exited with code {process.exitcode}"
+                )
+    finally:
+        report.duration = time.monotonic() - start_time
+        for process, out in shards:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+            out.close()
+            out.cancel_join_thread()
+        _log_report(report, recent, corpus_dir)
+    return report
+
+
+def _log_report(
+    report: PrerenderReport,
+    recent: Deque[RenderedCase],
+    corpus_dir: Optional[Path],
+) -> None:
+    if report.crashed:
+        logger.warning(
+            "broker exited after pre-rendered mutation %d (%s)",
+            report.crash_index,
+            report.crash_case,
+        )
+        if corpus_dir is not None:
+            corpus = CorpusDir(corpus_dir)
+            for case in recent:
+                corpus.add(CRASHES, case.request, case.messages)
+    for error in report.errors:
+        logger.error("pre-rendered fuzzing: %s", error)
+    logger.info(
+        "sent %d pre-rendered test cases (%d bytes) in %.1fs (%.0f/s)",
+        report.cases,
+        report.bytes,
+        report.duration,
+        report.cases_per_sec,
+    )
@@ -0,0 +1,573 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Grammar-based generation of PUT events with message properties.
+
+'put_message_properties' mutates a few fields of a fixed properties area one
+value at a time.  Here, each PUT message is derived from a grammar of the
+wire format instead: the PUT header, its options, the message properties
+area (old style, with value lengths, or new style, with offsets) and the
+CRC32-C checksum of the application data.  Most productions are valid, but
+are pushed to the limits of the protocol (255 properties, names of 4095
+bytes, extended header sizes, ...), and some fields lie about the data they
+describe (overlapping offsets, area and option sizes, property counts,
+checksums), so that the parsing paths of the broker see both deep valid
+inputs and inconsistent ones.
+
+A derivation is a tree of 'NamedTuple' specs holding the encoded value of
+each field, which are then encoded in one pass with precompiled layouts and
+precomputed name and value pools, so that thousands of distinct messages
+are generated per second.
+
+Public types:
+o 'PropertySpec', 'PropertiesSpec', 'OptionSpec', 'PutSpec': derivations.
+o 'PutGrammar': generate random derivations.
+o 'GrammarPut': a boofuzz primitive whose mutations are generated events.
+  See 'put_message_properties.fuzz_put_grammar' to send them without boofuzz.
+
+Public functions:
+o 'encode_properties', 'encode_option_spec', 'encode_put_message',
+  'encode_put': encode derivations.
+
+See also: bmqp::MessageProperties, bmqp::OptionUtil, bmqp::PutHeader
+"""
+
+import random
+import struct
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import boofuzz
+import crc32c
+
+from blazingmq.schemas.broker import EventType, PutHeaderFlags
+from blazingmq.schemas.protocol import (
+    NULL_GUID,
+    PROPERTIES_HEADER_SIZE,
+    PROPERTY_HEADER_SIZE,
+    PUT_HEADER_SIZE,
+    WORD_SIZE,
+    OptionType,
+    PropertyType,
+    encode_event,
+    padding,
+)
+
+# =============================================================================
+#                                  CONSTANTS
+# =============================================================================
+
+# Limits of the wire format, see bmqp_protocol.h.
+MAX_NUM_PROPERTIES = (1 << 8) - 1
+MAX_PROPERTY_NAME_LENGTH = (1 << 12) - 1
+MAX_PROPERTY_VALUE_LENGTH = (1 << 26) - 1
+MAX_AREA_WORDS = (1 << 24) - 1
+MAX_PROPERTIES_HEADER_SIZE = ((1 << 3) - 1) * 2
+MAX_OPTION_TYPE = (1 << 6) - 1
+MAX_OPTION_WORDS = (1 << 21) - 1
+MAX_PUT_HEADER_WORDS = (1 << 5) - 1
+MAX_COMPRESSION = (1 << 3) - 1
+
+# Size of the properties area generated at most, so that each message stays
+# cheap to generate and to send, even with the maximum number of properties.
+MAX_AREA_SIZE = 1 << 18
+
+# Probability that a message lies about its contents, and probability that
+# each production of such a message is pushed outside the valid encodings.
+INVALID_PROBABILITY = 0.5
+LIE_PROBABILITY = 0.1
+
+_HEADER = struct.Struct(">IIi16sIH2x")
+_PROPERTIES_HEADER = struct.Struct(">BBHxB")
+_PROPERTY_HEADER = struct.Struct(">HHH")
+_OPTION_HEADER = struct.Struct(">I")
+
+_ALPHABET = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_."
+_TEXT_POOL = (_ALPHABET * (MAX_AREA_SIZE // len(_ALPHABET) + 1))[:MAX_AREA_SIZE]
+_VALUE_POOL = (
+    random.Random(0).getrandbits(8 * MAX_AREA_SIZE).to_bytes(MAX_AREA_SIZE, "little")
+)
+
+# The extreme values of the fixed size property types.
+_FIXED_VALUES: Dict[int, Tuple[bytes, ...]] = {
+    PropertyType.BOOL: (b"\x00", b"\x01"),
+    PropertyType.CHAR: tuple(struct.pack(">b", v) for v in (-128, -1, 0, 127)),
+    PropertyType.SHORT: tuple(struct.pack(">h", v) for v in (-(1 << 15), 0, 1 << 14)),
+    PropertyType.INT32: tuple(struct.pack(">i", v) for v in (-(1 << 31), 0, 42)),
+    PropertyType.INT64: tuple(struct.pack(">q", v) for v in (-(1 << 63), 0, 1 << 62)),
+}
+_PROPERTY_TYPES = tuple(PropertyType)
+_INVALID_TYPES = (0,) + tuple(range(max(PropertyType) + 1, 1 << 5))
+_INVALID_OPTION_TYPES = (OptionType.UNDEFINED,) + tuple(
+    range(max(OptionType) + 1, MAX_OPTION_TYPE + 1)
+)
+
+# Number of properties: weights of the choices of 'PutGrammar.properties'.
+_COUNT_WEIGHTS = (4, 6, 4, 4, 2, 1, 1)  # 0, 1, 2, 3, 4-32, 254, 255
+
+
+# =============================================================================
+#                                 DERIVATIONS
+# =============================================================================
+
+
+class PropertySpec(NamedTuple):
+    type: int  # 5 bits
+    name: bytes
+    value: bytes
+    name_length: int  # as encoded, 12 bits
+    middle: int  # value length (old style) or offset (new style), 26 bits
+
+
+class PropertiesSpec(NamedTuple):
+    properties: Tuple[PropertySpec, ...]
+    header_size: int  # as encoded, in bytes
+    property_header_size: int  # as encoded, in bytes
+    area_words: int  # as encoded, 24 bits
+    count: int  # as encoded, 8 bits
+    padding: bytes
+
+
+class OptionSpec(NamedTuple):
+    type: int  # 6 bits
+    packed: bool
+    type_specific: int  # 4 bits
+    words: int  # as encoded (or packed value), 21 bits
+    content: bytes
+
+
+class PutSpec(NamedTuple):
+    queue_id: int
+    flags: int  # 4 bits
+    options: Tuple[OptionSpec, ...]
+    properties: Optional[PropertiesSpec]
+    payload: bytes
+    schema_id: int  # 0 for old style properties
+    guid: bytes = NULL_GUID
+    compression: int = 0  # 3 bits
+    header_words: int = PUT_HEADER_SIZE // WORD_SIZE  # 5 bits
+    crc32c: Optional[int] = None  # 'None' for the checksum of the data
+
+
+# =============================================================================
+#                                   ENCODER
+# =============================================================================
+
+
+def encode_properties(spec: PropertiesSpec) -> bytes:
+    """
+    Return the message properties area of the specified 'spec'.  Headers
+    larger than the standard ones are padded with zeros; smaller ones are
+    only a lie of the size fields.
+    """
+    header_extra = bytes(max(0, spec.header_size - PROPERTIES_HEADER_SIZE))
+    property_extra = bytes(max(0, spec.property_header_size - PROPERTY_HEADER_SIZE))
+
+    area = bytearray(
+        _PROPERTIES_HEADER.pack(
+            ((spec.property_header_size // 2 & 0x07) << 3)
+            | (spec.header_size // 2 & 0x07),
+            spec.area_words >> 16 & 0xFF,
+            spec.area_words & 0xFFFF,
+            spec.count & 0xFF,
+        )
+    )
+    area += header_extra
+    for prop in spec.properties:
+        area += _PROPERTY_HEADER.pack(
+            (prop.type & 0x1F) << 10 | (prop.middle >> 16 & 0x3FF),
+            prop.middle & 0xFFFF,
+            prop.name_length & 0x0FFF,
+        )
+        area += property_extra
+    for prop in spec.properties:
+        area += prop.name
+        area += prop.value
+    area += spec.padding
+    return bytes(area)
+
+
+def encode_option_spec(spec: OptionSpec) -> bytes:
+    """
+    Return the option of the specified 'spec'.
+    """
+    return (
+        _OPTION_HEADER.pack(
+            (spec.type & 0x3F) << 26
+            | int(spec.packed) << 25
+            | (spec.type_specific & 0x0F) << 21
+            | (spec.words & MAX_OPTION_WORDS)
+        )
+        + spec.content
+    )
+
+
+def _application_data(spec: PutSpec) -> bytes:
+    if spec.properties is None:
+        return spec.payload
+    return encode_properties(spec.properties) + spec.payload
+
+
+def encode_put_message(spec: PutSpec) -> bytes:
+    """
+    Return the PUT message of the specified 'spec', i.e. its header, options
+    and padded application data.  A header larger than the standard one is
+    padded with zeros.
+    """
+    options = b"".join(encode_option_spec(option) for option in spec.options)
+    data = _application_data(spec)
+    checksum = crc32c.crc32c(data) if spec.crc32c is None else spec.crc32c
+
+    message = bytearray(_HEADER.size)
+    message += bytes(max(0, spec.header_words * WORD_SIZE - PUT_HEADER_SIZE))
+    message += options
+    message += data
+    message += padding(len(data))
+    _HEADER.pack_into(
+        message,
+        0,
+        (spec.flags & 0x0F) << 28 | (len(message) // WORD_SIZE & 0x0FFFFFFF),
+        (len(options) // WORD_SIZE) << 8
+        | (spec.compression & 0x07) << 5
+        | (spec.header_words & 0x1F),
+        spec.queue_id,
+        spec.guid,
+        checksum,
+        spec.schema_id,
+    )
+    return bytes(message)
+
+
+def encode_put(specs: List[PutSpec]) -> bytes:
+    """
+    Return the PUT event holding the messages of the specified 'specs'.
+    """
+    return encode_event(
+        EventType.PUT, b"".join(encode_put_message(spec) for spec in specs)
+    )
+
+
+# =============================================================================
+#                                   GRAMMAR
+# =============================================================================
+
+
+class PutGrammar:
+    """
+    Generate random derivations of PUT messages to the specified 'queue_id',
+    drawing from the specified 'rng'.  A message lies about its contents
+    with the specified 'invalid_probability', in which case each of its
+    productions is pushed outside the valid encodings with the probability
+    'LIE_PROBABILITY'; the other messages are valid, so that the broker
+    parses them fully.  Properties areas are at most 'max_area_size' bytes,
+    but for the lies of their size fields.
+    """
+
+    def __init__(
+        self,
+        rng: Optional[random.Random] = None,
+        queue_id: int = 0,
+        invalid_probability: float = INVALID_PROBABILITY,
+        max_area_size: int = MAX_AREA_SIZE,
+    ):
+        self._rng = rng or random.Random()
+        self._queue_id = queue_id
+        self._invalid_probability = invalid_probability
+        self._max_area_size = min(max_area_size, MAX_AREA_SIZE)
+        self._lying = False
+
+    def _invalid(self) -> bool:
+        return self._lying and self._rng.random() < LIE_PROBABILITY
+
+    def _pool(self, pool: bytes, length: int) -> bytes:
+        start = self._rng.randrange(len(pool) - length + 1)
+        return pool[start : start + length]
+
+    # Properties
+
+    def _count(self) -> int:
+        choice = self._rng.choices(range(len(_COUNT_WEIGHTS)), _COUNT_WEIGHTS)[0]
+        if choice == 4:
+            return self._rng.randint(4, 32)
+        if choice >= 5:
+            return MAX_NUM_PROPERTIES - 6 + choice
+        return choice
+
+    def _name(self, index: int, budget: int, previous: bytes) -> bytes:
+        rng = self._rng
+        if previous and self._invalid():
+            # Duplicate, empty or not UTF-8.
+            return rng.choice((previous, b"", b"\xff\xfe" + previous[2:]))
+
+        # Unique names: a prefix from the index, then the pool.
+        prefix = b"%x." % index
+        choice = rng.random()
+        if choice < 0.4:
+            length = len(prefix) + 1
+        elif choice < 0.7:
+            length = rng.randint(len(prefix), 16)
+        elif choice < 0.9:
+            length = rng.randint(17, 255)
+        else:
+            length = MAX_PROPERTY_NAME_LENGTH
+        length = max(len(prefix), min(length, budget))
+        return prefix + self._pool(_TEXT_POOL, length - len(prefix))
+
+    def _value(self, property_type: int, budget: int) -> bytes:
+        rng = self._rng
+        fixed = _FIXED_VALUES.get(property_type)
+        if fixed is not None and not self._invalid():
+            return rng.choice(fixed)
+        if fixed is not None:
+            # A fixed size type with a value of the wrong size.
+            return self._pool(_VALUE_POOL, rng.choice((0, 3, 9, 16)))
+
+        choice = rng.random()
+        if choice < 0.1:
+            length = 0
+        elif choice < 0.2:
+            length = 1
+        elif choice < 0.7:
+            length = rng.randint(2, 64)
+        elif choice < 0.9:
+            length = rng.randint(65, 4096)
+        else:
+            length = rng.randint(0, budget)
+        pool = _TEXT_POOL if property_type == PropertyType.STRING else _VALUE_POOL
+        return self._pool(pool, max(0, min(length, budget)))
+
+    def property(
+        self, index: int, offset: int, new_style: bool, budget: int, previous: bytes
+    ) -> PropertySpec:
+        """
+        Return the derivation of the property at the specified 'index',
+        whose name starts at the specified 'offset' in the data of the
+        properties, leaving at most 'budget' bytes for its name and value.
+        """
+        rng = self._rng
+        if self._invalid():
+            property_type = rng.choice(_INVALID_TYPES)
+        else:
+            property_type = rng.choice(_PROPERTY_TYPES)
+        name = self._name(index, max(budget // 2, 1), previous)
+        value = self._value(property_type, max(budget - len(name), 0))
+
+        name_length = len(name)
+        if self._invalid():
+            name_length = rng.choice(
+                (0, name_length + 1, max(name_length - 1, 0), MAX_PROPERTY_NAME_LENGTH)
+            )
+
+        middle = offset if new_style else len(value)
+        if self._invalid():
+            if new_style:
+                # Overlapping the previous property, or outside of the area.
+                middle = rng.choice(
+                    (0, max(offset - 1, 0), offset + len(name) + len(value) + 1)
+                )
+            else:
+                middle = rng.choice((0, len(value) + 1, len(value) - 1))
+            if rng.random() < 0.1:
+                middle = MAX_PROPERTY_VALUE_LENGTH
+        return PropertySpec(
+            property_type, name, value, name_length, middle & MAX_PROPERTY_VALUE_LENGTH
+        )
+
+    def properties(self, new_style: bool) -> PropertiesSpec:
+        """
+        Return the derivation of a properties area, whose property headers
+        hold offsets if 'new_style' is True, or value lengths otherwise.
+        """
+        rng = self._rng
+        count = self._count()
+        header_size = PROPERTIES_HEADER_SIZE
+        property_header_size = PROPERTY_HEADER_SIZE
+        if self._invalid():
+            # Larger sizes are valid: the broker skips the unknown fields.
+            header_size = rng.randrange(0, MAX_PROPERTIES_HEADER_SIZE + 1, 2)
+        if self._invalid():
+            property_header_size = rng.randrange(0, MAX_PROPERTIES_HEADER_SIZE + 1, 2)
+
+        budget = self._max_area_size - header_size - count * property_header_size
+        properties = []
+        offset = 0
+        previous = b""
+        for index in range(count):
+            share = max(budget // (count - index), 0)
+            prop = self.property(index, offset, new_style, share, previous)
+            properties.append(prop)
+            offset += len(prop.name) + len(prop.value)
+            budget -= len(prop.name) + len(prop.value)
+            previous = prop.name
+
+        size = (
+            max(header_size, PROPERTIES_HEADER_SIZE)
+            + count * max(property_header_size, PROPERTY_HEADER_SIZE)
+            + offset
+        )
+        pad = padding(size)
+        if self._invalid():
+            # Inconsistent with the size of the padding.
+            pad = pad[:-1] + rng.choice((b"\x00", b"\x05", b"\xff"))
+        area_words = (size + len(pad)) // WORD_SIZE
+        if self._invalid():
+            area_words = rng.choice(
+                (0, area_words - 1, area_words + 1, area_words * 2, MAX_AREA_WORDS)
+            )
+        encoded_count = count
+        if self._invalid():
+            encoded_count = rng.choice((count + 1, count - 1, MAX_NUM_PROPERTIES))
+        return PropertiesSpec(
+            tuple(properties),
+            header_size,
+            property_header_size,
+            area_words & MAX_AREA_WORDS,
+            encoded_count & MAX_NUM_PROPERTIES,
+            pad,
+        )
+
+    # Options
+
+    def option(self) -> OptionSpec:
+        """
+        Return the derivation of an option of a PUT message.
+        """
+        rng = self._rng
+        option_type = rng.choice(tuple(OptionType)[1:])
+        packed = False
+        type_specific = 0
+        if option_type == OptionType.MSG_GROUP_ID:
+            group_id = self._pool(_TEXT_POOL, rng.choice((1, 31, 32, 255)))
+            content = group_id + padding(len(group_id))
+        elif option_type == OptionType.SUB_QUEUE_IDS_OLD:
+            content = self._pool(_VALUE_POOL, WORD_SIZE * rng.randint(0, 16))
+        else:
+            # Items of 2 words: a sub-queue id and an RDA counter.
+            type_specific = 2
+            content = self._pool(_VALUE_POOL, 2 * WORD_SIZE * rng.randint(0, 8))
+            packed = rng.random() < 0.25
+            if packed:
+                content = b""
+
+        words = 1 + len(content) // WORD_SIZE
+        if packed:
+            words = rng.randrange(MAX_OPTION_WORDS + 1)
+        if self._invalid():
+            option_type = rng.choice(_INVALID_OPTION_TYPES + (option_type,))
+            type_specific = rng.randrange(16)
+            words = rng.choice((0, words + 1, max(words - 1, 0), MAX_OPTION_WORDS))
+        return OptionSpec(option_type, packed, type_specific, words, content)
+
+    # PUT
+
+    def put(self) -> PutSpec:
+        """
+        Return the derivation of a PUT message.
+        """
+        rng = self._rng
+        self._lying = rng.random() < self._invalid_probability
+        with_properties = rng.random() < 0.9
+        new_style = rng.random() < 0.5
+        flags = PutHeaderFlags.ACK_REQUESTED
+        if with_properties:
+            flags |= PutHeaderFlags.MESSAGE_PROPERTIES
+        schema_id = rng.choice((1, 2 * rng.randint(1, 0x7FFF))) if new_style else 0
+
+        options: Tuple[OptionSpec, ...] = ()
+        if rng.random() < 0.2:
+            options = tuple(self.option() for _ in range(rng.randint(1, 3)))
+
+        spec = PutSpec(
+            queue_id=self._queue_id,
+            flags=int(flags),
+            options=options,
+            properties=self.properties(new_style) if with_properties else None,
+            payload=self._pool(_VALUE_POOL, rng.choice((0, 1, 7, 64, 1024))),
+            schema_id=schema_id,
+            guid=self._pool(_VALUE_POOL, 16),
+        )
+        if not self._lying or rng.random() < 0.5:
+            return spec
+
+        # Lie in the header of the message.
+        field = rng.randrange(6)
+        if field == 0:
+            # Properties without the flag, or the other way round.
+            return spec._replace(flags=spec.flags ^ PutHeaderFlags.MESSAGE_PROPERTIES)
+        if field == 1:
+            # The style of the properties does not match the schema id.
+            return spec._replace(
+                schema_id=rng.choice((0, 1, 3, 0xFFFF)) if not new_style else 0
+            )
+        if field == 2:
+            return spec._replace(compression=rng.randint(1, MAX_COMPRESSION))
+        if field == 3:
+            return spec._replace(
+                header_words=rng.choice((0, 1, 8, 10, MAX_PUT_HEADER_WORDS))
+            )
+        if field == 4:
+            return spec._replace(queue_id=rng.choice((-1, 1, (1 << 31) - 1)))
+        return spec._replace(
+            crc32c=rng.choice((0, crc32c.crc32c(_application_data(spec)) ^ 1))
+        )
+
+    def event(self) -> bytes:
+        """
+        Return a PUT event holding 1 to 4 generated messages.
+        """
+        count = 1 if self._rng.random() < 0.75 else self._rng.randint(2, 4)
+        return encode_put([self.put() for _ in range(count)])
+
+    def events(self, count: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Yield the specified 'count' of generated PUT events, endlessly if
+        'None'.
+        """
+        generated = 0
+        while count is None or generated < count:
+            yield self.event()
+            generated += 1
+
+
+# =============================================================================
+#                                   BOOFUZZ
+# =============================================================================
+
+
+class GrammarPut(boofuzz.Fuzzable):
+    """
+    A boofuzz primitive rendering a whole PUT event, whose 'num_cases'
+    mutations are events generated by 'PutGrammar' from the specified
+    'seed', so that a session can run them like any other request.
+    """
+
+    def __init__(
+        self, name: Optional[str] = None, num_cases: int = 1000, seed: int = 0
+    ):
+        default = encode_put(
+            [PutGrammar(random.Random(seed), invalid_probability=0).put()]
+        )
+        super().__init__(name=name, default_value=default, fuzzable=True)
+        self._num_cases = num_cases
+        self._seed = seed
+
+    def mutations(self, default_value):
+        yield from PutGrammar(random.Random(self._seed)).events(self._num_cases)
+
+    def encode(self, value, mutation_context=None):
+        return value
+
+    def num_mutations(self, default_value):
+        return self._num_cases
@@ -20,12 +20,28 @@ Performs session setup once over a raw TCP connection, then sends many PUT
 messages with fuzzed MessageProperties fields to verify the broker handles
 malformed properties without crashing.
 
+Public types:
+o 'GrammarReport': the outcome of a 'fuzz_put_grammar' run.
+
 Public functions:
 o 'fuzz_properties': launch a message-properties fuzzing session against a
                      BlazingMQ Broker at the given 'host':'port'.
+o 'fuzz_put_grammar': stream PUT events generated by 'put_grammar' to a
+                      BlazingMQ Broker at the given 'host':'port'.
+o 'make_setup_steps': the requests opening the queue the PUTs are sent to.
 """
 
+import logging
+import random
+import select
+import socket
 import struct
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, List, Optional, Tuple
+
 import boofuzz
 
 from blazingmq.dev.fuzztest import (
@@ -37,16 +53,26 @@ from blazingmq.dev.fuzztest import (
     make_authentication_message,
     make_control_message,
 )
+from blazingmq.dev.fuzztest.corpus import CONNECT_TIMEOUT, CRASHES, CorpusDir
+from blazingmq.dev.fuzztest.fast_connection import LivenessMonitor
+from blazingmq.dev.fuzztest.metrics import FuzzMetrics
 from blazingmq.dev.fuzztest.persistent_connection import PersistentConnection
-from blazingmq.schemas import broker
+from blazingmq.dev.fuzztest.put_grammar import GrammarPut, PutGrammar
+from blazingmq.schemas import broker, protocol
+
+logger = logging.getLogger(__name__)
 
-PROPERTIES_HEADER_SIZE_2X = 3  # 6 bytes / 2
-MPH_SIZE_2X = 3  # 6 bytes / 2
-MPH_SIZE = 6  # bytes
-PROPERTIES_HEADER_SIZE = 6  # bytes
+PROPERTIES_HEADER_SIZE = protocol.PROPERTIES_HEADER_SIZE  # bytes
+MPH_SIZE = protocol.PROPERTY_HEADER_SIZE  # bytes
+PROPERTIES_HEADER_SIZE_2X = PROPERTIES_HEADER_SIZE // 2
+MPH_SIZE_2X = MPH_SIZE // 2
 
-PROP_TYPE_STRING = 6  # bmqt::PropertyType::e_STRING
-PROP_TYPE_INT32 = 4  # bmqt::PropertyType::e_INT32
+PROP_TYPE_STRING = protocol.PropertyType.STRING
+PROP_TYPE_INT32 = protocol.PropertyType.INT32
+
+# Number of generated events sent between checks of the broker process, and
+# kept to be saved if the broker exits.
+CHECK_INTERVAL = 64
 
 
 def _make_mph_fields(prefix, prop_type, name_len, middle_value, fuzzable=False):
@@ -232,7 +258,7 @@ def make_put_with_fuzzable_properties(
         ),
         boofuzz.BitField(
             name="header_words",
-            default_value=9,
+            default_value=protocol.PUT_HEADER_SIZE // protocol.WORD_SIZE,
             width=NumBits.BYTE,
             endian=">",
             fuzzable=False,
@@ -292,14 +318,7 @@ def make_put_with_fuzzable_properties(
     )
     event_desc = boofuzz.Bytes(
         name="event_desc",
-        default_value=bytes(
-            [
-                0x40 + broker.EventType.PUT,
-                0x02,
-                broker.TypeSpecific.EMPTY,
-                0x00,
-            ]
-        ),
+        default_value=protocol.event_descriptor(broker.EventType.PUT),
         size=NumBytes.WORD,
         fuzzable=False,
     )
@@ -311,33 +330,52 @@ def make_put_with_fuzzable_properties(
     return [event_size, event_contents]
 
 
-def fuzz_properties(host: str, port: int, max_depth: int = 2) -> None:
+def make_setup_steps() -> List[BoofuzzSequence]:
     """
-    Launch a long-running fuzzing session targeting message properties in PUT
-    messages at depth 2 (all pairs of fuzzable fields).
-    NOTE: This currently only fuzzes the first property's header fields to limit the combinatorial explosion, but can be extended to fuzz more.
+    Return the requests authenticating, negotiating, and opening and
+    configuring the queue the fuzzed PUT messages are sent to.
     """
 
-    setup_steps = [
+    return [
         make_authentication_message(),
         make_control_message(broker.CLIENT_IDENTITY_SCHEMA),
         make_control_message(broker.OPEN_QUEUE_SCHEMA),
         make_control_message(broker.CONFIGURE_STREAM_WITH_CONSUMER_SUBSCRIPTION_SCHEMA),
     ]
 
+
+def fuzz_properties(
+    host: str,
+    port: int,
+    max_depth: int = 2,
+    grammar_cases: int = 0,
+    metrics: Optional[FuzzMetrics] = None,
+) -> None:
+    """
+    Launch a long-running fuzzing session targeting message properties in PUT
+    messages at depth 2 (all pairs of fuzzable fields).  If 'grammar_cases'
+    is not 0, also send that many PUT events generated by 'put_grammar'.  If
+    the specified 'metrics' are provided, record the session in them.
+    NOTE: This currently only fuzzes the first property's header fields to limit the combinatorial explosion, but can be extended to fuzz more.
+    """
+
     conn = PersistentConnection(
         host,
         port,
-        setup_steps=setup_steps,
+        setup_steps=make_setup_steps(),
         recv_timeout=0.05,
     )
+    fuzz_loggers = [FuzzLoggerLimited()]
+    if metrics is not None:
+        metrics.connection = conn
+        fuzz_loggers.append(metrics)
 
     session = boofuzz.Session(
         target=boofuzz.Target(connection=conn),
         receive_data_after_each_request=True,
         receive_data_after_fuzz=True,
         web_port=None,
-        fuzz_loggers=[FuzzLoggerLimited()],
+        fuzz_loggers=fuzz_loggers,
         fuzz_db_keep_only_n_pass_cases=1,
     )
 
@@ -346,8 +384,146 @@ def fuzz_properties(host: str, port: int, max_depth: int = 2) -> None:
         children=(make_put_with_fuzzable_properties()),
     )
     session.connect(put)
+    if grammar_cases:
+        session.connect(
+            boofuzz.Request(
+                "PutGrammar", children=[GrammarPut("put", num_cases=grammar_cases)]
+            )
+        )
 
     try:
         session.fuzz(max_depth=max_depth)
     finally:
         conn.shutdown()
+
+
+@dataclass
+class GrammarReport:
+    events: int = 0
+    bytes: int = 0
+    duration: float = 0.0  # seconds
+    reconnects: int = 0
+    crashed: bool = False
+
+    @property
+    def events_per_sec(self) -> float:
+        return self.events / self.duration if self.duration else 0.0
+
+
+def _connect(
+    address: Tuple[str, int],
+    setup: List[bytes],
+    recv_timeout: float,
+    connect_timeout: float = 0,
+) -> socket.socket:
+    """
+    Return a connection to the broker at the specified 'address', on which
+    the specified 'setup' messages were sent, waiting up to 'recv_timeout'
+    for the response to each one.  Retry for up to 'connect_timeout' seconds
+    while the broker refuses the connection.
+    """
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection(address, timeout=1)
+            break
+        except ConnectionRefusedError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.1)
+    for message in setup:
+        sock.sendall(message)
+        if select.select([sock], [], [], recv_timeout)[0]:
+            sock.recv(65536)
+    return sock
+
+
+def _drain(sock: socket.socket) -> None:
+    """
+    Read the responses already received on the specified 'sock', without
+    waiting.
+    """
+    while select.select([sock], [], [], 0)[0]:
+        if not sock.recv(65536):
+            raise ConnectionResetError("closed by the broker")
+
+
+def fuzz_put_grammar(
+    host: str,
+    port: int,
+    count: Optional[int] = None,
+    duration: Optional[float] = None,
+    seed: Optional[int] = None,
+    liveness: Optional[LivenessMonitor] = None,
+    corpus_dir: Optional[Path] = None,
+    recv_timeout: float = 0.05,
+    metrics: Optional[FuzzMetrics] = None,
+) -> GrammarReport:
+    """
+    Open a queue on the broker at the specified 'host' and 'port', then send
+    it the specified 'count' of PUT events generated by 'PutGrammar' from
+    the specified 'seed', or for 'duration' seconds, whichever comes first,
+    without waiting for the responses.  The connection is opened again when
+    the broker closes it, e.g. on an invalid message.  If the specified
+    'liveness' monitor is provided, stop when the broker exits and, if
+    'corpus_dir' is also provided, save the setup messages and the last
+    events sent in it.  Count the events sent in the specified 'metrics' if
+    provided.
+    """
+
+    if count is None and duration is None:
+        raise ValueError("either 'count' or 'duration' is required")
+
+    setup = [
+        boofuzz.Request("setup", children=children).render()
+        for children in make_setup_steps()
+    ]
+    grammar = PutGrammar(random.Random(seed))
+    recent: Deque[bytes] = deque(maxlen=CHECK_INTERVAL)
+    report = GrammarReport()
+    start = time.monotonic()
+    deadline = None if duration is None else start + duration
+
+    # The broker may still be starting.
+    sock = _connect((host, port), setup, recv_timeout, CONNECT_TIMEOUT)
+    try:
+        for event in grammar.events(count):
+            if report.events % CHECK_INTERVAL == 0:
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                if liveness is not None and not liveness.is_running():
+                    report.crashed = True
+                    break
+            recent.append(event)
+            try:
+                sock.sendall(event)
+                _drain(sock)
+            except OSError:
+                sock.close()
+                if liveness is not None and not liveness.is_running():
+                    report.crashed = True
+                    break
+                report.reconnects += 1
+                if metrics is not None:
+                    metrics.add(reconnects=1)
+                sock = _connect((host, port), setup, recv_timeout)
+            report.events += 1
+            report.bytes += len(event)
+            if metrics is not None:
+                metrics.add(cases=1, bytes_sent=len(event))
+    finally:
+        sock.close()
+    report.duration = time.monotonic() - start
+
+    if report.crashed:
+        logger.warning("broker exited after %d generated events", report.events)
+        if corpus_dir is not None:
+            CorpusDir(corpus_dir).add(CRASHES, "put", setup + list(recent))
+    logger.info(
+        "sent %d generated PUT events (%d bytes) in %.1fs (%.0f/s)",
+        report.events,
+        report.bytes,
+        report.duration,
+        report.events_per_sec,
+    )
+    return report
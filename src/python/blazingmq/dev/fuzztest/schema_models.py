@@ -0,0 +1,511 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Fuzz models of the control messages, generated from 'bmqp_ctrlmsg.xsd'.
+
+'schema_to_boofuzz' converts the hand-written dictionaries of
+'blazingmq.schemas.broker', which cover a handful of messages.  Here, the
+models are derived from the types of the XSD, as loaded by
+'ber.control_schema', so that every message the broker decodes is fuzzed:
+
+o each selection of each choice, nested choices included, gets a model of its
+  own, named after the path of its selections (e.g.
+  'ControlMessage.clusterMessage.partitionMessage.replicaStateRequest');
+o the elements of a sequence are all present, and the optional ones can be
+  omitted;
+o arrays hold one item, and are fuzzed with 0 and more items;
+o enumerations are fuzzed with each enumerator, and an unknown one;
+o integers, strings and binary values are fuzzed as by 'schema_to_boofuzz'.
+The default value of a field is the one of the hand-written dictionaries when
+they have it, then the 'default' of the XSD, so that the models of the
+requests sent by clients reach past the validation of their content.
+
+Messages are rendered in JSON, as the hand-written ones.  Models are walked
+from the XSD once and cached; each request gets its own boofuzz tree, since
+boofuzz binds the primitives of a tree to their request.
+
+Public types:
+o 'Field', 'Node': the tree of a model.
+o 'Model': a message of the schema, with its selections fixed.
+o 'Present': a boofuzz primitive toggling an optional block.
+
+Public functions:
+o 'schema_models': the models of a top-level type of the schema.
+o 'model_to_boofuzz': the boofuzz primitives of a model, in a control event.
+o 'make_schema_workflows': the sequences of requests sending each model.
+o 'fuzz_schema': launch a fuzzing session of the models.
+
+See also: bmqp_ctrlmsg.xsd, baljsn_decoder.h
+"""
+
+import functools
+import json
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import boofuzz
+
+from blazingmq.dev.fuzztest import (
+    BoofuzzSequence,
+    disable_fuzzing,
+    make_authentication_message,
+    make_control_message,
+    make_session,
+    wrap_event,
+)
+from blazingmq.dev.fuzztest.fast_connection import LivenessMonitor
+from blazingmq.schemas import ber, broker
+
+# =============================================================================
+#                                  CONSTANTS
+# =============================================================================
+
+
+# The top-level types of the schema, and the event type carrying them.
+MESSAGE_TYPES = {
+    "AuthenticationMessage": broker.EventType.AUTHENTICATION,
+    "NegotiationMessage": broker.EventType.CONTROL,
+    "ControlMessage": broker.EventType.CONTROL,
+}
+
+# The default values of the fields of each top-level type.  The choices of the
+# hand-written dictionaries select different fields, so they can be merged.
+SEEDS: Dict[str, broker.SchemaDescription] = {
+    "AuthenticationMessage": broker.AUTHENTICATION_REQUEST_SCHEMA,
+    "NegotiationMessage": broker.CLIENT_IDENTITY_SCHEMA,
+    "ControlMessage": {
+        **broker.OPEN_QUEUE_SCHEMA,
+        **broker.CONFIGURE_STREAM_SCHEMA,
+        **broker.CONFIGURE_QUEUE_STREAM_SCHEMA,
+        **broker.CLOSE_QUEUE_SCHEMA,
+        **broker.DISCONNECT_SCHEMA,
+        **broker.ADMIN_COMMAND_SCHEMA,
+    },
+}
+
+# The numbers of items added to an array holding one item.
+ARRAY_REPETITIONS = (1, 2, 15, 255)
+
+UNKNOWN_ENUMERATOR = "E_FUZZ_UNKNOWN"
+
+_INTEGER_PRIMITIVES = {
+    "byte": (boofuzz.Byte, True),
+    "unsignedByte": (boofuzz.Byte, False),
+    "short": (boofuzz.Word, True),
+    "unsignedShort": (boofuzz.Word, False),
+    "int": (boofuzz.DWord, True),
+    "unsignedInt": (boofuzz.DWord, False),
+    "long": (boofuzz.QWord, True),
+    "unsignedLong": (boofuzz.QWord, False),
+}
+
+
+# =============================================================================
+#                                   MODELS
+# =============================================================================
+
+
+class Field(NamedTuple):
+    """A member of a JSON object, an element of the XSD."""
+
+    name: str
+    node: "Node"
+    is_optional: bool
+    is_array: bool
+
+
+class Node(NamedTuple):
+    """
+    A value of the XSD type 'type': an object of 'fields' for a complex type,
+    or a primitive or enumeration with a 'default' value if 'fields' is
+    'None'.
+    """
+
+    type: str
+    fields: Optional[Tuple[Field, ...]]
+    default: Any = None
+
+
+class Model(NamedTuple):
+    """A message of the top-level 'type_name', with its selections fixed."""
+
+    name: str
+    type_name: str
+    root: Node
+
+    @property
+    def event_type(self) -> int:
+        return MESSAGE_TYPES[self.type_name]
+
+
+def _is_primitive(schema: ber.Schema, type_name: str) -> bool:
+    return (
+        type_name in schema.enum_types
+        or type_name in _INTEGER_PRIMITIVES
+        or type_name in ber.BINARY_TYPES
+        or type_name in ("boolean", "string")
+    )
+
+
+def _primitive_default(
+    schema: ber.Schema, type_name: str, default: Optional[str]
+) -> Any:
+    """
+    Return the default value of the primitive or enumeration 'type_name',
+    given the optionally specified 'default' attribute of the XSD.
+    """
+
+    if type_name in schema.enum_types:
+        if default is not None:
+            return default
+        return next(iter(schema.enum_types[type_name].ids), UNKNOWN_ENUMERATOR)
+    if type_name == "boolean":
+        return default == "true"
+    if type_name in _INTEGER_PRIMITIVES:
+        return int(default or 0)
+    return default or ""
+
+
+def _variants(
+    schema: ber.Schema,
+    element: ber.Element,
+    value: Any,
+    stack: Tuple[str, ...],
+) -> List[Tuple[str, List[Field]]]:
+    """
+    Return the variants of the specified 'element' as pairs of the path of
+    their selections and of their fields: one field, or the fields of the
+    selection for an anonymous choice.  Take the default values from the
+    specified 'value' when it is provided.  The specified 'stack' holds the
+    complex types being walked, to stop on recursive types.
+    """
+
+    if not element.name:
+        # Flattened into the parent object.
+        return [
+            (path, list(node.fields))
+            for path, node in _node_variants(schema, element.type, value, stack)
+        ]
+
+    item = value
+    if element.is_array and isinstance(value, list):
+        item = value[0] if value else None
+    if _is_primitive(schema, element.type):
+        if item is None:
+            item = _primitive_default(schema, element.type, element.default)
+        variants = [("", Node(element.type, None, item))]
+    else:
+        variants = _node_variants(schema, element.type, item, stack)
+
+    return [
+        (path, [Field(element.name, node, element.is_optional, element.is_array)])
+        for path, node in variants
+    ]
+
+
+def _node_variants(
+    schema: ber.Schema, type_name: str, value: Any, stack: Tuple[str, ...]
+) -> List[Tuple[str, Node]]:
+    """
+    Return the variants of a value of the complex 'type_name', as pairs of
+    the path of their selections and of their node.  Types missing from the
+    schema, and recursive types, are empty objects.
+    """
+
+    complex_ = schema.complex_types.get(type_name)
+    if complex_ is None or type_name in stack:
+        return [("", Node(type_name, ()))]
+    stack += (type_name,)
+    if not isinstance(value, dict):
+        value = {}
+
+    if complex_.is_choice:
+        return [
+            (
+                ".".join(filter(None, (element.name, path))),
+                Node(type_name, tuple(fields)),
+            )
+            for element in complex_.elements
+            for path, fields in _variants(
+                schema, element, value.get(element.name), stack
+            )
+        ]
+
+    # Walk the variants of all the elements together, so that each one is in
+    # a model without multiplying their numbers.
+    per_element = [
+        _variants(schema, element, value.get(element.name), stack)
+        if element.name
+        else _variants(schema, element, value, stack)
+        for element in complex_.elements
+    ]
+    count = max((len(variants) for variants in per_element), default=1)
+    result = []
+    for index in range(count):
+        paths = []
+        fields: List[Field] = []
+        for variants in per_element:
+            path, element_fields = variants[index % len(variants)]
+            if len(variants) > 1:
+                paths.append(path)
+            fields += element_fields
+        result.append((".".join(filter(None, paths)), Node(type_name, tuple(fields))))
+    return result
+
+
+@functools.lru_cache(maxsize=None)
+def schema_models(type_name: str = "ControlMessage") -> Tuple[Model, ...]:
+    """
+    Return the models of the top-level 'type_name' of 'bmqp_ctrlmsg.xsd', one
+    per selection of each of its choices.
+    """
+
+    schema = ber.control_schema()
+    return tuple(
+        Model(".".join(filter(None, (type_name, path))), type_name, node)
+        for path, node in _node_variants(schema, type_name, SEEDS.get(type_name), ())
+    )
+
+
+def model_to_json(model: Model) -> Dict[str, Any]:
+    """
+    Return the default value of the specified 'model', as decoded from its
+    JSON rendering.
+    """
+
+    def convert(node: Node) -> Any:
+        if node.fields is None:
+            return node.default
+        return {
+            field.name: [convert(field.node)] if field.is_array else convert(field.node)
+            for field in node.fields
+        }
+
+    return convert(model.root)
+
+
+# =============================================================================
+#                                  BOOFUZZ
+# =============================================================================
+
+
+class Present(boofuzz.Fuzzable):
+    """
+    A primitive rendering nothing, whose value is b"\\x01" by default and
+    b"" when mutated: the block depending on it is omitted by its mutation.
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name=name, default_value=b"\x01")
+
+    def mutations(self, default_value):
+        yield b""
+
+    def encode(self, value, mutation_context=None):
+        return b""
+
+    def num_mutations(self, default_value):
+        return 1
+
+
+class _ArrayRepeat(boofuzz.Repeat):
+    """
+    Repeat the block with the specified 'block_name' the specified 'counts'
+    of times.  Unlike 'boofuzz.Repeat', the request needs not be known
+    before the primitive is added to it.
+    """
+
+    def __init__(self, name: str, block_name: str, counts: Tuple[int, ...]) -> None:
+        super().__init__(name=name, block_name=block_name)
+        self._fuzz_library = list(counts)
+
+
+def _json_object(data: bytes) -> bytes:
+    # Each member is followed by a comma.
+    return b"{" + data[:-1] + b"}" if data else b"{}"
+
+
+def _json_array(data: bytes) -> bytes:
+    return b"[" + data[:-1] + b"]" if data else b"[]"
+
+
+def _string(name: str, value: str) -> BoofuzzSequence:
+    return [
+        boofuzz.Static(default_value='"'),
+        boofuzz.String(name=name, default_value=json.dumps(value)[1:-1]),
+        boofuzz.Static(default_value='"'),
+    ]
+
+
+def _value_to_boofuzz(schema: ber.Schema, name: str, node: Node) -> BoofuzzSequence:
+    """
+    Return the primitives rendering the specified 'node' in JSON, named after
+    the specified 'name'.
+    """
+
+    if node.fields is not None:
+        members: BoofuzzSequence = []
+        for field in node.fields:
+            members += _field_to_boofuzz(schema, field)
+        return [boofuzz.Block(name, children=members, encoder=_json_object)]
+
+    enum = schema.enum_types.get(node.type)
+    if enum is not None:
+        values = [json.dumps(enumerator) for enumerator in enum.ids]
+        values.append(json.dumps(UNKNOWN_ENUMERATOR))
+        default = json.dumps(node.default)
+        if default in values:
+            values.remove(default)
+        return [boofuzz.Group(name=name, values=[default] + values)]
+    if node.type == "boolean":
+        default = json.dumps(bool(node.default))
+        values = [default, json.dumps(not node.default)]
+        return [boofuzz.Group(name=name, values=values)]
+    if node.type in _INTEGER_PRIMITIVES:
+        primitive, signed = _INTEGER_PRIMITIVES[node.type]
+        return [
+            primitive(
+                name=name,
+                default_value=int(node.default),
+                signed=signed,
+                output_format="ascii",
+            )
+        ]
+    # Binary values are base64 strings.
+    return _string(name, str(node.default))
+
+
+def _field_to_boofuzz(schema: ber.Schema, field: Field) -> BoofuzzSequence:
+    """
+    Return the primitives rendering the specified 'field' in JSON, followed by
+    a comma.
+    """
+
+    name = field.name
+    if field.is_array:
+        item = boofuzz.Block(
+            f"{name}_item",
+            children=[Present(f"{name}_first")]
+            + _value_to_boofuzz(schema, "value", field.node)
+            + [boofuzz.Static(default_value=",")],
+            dep=f"{name}_first",
+            dep_value=b"\x01",
+        )
+        value = [
+            boofuzz.Block(
+                name,
+                children=[
+                    item,
+                    _ArrayRepeat(f"{name}_repeat", f"{name}_item", ARRAY_REPETITIONS),
+                ],
+                encoder=_json_array,
+            )
+        ]
+    else:
+        value = _value_to_boofuzz(schema, name, field.node)
+
+    member = (
+        [boofuzz.Static(default_value=f'"{name}":')]
+        + value
+        + [boofuzz.Static(default_value=",")]
+    )
+    if not field.is_optional:
+        return member
+    return [
+        Present(f"{name}_present"),
+        boofuzz.Block(
+            f"{name}_member",
+            children=member,
+            dep=f"{name}_present",
+            dep_value=b"\x01",
+        ),
+    ]
+
+
+def model_to_boofuzz(model: Model) -> BoofuzzSequence:
+    """
+    Return the primitives of a control event holding the specified 'model'
+    in JSON.
+    """
+
+    return wrap_event(
+        _value_to_boofuzz(ber.control_schema(), "message", model.root),
+        model.event_type,
+        broker.TypeSpecific.ENCODING_JSON,
+    )
+
+
+# =============================================================================
+#                                PUBLIC INTERFACE
+# =============================================================================
+
+
+def make_schema_workflows(
+    type_names: Tuple[str, ...] = tuple(MESSAGE_TYPES),
+) -> List[List[Tuple[boofuzz.Request, str]]]:
+    """
+    Return the sequences of requests sending each model of the specified
+    'type_names', as pairs of a request and the name of its model.  The
+    authentication and negotiation sent before a model, if any, are not
+    fuzzed.
+    """
+
+    authentication = boofuzz.Request(
+        "Authentication", children=make_authentication_message()
+    )
+    negotiation = boofuzz.Request(
+        "Negotiation", children=make_control_message(broker.CLIENT_IDENTITY_SCHEMA)
+    )
+    disable_fuzzing(authentication)
+    disable_fuzzing(negotiation)
+    heads = {
+        "AuthenticationMessage": [],
+        "NegotiationMessage": [(authentication, "authentication")],
+        "ControlMessage": [
+            (authentication, "authentication"),
+            (negotiation, "negotiation"),
+        ],
+    }
+
+    workflows = []
+    for type_name in type_names:
+        for model in schema_models(type_name):
+            request = boofuzz.Request(model.name, children=model_to_boofuzz(model))
+            workflows.append(heads[type_name] + [(request, model.name)])
+    return workflows
+
+
+def fuzz_schema(
+    host: str,
+    port: int,
+    model: Optional[str] = None,
+    liveness: Optional[LivenessMonitor] = None,
+    type_names: Tuple[str, ...] = tuple(MESSAGE_TYPES),
+) -> None:
+    """
+    Launch a fuzzing session of the models of the specified 'type_names' with
+    the specified 'host' and 'port' of the launched BlazingMQ Broker instance.
+    If the optionally specified 'model' name is provided, fuzz only this
+    model.  If the optionally specified 'liveness' monitor of the broker
+    process is provided, use the fast path of 'make_session'.
+    """
+
+    make_session(
+        host,
+        port,
+        model,
+        liveness=liveness,
+        workflows=make_schema_workflows(type_names),
+    ).fuzz(max_depth=1)
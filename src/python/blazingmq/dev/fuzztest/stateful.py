@@ -0,0 +1,493 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Stateful fuzzing of concurrent broker sessions.
+
+The boofuzz workflows of 'fuzz' send one chain of requests on one connection
+at a time.  Here, many raw connections are open at once, and a scheduler
+interleaves well-formed operations on a few shared queues across them:
+opening or closing the same queue from two sessions, configuring, posting
+and confirming after a close, disconnecting or dropping a connection in the
+middle of a configure, ...
+
+The scheduler tracks the state of each connection as it planned it
+(connected, negotiated, queues open), not as the broker answered, so that a
+schedule only depends on its seed: the same seed gives the same
+interleaving.  Operations are sent without waiting for the responses, which
+are drained as they arrive, so that the broker handles the sessions
+concurrently.
+
+A run stops when the broker exits, or when an assertion shows up in its log,
+and reports the interleaving of the operations sent so far, which can be
+saved and replayed.
+
+Public types:
+o 'Op': an operation of a session.
+o 'Step': an operation scheduled on a connection and a queue.
+o 'Scheduler': generate the steps of a seed.
+o 'StatefulReport': outcome of a run, with its interleaving.
+
+Public functions:
+o 'run_steps': send steps to a broker.
+o 'fuzz_stateful': run the schedule of a seed.
+o 'save_steps', 'load_steps': store an interleaving in a JSON file.
+"""
+
+import enum
+import itertools
+import json
+import logging
+import random
+import re
+import select
+import socket
+import struct
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from blazingmq.dev.fuzztest.corpus import CONNECT_TIMEOUT
+from blazingmq.dev.fuzztest.fast_connection import LivenessMonitor
+from blazingmq.schemas import broker, protocol
+from blazingmq.schemas.protocol import (
+    NULL_GUID,
+    ConfirmMessage,
+    ControlTemplate,
+    PutMessage,
+)
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+#                                  CONSTANTS
+# =============================================================================
+
+
+DEFAULT_URIS = (
+    "bmq://bmq.test.mem.priority/stateful-0",
+    "bmq://bmq.test.mem.priority/stateful-1",
+)
+
+# Number of steps between two reads of the broker log.
+LOG_CHECK_INTERVAL = 16
+
+# Lines of the broker log reporting a failed assertion.
+ASSERTION_PATTERN = re.compile(rb"Assertion failed|BSLS_ASSERT|BSLS_REVIEW")
+
+
+class Op(enum.Enum):
+    CONNECT = "connect"
+    NEGOTIATE = "negotiate"
+    OPEN_QUEUE = "openQueue"
+    CONFIGURE_QUEUE_STREAM = "configureQueueStream"
+    CONFIGURE_STREAM = "configureStream"
+    PUT = "put"
+    CONFIRM = "confirm"
+    CLOSE_QUEUE = "closeQueue"
+    DISCONNECT = "disconnect"
+    DROP = "drop"  # close the socket without disconnecting
+
+
+# Relative weights of the operations on a negotiated connection.
+_SESSION_WEIGHTS = {
+    Op.OPEN_QUEUE: 6,
+    Op.CONFIGURE_QUEUE_STREAM: 3,
+    Op.CONFIGURE_STREAM: 3,
+    Op.PUT: 6,
+    Op.CONFIRM: 3,
+    Op.CLOSE_QUEUE: 4,
+    Op.NEGOTIATE: 1,
+    Op.DISCONNECT: 1,
+    Op.DROP: 1,
+}
+_SESSION_OPS = tuple(_SESSION_WEIGHTS)
+_SESSION_CUM_WEIGHTS = tuple(itertools.accumulate(_SESSION_WEIGHTS.values()))
+
+_OPEN_QUEUE = ControlTemplate(
+    broker.OPEN_QUEUE_SCHEMA,
+    rid=("rId",),
+    uri=("openQueue", "handleParameters", "uri"),
+    qid=("openQueue", "handleParameters", "qId"),
+)
+_CLOSE_QUEUE = ControlTemplate(
+    broker.CLOSE_QUEUE_SCHEMA,
+    rid=("rId",),
+    uri=("closeQueue", "handleParameters", "uri"),
+    qid=("closeQueue", "handleParameters", "qId"),
+)
+_CONFIGURE_QUEUE_STREAM = ControlTemplate(
+    broker.CONFIGURE_QUEUE_STREAM_SCHEMA,
+    rid=("rId",),
+    qid=("configureQueueStream", "qId"),
+)
+_CONFIGURE_STREAM = ControlTemplate(
+    broker.CONFIGURE_STREAM_WITH_CONSUMER_SUBSCRIPTION_SCHEMA,
+    rid=("rId",),
+    qid=("configureStream", "qId"),
+)
+_DISCONNECT = ControlTemplate(broker.DISCONNECT_SCHEMA, rid=("rId",))
+_NEGOTIATE = protocol.encode_control_event(broker.CLIENT_IDENTITY_SCHEMA)
+
+
+# =============================================================================
+#                                  SCHEDULE
+# =============================================================================
+
+
+class Step(NamedTuple):
+    """Operation 'op' sent on 'connection', about the queue 'queue'."""
+
+    connection: int
+    op: Op
+    queue: int = 0
+
+    def __str__(self) -> str:
+        return f"connection {self.connection}: {self.op.value} queue {self.queue}"
+
+
+@dataclass
+class _Session:
+    connected: bool = False
+    negotiated: bool = False
+    open_queues: Set[int] = field(default_factory=set)
+
+
+class Scheduler:
+    """
+    Generate the steps of the specified 'seed' on the specified number of
+    'connections' and 'queues'.  A connection is connected, then negotiated,
+    before any other operation; after that, operations are drawn at random,
+    including the ones the broker rejects in the current state of the
+    session, e.g. a confirm on a closed queue.
+    """
+
+    def __init__(self, seed: int, connections: int = 8, queues: int = 2) -> None:
+        self.rng = random.Random(seed)
+        self.queues = queues
+        self.sessions = [_Session() for _ in range(connections)]
+
+    def __iter__(self) -> Iterator[Step]:
+        while True:
+            yield self.next_step()
+
+    def next_step(self) -> Step:
+        rng = self.rng
+        index = rng.randrange(len(self.sessions))
+        session = self.sessions[index]
+        if not session.connected:
+            session.connected = True
+            return Step(index, Op.CONNECT)
+        if not session.negotiated:
+            session.negotiated = True
+            return Step(index, Op.NEGOTIATE)
+
+        [op] = rng.choices(_SESSION_OPS, cum_weights=_SESSION_CUM_WEIGHTS)
+        queue = rng.randrange(self.queues)
+        if op in (Op.DISCONNECT, Op.DROP):
+            self.sessions[index] = _Session()
+        elif op is Op.OPEN_QUEUE:
+            session.open_queues.add(queue)
+        elif op is Op.CLOSE_QUEUE:
+            session.open_queues.discard(queue)
+        elif session.open_queues and rng.random() < 0.75:
+            # Favor the queues which are open.
+            queue = rng.choice(sorted(session.open_queues))
+        return Step(index, op, queue)
+
+    def steps(self, count: int) -> List[Step]:
+        return [self.next_step() for _ in range(count)]
+
+
+def save_steps(path: Path, steps: Sequence[Step], **info) -> None:
+    """
+    Save the specified 'steps' to the JSON file at the specified 'path',
+    along with the specified 'info'.
+    """
+
+    data = dict(
+        info, steps=[[step.connection, step.op.value, step.queue] for step in steps]
+    )
+    path.write_text(json.dumps(data, indent=1))
+
+
+def load_steps(path: Path) -> List[Step]:
+    """Return the steps saved in the JSON file at the specified 'path'."""
+
+    data = json.loads(path.read_text())
+    return [Step(connection, Op(op), queue) for connection, op, queue in data["steps"]]
+
+
+# =============================================================================
+#                                   DRIVER
+# =============================================================================
+
+
+@dataclass
+class StatefulReport:
+    seed: Optional[int]
+    steps: List[Step] = field(default_factory=list)  # sent, in order
+    errors: int = 0  # steps whose connection was closed by the broker
+    duration: float = 0.0  # seconds
+    crashed: bool = False
+    assertions: List[str] = field(default_factory=list)
+
+    @property
+    def failed(self) -> bool:
+        return self.crashed or bool(self.assertions)
+
+    def interleaving(self, last: Optional[int] = None) -> str:
+        """
+        Return the steps sent, or the 'last' ones if specified, one per line.
+        """
+
+        start = 0 if last is None else max(len(self.steps) - last, 0)
+        return "\n".join(
+            f"#{index} {step}"
+            for index, step in enumerate(self.steps[start:], start=start)
+        )
+
+
+class _LogWatcher:
+    """Report the assertions appended to a broker log file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        try:
+            self.offset = path.stat().st_size
+        except OSError:
+            self.offset = 0
+
+    def read(self) -> List[str]:
+        try:
+            with self.path.open("rb") as log:
+                log.seek(self.offset)
+                data = log.read()
+        except OSError:
+            return []
+        # Only consume complete lines.
+        end = data.rfind(b"\n") + 1
+        self.offset += end
+        return [
+            line.decode("utf-8", "replace")
+            for line in data[:end].splitlines()
+            if ASSERTION_PATTERN.search(line)
+        ]
+
+
+class _Connection:
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.next_rid = 1
+
+    def rid(self) -> int:
+        self.next_rid += 1
+        return self.next_rid
+
+    def send(self, data: bytes) -> None:
+        self.sock.sendall(data)
+        # Read the responses already received, without waiting.
+        while select.select([self.sock], [], [], 0)[0]:
+            if not self.sock.recv(65536):
+                raise ConnectionResetError("closed by the broker")
+
+    def drop(self) -> None:
+        # Reset the connection instead of closing it gracefully.
+        self.sock.setsockopt(
+            socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+        )
+        self.sock.close()
+
+
+def _render(step: Step, connection: _Connection, uris: Sequence[str]) -> bytes:
+    qid = step.queue
+    uri = uris[step.queue]
+    if step.op is Op.NEGOTIATE:
+        return _NEGOTIATE
+    if step.op is Op.OPEN_QUEUE:
+        return _OPEN_QUEUE.render(rid=connection.rid(), uri=uri, qid=qid)
+    if step.op is Op.CLOSE_QUEUE:
+        return _CLOSE_QUEUE.render(rid=connection.rid(), uri=uri, qid=qid)
+    if step.op is Op.CONFIGURE_QUEUE_STREAM:
+        return _CONFIGURE_QUEUE_STREAM.render(rid=connection.rid(), qid=qid)
+    if step.op is Op.CONFIGURE_STREAM:
+        return _CONFIGURE_STREAM.render(rid=connection.rid(), qid=qid)
+    if step.op is Op.PUT:
+        return protocol.encode_put_event([PutMessage(qid, b"stateful")])
+    if step.op is Op.CONFIRM:
+        return protocol.encode_confirm_event([ConfirmMessage(qid, NULL_GUID)])
+    if step.op is Op.DISCONNECT:
+        return _DISCONNECT.render(rid=connection.rid())
+    raise ValueError(f"{step.op} is not a message")
+
+
+def _connect(address: Tuple[str, int], connect_timeout: float) -> socket.socket:
+    """
+    Return a connection to the specified 'address', retrying for up to
+    'connect_timeout' seconds while the broker refuses it.
+    """
+
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            return socket.create_connection(address, timeout=1)
+        except ConnectionRefusedError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.1)
+
+
+def run_steps(
+    host: str,
+    port: int,
+    steps: Iterable[Step],
+    uris: Sequence[str] = DEFAULT_URIS,
+    liveness: Optional[LivenessMonitor] = None,
+    log_file: Optional[Path] = None,
+    seed: Optional[int] = None,
+    duration: Optional[float] = None,
+) -> StatefulReport:
+    """
+    Send the specified 'steps' to the broker at the specified 'host' and
+    'port', on the queues with the specified 'uris', and return the report of
+    the run.  Stop after 'duration' seconds if specified, when the broker
+    exits if the specified 'liveness' monitor is provided, or when an
+    assertion is appended to the specified 'log_file' if provided.  The
+    specified 'seed' is only recorded in the report.
+    """
+
+    connections: Dict[int, _Connection] = {}
+    watcher = None if log_file is None else _LogWatcher(log_file)
+    report = StatefulReport(seed)
+    start = time.monotonic()
+    deadline = None if duration is None else start + duration
+    # The broker may still be starting when the first connection is opened.
+    connect_timeout = CONNECT_TIMEOUT
+
+    def check(read_log: bool = True) -> bool:
+        if liveness is not None and not liveness.is_running():
+            report.crashed = True
+        if watcher is not None and read_log:
+            report.assertions += watcher.read()
+        return not report.failed
+
+    try:
+        for step in steps:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            report.steps.append(step)
+            connection = connections.pop(step.connection, None)
+            try:
+                if step.op is Op.CONNECT:
+                    if connection is not None:
+                        connection.sock.close()
+                    connection = _Connection(_connect((host, port), connect_timeout))
+                    connect_timeout = 0
+                elif connection is None:
+                    # Closed by the broker.
+                    report.errors += 1
+                elif step.op is Op.DROP:
+                    connection.drop()
+                    connection = None
+                else:
+                    connection.send(_render(step, connection, uris))
+            except OSError as ex:
+                logger.debug("#%d %s: %s", len(report.steps) - 1, step, ex)
+                report.errors += 1
+                if connection is not None:
+                    connection.sock.close()
+                    connection = None
+            if connection is not None:
+                connections[step.connection] = connection
+
+            if not check(read_log=len(report.steps) % LOG_CHECK_INTERVAL == 0):
+                break
+        else:
+            # Give the broker the time to log what the last steps did.
+            time.sleep(0.1)
+            check()
+    finally:
+        for connection in connections.values():
+            connection.sock.close()
+        report.duration = time.monotonic() - start
+
+    if report.failed:
+        logger.error(
+            "broker %s after:\n%s",
+            "crashed" if report.crashed else "asserted",
+            report.interleaving(last=64),
+        )
+    return report
+
+
+def fuzz_stateful(
+    host: str,
+    port: int,
+    seed: int = 0,
+    count: Optional[int] = None,
+    duration: Optional[float] = None,
+    connections: int = 8,
+    uris: Sequence[str] = DEFAULT_URIS,
+    liveness: Optional[LivenessMonitor] = None,
+    log_file: Optional[Path] = None,
+    work_dir: Optional[Path] = None,
+) -> StatefulReport:
+    """
+    Run the schedule of the specified 'seed' on the specified number of
+    'connections' to the broker at the specified 'host' and 'port', for
+    'count' steps, or for 'duration' seconds, whichever comes first.  See
+    'run_steps' for the other arguments.  If the run fails and the specified
+    'work_dir' is provided, save its steps in it, to be replayed with
+    'load_steps' and 'run_steps'.
+    """
+
+    if count is None and duration is None:
+        raise ValueError("either 'count' or 'duration' is required")
+
+    scheduler = Scheduler(seed, connections, len(uris))
+    steps = iter(scheduler) if count is None else iter(scheduler.steps(count))
+    report = run_steps(
+        host,
+        port,
+        steps,
+        uris=uris,
+        liveness=liveness,
+        log_file=log_file,
+        seed=seed,
+        duration=duration,
+    )
+    if report.failed and work_dir is not None:
+        path = work_dir / f"stateful-{seed}.json"
+        save_steps(
+            path,
+            report.steps,
+            seed=seed,
+            uris=list(uris),
+            crashed=report.crashed,
+            assertions=report.assertions,
+        )
+        logger.error("steps saved to %s", path)
+    return report
@@ -0,0 +1,120 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import struct
+
+import boofuzz
+from boofuzz.mutation_context import MutationContext
+
+from blazingmq.dev.fuzztest import make_session, wrap_event
+from blazingmq.dev.fuzztest.cluster import (
+    cluster_requests,
+    elector_selections,
+    is_finding,
+    make_cluster_workflows,
+    make_elector_message,
+)
+from blazingmq.schemas import ber, broker, protocol
+
+
+def _body(request, mutations=()):
+    context = MutationContext(mutations={m.qualified_name: m for m in mutations})
+    [(header, body)] = protocol.iter_events(request.render(context))
+    return header, body
+
+
+def test_workflows_impersonate_peer():
+    workflows = make_cluster_workflows("fuzzCluster", 2)
+    assert [workflow[-1][1] for workflow in workflows] == list(cluster_requests())
+
+    for workflow in workflows:
+        (negotiation, _), *heads, _ = workflow
+        _, body = _body(negotiation)
+        identity = json.loads(bytes(protocol.strip_padding(body)))["clientIdentity"]
+        assert identity["clientType"] == "E_TCPBROKER"
+        assert identity["clusterName"] == "fuzzCluster"
+        assert identity["clusterNodeId"] == 2
+        for request, _ in [(negotiation, None)] + heads:
+            assert request.num_mutations() == 0
+
+    session = make_session(
+        "localhost",
+        0,
+        "replication_receipt",
+        workflows=workflows,
+        db_filename=":memory:",
+    )
+    [*_, (receipt, _)] = workflows[-1]
+    assert session.num_mutations(max_depth=1) == receipt.num_mutations()
+
+
+def test_elector_messages_decode():
+    schema = ber.control_schema()
+    for selection in elector_selections():
+        request = boofuzz.Request(
+            selection,
+            children=wrap_event(
+                make_elector_message(selection, term=2**64 - 1),
+                broker.EventType.ELECTOR,
+                broker.TypeSpecific.ENCODING_BER,
+            ),
+        )
+        header, body = _body(request)
+        assert header.type == broker.EventType.ELECTOR
+        message = schema.decode("ElectorMessage", protocol.strip_padding(body))
+        assert message["term"] == 2**64 - 1
+        assert set(message) == {"term", selection}
+
+        # Mutating the selection tag reaches the other selections.
+        tag = request.resolve_name(request.name, "selection")
+        tags = set(tag.mutations(None))
+        assert len(tags) > len(elector_selections())
+
+
+def test_storage_messages_layout():
+    workflows = make_cluster_workflows("fuzzCluster", 2)
+    requests = {workflow[-1][1]: workflow[-1][0] for workflow in workflows}
+
+    for event_type in (broker.EventType.STORAGE, broker.EventType.PARTITION_SYNC):
+        for message_type in broker.StorageMessageType:
+            request = requests[f"{event_type.name.lower()}.{message_type.name.lower()}"]
+            header, body = _body(request)
+            assert header.type == event_type
+
+            words, spv_and_hw, type_, partition_id, offset = struct.unpack_from(
+                ">IBBHI", body
+            )
+            assert words * protocol.WORD_SIZE == len(body)
+            assert words >> 27 == 0  # flags
+            assert spv_and_hw & 0x0F == 3
+            assert type_ == message_type
+            assert partition_id == offset == 0
+
+            record = bytes(body[12:72])
+            (type_and_flags,) = struct.unpack_from(">H", record)
+            assert type_and_flags >> 12 in range(1, 6)
+            assert record[-4:] == struct.pack(">I", 0x2A724563)
+
+    _, body = _body(requests["replication_receipt"])
+    assert struct.unpack(">IIII", body) == (0, 0, 1, 1)
+
+
+def test_is_finding():
+    assert not is_finding(None)
+    assert not is_finding(0)
+    assert not is_finding(10)  # STORAGE_OUT_OF_SYNC
+    assert is_finding(-6)  # SIGABRT
+    assert is_finding(1)
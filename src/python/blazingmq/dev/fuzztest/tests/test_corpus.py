@@ -0,0 +1,152 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import socketserver
+import struct
+import threading
+
+import pytest
+
+from blazingmq.dev.fuzztest import corpus
+from blazingmq.dev.fuzztest.corpus import CRASHES, QUEUE, CorpusDir
+
+
+def _event(body):
+    return struct.pack(">I", 8 + len(body)) + b"\x41\x02\x20\x00" + body
+
+
+def test_input_round_trip():
+    messages = (b"", b"abc", _event(b"{}"))
+    data = corpus.encode_input(messages)
+    assert corpus.decode_input(data) == messages
+    assert not corpus.decode_input(b"")
+
+    with pytest.raises(ValueError):
+        corpus.decode_input(data[:-1])
+    with pytest.raises(ValueError):
+        corpus.decode_input(b"\x00\x00")
+
+
+def test_corpus_dir_stores_inputs_once(tmp_path):
+    store = CorpusDir(tmp_path / "corpus")
+    assert not store.inputs()
+
+    path = store.add(QUEUE, "put", (b"a", b"b"))
+    assert store.add(QUEUE, "put", (b"a", b"b")) == path
+    store.add(CRASHES, "put", (b"c",))
+    store.add(QUEUE, "confirm", (b"d",))
+    with pytest.raises(ValueError):
+        store.add("nope", "put", (b"e",))
+
+    assert [str(stored) for stored in store.inputs([QUEUE])] == [
+        f"confirm/queue/{store.inputs([QUEUE], 'confirm')[0].path.name}",
+        f"put/queue/{path.name}",
+    ]
+    [crash] = store.inputs((kind for kind in [CRASHES]), "put")
+    assert crash.messages == (b"c",)
+    assert len(store.inputs()) == 3
+
+
+def test_corpus_dir_tracks_explored_mutations(tmp_path):
+    store = CorpusDir(tmp_path)
+    assert store.unexplored("put", 10) == [(1, 10)]
+
+    store.mark_explored("put", 10, 4, 5)
+    store.mark_explored("put", 10, 8, 8)
+    store.mark_explored("put", 10, 6, 7)
+    assert store.explored("put", 10) == [(4, 8)]
+    assert store.unexplored("put", 10) == [(1, 3), (9, 10)]
+
+    store.mark_explored("put", 10, 1, 10)
+    assert not store.unexplored("put", 10)
+
+    # Persisted, and forgotten when the fuzzed messages change.
+    assert not CorpusDir(tmp_path).unexplored("put", 10)
+    assert CorpusDir(tmp_path).unexplored("put", 12) == [(1, 12)]
+    assert CorpusDir(tmp_path).unexplored("confirm", 3) == [(1, 3)]
+
+
+def test_ddmin_finds_minimal_subsequence():
+    calls = []
+
+    def test(kept):
+        calls.append(tuple(kept))
+        return 3 in kept and 11 in kept
+
+    assert corpus.ddmin(range(20), test) == [3, 11]
+    assert len(calls) == len(set(calls))
+    assert corpus.ddmin([5], test) == [5]
+
+
+def test_minimize_drops_messages_and_bytes():
+    def crashes(messages):
+        *prefix, last = messages
+        length = struct.unpack_from(">I", last)[0] & 0x7FFFFFFF
+        return b"open" in prefix and length == len(last) and b"X" in last[8:]
+
+    messages = (b"hello", b"open", _event(b"abcdXefgh" * 4))
+    minimized = corpus.minimize(messages, crashes)
+    assert minimized == (b"open", _event(b"X"))
+
+    # Without a valid event header, bytes are dropped anywhere.
+    minimized = corpus.minimize((b"abXcd",), lambda messages: b"X" in messages[0])
+    assert minimized == (b"X",)
+
+
+class _CrashingServer(socketserver.ThreadingTCPServer):
+    """
+    Close each connection at its end, and "exit" upon receiving 'X'.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        self.exited = threading.Event()
+        super().__init__(("127.0.0.1", 0), _CrashingHandler)
+
+
+class _CrashingHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            data = self.request.recv(65536)
+            if not data:
+                return
+            if b"X" in data:
+                self.server.exited.set()
+
+
+@pytest.fixture
+def server():
+    server = _CrashingServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_replay_reports_exit(server):
+    port = server.server_address[1]
+
+    def running():
+        return not server.exited.is_set()
+
+    assert not corpus.replay("127.0.0.1", port, (b"ab", b"cd"), running)
+    assert corpus.replay("127.0.0.1", port, (b"ab", b"cXd"), running)
+
+    def crashed(messages):
+        server.exited.clear()
+        return corpus.replay("127.0.0.1", port, messages, running)
+
+    assert corpus.minimize((b"ab", b"cXd"), crashed) == (b"X",)
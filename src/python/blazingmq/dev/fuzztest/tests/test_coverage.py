@@ -0,0 +1,205 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import socketserver
+import struct
+import threading
+import zlib
+from multiprocessing import shared_memory
+
+import pytest
+
+from blazingmq.dev.fuzztest import coverage
+from blazingmq.dev.fuzztest.coverage import Corpus, CoverageFuzzer, CoverageMap
+
+
+def test_coverage_map_classifies_hit_counts():
+    with CoverageMap(size=16) as cov:
+        assert cov.env == {
+            coverage.SHM_ENV: cov.env[coverage.SHM_ENV],
+            coverage.SIZE_ENV: "16",
+        }
+        broker = shared_memory.SharedMemory(name=cov.env[coverage.SHM_ENV])
+        try:
+            broker.buf[0] = 1
+            broker.buf[1] = 3
+            broker.buf[2] = 200
+            assert cov.read() == 1 | 4 << 8 | 128 << 16
+
+            cov.reset()
+            assert cov.read() == 0
+        finally:
+            broker.close()
+
+    with pytest.raises(ValueError):
+        CoverageMap(size=100)
+
+
+def test_corpus_keeps_new_coverage_only():
+    corpus = Corpus()
+    assert corpus.add("put", (b"a",), 0b0011).new_bits == 2
+    assert corpus.add("put", (b"b",), 0b0001) is None
+    entry = corpus.add("put", (b"c",), 0b0111)
+    assert entry.new_bits == 1
+    assert len(corpus) == 2
+    assert corpus.edges == 3
+
+    entry.found = 3
+    assert corpus.choose(random.Random(0)) in corpus.entries
+
+
+def test_mutate_fixes_event_length():
+    rng = random.Random(1)
+    message = struct.pack(">I", 12) + b"\x41\x02\x20\x00" + b"abcd"
+    lengths = set()
+    for _ in range(200):
+        mutated = coverage.mutate(message, rng, splice=b"\x00" * 40)
+        assert len(mutated) <= coverage.MAX_MESSAGE_SIZE
+        if len(mutated) >= 4:
+            lengths.add(struct.unpack_from(">I", mutated)[0] & 0x7FFFFFFF)
+        if mutated != message and (
+            struct.unpack_from(">I", mutated)[0] & 0x7FFFFFFF == len(mutated)
+        ):
+            break
+    else:
+        pytest.fail(f"event length never fixed up: {lengths}")
+
+
+class _FakeBroker(socketserver.ThreadingTCPServer):
+    """
+    Count one edge per distinct (message size, first payload byte) received,
+    in the coverage map named by 'env', and exit with code -11 upon
+    receiving a message with the specified 'crash_byte' after its header.
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, env, crash_byte=None):
+        self.map = shared_memory.SharedMemory(name=env[coverage.SHM_ENV])
+        self.size = int(env[coverage.SIZE_ENV])
+        self.crash_byte = crash_byte
+        self.returncode = None
+        super().__init__(("127.0.0.1", 0), _FakeHandler)
+
+    def poll(self):
+        return self.returncode
+
+    def restart(self):
+        self.returncode = None
+
+
+class _FakeHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server = self.server
+        try:
+            while True:
+                data = self.request.recv(65536)
+                if not data:
+                    return
+                first = data[8] if len(data) > 8 else 0
+                if first == server.crash_byte:
+                    server.returncode = -11
+                edge = zlib.crc32(bytes([len(data) % 251, first])) % server.size
+                server.map.buf[edge] = min(server.map.buf[edge] + 1, 255)
+                self.request.sendall(b"ok")
+        except OSError:
+            pass
+
+
+@pytest.fixture
+def coverage_map():
+    with CoverageMap(size=1 << 12) as cov:
+        yield cov
+
+
+def _serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server.server_address[1]
+
+
+def test_fuzzer_grows_corpus(coverage_map):
+    server = _FakeBroker(coverage_map.env)
+    try:
+        port = _serve(server)
+        fuzzer = CoverageFuzzer(
+            "127.0.0.1",
+            port,
+            coverage_map,
+            "authentication",
+            rng=random.Random(0),
+            poll=server.poll,
+            recv_timeout=0.005,
+        )
+        report = fuzzer.run(iterations=150)
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.map.close()
+
+    # The seed, and mutations of the authentication message reaching new edges.
+    assert report.corpus > 1
+    assert report.edges == fuzzer.corpus.edges > 0
+    assert report.executions >= 151
+    assert not report.crashes
+    assert {entry.request for entry in fuzzer.corpus.entries} == {"authentication"}
+    assert all(len(entry.messages) == 1 for entry in fuzzer.corpus.entries)
+    assert report.to_dict()["corpus"] == report.corpus
+
+
+def test_fuzzer_records_crashes(coverage_map):
+    # The byte after the header of control messages is '{'.
+    server = _FakeBroker(coverage_map.env, crash_byte=ord("{"))
+    restarts = []
+    try:
+        port = _serve(server)
+        fuzzer = CoverageFuzzer(
+            "127.0.0.1",
+            port,
+            coverage_map,
+            "authentication",
+            poll=server.poll,
+            restart=lambda: (restarts.append(1), server.restart()),
+            recv_timeout=0.005,
+        )
+        report = fuzzer.run(iterations=3)
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.map.close()
+
+    assert report.crashes
+    assert report.crashes[0].request == "authentication"
+    assert report.crashes[0].returncode == -11
+    assert len(restarts) == len(report.crashes)
+
+
+def test_fuzzer_requires_instrumented_broker(coverage_map):
+    server = socketserver.TCPServer(("127.0.0.1", 0), socketserver.BaseRequestHandler)
+    try:
+        port = _serve(server)
+        fuzzer = CoverageFuzzer(
+            "127.0.0.1", port, coverage_map, "disconnect", recv_timeout=0.005
+        )
+        with pytest.raises(RuntimeError, match="--broker-coverage"):
+            fuzzer.run(iterations=1)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    with pytest.raises(ValueError):
+        CoverageFuzzer("127.0.0.1", port, coverage_map, "nope")
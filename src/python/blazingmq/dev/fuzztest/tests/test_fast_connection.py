@@ -0,0 +1,156 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from blazingmq.dev.fuzztest import LivenessMonitor
+from blazingmq.dev.fuzztest.parallel import Shard, run_shard
+
+
+@pytest.fixture
+def process():
+    with subprocess.Popen(
+        [sys.executable, "-c", "import time; time.sleep(60)"]
+    ) as proc:
+        yield proc
+        proc.kill()
+
+
+def _wait_exit(monitor):
+    deadline = time.monotonic() + 5
+    while monitor.is_running():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_liveness_monitor_detects_exit(process):
+    monitor = LivenessMonitor(pid=process.pid)
+    assert monitor.alive()
+    assert monitor.is_running()
+    assert monitor.post_send()
+
+    process.kill()
+    # Not reaped yet: the process is a zombie, and must still be seen as
+    # exited.
+    _wait_exit(monitor)
+    session = SimpleNamespace(total_mutant_index=7, current_test_case_name="Put:7")
+    assert not monitor.post_send(session=session)
+    assert (monitor.exit_index, monitor.exit_case) == (7, "Put:7")
+    assert str(process.pid) in monitor.get_crash_synopsis()
+    monitor.close()
+
+
+def test_liveness_monitor_follows_pid_file(tmp_path, process):
+    pid_file = tmp_path / "bmqbrkr.pid"
+    monitor = LivenessMonitor(pid_file=pid_file)
+    # The broker has not written its pid yet.
+    assert monitor.alive()
+    assert monitor.is_running()
+
+    pid_file.write_text(str(process.pid), encoding="utf-8")
+    monitor.alive()
+    process.kill()
+    _wait_exit(monitor)
+
+    # The broker was restarted.
+    with subprocess.Popen(
+        [sys.executable, "-c", "import time; time.sleep(60)"]
+    ) as restarted:
+        pid_file.write_text(str(restarted.pid), encoding="utf-8")
+        monitor.alive()
+        assert monitor.is_running()
+        restarted.kill()
+
+    with pytest.raises(ValueError):
+        LivenessMonitor()
+    with pytest.raises(ValueError):
+        LivenessMonitor(pid=1, pid_file=pid_file)
+
+
+class _Sink(socketserver.ThreadingTCPServer):
+    """
+    Read everything sent on each connection and count the bytes received.
+    Like the broker for most malformed requests, never answer.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        self.received = 0
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), _SinkHandler)
+
+
+class _SinkHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        try:
+            while True:
+                data = self.request.recv(65536)
+                if not data:
+                    return
+                with self.server.lock:
+                    self.server.received += len(data)
+        except OSError:
+            pass
+
+
+@pytest.fixture
+def sink():
+    server = _Sink()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_fast_shard_does_not_wait(sink, process):
+    port = sink.server_address[1]
+
+    start = time.monotonic()
+    result = run_shard("127.0.0.1", port, Shard("disconnect", 1, 40), process.pid)
+    fast = (time.monotonic() - start) / 40
+    assert result.error is None
+    assert result.num_cases == 40
+    assert sink.received > 0
+
+    # Waits for a response after each of the 9 requests of each case.
+    start = time.monotonic()
+    result = run_shard("127.0.0.1", port, Shard("disconnect", 1, 2))
+    slow = (time.monotonic() - start) / 2
+    assert result.num_cases == 2
+    assert fast < slow / 10
+
+
+def test_fast_shard_stops_when_broker_exits(sink, process):
+    process.kill()
+    process.wait()
+
+    result = run_shard(
+        "127.0.0.1", sink.server_address[1], Shard("disconnect", 5, 40), process.pid
+    )
+    assert result.last_index == 5
+    assert result.last_case
+    assert "exited" in result.error
+    # The messages of the case after which the exit was detected, and of the
+    # next ones, as the sink still accepts connections.
+    assert result.inputs
+    assert all(messages and all(messages) for messages in result.inputs)
@@ -0,0 +1,130 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import csv
+import json
+import socketserver
+import subprocess
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from blazingmq.dev import fuzztest
+from blazingmq.dev.fuzztest.metrics import BrokerSampler, FuzzMetrics, MetricsSample
+
+
+@pytest.fixture
+def process():
+    with subprocess.Popen(
+        [sys.executable, "-c", "import time; time.sleep(60)"]
+    ) as proc:
+        yield proc
+        proc.kill()
+
+
+class _Sink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+
+class _SinkHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        try:
+            while self.request.recv(65536):
+                pass
+        except OSError:
+            pass
+
+
+@pytest.fixture
+def sink():
+    server = _Sink(("127.0.0.1", 0), _SinkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_broker_sampler(tmp_path, process):
+    pid_file = tmp_path / "bmqbrkr.pid"
+    sampler = BrokerSampler(pid_file=pid_file)
+    # The broker has not written its pid yet.
+    assert sampler.sample() is None
+    assert not sampler.exited
+
+    pid_file.write_text(str(process.pid), encoding="utf-8")
+    sample = sampler.sample()
+    assert sample["broker_rss"] > 0
+    assert sample["broker_cpu"] >= 0
+
+    process.kill()
+    process.wait()
+    assert sampler.sample() is None
+    assert sampler.exited
+
+    with pytest.raises(ValueError):
+        BrokerSampler()
+
+
+def test_metrics_record_session(tmp_path, sink, process):
+    path = tmp_path / "metrics.csv"
+    liveness = fuzztest.LivenessMonitor(pid=process.pid)
+    with FuzzMetrics(path, interval=0.05, broker=BrokerSampler(pid=process.pid)) as m:
+        fuzztest.make_session(
+            *sink.server_address,
+            request="disconnect",
+            liveness=liveness,
+            metrics=m,
+            index_end=30,
+            db_filename=":memory:",
+        ).fuzz(max_depth=1)
+    liveness.close()
+
+    assert m.cases == 30
+    assert m.bytes_sent > 0
+    with path.open(encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert list(rows[0]) == list(MetricsSample._fields)
+    assert len(rows) == len(m.samples) >= 2
+    assert int(rows[-1]["cases"]) == 30
+    assert int(rows[-1]["broker_rss"]) > 0
+
+    summary = json.loads(
+        (tmp_path / "metrics.summary.json").read_text(encoding="utf-8")
+    )
+    assert summary["cases"] == 30
+    assert summary["bytes_sent"] == m.bytes_sent
+    assert summary["peak_broker_rss"] > 0
+    assert summary["time_to_crash"] is None
+
+
+def test_metrics_time_to_crash(tmp_path, process):
+    path = tmp_path / "metrics.jsonl"
+    metrics = FuzzMetrics(path, interval=0.01, broker=BrokerSampler(pid=process.pid))
+    metrics.connection = SimpleNamespace(reconnects=2)
+    metrics.start()
+    metrics.add(cases=5, bytes_sent=100, reconnects=1)
+    process.kill()
+    process.wait()
+    summary = metrics.close()
+
+    assert summary["time_to_crash"] is not None
+    assert summary["reconnects"] == 3
+    samples = [
+        json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()
+    ]
+    assert samples[-1]["cases"] == 5
+    assert samples[-1]["broker_rss"] is None
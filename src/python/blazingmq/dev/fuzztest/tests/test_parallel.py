@@ -0,0 +1,200 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# pylint: disable=protected-access; testing the orchestration of '_drain'
+
+import contextlib
+import queue
+import shutil
+import socket
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+
+from blazingmq.dev import fuzztest
+from blazingmq.dev.fuzztest import parallel
+from blazingmq.dev.fuzztest.corpus import CRASHES, CorpusDir
+from blazingmq.dev.fuzztest.parallel import FuzzReport, Shard, ShardResult
+
+
+def test_make_shards():
+    counts = {"put": 10, "disconnect": 3}
+    shards = parallel.make_shards(counts, 1, shard_size=4, num_mutations=counts.get)
+
+    assert shards[0].index_end - shards[0].index_start == 3
+    assert sorted(shards, key=lambda s: (s.request, s.index_start)) == [
+        Shard("disconnect", 1, 3),
+        Shard("put", 1, 4),
+        Shard("put", 5, 8),
+        Shard("put", 9, 10),
+    ]
+
+    # By default, each broker gets several shards.
+    shards = parallel.make_shards(counts, 2, num_mutations=counts.get)
+    assert len(shards) >= 2 * parallel.SHARDS_PER_BROKER - 1
+    assert max(s.index_end - s.index_start + 1 for s in shards) == 2
+    assert sum(s.index_end - s.index_start + 1 for s in shards) == 13
+
+    # Only the specified ranges of mutations.
+    ranges = {"put": [(2, 3), (7, 10)], "disconnect": []}
+    shards = parallel.make_shards(
+        counts,
+        1,
+        shard_size=3,
+        num_mutations=counts.get,
+        ranges=lambda request, count: ranges[request],
+    )
+    assert sorted(shards, key=lambda s: s.index_start) == [
+        Shard("put", 2, 3),
+        Shard("put", 7, 9),
+        Shard("put", 10, 10),
+    ]
+
+
+class _FakeBroker:
+    name = "fuzz0"
+    port = 1
+    pid = None
+    log_path = Path("fuzz0.log")
+
+    def __init__(self, crash_on):
+        self.crash_on = crash_on
+        self.returncode = None
+        self.restarts = 0
+
+    def poll(self):
+        return self.returncode
+
+    def restart(self):
+        self.returncode = None
+        self.restarts += 1
+
+
+class _FakeExecutor:
+    """
+    Run shards inline, crashing the broker on the mutation with index
+    'broker.crash_on' of the "put" request.
+    """
+
+    def __init__(self, broker):
+        self._broker = broker
+        self.shards = []
+
+    def submit(self, _fn, _host, _port, shard, _pid):
+        self.shards.append(shard)
+        future = Future()
+        last = shard.index_end
+        error = None
+        if (
+            shard.request == "put"
+            and shard.index_start <= self._broker.crash_on <= last
+        ):
+            last = self._broker.crash_on
+            self._broker.returncode = -11
+            error = "BoofuzzTargetConnectionFailedError"
+        future.set_result(
+            ShardResult(
+                shard,
+                last - shard.index_start + 1,
+                last,
+                f"Put:{last}",
+                error,
+                inputs=((b"open", f"put{last}".encode()),) if error else (),
+            )
+        )
+        return future
+
+
+def test_drain_records_crashes_and_requeues_the_rest():
+    broker = _FakeBroker(crash_on=6)
+    executor = _FakeExecutor(broker)
+    shards = queue.Queue()
+    for shard in (Shard("put", 1, 4), Shard("put", 5, 8), Shard("confirm", 1, 2)):
+        shards.put(shard)
+
+    report = FuzzReport()
+    parallel._drain(shards, broker, executor, report, threading.Lock())
+
+    assert broker.restarts == 1
+    assert executor.shards[-1] == Shard("put", 7, 8)
+    assert report.num_cases == 4 + 2 + 2 + 2
+    [finding] = report.findings
+    assert (finding.request, finding.index, finding.returncode) == ("put", 6, -11)
+    assert finding.test_case == "Put:6"
+    assert not report.errors
+
+    # The same crash found by another broker is reported once.
+    report.add_finding(finding)
+    assert len(report.findings) == 1
+    assert report.to_dict()["findings"][0]["shard"] == "put[5:8]"
+
+
+def test_drain_records_explored_mutations(tmp_path):
+    broker = _FakeBroker(crash_on=6)
+    shards = queue.Queue()
+    for shard in (Shard("put", 1, 4), Shard("put", 5, 8)):
+        shards.put(shard)
+
+    corpus = CorpusDir(tmp_path)
+    parallel._drain(
+        shards,
+        broker,
+        _FakeExecutor(broker),
+        FuzzReport(),
+        threading.Lock(),
+        corpus=corpus,
+        counts={"put": 10},
+    )
+
+    assert corpus.unexplored("put", 10) == [(9, 10)]
+    [crash] = corpus.inputs([CRASHES])
+    assert crash.messages == (b"open", b"put6")
+
+    # The next run resumes from the saved state.
+    assert CorpusDir(tmp_path).unexplored("put", 10) == [(9, 10)]
+
+
+def test_run_shard_stops_when_broker_is_unreachable():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    result = parallel.run_shard("127.0.0.1", port, Shard("disconnect", 1, 3))
+    assert result.error is not None
+    assert "unreachable" in result.error
+    assert result.num_cases == 0
+
+
+def test_count_mutations_matches_session():
+    assert fuzztest.count_mutations("disconnect") > 0
+    assert set(fuzztest.REQUESTS) >= {"put", "negotiation_bypass_authentication"}
+
+
+def test_temporary_work_dir_is_kept_on_findings():
+    report = FuzzReport()
+    with contextlib.ExitStack() as stack:
+        removed = parallel.temporary_work_dir(stack, lambda: bool(report.findings))
+        (removed / "broker.log").write_text("log")
+    assert not removed.exists()
+
+    with contextlib.ExitStack() as stack:
+        kept = parallel.temporary_work_dir(stack, lambda: bool(report.findings))
+        report.add_finding(
+            parallel.Finding("openQueue", "fuzz0", -6, 0, "", "", None, str(kept))
+        )
+    try:
+        assert kept.is_dir()
+    finally:
+        shutil.rmtree(kept)
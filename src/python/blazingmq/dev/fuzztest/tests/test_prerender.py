@@ -0,0 +1,144 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# pylint: disable=protected-access; testing the worker batches of the pre-rendering
+
+import multiprocessing
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, Tuple
+
+import pytest
+
+from blazingmq.dev import fuzztest
+from blazingmq.dev.fuzztest import LivenessMonitor, prerender
+from blazingmq.dev.fuzztest.corpus import CRASHES, CorpusDir
+
+
+def test_iter_cases_matches_session():
+    cases = list(prerender.iter_cases("disconnect"))
+    assert len(cases) == fuzztest.count_mutations("disconnect")
+    assert [case.index for case in cases] == list(range(1, len(cases) + 1))
+    assert {case.request for case in cases} == {"disconnect"}
+    assert all(case.messages and all(case.messages) for case in cases)
+
+    # A range renders the same cases as the full run.
+    assert list(prerender.iter_cases("disconnect", 10, 19)) == cases[9:19]
+
+
+class _Recorder(socketserver.ThreadingTCPServer):
+    """Record everything received on each connection, in accept order."""
+
+    daemon_threads = True
+    # Connections are opened faster than this thread may accept them.
+    request_queue_size = 256
+
+    def __init__(self):
+        self.received: Dict[int, bytes] = {}
+        self.indices: Dict[Tuple[str, int], int] = {}
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), _RecorderHandler)
+
+    def process_request(self, request, client_address):
+        self.indices[client_address] = len(self.indices)
+        super().process_request(request, client_address)
+
+
+class _RecorderHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        chunks = []
+        try:
+            while True:
+                data = self.request.recv(65536)
+                if not data:
+                    break
+                chunks.append(data)
+        except OSError:
+            pass
+        with self.server.lock:
+            index = self.server.indices[self.client_address]
+            self.server.received[index] = b"".join(chunks)
+
+
+@pytest.fixture
+def recorder():
+    server = _Recorder()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_fuzz_prerendered_sends_cases_in_order(recorder):
+    metrics = fuzztest.FuzzMetrics()
+    report = prerender.fuzz_prerendered(
+        "127.0.0.1",
+        recorder.server_address[1],
+        "disconnect",
+        index_start=5,
+        index_end=60,
+        workers=2,
+        batch_size=7,
+        metrics=metrics,
+    )
+    expected = [
+        b"".join(case.messages) for case in prerender.iter_cases("disconnect", 5, 60)
+    ]
+
+    assert not report.crashed and not report.errors
+    assert report.cases == metrics.cases == len(expected) == 56
+    assert report.bytes == metrics.bytes_sent == sum(map(len, expected))
+    deadline = time.monotonic() + 5
+    while len(recorder.received) < len(expected):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert [recorder.received[i] for i in range(len(expected))] == expected
+
+
+def test_fuzz_prerendered_stops_when_broker_exits(tmp_path, recorder):
+    with subprocess.Popen([sys.executable, "-c", "pass"]) as process:
+        process.wait()
+
+    report = prerender.fuzz_prerendered(
+        "127.0.0.1",
+        recorder.server_address[1],
+        "disconnect",
+        workers=2,
+        liveness=LivenessMonitor(pid=process.pid),
+        corpus_dir=tmp_path,
+    )
+    assert report.crashed
+    assert (report.crash_index, report.cases) == (1, 1)
+    assert report.crash_case
+    assert len(list(CorpusDir(tmp_path).inputs([CRASHES]))) == 1
+
+
+def _put_without_sentinel(out):
+    out.put(["first"])
+    out.put(["second"])
+
+
+def test_batches_of_a_worker_exiting_early():
+    out = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_put_without_sentinel, args=(out,))
+    process.start()
+    process.join()
+
+    errors = []
+    assert list(prerender._batches(process, out, errors)) == [["first"], ["second"]]
+    assert len(errors) == 1 and "exited before" in errors[0]
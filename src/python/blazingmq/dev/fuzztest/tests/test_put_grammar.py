@@ -0,0 +1,179 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import socketserver
+import subprocess
+import sys
+import threading
+
+import boofuzz
+import crc32c
+
+from blazingmq.dev.fuzztest import LivenessMonitor, put_grammar
+from blazingmq.dev.fuzztest.corpus import CRASHES, CorpusDir
+from blazingmq.dev.fuzztest.put_grammar import GrammarPut, PutGrammar
+from blazingmq.dev.fuzztest.put_message_properties import fuzz_put_grammar
+from blazingmq.schemas import protocol
+from blazingmq.schemas.broker import EventType, PutHeaderFlags
+from blazingmq.schemas.protocol import OptionType, PropertyType
+
+
+def test_valid_derivations_decode():
+    grammar = PutGrammar(random.Random(7), invalid_probability=0)
+    counts = set()
+    for _ in range(300):
+        spec = grammar.put()
+        [(header, body)] = protocol.iter_events(put_grammar.encode_put([spec]))
+        assert header.type == EventType.PUT
+        [(put, options, data)] = protocol.decode_put_event(body)
+        assert put.header_words == protocol.PUT_HEADER_SIZE // protocol.WORD_SIZE
+        assert bytes(options) == b"".join(
+            put_grammar.encode_option_spec(option) for option in spec.options
+        )
+        data = protocol.strip_padding(data)
+        assert put.crc32c == crc32c.crc32c(data)
+        assert bytes(data).endswith(spec.payload)
+        if spec.properties is None:
+            assert not put.flags & PutHeaderFlags.MESSAGE_PROPERTIES
+            continue
+
+        new_style = put.schema_id != 0
+        properties, size = protocol.decode_message_properties(data, new_style)
+        assert size == len(data) - len(spec.payload)
+        assert [prop.name.encode() for prop in properties] == [
+            prop.name for prop in spec.properties.properties
+        ]
+        assert len({prop.name for prop in properties}) == len(properties)
+        counts.add(len(properties))
+
+    assert {0, 1, put_grammar.MAX_NUM_PROPERTIES} <= counts
+
+
+def test_derivations_reach_extremes():
+    grammar = PutGrammar(random.Random(3))
+    lies = set()
+    name_lengths = set()
+    for _ in range(500):
+        spec = grammar.put()
+        if spec.crc32c is not None:
+            lies.add("crc32c")
+        if spec.header_words != protocol.PUT_HEADER_SIZE // protocol.WORD_SIZE:
+            lies.add("header_words")
+        for option in spec.options:
+            if option.type not in tuple(OptionType)[1:]:
+                lies.add("option_type")
+        if spec.properties is None:
+            continue
+        area = spec.properties
+        for index, prop in enumerate(area.properties):
+            name_lengths.add(len(prop.name))
+            if prop.type not in tuple(PropertyType):
+                lies.add("property_type")
+            if prop.name_length != len(prop.name):
+                lies.add("name_length")
+            if (
+                spec.schema_id
+                and index
+                and prop.middle < area.properties[index - 1].middle
+            ):
+                lies.add("overlap")
+        if area.count != len(area.properties):
+            lies.add("count")
+        if area.header_size > protocol.PROPERTIES_HEADER_SIZE:
+            lies.add("extended_header")
+        encoded = put_grammar.encode_properties(area)
+        if area.area_words * protocol.WORD_SIZE != len(encoded):
+            lies.add("area_words")
+
+    assert put_grammar.MAX_PROPERTY_NAME_LENGTH in name_lengths
+    assert lies == {
+        "crc32c",
+        "header_words",
+        "option_type",
+        "property_type",
+        "name_length",
+        "overlap",
+        "count",
+        "extended_header",
+        "area_words",
+    }
+
+
+def test_grammar_is_deterministic():
+    first = list(PutGrammar(random.Random(5)).events(20))
+    assert first == list(PutGrammar(random.Random(5)).events(20))
+    assert len(set(first)) == 20
+
+
+def test_grammar_put_primitive():
+    request = boofuzz.Request("PutGrammar", children=[GrammarPut("put", num_cases=5)])
+    [(header, _)] = protocol.iter_events(request.render())
+    assert header.type == EventType.PUT
+
+    primitive = request.stack[0]
+    assert primitive.get_num_mutations() == 5
+    mutations = list(primitive.mutations(primitive.original_value()))
+    assert len(set(mutations)) == 5
+
+
+class _Sink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        self.received = 0
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), _SinkHandler)
+
+
+class _SinkHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        try:
+            while True:
+                data = self.request.recv(1 << 20)
+                if not data:
+                    return
+                with self.server.lock:
+                    self.server.received += len(data)
+        except OSError:
+            pass
+
+
+def test_fuzz_put_grammar_streams_events(tmp_path):
+    server = _Sink()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    try:
+        report = fuzz_put_grammar("127.0.0.1", port, count=200, seed=1)
+        assert report.events == 200
+        assert not report.crashed
+
+        exited = subprocess.Popen([sys.executable, "-c", "pass"])
+        exited.wait()
+        report = fuzz_put_grammar(
+            "127.0.0.1",
+            port,
+            count=200,
+            liveness=LivenessMonitor(pid=exited.pid),
+            corpus_dir=tmp_path,
+        )
+        assert report.crashed
+        assert report.events == 0
+        [crash] = CorpusDir(tmp_path).inputs([CRASHES])
+        assert crash.request == "put"
+        assert len(crash.messages) == 4  # The setup steps.
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,123 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import json
+
+import boofuzz
+from boofuzz.mutation_context import MutationContext
+
+from blazingmq.dev.fuzztest import make_session
+from blazingmq.dev.fuzztest.schema_models import (
+    MESSAGE_TYPES,
+    UNKNOWN_ENUMERATOR,
+    make_schema_workflows,
+    model_to_boofuzz,
+    model_to_json,
+    schema_models,
+)
+from blazingmq.schemas import ber, broker, protocol
+
+
+def _render(request, mutations=()):
+    context = MutationContext(mutations={m.qualified_name: m for m in mutations})
+    [(_, body)] = protocol.iter_events(request.render(context))
+    return json.loads(bytes(protocol.strip_padding(body)))
+
+
+def test_models_cover_every_selection():
+    schema = ber.control_schema()
+    names = [model.name for name in MESSAGE_TYPES for model in schema_models(name)]
+    assert len(set(names)) == len(names)
+    selections = {part for name in names for part in name.split(".")}
+    for type_name in (
+        "ControlMessageChoice",
+        "ClusterMessageChoice",
+        "ClusterStateFSMMessageChoice",
+        "PartitionMessageChoice",
+        "NegotiationMessage",
+        "AuthenticationMessage",
+    ):
+        for element in schema.complex_types[type_name].elements:
+            assert element.name in selections
+
+    assert schema_models("ControlMessage") is schema_models("ControlMessage")
+
+
+def test_default_rendering_is_valid():
+    schema = ber.control_schema()
+    for type_name in MESSAGE_TYPES:
+        for model in schema_models(type_name):
+            request = boofuzz.Request(model.name, children=model_to_boofuzz(model))
+            value = _render(request)
+            assert value == model_to_json(model)
+            assert schema.decode(type_name, schema.encode(type_name, value))
+
+    [open_queue] = [m for m in schema_models() if m.name == "ControlMessage.openQueue"]
+    assert model_to_json(open_queue) == {
+        **broker.OPEN_QUEUE_SCHEMA,
+        "openQueue": {
+            "handleParameters": {
+                **broker.OPEN_QUEUE_SCHEMA["openQueue"]["handleParameters"],
+                "flags": int(broker.QueueFlags.READ | broker.QueueFlags.WRITE),
+            }
+        },
+    }
+
+
+def test_mutations_follow_schema():
+    [model] = [m for m in schema_models() if m.name == "ControlMessage.configureStream"]
+    request = boofuzz.Request(model.name, children=model_to_boofuzz(model))
+    values = []
+    for primitive in request.walk():
+        if isinstance(primitive, (boofuzz.String, boofuzz.BitField)):
+            continue  # Mutated as by 'schema_to_boofuzz'.
+        for mutations in primitive.get_mutations():
+            try:
+                values.append(_render(request, mutations))
+            except ValueError:  # The event header.
+                pass
+
+    assert any("rId" not in value for value in values)
+    parameters = [
+        value["configureStream"]["streamParameters"]
+        for value in values
+        if "configureStream" in value
+    ]
+    counts = collections.Counter(len(p["subscriptions"]) for p in parameters)
+    assert {0, 1, 2, 16, 256} <= counts.keys()
+    versions = {
+        p["subscriptions"][0]["expression"]["version"]
+        for p in parameters
+        if p["subscriptions"]
+    }
+    assert versions == {"E_UNDEFINED", "E_VERSION_1", UNKNOWN_ENUMERATOR}
+
+
+def test_schema_session():
+    workflows = make_schema_workflows(("NegotiationMessage",))
+    assert [[name for _, name in workflow] for workflow in workflows] == [
+        ["authentication", model.name] for model in schema_models("NegotiationMessage")
+    ]
+
+    session = make_session(
+        "localhost",
+        0,
+        "NegotiationMessage.clientIdentity",
+        workflows=workflows,
+        db_filename=":memory:",
+    )
+    [request] = [r for r, name in workflows[0] if name != "authentication"]
+    assert 0 < session.num_mutations(max_depth=1) == request.get_num_mutations()
@@ -0,0 +1,201 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import json
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from blazingmq.dev.fuzztest import LivenessMonitor
+from blazingmq.dev.fuzztest.stateful import (
+    Op,
+    Scheduler,
+    Step,
+    fuzz_stateful,
+    load_steps,
+    run_steps,
+)
+from blazingmq.schemas import protocol
+from blazingmq.schemas.broker import EventType
+
+
+class _Recorder(socketserver.ThreadingTCPServer):
+    """
+    Record the events received on each connection.  Append an assertion to
+    'log_file', if set, when a 'closeQueue' request is received.
+    """
+
+    daemon_threads = True
+    request_queue_size = 64
+
+    def __init__(self):
+        self.events = []  # (type, body) of all the connections
+        self.connections = 0
+        self.log_file = None
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), _RecorderHandler)
+
+
+class _RecorderHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+        data = b""
+        try:
+            while True:
+                chunk = self.request.recv(65536)
+                if not chunk:
+                    return
+                data += chunk
+                while len(data) >= protocol.EVENT_HEADER_SIZE:
+                    header = protocol.decode_event_header(data)
+                    if len(data) < header.length:
+                        break
+                    body = data[protocol.EVENT_HEADER_SIZE : header.length]
+                    data = data[header.length :]
+                    with self.server.lock:
+                        self.server.events.append((header.type, body))
+                    if self.server.log_file is not None and b"closeQueue" in body:
+                        with self.server.log_file.open("a") as log:
+                            log.write("ERROR Assertion failed: queue.isOpen()\n")
+        except OSError:
+            pass
+
+
+@pytest.fixture
+def recorder():
+    server = _Recorder()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_schedule_is_seeded():
+    steps = Scheduler(1, connections=4).steps(500)
+    assert steps == Scheduler(1, connections=4).steps(500)
+    assert steps != Scheduler(2, connections=4).steps(500)
+    assert {step.op for step in steps} == set(Op)
+    assert {step.queue for step in steps} == {0, 1}
+
+    # Sessions are connected and negotiated first, again after a disconnect.
+    last = {}
+    for step in steps:
+        previous = last.get(step.connection, Op.DISCONNECT)
+        if previous in (Op.DISCONNECT, Op.DROP):
+            assert step.op is Op.CONNECT
+        elif previous is Op.CONNECT:
+            assert step.op is Op.NEGOTIATE
+        last[step.connection] = step.op
+
+    # Both queues are opened by two sessions at once.
+    open_queues = collections.defaultdict(set)
+    shared = set()
+    for step in steps:
+        if step.op is Op.OPEN_QUEUE:
+            open_queues[step.queue].add(step.connection)
+        elif step.op in (Op.CLOSE_QUEUE, Op.DISCONNECT, Op.DROP):
+            for connections in open_queues.values():
+                if (
+                    step.op is Op.CLOSE_QUEUE
+                    and connections is not open_queues[step.queue]
+                ):
+                    continue
+                connections.discard(step.connection)
+        shared |= {queue for queue, c in open_queues.items() if len(c) > 1}
+    assert shared == {0, 1}
+
+
+def _wait(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_run_steps_sends_interleaving(recorder):
+    # The data not read yet when a connection is reset is lost.
+    steps = [
+        step
+        for step in Scheduler(3, connections=4).steps(300)
+        if step.op is not Op.DROP
+    ]
+    report = run_steps("127.0.0.1", recorder.server_address[1], steps, seed=3)
+    assert not report.failed
+    assert report.steps == steps
+    assert report.errors == 0
+
+    sent = [step.op for step in steps if step.op is not Op.CONNECT]
+    _wait(lambda: len(recorder.events) == len(sent))
+    assert recorder.connections == sum(step.op is Op.CONNECT for step in steps)
+
+    expected = collections.Counter(
+        {
+            EventType.PUT: sent.count(Op.PUT),
+            EventType.CONFIRM: sent.count(Op.CONFIRM),
+            EventType.CONTROL: len(sent) - sent.count(Op.PUT) - sent.count(Op.CONFIRM),
+        }
+    )
+    assert collections.Counter(type for type, _ in recorder.events) == expected
+    requests = collections.Counter(
+        next(iter(json.loads(bytes(protocol.strip_padding(body))).keys() - {"rId"}))
+        for type, body in recorder.events
+        if type == EventType.CONTROL
+    )
+    assert requests["openQueue"] == sent.count(Op.OPEN_QUEUE)
+    assert requests["clientIdentity"] == sent.count(Op.NEGOTIATE)
+
+
+def test_stateful_reports_assertion(recorder, tmp_path):
+    recorder.log_file = tmp_path / "bmqbrkr.log"
+    recorder.log_file.write_text("INFO Assertion failed: before the run\n")
+
+    report = fuzz_stateful(
+        "127.0.0.1",
+        recorder.server_address[1],
+        seed=5,
+        count=2000,
+        log_file=recorder.log_file,
+        work_dir=tmp_path,
+    )
+    assert report.failed and not report.crashed
+    assert set(report.assertions) == {"ERROR Assertion failed: queue.isOpen()"}
+    assert any(step.op is Op.CLOSE_QUEUE for step in report.steps)
+    assert len(report.steps) < 2000
+    assert "closeQueue" in report.interleaving(last=20)
+    assert load_steps(tmp_path / "stateful-5.json") == report.steps
+
+
+def test_stateful_stops_when_broker_exits(recorder, tmp_path):
+    with subprocess.Popen([sys.executable, "-c", "pass"]) as exited:
+        exited.wait()
+    report = fuzz_stateful(
+        "127.0.0.1",
+        recorder.server_address[1],
+        count=100,
+        liveness=LivenessMonitor(pid=exited.pid),
+        work_dir=tmp_path,
+    )
+    assert report.crashed
+    assert report.steps == [Step(report.steps[0].connection, Op.CONNECT)]
+    assert load_steps(tmp_path / "stateful-0.json") == report.steps
+
+    with pytest.raises(ValueError):
+        fuzz_stateful("127.0.0.1", recorder.server_address[1])
@@ -32,10 +32,11 @@ from blazingmq.dev.configurator.localsite import LocalSite
 import blazingmq.dev.it.process.proc
 import blazingmq.dev.it.testconstants as tc
 import blazingmq.dev.configurator.configurator as cfg
-from blazingmq.dev.it.process.broker import Broker
-from blazingmq.dev.it.process.client import Client
+from blazingmq.dev.it.process.broker import BLOCK_TIMEOUT, Broker
+from blazingmq.dev.it.process.client import Client, ClientPool, PooledClient
 from blazingmq.dev.it.process.proc import Process
 from blazingmq.dev.it.util import ListContextManager, Queue, internal_use
+from blazingmq.util import fastjson
 
 logger = logging.getLogger(__name__)
 
@@ -120,6 +121,7 @@ class Cluster(contextlib.AbstractContextManager):
         self._virtual_nodes: List[Broker] = []
         self._proxies: List[Broker] = []
         self._clients: List[Client] = []
+        self._client_pools: Dict[str, ClientPool] = {}
         self._other_processes: List[Process] = []
 
         # out soon
@@ -239,6 +241,7 @@ class Cluster(contextlib.AbstractContextManager):
                 else:
                     self._clients.remove(process)
 
+        self._client_pools.clear()
         self.last_known_leader = None
         bad_exit_code = False
         bad_exit_still_alive = False
@@ -633,7 +636,10 @@ class Cluster(contextlib.AbstractContextManager):
         dump_messages=True,
         options=None,
         port=None,
-    ) -> Client:
+        pool: Optional[str] = None,
+        latency: Optional[str] = None,
+        latency_report: Optional[Path] = None,
+    ) -> Union[Client, PooledClient]:
         """
         Create a client with the specified name.
 
@@ -641,8 +647,35 @@ class Cluster(contextlib.AbstractContextManager):
         connects to the specified proxy.  If 'options' is specified, its string
         value is tacked at the end of the 'bmqtool.tsk' argument list. If 'port' is not
         specified, use either the first listener if it exists or 'broker.port'.
+
+        If 'pool' is specified, return a 'PooledClient' hosted by the
+        'bmqtool.tsk' process shared by all the clients created with the same
+        'pool' name on the same 'broker'.  The host process is created, with
+        the specified 'dump_messages', 'options', 'port' and latency
+        parameters, by the first call for a given pool, and its session is
+        always started.
+
+        If 'latency' ('hires' or 'epoch') is specified, the client records
+        its latencies, and writes them on exit to 'latency_report' (relative
+        to the broker's directory), see 'Client.latency_histogram'.
         """
 
+        if pool is not None:
+            key = f"{pool}@{broker.name}"
+            client_pool = self._client_pools.get(key)
+            if client_pool is None:
+                host = self.create_client(
+                    pool,
+                    broker,
+                    dump_messages=dump_messages,
+                    options=options,
+                    port=port,
+                    latency=latency,
+                    latency_report=latency_report,
+                )
+                client_pool = self._client_pools[key] = ClientPool(host)
+            return client_pool.create_client(f"{prefix}@{key}")
+
         if isinstance(options, str):
             options = options.split()
 
@@ -661,6 +694,8 @@ class Cluster(contextlib.AbstractContextManager):
             cwd=(self.work_dir / broker.name),
             dump_messages=dump_messages,
             options=(self._tool_extra_args or []) + (options or []),
+            latency=latency,
+            latency_report=latency_report,
         )
         client.add_sync_log_hook(lambda _: self.check_processes())
         client.start()
@@ -711,6 +746,50 @@ class Cluster(contextlib.AbstractContextManager):
 
         return self.last_known_leader
 
+    def admin_all(
+        self,
+        command: str,
+        brokers: Optional[List[Broker]] = None,
+        timeout: float = BLOCK_TIMEOUT,
+    ) -> Dict[str, Union[dict, list]]:
+        """
+        Send the specified admin 'command' to each of the specified 'brokers'
+        (by default, all the alive nodes of this cluster) and return the
+        decoded JSON responses, keyed by broker name.
+
+        The command is sent with 'ENCODING JSON_COMPACT' over each broker's
+        persistent admin session.  All the commands are sent before any
+        response is awaited, so that the brokers execute them concurrently,
+        and the whole operation costs one round trip.  Raise an exception if
+        a broker does not respond within 'timeout' seconds, or responds with
+        something that is not JSON.
+        """
+
+        if brokers is None:
+            brokers = self.nodes(alive=True)
+
+        self._logger.debug(
+            "admin_all(%s) on %s", command, [broker.name for broker in brokers]
+        )
+
+        requests = [
+            (broker, broker.admin_session().request(f"ENCODING JSON_COMPACT {command}"))
+            for broker in brokers
+        ]
+
+        deadline = time.monotonic() + timeout
+        responses = {}
+        for broker, request in requests:
+            text = request.result(max(0.0, deadline - time.monotonic()))
+            try:
+                responses[broker.name] = fastjson.loads(text)
+            except ValueError as exc:
+                raise RuntimeError(
+                    f"{broker.name}: non-JSON response to '{command}': {text!r}"
+                ) from exc
+
+        return responses
+
     def open_priority_queues(
         self, count, start=0, port=None, uri_priority=tc.URI_PRIORITY, **kw
     ) -> ListContextManager[Queue]:
@@ -13,13 +13,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import difflib
 import glob
 import json
 import os
 import re
 import subprocess
 from pathlib import Path
+from typing import Dict, Iterable
 
 import blazingmq.dev.it.testconstants as tc
 from blazingmq.dev import paths
@@ -28,7 +28,9 @@ from blazingmq.dev.it.fixtures import test_logger, Cluster
 
 from blazingmq.dev.it.process.broker import Broker
 from blazingmq.dev.it.process.client import Client
+from blazingmq.dev.it.process.results import StorageSummary, unwrap
 from blazingmq.dev.it.util import wait_until
+from blazingmq.storage import compare_journals
 
 
 def set_config_quorum(cluster: Cluster, node: str, quorum: int):
@@ -58,30 +60,31 @@ def ensure_message_at_storage_layer(
     # have received the message at the storage layer.  This is necessary
     # in the absence of stronger consistency in storage replication in
     # BMQ.  Presence of message in the storage at each node is checked by
-    # sending 'STORAGE SUMMARY' command and grepping its output.
+    # sending 'STORAGE SUMMARY' to all the nodes at once, and looking up the
+    # queue in the JSON results.
 
     nodes = cluster.nodes(alive=alive)
+    mismatches = {}
 
-    for node in nodes:
-
-        def check(node=node):
-            node.command(f"CLUSTERS CLUSTER {node.cluster_name} STORAGE SUMMARY")
-            return node.outputs_regex(
-                r"\w{10}\s+%s\s+%s\s+\d+\s+B\s+" % (partition_id, expected_count)
-                + re.escape(queue_uri)
-            )
-
-        assert wait_until(
-            check,
-            timeout=3,
-        ), (
-            f"Node {node.name} does not have {expected_count} messages for queue {queue_uri} in partition {partition_id} at storage layer"
+    def check():
+        responses = cluster.admin_all(
+            f"CLUSTERS CLUSTER {cluster.name} STORAGE SUMMARY", nodes
         )
-
-        # Above regex is to match line:
-        # C1E2A44527    0      1      68  B      bmq://bmq.test.mmap.priority.~tst/qqq
-        # where columns are: QueueKey, PartitionId, NumMsgs, NumBytes,
-        # QueueUri respectively.
+        mismatches.clear()
+        for name, response in responses.items():
+            summary = StorageSummary.from_json(
+                unwrap(response, "clusterStorageSummary")
+            )
+            partition = summary.partitions.get(partition_id)
+            info = partition and partition.queues.get(queue_uri)
+            count = info.num_messages if info else None
+            if count != expected_count:
+                mismatches[name] = count
+        return not mismatches
+
+    assert wait_until(check, timeout=3), (
+        f"Nodes {sorted(mismatches)} do not have {expected_count} messages for queue {queue_uri} in partition {partition_id} at storage layer (found {mismatches})"
+    )
 
 
 def simulate_csl_rollover(du: tc.DomainUrls, leader: Broker, producer: Client):
@@ -218,58 +221,31 @@ def rollover_queues_and_apps_test(cluster: Cluster, domain_urls, trigger_rollove
     check_if_queue_has_n_messages(consumer, fanout_queue + "?id=quux", 1)
 
 
-def run_storage_tool(journal_file: Path, mode: str) -> subprocess.CompletedProcess:
-    """Run storage tool on `journal_file` in the specified `mode`."""
+def run_storage_tool_batch(journal_files: Iterable[Path], mode: str) -> Dict[str, dict]:
+    """
+    Run storage tool once on all the `journal_files`, e.g. those of the
+    leader and replica partitions, which it processes concurrently in batch
+    mode, in the specified `mode`.  Return the JSON output of the tool for
+    each journal file, by path.
+    """
 
-    return subprocess.run(
-        [
-            paths.required_paths.storagetool,
-            "--journal-file",
-            journal_file,
-            f"--{mode}",
-            "--print-mode=json-pretty",
-        ],
+    command = [paths.required_paths.storagetool]
+    for journal_file in journal_files:
+        command += ["--batch", str(journal_file)]
+    res = subprocess.run(
+        command + [f"--{mode}", "--print-mode=json-line"],
         capture_output=True,
         check=True,
     )
 
-
-def clean_storage_output(output_str: str) -> str:
-    """
-    Clean the output by removing any non-deterministic parts, such as
-    timestamps/epochs.
-    """
-    RECORDS_KEYS_TO_REMOVE = [
-        "Timestamp",
-        "Epoch",
-    ]
-    SUMMARY_KEYS_TO_REMOVE = [
-        "First SyncPointRecord timestamp",
-        "First SyncPointRecord epoch",
-        "Record Timestamp",
-        "Record Epoch",
-        "SyncPoint Timestamp",
-        "SyncPoint Epoch",
-    ]
-    data = json.loads(output_str)
-    if "Records" in data:
-        for record in data["Records"]:
-            for key in RECORDS_KEYS_TO_REMOVE:
-                if key in record:
-                    del record[key]
-    elif "JournalFileDetails" in data:
-        journal_details = data["JournalFileDetails"]
-        journal_hdr = journal_details["Journal File Header"]
-        for key in SUMMARY_KEYS_TO_REMOVE:
-            if key in journal_hdr:
-                del journal_hdr[key]
-        if "Journal SyncPoint" in journal_details:
-            journal_sync = journal_details["Journal SyncPoint"]
-            for key in SUMMARY_KEYS_TO_REMOVE:
-                if key in journal_sync:
-                    del journal_sync[key]
-
-    return json.dumps(data, indent=2)
+    results = {}
+    for line in res.stdout.splitlines():
+        entry = json.loads(line)
+        assert "Error" not in entry, (
+            f"Storage tool failed on {entry['JournalFile']}: {entry['Error']}"
+        )
+        results[entry["JournalFile"]] = entry["Result"]
+    return results
 
 
 def _wait_for_passive_advisories(leader: Broker, cluster: Cluster, timeout: int = 10):
@@ -310,7 +286,8 @@ def stop_cluster_and_compare_journal_files(
     """
     Stop cluster after bumping quorum on all replicas to prevent primary
     switch.  Then, compare leader and replica journal files content, and
-    assert that they are equal.
+    assert that they are equal, timestamps aside (see
+    'blazingmq.storage.compare_journals').
 
     NOTE: Stopping all nodes ensures that all journal files are closed and
     flushed to disk, and that there are no discrepancies due to in-flight
@@ -347,60 +324,12 @@ def stop_cluster_and_compare_journal_files(
         sorted(leader_journal_files),
         sorted(replica_journal_files),
     ):
-        leader_res = run_storage_tool(leader_file, "details")
-        assert leader_res.returncode == 0, (
-            f"Leader storage tool failed on {leader_file} with rc {leader_res.returncode}"
-        )
-
-        replica_res = run_storage_tool(replica_file, "details")
-        assert replica_res.returncode == 0, (
-            f"Replica storage tool failed on {replica_file} with rc {replica_res.returncode}"
+        divergence = compare_journals(leader_file, replica_file)
+        assert divergence is None, (
+            f"Leader and replica journal files differ for "
+            f"{leader_file} and {replica_file}: {divergence}"
         )
 
-        leader_out = clean_storage_output(leader_res.stdout)
-        replica_out = clean_storage_output(replica_res.stdout)
-        if leader_out != replica_out:
-            diff = "\n".join(
-                difflib.unified_diff(
-                    leader_out.splitlines(),
-                    replica_out.splitlines(),
-                    fromfile=str(leader_file),
-                    tofile=str(replica_file),
-                    lineterm="",
-                )
-            )
-            assert False, (
-                f"Leader and replica journal file contents differ for "
-                f"{leader_file} and {replica_file}\n{diff}"
-            )
-
-        leader_res = run_storage_tool(leader_file, "summary")
-        assert leader_res.returncode == 0, (
-            f"Leader storage tool (summary) failed on {leader_file} with rc {leader_res.returncode}"
-        )
-
-        replica_res = run_storage_tool(replica_file, "summary")
-        assert replica_res.returncode == 0, (
-            f"Replica storage tool (summary) failed on {replica_file} with rc {replica_res.returncode}"
-        )
-
-        leader_out = clean_storage_output(leader_res.stdout)
-        replica_out = clean_storage_output(replica_res.stdout)
-        if leader_out != replica_out:
-            diff = "\n".join(
-                difflib.unified_diff(
-                    leader_out.splitlines(),
-                    replica_out.splitlines(),
-                    fromfile=str(leader_file),
-                    tofile=str(replica_file),
-                    lineterm="",
-                )
-            )
-            assert False, (
-                f"Leader and replica journal file summary differ for "
-                f"{leader_file} and {replica_file}\n{diff}"
-            )
-
 
 def wipe_files(file_patterns: list, storage_dir: str) -> None:
     """Delete all files matching the given glob patterns in storage_dir."""
@@ -0,0 +1,232 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+blazingmq.dev.it.latency
+
+
+PURPOSE: Provide latency histograms built from 'bmqtool.tsk' latency reports.
+
+TYPES:
+    LatencyHistogram: a mergeable histogram of latencies in nanoseconds
+
+FUNCTIONS:
+    assert_latency_below: assert that percentiles of a histogram are below
+                          given limits
+
+When started with '--latency' and '--latency-report', 'bmqtool.tsk' records
+the ACK latency (for producers) or the PUT to PUSH latency (for consumers) of
+each message, and writes a JSON report on exit (see
+'m_bmqtool::LatencyStorage').  Latencies are rounded to a fixed number of
+significant digits, i.e. the report is a histogram with logarithmically sized
+buckets, similar to an HDR histogram.  'LatencyHistogram' loads such reports,
+and can merge the reports of several clients.
+
+Usage
+-----
+
+```
+from blazingmq.dev.it.latency import LatencyHistogram, assert_latency_below
+
+def test_latency(cluster, domain_urls):
+    proxy = next(cluster.proxy_cycle())
+    consumer = proxy.create_client("consumer", latency="epoch")
+    ...
+    consumer.exit_gracefully()
+    consumer.wait()
+
+    histogram = consumer.latency_histogram()
+    assert histogram.p99 < 5_000_000
+    assert_latency_below(histogram, p50=1_000_000, p99=5_000_000)
+```
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+# Number of significant digits kept by 'bmqtool.tsk' (see
+# 'Application::d_ackLatencyStorage').
+DEFAULT_SIGNIFICANT_DIGITS = 3
+
+
+class LatencyHistogram:
+    """
+    A histogram of latencies, in nanoseconds, rounded down to a fixed number
+    of significant digits.
+    """
+
+    __slots__ = ("_buckets", "_count", "_limit")
+
+    def __init__(
+        self,
+        buckets: Optional[Dict[int, int]] = None,
+        significant_digits: int = DEFAULT_SIGNIFICANT_DIGITS,
+    ):
+        self._limit = 10**significant_digits
+        self._buckets: Dict[int, int] = {}
+        self._count = 0
+        for latency, count in (buckets or {}).items():
+            self.record(latency, count)
+
+    @classmethod
+    def from_report(cls, report: Union[dict, str, Path]) -> "LatencyHistogram":
+        """
+        Return a histogram built from the specified 'bmqtool.tsk' latency
+        'report', either already parsed, or stored in a file at the specified
+        path.
+        """
+        if not isinstance(report, dict):
+            with Path(report).open("r", encoding="utf-8") as file:
+                report = json.load(file)
+        return cls(
+            {int(latency): count for latency, count in report["dataPoints"].items()}
+        )
+
+    @classmethod
+    def merged(cls, histograms: Iterable["LatencyHistogram"]) -> "LatencyHistogram":
+        """Return the merge of the specified 'histograms'."""
+        result = cls()
+        for histogram in histograms:
+            result += histogram
+        return result
+
+    def _round(self, latency: int) -> int:
+        divisor = 1
+        while divisor * self._limit < latency:
+            divisor *= 10
+        return (latency // divisor) * divisor
+
+    def record(self, latency: int, count: int = 1) -> None:
+        """Record the specified 'count' samples of the specified 'latency'."""
+        assert latency >= 0
+        bucket = self._round(latency)
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + count
+        self._count += count
+
+    def __iadd__(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        for latency, count in other._buckets.items():
+            self.record(latency, count)
+        return self
+
+    def __add__(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        result = LatencyHistogram(self._buckets)
+        result += other
+        return result
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, LatencyHistogram):
+            return NotImplemented
+        return self._buckets == other._buckets
+
+    def __repr__(self) -> str:
+        return f"LatencyHistogram({self.summary()})"
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def min(self) -> int:
+        return min(self._buckets, default=0)
+
+    @property
+    def max(self) -> int:
+        return max(self._buckets, default=0)
+
+    @property
+    def mean(self) -> float:
+        if self._count == 0:
+            return 0.0
+        total = sum(latency * count for latency, count in self._buckets.items())
+        return total / self._count
+
+    def percentile(self, percentile: float) -> int:
+        """
+        Return the latency at the specified 'percentile' (in [0, 100]), i.e.
+        the smallest recorded latency such that at least 'percentile' percent
+        of the samples are lower or equal.  Return 0 if the histogram is
+        empty.  This is the same definition as 'bmqtool.tsk' uses.
+        """
+        assert 0 <= percentile <= 100
+        if self._count == 0:
+            return 0
+        target = math.ceil(percentile * self._count / 100)
+        accumulated = 0
+        for latency in sorted(self._buckets):
+            accumulated += self._buckets[latency]
+            if accumulated >= target:
+                return latency
+        return self.max
+
+    @property
+    def p50(self) -> int:
+        return self.percentile(50)
+
+    @property
+    def p90(self) -> int:
+        return self.percentile(90)
+
+    @property
+    def p99(self) -> int:
+        return self.percentile(99)
+
+    @property
+    def p999(self) -> int:
+        return self.percentile(99.9)
+
+    def summary(self) -> Dict[str, Union[int, float]]:
+        """Return the count, extrema, mean and usual percentiles."""
+        if self._count == 0:
+            return {"count": 0}
+        return {
+            "count": self._count,
+            "min": self.min,
+            "mean": round(self.mean),
+            "p50": self.p50,
+            "p90": self.p90,
+            "p99": self.p99,
+            "p99.9": self.p999,
+            "max": self.max,
+        }
+
+
+def assert_latency_below(
+    histogram: LatencyHistogram,
+    *,
+    min_count: int = 1,
+    **limits: int,
+) -> None:
+    """
+    Assert that the specified 'histogram' contains at least 'min_count'
+    samples, and that each of its percentiles specified in 'limits' (as
+    'p50', 'p90', 'p99', 'p999' or 'max') is strictly lower than the
+    corresponding limit, in nanoseconds.
+    """
+    assert histogram.count >= min_count, (
+        f"expected at least {min_count} latency samples, got {histogram.count}"
+    )
+    failures = []
+    for name, limit in limits.items():
+        value = getattr(histogram, name)
+        if value >= limit:
+            failures.append(f"{name} = {value}ns >= {limit}ns")
+    assert not failures, (
+        f"latency above limits: {', '.join(failures)} ({histogram.summary()})"
+    )
@@ -0,0 +1,528 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+blazingmq.dev.it.loadgen
+
+
+PURPOSE: Provide an open-loop load generator for a local cluster.
+
+TYPES:
+    Step: a period of time during which events are posted at a constant rate
+    Workload: a queue to post to, and the queues to consume from
+    StepResult: the measurements collected during one step
+    LoadGenerator: run a profile of steps against a cluster
+
+FUNCTIONS:
+    constant_rate: a profile consisting of a single step
+    ramp: a profile of steps with a linearly increasing rate
+    burst: a profile alternating a base rate and a burst rate
+    poisson: a profile approximating Poisson arrivals with a given mean rate
+
+The load is generated by 'bmqtool.tsk' clients running 'batch-post' commands,
+i.e. the producers post at the requested rate regardless of how fast the
+broker acknowledges the messages.  Each step runs with a fresh set of
+producers and consumers started in latency mode, so that the ACK and PUSH
+latency reports written by 'bmqtool.tsk' on exit cover exactly one step.
+The clients also write a message log ('--log'), which the generator follows
+to measure a step until its last ACK, and to let the consumers receive all
+the acknowledged messages before they are stopped.
+
+Usage
+-----
+
+```
+from blazingmq.dev.it import loadgen
+
+def test_saturation(cluster, domain_urls):
+    generator = loadgen.LoadGenerator(
+        cluster,
+        [loadgen.Workload(domain_urls.uri_priority)],
+        producers_per_queue=4,
+    )
+    report = generator.run(
+        loadgen.ramp(100, 5000, steps=10, step_duration=5),
+        output=cluster.work_dir / "loadgen.json",
+    )
+```
+"""
+
+import itertools
+import json
+import logging
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from blazingmq.dev.it.latency import LatencyHistogram
+from blazingmq.dev.it.process.client import Client
+
+if TYPE_CHECKING:
+    from blazingmq.dev.it.cluster import Cluster
+
+logger = logging.getLogger(__name__)
+
+# Shortest interval, in seconds, between two bursts of posts in a
+# 'batch-post' command.
+MIN_POST_INTERVAL = 0.01
+
+# Extra time, in seconds, granted to the producers to finish posting a step
+# before it is considered failed.
+POST_TIMEOUT_SLACK = 30
+
+# Time, in seconds, granted to the consumers to receive the acknowledged
+# messages once the producers are done.
+DRAIN_TIMEOUT = 30
+
+# Interval, in seconds, between two reads of the message logs of the clients.
+POLL_INTERVAL = 0.05
+
+# A step is considered saturated if less than this fraction of the posted
+# messages were acknowledged, or if posting took longer than the step duration
+# by more than this fraction.
+SATURATION_TOLERANCE = 0.05
+
+
+@dataclass(frozen=True)
+class Step:
+    """Post 'rate' events per second during 'duration' seconds."""
+
+    rate: float
+    duration: float
+
+
+@dataclass(frozen=True)
+class Workload:
+    """
+    Post to the queue specified by 'uri', and consume from each of the
+    specified 'consumer_uris' (which default to 'uri').  For a fanout queue,
+    'consumer_uris' should contain one URI per app id; for a broadcast queue,
+    several consumers may be specified with the same URI.  Each consumer is
+    expected to receive every message posted to the queue.
+    """
+
+    uri: str
+    consumer_uris: Tuple[str, ...] = ()
+
+    @property
+    def readers(self) -> Tuple[str, ...]:
+        return self.consumer_uris or (self.uri,)
+
+    @classmethod
+    def fanout(cls, uri: str, app_ids: Iterable[str]) -> "Workload":
+        return cls(uri, tuple(f"{uri}?id={app_id}" for app_id in app_ids))
+
+
+@dataclass
+class StepResult:
+    """Measurements collected during one step."""
+
+    rate: float
+    duration: float
+    messages_offered: int
+    messages_posted: int
+    messages_acked: int
+    messages_nacked: int
+    elapsed: float
+    ack_latency: Dict[str, int] = field(default_factory=dict)
+    push_latency: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def offered_msgs_per_sec(self) -> float:
+        return self.messages_offered / self.duration if self.duration else 0.0
+
+    @property
+    def achieved_msgs_per_sec(self) -> float:
+        return self.messages_acked / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def saturated(self) -> bool:
+        return self.messages_acked < self.messages_offered * (
+            1 - SATURATION_TOLERANCE
+        ) or self.elapsed > self.duration * (1 + SATURATION_TOLERANCE)
+
+    def to_dict(self) -> dict:
+        result = asdict(self)
+        result["offered_msgs_per_sec"] = self.offered_msgs_per_sec
+        result["achieved_msgs_per_sec"] = self.achieved_msgs_per_sec
+        result["saturated"] = self.saturated
+        return result
+
+
+# =============================================================================
+#                                  PROFILES
+# =============================================================================
+
+
+def constant_rate(rate: float, duration: float) -> List[Step]:
+    """Return a profile posting 'rate' events per second for 'duration'."""
+    return [Step(rate, duration)]
+
+
+def ramp(
+    start_rate: float, end_rate: float, steps: int, step_duration: float
+) -> List[Step]:
+    """
+    Return a profile of the specified number of 'steps' of 'step_duration'
+    seconds each, with a rate increasing linearly from 'start_rate' to
+    'end_rate'.
+    """
+    if steps == 1:
+        return [Step(start_rate, step_duration)]
+    increment = (end_rate - start_rate) / (steps - 1)
+    return [Step(start_rate + i * increment, step_duration) for i in range(steps)]
+
+
+def burst(
+    base_rate: float,
+    burst_rate: float,
+    period: float,
+    burst_duration: float,
+    duration: float,
+) -> List[Step]:
+    """
+    Return a profile lasting 'duration' seconds, posting 'burst_rate' events
+    per second during the first 'burst_duration' seconds of every 'period',
+    and 'base_rate' events per second the rest of the time.
+    """
+    assert 0 < burst_duration < period
+    profile = []
+    elapsed = 0.0
+    while elapsed < duration:
+        high = min(burst_duration, duration - elapsed)
+        profile.append(Step(burst_rate, high))
+        elapsed += high
+        low = min(period - burst_duration, duration - elapsed)
+        if low > 0:
+            profile.append(Step(base_rate, low))
+            elapsed += low
+    return profile
+
+
+def poisson(
+    mean_rate: float,
+    duration: float,
+    slice_duration: float = 1.0,
+    seed: Optional[int] = None,
+) -> List[Step]:
+    """
+    Return a profile lasting 'duration' seconds approximating Poisson arrivals
+    with the specified 'mean_rate' of events per second.  The profile is
+    divided in slices of 'slice_duration' seconds, the rate of each slice
+    being the number of arrivals drawn for that slice.  The optionally
+    specified 'seed' makes the profile reproducible.
+    """
+    rng = random.Random(seed)
+    profile = []
+    for start in itertools.takewhile(
+        lambda start: start < duration, itertools.count(0.0, slice_duration)
+    ):
+        length = min(slice_duration, duration - start)
+        arrivals = 0
+        clock = rng.expovariate(mean_rate)
+        while clock < length:
+            arrivals += 1
+            clock += rng.expovariate(mean_rate)
+        profile.append(Step(arrivals / length, length))
+    return profile
+
+
+def pacing(rate: float) -> Tuple[float, int]:
+    """
+    Return the '(post_interval, post_rate)' arguments of 'Client.batch_post'
+    achieving the specified 'rate' of events per second as closely as
+    possible.
+    """
+    assert rate > 0
+    post_rate = max(1, round(rate * MIN_POST_INTERVAL))
+    post_interval = max(MIN_POST_INTERVAL, round(post_rate / rate, 3))
+    return post_interval, post_rate
+
+
+# =============================================================================
+#                                LOAD GENERATOR
+# =============================================================================
+
+
+class _MessageLog:
+    """
+    Count the records of the specified 'category' ('ACK' or 'PUSH') in the
+    message log that a 'bmqtool.tsk' client started with '--log' writes at the
+    specified 'path', reading only what was appended since the last update.
+    NAKs are logged as ACK records with a status other than 'SUCCESS', and are
+    also counted in 'failed'.
+    """
+
+    def __init__(self, path: Path, category: str):
+        self.path = path
+        self.failed = 0
+        self._category = category.encode()
+        self._offset = 0
+        self._complete = (0, 0)
+        # Records start with a newline: the last one is not terminated.
+        self._last = b""
+
+    def _count(self, record: bytes) -> Tuple[int, int]:
+        """
+        Return 1 and whether the specified 'record' is a NAK if it is of the
+        category of this log, and (0, 0) otherwise.
+        """
+        # Record format: "<timestamp> <pid>:<tid> <severity> <category> ...",
+        # ACK records ending with "<uri>|<correlationId>|<GUID>|<status>|".
+        fields = record.split(maxsplit=4)
+        if len(fields) < 4 or fields[3] != self._category:
+            return 0, 0
+        parts = record.split(b"|")
+        # The status of the last record may not be fully written yet.
+        failed = self._category == b"ACK" and len(parts) > 4 and parts[3] != b"SUCCESS"
+        return 1, int(failed)
+
+    def update(self) -> int:
+        """
+        Return the number of records written so far, and update the number
+        of 'failed' ones.
+        """
+        try:
+            with self.path.open("rb") as file:
+                file.seek(self._offset)
+                data = file.read()
+        except FileNotFoundError:
+            data = b""
+        self._offset += len(data)
+        records = (self._last + data).split(b"\n")
+        self._last = records.pop()
+        count, failed = self._complete
+        for record in records:
+            record_count, record_failed = self._count(record)
+            count += record_count
+            failed += record_failed
+        self._complete = (count, failed)
+        last_count, last_failed = self._count(self._last)
+        self.failed = failed + last_failed
+        return count + last_count
+
+
+def _wait_for_count(logs: Sequence[_MessageLog], expected: int, deadline: float) -> int:
+    """
+    Wait until the specified message 'logs' hold together the 'expected'
+    number of records, or until the 'deadline' (on the monotonic clock).
+    Return the number of records.
+    """
+    while True:
+        count = sum(log.update() for log in logs)
+        if count >= expected or time.monotonic() >= deadline:
+            return count
+        time.sleep(POLL_INTERVAL)
+
+
+class LoadGenerator:
+    """
+    Run profiles of steps against a cluster, posting to the queues of the
+    specified 'workloads'.
+    """
+
+    def __init__(
+        self,
+        cluster: "Cluster",
+        workloads: Sequence[Workload],
+        *,
+        producers_per_queue: int = 1,
+        msg_size: int = 1024,
+        event_size: int = 1,
+        latency: str = "epoch",
+    ):
+        self.cluster = cluster
+        self.workloads = list(workloads)
+        self.producers_per_queue = producers_per_queue
+        self.msg_size = msg_size
+        self.event_size = event_size
+        self.latency = latency
+        self._run_id = itertools.count()
+
+    def run(
+        self,
+        profile: Sequence[Step],
+        output: Optional[Path] = None,
+        isolate_steps: bool = True,
+    ) -> dict:
+        """
+        Run the specified 'profile' and return a report.  If 'output' is
+        specified, also write the report in JSON format to that path.
+
+        If 'isolate_steps' is True, each step is run with a fresh set of
+        clients and measured separately, which is what ramps looking for a
+        saturation point need.  Otherwise, the steps are posted back-to-back
+        by the same clients and measured as a whole, which is what bursts and
+        Poisson arrivals need.  Note that in the latter mode, steps with a null
+        rate do not pause the producers.
+
+        The report contains the measurements of each step (or of the whole
+        profile), and the index of the first saturated one, if any.
+        """
+        if isolate_steps:
+            results = [self.run_steps([step]) for step in profile]
+        else:
+            results = [self.run_steps(profile)]
+
+        saturation = next(
+            (index for index, result in enumerate(results) if result.saturated),
+            None,
+        )
+        report = {
+            "workloads": [asdict(workload) for workload in self.workloads],
+            "producers_per_queue": self.producers_per_queue,
+            "msg_size": self.msg_size,
+            "event_size": self.event_size,
+            "steps": [result.to_dict() for result in results],
+            "saturation_step": saturation,
+        }
+
+        if output is not None:
+            with Path(output).open("w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2)
+
+        return report
+
+    def run_steps(self, steps: Sequence[Step]) -> StepResult:
+        """
+        Post at the rates of the specified 'steps', one after the other, with
+        a fresh set of clients, and return the collected measurements.
+        """
+        run_id = next(self._run_id)
+        report_dir = self.cluster.work_dir / "loadgen" / str(run_id)
+        report_dir.mkdir(parents=True, exist_ok=True)
+        proxies = self.cluster.proxy_cycle()
+
+        def create_client(name: str, category: str) -> Tuple[Client, _MessageLog]:
+            message_log = _MessageLog(report_dir / f"{name}.log", category)
+            client = next(proxies).create_client(
+                f"loadgen{run_id}_{name}",
+                dump_messages=False,
+                options=["--confirmmsg", "--log", str(message_log.path)],
+                latency=self.latency,
+                latency_report=report_dir / f"{name}.json",
+            )
+            return client, message_log
+
+        consumers = []
+        producers = []
+        # Message logs of the producers and of the consumers, by workload.
+        ack_logs: List[List[_MessageLog]] = []
+        push_logs: List[List[_MessageLog]] = []
+        for qid, workload in enumerate(self.workloads):
+            push_logs.append([])
+            for cid, uri in enumerate(workload.readers):
+                consumer, push_log = create_client(f"consumer{qid}_{cid}", "PUSH")
+                consumer.open(uri, flags=["read"], succeed=True)
+                consumers.append(consumer)
+                push_logs[-1].append(push_log)
+            ack_logs.append([])
+            for pid in range(self.producers_per_queue):
+                producer, ack_log = create_client(f"producer{qid}_{pid}", "ACK")
+                producer.open(workload.uri, flags=["write", "ack"], succeed=True)
+                producers.append((producer, workload.uri))
+                ack_logs[-1].append(ack_log)
+
+        # Each producer posts its share of each step's rate.  'bmqtool.tsk'
+        # executes the 'batch-post' commands one after the other, so the steps
+        # are queued upfront, and the producers run concurrently.
+        batches = []
+        for step in steps:
+            producer_rate = step.rate / len(producers)
+            events_count = round(producer_rate * step.duration)
+            if events_count > 0:
+                batches.append((events_count, *pacing(producer_rate)))
+
+        duration = sum(step.duration for step in steps)
+        start = time.monotonic()
+        for producer, uri in producers:
+            for events_count, post_interval, post_rate in batches:
+                producer.batch_post(
+                    uri,
+                    msg_size=self.msg_size,
+                    event_size=self.event_size,
+                    events_count=events_count,
+                    post_interval=post_interval,
+                    post_rate=post_rate,
+                )
+
+        deadline = start + duration + POST_TIMEOUT_SLACK
+        posted = 0
+        for producer, _ in producers:
+            for events_count, _, _ in batches:
+                remaining = deadline - time.monotonic()
+                if not producer.outputs_substr(
+                    "All messages have been posted", timeout=max(remaining, 0)
+                ):
+                    break
+                posted += events_count * self.event_size
+        if not batches:
+            time.sleep(duration)
+
+        # The step lasts until the last ACK or NAK.
+        _wait_for_count([log for logs in ack_logs for log in logs], posted, deadline)
+        elapsed = time.monotonic() - start
+
+        # Producers write their ACK latency report on exit.
+        for producer, _ in producers:
+            producer.exit_gracefully()
+            producer.wait()
+        acked = []
+        nacked = []
+        for logs in ack_logs:
+            records = sum(log.update() for log in logs)
+            nacked.append(sum(log.failed for log in logs))
+            acked.append(records - nacked[-1])
+
+        # Consumers are stopped once they received every acknowledged message.
+        deadline = time.monotonic() + DRAIN_TIMEOUT
+        for workload, logs, workload_acked in zip(self.workloads, push_logs, acked):
+            expected = workload_acked * len(workload.readers)
+            if _wait_for_count(logs, expected, deadline) < expected:
+                logger.warning(
+                    "load run %s: consumers of %s did not receive all the"
+                    " acknowledged messages within %ss",
+                    run_id,
+                    workload.uri,
+                    DRAIN_TIMEOUT,
+                )
+        for consumer in consumers:
+            consumer.exit_gracefully()
+            consumer.wait()
+
+        ack_latency = LatencyHistogram.merged(
+            producer.latency_histogram() for producer, _ in producers
+        )
+        push_latency = LatencyHistogram.merged(
+            consumer.latency_histogram() for consumer in consumers
+        )
+
+        result = StepResult(
+            rate=sum(step.rate * step.duration for step in steps) / duration,
+            duration=duration,
+            messages_offered=sum(batch[0] for batch in batches)
+            * self.event_size
+            * len(producers),
+            messages_posted=posted,
+            messages_acked=sum(acked),
+            messages_nacked=sum(nacked),
+            elapsed=elapsed,
+            ack_latency=ack_latency.summary(),
+            push_latency=push_latency.summary(),
+        )
+        logger.info("load run %s: %s", run_id, result.to_dict())
+        return result
@@ -20,24 +20,32 @@ blazingmq.dev.it.process.admin
 PURPOSE: Provide a BMQ admin client.
 """
 
-import json
-from typing import Union, Dict, Any
+import itertools
+import re
+import threading
+from concurrent.futures import Future
+from typing import Union, Dict, Any, Optional
 
-from blazingmq.schemas import broker
-from .rawclient import RawClient
+from blazingmq.schemas import broker, protocol
+from blazingmq.util import fastjson
+from .rawclient import CLIENT_IDENTITY_TEMPLATE, RawClient
+
+ADMIN_COMMAND_TEMPLATE = protocol.ControlTemplate(
+    broker.ADMIN_COMMAND_SCHEMA, rid=("rId",), command=("adminCommand", "command")
+)
+
+_RID_PATTERN = re.compile(rb'"rId"\s*:\s*(\d+)')
 
 
 class AdminClient(RawClient):
-    @classmethod
-    def _make_admin_command(cls, message: str) -> bytes:
+    def _make_admin_command(self, message: str, rid: int = 0) -> bytes:
         """
         Wraps the specified 'message' with admin command and returns it as raw
-        bytes control message.
+        bytes control message, with the specified request id 'rid'.
         """
-        command = broker.ADMIN_COMMAND_SCHEMA
-        command["adminCommand"]["command"] = message
-
-        return cls._wrap_control_event(command)
+        return self.render(
+            ADMIN_COMMAND_TEMPLATE, "ControlMessage", rid=rid, command=message
+        )
 
     def send_admin(self, admin_command: str) -> Union[dict, str]:
         """
@@ -58,10 +66,14 @@ class AdminClient(RawClient):
 
         self.open_channel(host, port)
 
-        admin_client_identity = broker.CLIENT_IDENTITY_SCHEMA
-        admin_client_identity["clientIdentity"]["clientType"] = "E_TCPADMIN"
-
-        self._send_raw(self._wrap_control_event(admin_client_identity))
+        self._send_raw(
+            self.render(
+                CLIENT_IDENTITY_TEMPLATE,
+                "NegotiationMessage",
+                client_type="E_TCPADMIN",
+                features=f"PROTOCOL_ENCODING:{self._encoding}",
+            )
+        )
         self._receive_event()
 
     # Admin APIs
@@ -84,6 +96,103 @@ class AdminClient(RawClient):
         #     }
         # }
         # Need to look up to configJson and parse the string
-        domain_stats = json.loads(admin_response)
+        domain_stats = fastjson.loads(admin_response)
         config_json = domain_stats["domainInfo"]["configJson"]
-        return json.loads(config_json)
+        return fastjson.loads(config_json)
+
+
+class AdminSession(AdminClient):
+    """
+    An admin client that stays connected: the receiver thread of the client
+    receives the responses and answers the heartbeats of the broker, so that
+    the session survives idle periods.  Requests are tagged with distinct
+    request ids ('rId'), so that several threads can have requests in flight
+    at the same time on the same connection.
+    """
+
+    def __init__(
+        self,
+        *,
+        verbose: bool = False,
+        socket_timeout: float = 10.0,
+        encoding: str = "JSON",
+    ):
+        super().__init__(
+            verbose=verbose, socket_timeout=socket_timeout, encoding=encoding
+        )
+        self._rids = itertools.count(1)
+        self._pending: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def is_connected(self) -> bool:
+        return self._receiver is not None and self._receiver.is_alive()
+
+    def connect(self, host: str, port: int) -> None:
+        super().connect(host, port)
+        self.start_receiver()
+
+    def _deliver(self, header: bytes, body: bytes) -> None:
+        try:
+            response = self.decode_event_bytes(header, body)
+        except ValueError as exc:
+            # The event is lost, and so is its request id, unless it can be
+            # found in the JSON text: fail the requests it may answer, and
+            # keep receiving.
+            match = _RID_PATTERN.search(body)
+            with self._lock:
+                if match is not None and int(match[1]) in self._pending:
+                    failed = [self._pending.pop(int(match[1]))]
+                else:
+                    failed, self._pending = list(self._pending.values()), {}
+            for future in failed:
+                future.set_exception(
+                    ValueError(f"Failed to decode admin response: {exc}")
+                )
+            return
+
+        with self._lock:
+            future = self._pending.pop(response.get("rId"), None)
+        if future is None:
+            return
+        if "adminCommandResponse" in response:
+            future.set_result(response["adminCommandResponse"]["text"])
+        else:
+            future.set_exception(RuntimeError(f"Unexpected admin response: {response}"))
+
+    def _on_receiver_exit(self, error: Exception) -> None:
+        super()._on_receiver_exit(error)
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(ConnectionError(f"Admin session closed: {error}"))
+
+    def request(self, admin_command: str) -> "Future[str]":
+        """
+        Send the specified 'admin_command' and return a future holding the
+        command execution results.
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._receiver_error is not None or self._channel is None:
+                raise ConnectionError(f"Admin session closed: {self._receiver_error}")
+            rid = next(self._rids)
+            self._pending[rid] = future
+        try:
+            self._send_raw(self._make_admin_command(admin_command, rid))
+        except ConnectionError:
+            with self._lock:
+                self._pending.pop(rid, None)
+            raise
+        return future
+
+    def send_admin(
+        self, admin_command: str, timeout: Optional[float] = None
+    ) -> Union[dict, str]:
+        """
+        Send the specified 'admin_command' and wait up to 'timeout' (by
+        default, the socket timeout) for its execution results.
+        """
+        return self.request(admin_command).result(
+            self._socket_timeout if timeout is None else timeout
+        )
@@ -27,14 +27,23 @@ import itertools
 import os
 import re
 import signal
+import threading
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional, TypeVar
 
 import blazingmq.dev.configurator.configurator as cfg
-from blazingmq.dev.it.process.admin import AdminClient
+from blazingmq.dev.it.process.admin import AdminClient, AdminSession
 import blazingmq.dev.it.process.bmqproc
 import blazingmq.dev.it.testconstants as tc
 from blazingmq.dev.it.process import proc
+from blazingmq.dev.it.process.results import (
+    ClusterStatus,
+    PartitionSummary,
+    QueueInternals,
+    StorageSummary,
+    unwrap,
+)
+from blazingmq.util import fastjson
 from blazingmq.dev.it.util import ListContextManager, Queue, internal_use, wait_until
 
 if TYPE_CHECKING:
@@ -76,6 +85,8 @@ class Broker(blazingmq.dev.it.process.bmqproc.BMQProcess):
         self.cluster_name = cluster.name
         self._pid = None
         self._auto_id = itertools.count(1)
+        self._admin_session: Optional[AdminSession] = None
+        self._admin_session_lock = threading.Lock()
 
         if len(cluster.config.nodes) == 1:
             self.last_known_leader = self
@@ -263,6 +274,55 @@ class Broker(blazingmq.dev.it.process.bmqproc.BMQProcess):
         """
         self.command(f"DOMAINS DOMAIN {domain} QUEUE {queue} INTERNALS")
 
+    def admin_command(self, command: str, timeout=BLOCK_TIMEOUT) -> dict:
+        """
+        Send the specified admin 'command' over the admin session of this
+        broker, with JSON encoding, and return the decoded response.  Raise an
+        exception if no response arrives within 'timeout' seconds.
+        """
+
+        response = self.admin_session().send_admin(
+            f"ENCODING JSON_COMPACT {command}", timeout=timeout
+        )
+        return fastjson.loads(response)
+
+    def queue_internals(self, domain, queue) -> QueueInternals:
+        """
+        Return the state of the specified 'queue' in the specified 'domain'.
+        Raise 'CommandError' if the queue is not open on this broker.
+        """
+
+        response = self.admin_command(
+            f"DOMAINS DOMAIN {domain} QUEUE {queue} INTERNALS"
+        )
+        return QueueInternals.from_json(unwrap(response, "queueInternals"))
+
+    def storage_summary(self, cluster=None) -> StorageSummary:
+        """
+        Return the summary of the storage of the specified 'cluster' on this
+        broker, i.e. the state of each partition and the queues it contains.
+        """
+
+        if cluster is None:
+            cluster = self.cluster_name
+
+        response = self.admin_command(f"CLUSTERS CLUSTER {cluster} STORAGE SUMMARY")
+        return StorageSummary.from_json(unwrap(response, "clusterStorageSummary"))
+
+    def cluster_status(self, cluster=None) -> ClusterStatus:
+        """
+        Return the status of the specified 'cluster' as seen by this broker,
+        either a node or a proxy of the cluster.
+        """
+
+        if cluster is None:
+            cluster = self.cluster_name
+
+        response = self.admin_command(f"CLUSTERS CLUSTER {cluster} STATUS")
+        if "clusterProxyStatus" in response:
+            return ClusterStatus.from_json(response["clusterProxyStatus"])
+        return ClusterStatus.from_json(unwrap(response, "clusterStatus"))
+
     def queue_helper(self, cluster=None):
         """
         Dump state of the specified 'cluster'.
@@ -311,17 +371,19 @@ class Broker(blazingmq.dev.it.process.bmqproc.BMQProcess):
                 )
 
     def get_storage_partition_summary(
-        self, partitionId: int, succeed=None, timeout=None
-    ):
+        self, partitionId: int, timeout=BLOCK_TIMEOUT
+    ) -> PartitionSummary:
         """
-        Get storage partition summary for a cluster specified by 'partitionId'.
+        Return the storage summary of the partition specified by
+        'partitionId'.  Raise 'CommandError' if there is no such partition.
         """
 
-        return self.command(
+        response = self.admin_command(
             f"CLUSTERS CLUSTER {self.cluster_name} STORAGE PARTITION {partitionId} SUMMARY",
-            succeed,
             timeout=timeout,
         )
+        summary = StorageSummary.from_json(unwrap(response, "clusterStorageSummary"))
+        return summary.partitions[partitionId]
 
     def set_replication_factor(self, quorum, cluster=None, succeed=None):
         """
@@ -346,6 +408,32 @@ class Broker(blazingmq.dev.it.process.bmqproc.BMQProcess):
         admin.connect(self.config.host, int(self.config.port))
         return admin
 
+    def admin_session(self) -> AdminSession:
+        """
+        Return the persistent admin session to this broker, connecting it
+        first if it is not connected (e.g. because the broker restarted).
+        The session is shared by all the callers, and is closed when the
+        broker is stopped or killed.
+        """
+        with self._admin_session_lock:
+            session = self._admin_session
+            if session is None or not session.is_connected:
+                if session is not None:
+                    session.stop()
+                session = AdminSession()
+                session.connect(self.config.host, int(self.config.port))
+                self._admin_session = session
+            return session
+
+    def close_admin_session(self) -> None:
+        """
+        Close the persistent admin session to this broker, if any.
+        """
+        with self._admin_session_lock:
+            if self._admin_session is not None:
+                self._admin_session.stop()
+                self._admin_session = None
+
     def _is_healthy(self, admin: AdminClient) -> bool:
         """
         Return 'True' if this broker sees itself in a healthy state,
@@ -353,31 +441,32 @@ class Broker(blazingmq.dev.it.process.bmqproc.BMQProcess):
         This is an implementation function that expects the caller code to
         manage AdminClient lifetime efficiently.
         """
-        res = admin.send_admin(f"CLUSTERS CLUSTER {self.cluster_name} STATUS")
-        assert isinstance(res, str)
-        mm = re.search(r"Is Healthy\s*:\s*(\w+)", res)
-        return mm is not None and mm.group(1) == "Yes"
+        res = fastjson.loads(
+            admin.send_admin(
+                f"ENCODING JSON_COMPACT CLUSTERS CLUSTER {self.cluster_name} STATUS"
+            )
+        )
+        status = res.get("clusterStatus") or res.get("clusterProxyStatus") or {}
+        return status.get("isHealthy", False)
 
     def is_healthy(self) -> bool:
         """
         Return 'True' if this broker sees itself in a healthy state,
         'False' otherwise.
-        Note that this check actively opens an admin connection to the broker
-        and sends an admin command, altering the state of the broker.
+        Note that this check sends an admin command over the admin session of
+        the broker, altering the state of the broker.
         """
-        admin = self.open_admin_client()
-        return self._is_healthy(admin)
+        return self._is_healthy(self.admin_session())
 
     def wait_healthy(self) -> None:
         """
         Wait up to 'BLOCK_TIMEOUT' until this broker becomes healthy, or raise
         an exception if it does not.
-        Note that this check actively opens an admin connection to the broker
-        and sends an admin command, altering the state of the broker.
+        Note that this check sends admin commands over the admin session of
+        the broker, altering the state of the broker.
         """
-        admin = self.open_admin_client()
         wait_until(
-            lambda: self._is_healthy(admin),
+            lambda: self._is_healthy(self.admin_session()),
             timeout=BLOCK_TIMEOUT,
         )
 
@@ -535,7 +624,12 @@ class Broker(blazingmq.dev.it.process.bmqproc.BMQProcess):
             ]
         )
 
+    def kill(self):
+        self.close_admin_session()
+        super().kill()
+
     def exit_gracefully(self):
+        self.close_admin_session()
         self._logger.info(f"sending SIGINT to {self.pid}")
         self._process.send_signal(signal.SIGINT)
 
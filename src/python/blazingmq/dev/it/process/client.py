@@ -22,20 +22,144 @@ PURPOSE: Provide a BMQ client.
 Provide a subclass of 'ito.proc.Process' that wraps 'bmqtool.tsk'.
 """
 
-from collections import namedtuple
+from array import array
 import json
 import re
 import subprocess
+import sys
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional, List, NamedTuple
+from typing import Any, Callable, Dict, FrozenSet, Optional, List, NamedTuple, Set
 
+from blazingmq.dev.it.latency import LatencyHistogram
 from blazingmq.dev.it.process import bmqproc
 from blazingmq.dev.it.process.bmqproc import BMQProcess
 
 from blazingmq.dev.it.testconstants import *
 from blazingmq.dev.it.util import internal_use, ListContextManager, Queue
 
-Message = namedtuple("Message", "guid, uri, correlationId, payload")
+
+class MessageBuffer:
+    """
+    Compact storage for the messages of a listing.  GUIDs are kept as 16-byte
+    binary values, and payloads as UTF-8 encoded bytes, in contiguous buffers.
+    URIs and correlation ids are interned, as they repeat across messages.
+    """
+
+    __slots__ = ("_guids", "_payloads", "_offsets", "_irregular_guids")
+
+    def __init__(self):
+        self._guids = bytearray()
+        self._payloads = bytearray()
+        self._offsets = array("Q", [0])
+        self._irregular_guids: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def append(
+        self, guid: str, uri: str, correlationId: str, payload: str
+    ) -> "Message":
+        """Store the specified message fields and return a 'Message'."""
+        index = len(self)
+        # 'bmqtool.tsk' prints GUIDs as 32 upper case hexadecimal digits.
+        # Anything else (e.g. GUIDs made up by unit tests) is kept verbatim.
+        guid_bytes = None
+        if len(guid) == 32 and guid == guid.upper():
+            try:
+                guid_bytes = bytes.fromhex(guid)
+            except ValueError:
+                pass
+        if guid_bytes is None or len(guid_bytes) != 16:
+            guid_bytes = bytes(16)
+            self._irregular_guids[index] = guid
+        self._guids += guid_bytes
+        self._payloads += payload.encode()
+        self._offsets.append(len(self._payloads))
+        return Message.from_buffer(self, index, uri, correlationId)
+
+    def guid(self, index: int) -> str:
+        irregular = self._irregular_guids.get(index)
+        if irregular is not None:
+            return irregular
+        return self._guids[index * 16 : (index + 1) * 16].hex().upper()
+
+    def payload(self, index: int) -> str:
+        with memoryview(self._payloads) as view:
+            return str(view[self._offsets[index] : self._offsets[index + 1]], "utf-8")
+
+
+class Message:
+    """
+    A message listed by a client, with the 'guid', 'uri', 'correlationId' and
+    'payload' attributes.  The fields are kept in a shared 'MessageBuffer',
+    and the payload is decoded on access.  For compatibility, a message also
+    behaves like a '(guid, uri, correlationId, payload)' tuple.
+    """
+
+    __slots__ = ("uri", "correlationId", "_buffer", "_index")
+
+    _fields = ("guid", "uri", "correlationId", "payload")
+
+    def __init__(self, guid: str, uri: str, correlationId: str, payload: str):
+        buffer = MessageBuffer()
+        buffer.append(guid, uri, correlationId, payload)
+        self._init(buffer, 0, uri, correlationId)
+
+    @classmethod
+    def from_buffer(
+        cls, buffer: MessageBuffer, index: int, uri: str, correlationId: str
+    ) -> "Message":
+        """Return the message at the specified 'index' of 'buffer'."""
+        message = cls.__new__(cls)
+        message._init(buffer, index, uri, correlationId)
+        return message
+
+    def _init(
+        self, buffer: MessageBuffer, index: int, uri: str, correlationId: str
+    ) -> None:
+        self.uri = sys.intern(uri)
+        self.correlationId = sys.intern(correlationId)
+        self._buffer = buffer
+        self._index = index
+
+    @property
+    def guid(self) -> str:
+        return self._buffer.guid(self._index)
+
+    @property
+    def payload(self) -> str:
+        return self._buffer.payload(self._index)
+
+    def _astuple(self):
+        return (self.guid, self.uri, self.correlationId, self.payload)
+
+    def _asdict(self) -> Dict[str, str]:
+        return dict(zip(self._fields, self._astuple()))
+
+    def __iter__(self):
+        return iter(self._astuple())
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __getitem__(self, index):
+        return self._astuple()[index]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Message):
+            other = other._astuple()
+        elif not isinstance(other, tuple):
+            return NotImplemented
+        return self._astuple() == other
+
+    def __hash__(self) -> int:
+        return hash(self._astuple())
+
+    def __repr__(self) -> str:
+        return (
+            f"Message(guid={self.guid!r}, uri={self.uri!r}, "
+            f"correlationId={self.correlationId!r}, payload={self.payload!r})"
+        )
 
 
 class CommandResult(NamedTuple):
@@ -102,6 +226,8 @@ class Client(BMQProcess):
         tool_path: Path,
         options=None,
         dump_messages=True,
+        latency: Optional[str] = None,
+        latency_report: Optional[Path] = None,
         **kwargs,
     ):
         if options is None:
@@ -112,6 +238,17 @@ class Client(BMQProcess):
         if dump_messages:
             options.append("-d")
 
+        # If 'latency' ('hires' or 'epoch') is specified, 'bmqtool.tsk'
+        # measures the ACK or PUSH latency of each message, and writes a
+        # report to 'latency_report' (relative to the working directory of
+        # the process) on exit.
+        self.latency_report: Optional[Path] = None
+        if latency is not None:
+            if latency_report is None:
+                latency_report = Path(f"{name}.latency.json")
+            options += ["--latency", latency, "--latency-report", str(latency_report)]
+            self.latency_report = Path(kwargs.get("cwd") or ".") / latency_report
+
         super().__init__(
             name,
             [
@@ -137,6 +274,17 @@ class Client(BMQProcess):
         self._logger.info("send: command = %s", command)
         self.write_stdin(command + "\n").flush_stdin()
 
+    def latency_histogram(self) -> LatencyHistogram:
+        """
+        Return the latencies recorded by this client, which must have been
+        created in latency mode.  The report is written when the process
+        exits; return an empty histogram if it does not exist.
+        """
+        assert self.latency_report is not None, f"{self.name}: not in latency mode"
+        if not self.latency_report.exists():
+            return LatencyHistogram()
+        return LatencyHistogram.from_report(self.latency_report)
+
     def start_session(self, block=None, succeed=None, no_except=None, **kw):
         """
         Start the client.  If 'block' is specified and is True, wait for the
@@ -315,8 +463,19 @@ class Client(BMQProcess):
         events_count: int = 0,
         post_interval: float = 1,
         post_rate: int = 1,
+        block=None,
+        timeout=None,
     ):
-        """ """
+        """
+        Post 'events_count' events of 'event_size' messages each to the queue
+        with the specified 'uri', 'post_rate' events every 'post_interval'
+        seconds.  Each message contains the specified 'payload' if specified,
+        or 'msg_size' bytes otherwise.  If 'block' is specified and is True,
+        wait up to the optionally specified 'timeout' for all the messages to
+        be posted.  In blocking mode, return 'e_SUCCESS' if all the messages
+        were posted, and 'e_UNKNOWN' otherwise.  In non-blocking mode, return
+        None.
+        """
         command = (
             'batch-post uri="'
             + uri
@@ -327,52 +486,55 @@ class Client(BMQProcess):
             + " eventsCount="
             + str(events_count)
             + " postInterval="
-            + str(post_interval * 1000)
+            + str(round(post_interval * 1000))
             + " postRate="
             + str(post_rate)
         )
 
         res = self._command_helper(
             command,
-            block=False,
-            pattern=None,
+            block=block,
+            pattern=r"All messages have been posted",
             succeed=None,
-            no_except=None,
+            no_except=True,
             extra_patterns=None,
+            timeout=timeout,
         )
         return res.error_code
 
-    def list(self, uri=None, block=None) -> List[Message]:
+    def list(self, uri=None, block=None) -> Optional[List[Message]]:
         """
         Send the 'list' command with the 'uri' argument, if specified.
         If 'block' is specified and is True, wait for the command
         to complete and return the messages as an array of tuples.
+        Otherwise, return None.
         """
 
         with internal_use(self):
             self.send("list" + f' uri="{uri}"' if uri else "list")
 
             if not block:
-                return
+                return None
 
-            m = self.capture(
+            listing: Optional[re.Match] = self.capture(
                 r"Unconfirmed message listing: (-?\d+) messages", timeout=blocktimeout
             )
-            if m is None:
+            if listing is None:
                 self._error(f"list did not complete within {blocktimeout}s")
                 return []
 
             msgs = []
-            for i in range(0, int(m[1])):
-                m = self.capture(
+            buffer = MessageBuffer()
+            for i in range(0, int(listing.group(1))):
+                match: Optional[re.Match] = self.capture(
                     "\\[([0-9a-fA-F]+)\\] Queue: '\\[ uri = (\\S+) correlationId = \\[ autoValue = (-?\\d+) \\] \\]' = '([^']*)'",
                     timeout=blocktimeout,
                 )
-                if m is None:
+                if match is None:
                     self._error(f"list timed out while waiting for message #{i + 1}")
                     return []
 
-                msgs.append(Message(m[1], m[2], m[3], m[4]))
+                msgs.append(buffer.append(*match.groups()))
 
             self._logger.info("list -> %s message(s)", len(msgs))
 
@@ -653,3 +815,239 @@ class Client(BMQProcess):
                 error_code = Client.e_UNKNOWN
                 raise_if_enabled(f"{command} succeeded but should have failed")
         return error_code
+
+
+class ClientPool:
+    """
+    A set of logical clients hosted by a single 'Client' process.
+
+    Tests that need many producers or consumers against the same broker do not
+    usually need one 'bmqtool.tsk' process per client.  A 'ClientPool' owns a
+    single 'Client' (the host) and hands out 'PooledClient' objects that share
+    the host's session.
+
+    'bmqtool.tsk' hosts one session, with at most one handle per queue URI, so
+    the logical clients opening the same URI share the handle of the host: it
+    is opened by the first of them, with its flags and options, and closed
+    when the last of them closes the queue.  The other clients must open the
+    queue with the same flags, and the broker sees a single producer or
+    consumer per pool and queue.
+    """
+
+    def __init__(self, host: Client):
+        self.host = host
+        # Logical clients sharing the host handle of each queue URI, in the
+        # order they opened it, and the flags of the handle.
+        self._clients: Dict[str, Dict["PooledClient", None]] = {}
+        self._flags: Dict[str, FrozenSet[str]] = {}
+
+    def __repr__(self):
+        return f"ClientPool({self.host.name})"
+
+    def create_client(self, name: str) -> "PooledClient":
+        """
+        Return a new logical client with the specified 'name', hosted by this
+        pool's process.
+        """
+        return PooledClient(name, self)
+
+    def acquire(self, client: "PooledClient", uri: str, flags: List[str]) -> bool:
+        """
+        Register the specified 'client' as a user of the host handle of the
+        specified 'uri', with the specified 'flags'.  Return 'True' if the
+        handle must be opened, i.e. if 'client' is its first user.  Raise an
+        'ITError' if 'client' already opened 'uri', or if the handle is opened
+        with other flags.
+        """
+        clients = self._clients.get(uri)
+        if clients is None:
+            self._clients[uri] = {client: None}
+            self._flags[uri] = frozenset(flags)
+            return True
+        if client in clients:
+            raise ITError(f"{client.name}: queue {uri} is already opened")
+        if frozenset(flags) != self._flags[uri]:
+            raise ITError(
+                f"{client.name}: queue {uri} is opened in {self.host.name} with"
+                f" flags {sorted(self._flags[uri])}, cannot share it with"
+                f" flags {sorted(flags)}"
+            )
+        clients[client] = None
+        return False
+
+    def check_opened(self, client: "PooledClient", uri: str) -> None:
+        """
+        Raise an 'ITError' if the specified 'uri' is not opened by the
+        specified 'client'.
+        """
+        if client not in self._clients.get(uri, ()):
+            raise ITError(f"{client.name}: queue {uri} is not opened by this client")
+
+    def release(self, client: "PooledClient", uri: str) -> bool:
+        """
+        Unregister the specified 'client' as a user of the host handle of the
+        specified 'uri'.  Return 'True' if the handle must be closed, i.e. if
+        'client' was its last user.
+        """
+        clients = self._clients.get(uri)
+        if clients is None or client not in clients:
+            return False
+        del clients[client]
+        if clients:
+            return False
+        del self._clients[uri]
+        del self._flags[uri]
+        return True
+
+    def uris(self, client: "PooledClient") -> Set[str]:
+        """Return the set of queue URIs opened by the specified 'client'."""
+        return {uri for uri, clients in self._clients.items() if client in clients}
+
+
+class PooledClient:
+    """
+    A logical client sharing a 'Client' process with the other clients of a
+    'ClientPool'.
+
+    The queue operations of 'Client' ('open', 'configure', 'post',
+    'batch_post', 'list', 'confirm' and 'close') are forwarded to the host
+    process, and are restricted to the queues opened by this logical client.
+    Several logical clients may open the same queue (see 'ClientPool'): e.g.
+    many producers posting to one queue.  The messages posted with 'post'
+    carry the name of the logical client in the 'pooledClient' string
+    property, so that consumers can tell the producers apart.
+
+    Note that all the logical clients of a pool share the same broker session:
+    session-level operations (e.g. 'start_session', 'wait_push_event') are not
+    available, and 'stop_session' only closes the queues of this client.
+    """
+
+    PROPERTY_NAME = "pooledClient"
+
+    def __init__(self, name: str, pool: ClientPool):
+        self.name = name
+        self.pool = pool
+
+    def __repr__(self):
+        return f"PooledClient({self.name} on {self.pool.host.name})"
+
+    @property
+    def host(self) -> Client:
+        return self.pool.host
+
+    def open(self, uri, flags: List[str], **kw):
+        """
+        Open the queue with the specified 'uri' and 'flags' for this client.
+        If the queue is already opened by another client of the pool, share
+        its handle: the options in 'kw' are ignored, and the result is the
+        one of a successful 'Client.open' with the same 'block' and
+        'succeed' arguments.
+        """
+        if not self.pool.acquire(self, uri, flags):
+            return Client.e_SUCCESS if kw.get("block") or kw.get("succeed") else None
+        try:
+            rc = self.host.open(uri, flags, **kw)
+        except Exception:
+            self.pool.release(self, uri)
+            raise
+        if rc is not None and rc != Client.e_SUCCESS:
+            self.pool.release(self, uri)
+        return rc
+
+    def configure(self, uri, **kw):
+        self.pool.check_opened(self, uri)
+        return self.host.configure(uri, **kw)
+
+    def post(self, uri, payload, **kw):
+        self.pool.check_opened(self, uri)
+        properties = list(kw.pop("messageProperties", []))
+        properties.append(
+            {"name": self.PROPERTY_NAME, "value": self.name, "type": "E_STRING"}
+        )
+        return self.host.post(uri, payload, messageProperties=properties, **kw)
+
+    def batch_post(self, uri: str, /, **kw):
+        self.pool.check_opened(self, uri)
+        return self.host.batch_post(uri, **kw)
+
+    def list(self, uri=None, block=None) -> Optional[List[Message]]:
+        """
+        Send the 'list' command for the specified 'uri' if specified, or for
+        all the queues of this client otherwise.  If 'block' is specified and
+        is True, wait for the command to complete and return the messages of
+        the queues opened by this client, including those of the queues it
+        shares with other clients of the pool.
+        """
+        if uri is not None:
+            self.pool.check_opened(self, uri)
+            return self.host.list(uri, block=block)
+
+        msgs = self.host.list(block=block)
+        if msgs is None:
+            return None
+        uris = self.pool.uris(self)
+        return [msg for msg in msgs if msg.uri in uris]
+
+    def confirm(self, uri, guid, **kw) -> Optional[int]:
+        self.pool.check_opened(self, uri)
+        return self.host.confirm(uri, guid, **kw)
+
+    def close(self, uri, **kw):
+        """
+        Close the queue with the specified 'uri' for this client.  The handle
+        of the host is closed only if no other client of the pool uses it.
+        """
+        self.pool.check_opened(self, uri)
+        if not self.pool.release(self, uri):
+            return Client.e_SUCCESS if kw.get("block") or kw.get("succeed") else None
+        return self.host.close(uri, **kw)
+
+    def stop_session(self, block=None, **kw):
+        """
+        Close all the queues opened by this client.  The session of the host
+        process is left untouched.
+        """
+        for uri in sorted(self.pool.uris(self)):
+            self.close(uri, block=block, **kw)
+
+    def open_priority_queues(self, count, start=0, uri_priority=URI_PRIORITY, **kw):
+        """
+        Open *distinct* priority queues with the options specified in 'kw'.
+        See 'Client.open_priority_queues'.
+        """
+        return ListContextManager(
+            [
+                Queue(self, f"{uri_priority}{i}", **kw)
+                for i in range(start, start + count)
+            ]
+        )
+
+    def open_broadcast_queues(self, count, start=0, **kw):
+        """
+        Open *distinct* broadcast queues with the options specified in 'kw'.
+        See 'Client.open_broadcast_queues'.
+        """
+        return ListContextManager(
+            [
+                Queue(self, f"{URI_BROADCAST}{i}", **kw)
+                for i in range(start, start + count)
+            ]
+        )
+
+    def open_fanout_queues(
+        self, count, start=0, appids=None, uri_fanout=URI_FANOUT, **kw
+    ):
+        """
+        Open *distinct* fanout queues with the options specified in 'kw'.
+        See 'Client.open_fanout_queues'.
+        """
+        return ListContextManager(
+            [Queue(self, f"{uri_fanout}{i}", **kw) for i in range(start, start + count)]
+            if appids is None
+            else [
+                ListContextManager(
+                    [Queue(self, f"{uri_fanout}{i}?id={id}", **kw) for id in appids]
+                )
+                for i in range(start, start + count)
+            ]
+        )
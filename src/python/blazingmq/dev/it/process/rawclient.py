@@ -20,19 +20,149 @@ blazingmq.dev.it.process.rawclient
 PURPOSE: Provide a BMQ raw client.
 """
 
+import collections
 import socket
-import json
-from typing import Optional, Tuple, Union
+import threading
+import time
+from typing import Deque, Iterator, Optional, Tuple, Union
 import base64
 
-from blazingmq.schemas import broker
+from blazingmq.schemas import ber, broker, protocol
+from blazingmq.schemas.protocol import EVENT_HEADER_SIZE
+from blazingmq.util import fastjson
+
+CLIENT_IDENTITY_TEMPLATE = protocol.ControlTemplate(
+    broker.CLIENT_IDENTITY_SCHEMA,
+    client_type=("clientIdentity", "clientType"),
+    features=("clientIdentity", "features"),
+)
+
+AUTHENTICATION_REQUEST_TEMPLATE = protocol.ControlTemplate(
+    broker.AUTHENTICATION_REQUEST_SCHEMA,
+    broker.EventType.AUTHENTICATION,
+    mechanism=("authenticationRequest", "mechanism"),
+    data=("authenticationRequest", "data"),
+)
+
+
+class EventReader:
+    """
+    Read BlazingMQ events from a socket into a reusable buffer.
+
+    Data is received with 'recv_into' as large chunks, which may contain
+    partial events or several events.  Events are returned as '(header,
+    body)' memoryviews into the buffer, without copying; they remain valid
+    until the next call to 'read_event'.
+    """
+
+    def __init__(self, sock: socket.socket, buffer_size: int = 64 * 1024):
+        self._socket = sock
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+        self._start = 0  # start of the first unread event
+        self._end = 0  # end of the received data
+
+    def _reserve(self, size: int) -> None:
+        """
+        Make room for at least 'size' bytes after the first unread event.
+        """
+        pending = self._end - self._start
+        if size > len(self._buffer):
+            # Views returned by previous calls prevent resizing the buffer;
+            # allocate a new one instead.
+            buffer = bytearray(max(size, 2 * len(self._buffer)))
+            buffer[:pending] = self._view[self._start : self._end]
+            self._buffer = buffer
+            self._view = memoryview(buffer)
+        elif self._start + size > len(self._buffer):
+            self._view[:pending] = self._view[self._start : self._end]
+        else:
+            return
+        self._start = 0
+        self._end = pending
+
+    def _fill(self, size: int) -> None:
+        """
+        Receive data until at least 'size' bytes are available after the
+        first unread event.
+        """
+        self._reserve(size)
+        while self._end - self._start < size:
+            try:
+                received = self._socket.recv_into(self._view[self._end :])
+            except socket.timeout as exc:
+                raise ConnectionError("Timeout while waiting for event") from exc
+            except OSError as exc:
+                raise ConnectionError(f"Failed to receive event: {exc}") from exc
+            if received == 0:
+                raise ConnectionError("Connection closed while receiving event")
+            self._end += received
+
+    def read_event(self) -> Tuple[memoryview, memoryview]:
+        """
+        Return the header and the body, excluding the padding bytes, of the
+        next event.
+        """
+        self._fill(EVENT_HEADER_SIZE)
+        start = self._start
+        event_size = int.from_bytes(self._view[start : start + 4], "big")
+        if event_size < EVENT_HEADER_SIZE:
+            raise ValueError(f"Invalid event size: {event_size}")
+
+        self._fill(event_size)
+        start = self._start
+        end = start + event_size
+        self._start = end
+
+        header = self._view[start : start + EVENT_HEADER_SIZE]
+        if event_size == EVENT_HEADER_SIZE:
+            return header, self._view[end:end]
+
+        body = self._view[start + EVENT_HEADER_SIZE : end]
+        try:
+            return header, protocol.strip_padding(body)
+        except ValueError as exc:
+            raise ValueError(
+                f"Invalid padding bytes value: {body[-1]}, "
+                "expected value in range [1, 4]"
+            ) from exc
+
+    def __iter__(self) -> Iterator[Tuple[memoryview, memoryview]]:
+        while True:
+            yield self.read_event()
 
 
 class RawClient:
-    def __init__(self, *, verbose: bool = False, socket_timeout: float = 10.0):
+    """
+    A client exchanging raw events with a broker.  Control messages are
+    encoded with the specified 'encoding', "JSON" or "BER", which is also the
+    encoding the client requests from the broker during negotiation.
+    """
+
+    ENCODINGS = ("JSON", "BER")
+
+    def __init__(
+        self,
+        *,
+        verbose: bool = False,
+        socket_timeout: float = 10.0,
+        encoding: str = "JSON",
+    ):
+        if encoding not in self.ENCODINGS:
+            raise ValueError(
+                f"Unknown encoding '{encoding}', expected one of {self.ENCODINGS}"
+            )
         self._channel: Optional[socket.socket] = None
+        self._reader: Optional[EventReader] = None
         self._socket_timeout = socket_timeout
         self._verbose = verbose
+        self._encoding = encoding
+        self._send_lock = threading.Lock()
+        self._receiver: Optional[threading.Thread] = None
+        self._receiver_error: Optional[Exception] = None
+        # Events queued by the receiver: header, body and request id, if any.
+        self._received: Deque[Tuple[bytes, bytes, Optional[int]]] = collections.deque()
+        self._received_condition = threading.Condition()
 
     @staticmethod
     def _wrap_control_event(payload: Union[str, dict]) -> bytes:
@@ -42,29 +172,7 @@ class RawClient:
 
         See also: bmqp::EventHeader
         """
-        if isinstance(payload, str):
-            payload_str = payload
-        else:
-            payload_str = json.dumps(payload)
-
-        padding_len = 4 - len(payload_str) % 4
-        padding = bytes([padding_len] * padding_len)
-
-        event_type = broker.EventType.CONTROL
-        type_specific = broker.TypeSpecific.ENCODING_JSON
-
-        control_header_bytes = 8
-        control_event_size = (
-            control_header_bytes + len(payload_str) + padding_len
-        ).to_bytes(4, "big")
-        control_event_desc = bytes([0x40 + event_type, 0x02, type_specific, 0x00])
-
-        return (
-            control_event_size
-            + control_event_desc
-            + payload_str.encode("ascii")
-            + padding
-        )
+        return protocol.encode_control_event(payload)
 
     @staticmethod
     def _wrap_heartbeat_res_event() -> bytes:
@@ -74,14 +182,15 @@ class RawClient:
 
         See also: bmqp::EventHeader
         """
-        event_type = broker.EventType.HEARTBEAT_RSP
-        type_specific = broker.TypeSpecific.EMPTY
-
-        header_bytes = 8
-        event_size = header_bytes.to_bytes(4, "big")
-        event_desc = bytes([0x40 + event_type, 0x02, type_specific, 0x00])
+        return RawClient.heartbeat_response()
 
-        return event_size + event_desc
+    @staticmethod
+    def heartbeat_response() -> bytes:
+        """
+        Return the raw bytes of a heartbeat response event, which only has a
+        header.
+        """
+        return protocol.encode_event(broker.EventType.HEARTBEAT_RSP)
 
     @staticmethod
     def _wrap_authentication_event(payload: Union[str, dict]) -> bytes:
@@ -91,63 +200,80 @@ class RawClient:
 
         See also: bmqp::EventHeader
         """
+        return protocol.encode_control_event(payload, broker.EventType.AUTHENTICATION)
+
+    def _encode_message(
+        self,
+        payload: dict,
+        message_type: str = "ControlMessage",
+        event_type: int = broker.EventType.CONTROL,
+    ) -> bytes:
+        """
+        Encode the specified 'payload', a message of the specified
+        'message_type' ("ControlMessage", "NegotiationMessage" or
+        "AuthenticationMessage"), with the encoding of this client, and wrap
+        it as an event of the specified 'event_type'.
+        """
+        if self._encoding == "BER":
+            return protocol.encode_event(
+                event_type,
+                ber.encode(message_type, payload),
+                broker.TypeSpecific.ENCODING_BER,
+                add_padding=True,
+            )
+        return protocol.encode_control_event(payload, event_type)
 
-        if isinstance(payload, str):
-            payload_str = payload
-        else:
-            payload_str = json.dumps(payload)
-
-        padding_len = 4 - len(payload_str) % 4
-        padding = bytes([padding_len] * padding_len)
-
-        event_type = broker.EventType.AUTHENTICATION
-        type_specific = broker.TypeSpecific.ENCODING_JSON
-
-        auth_header_bytes = 8
-        auth_event_size = (auth_header_bytes + len(payload_str) + padding_len).to_bytes(
-            4, "big"
-        )
-        auth_event_desc = bytes([0x40 + event_type, 0x02, type_specific, 0x00])
-
-        return auth_event_size + auth_event_desc + payload_str.encode("ascii") + padding
+    def render(
+        self, template: protocol.ControlTemplate, message_type: str, **values
+    ) -> bytes:
+        """
+        Return the event holding the message of the specified 'template', a
+        message of the specified 'message_type', with the specified slot
+        'values', encoded with the encoding of this client.
+        """
+        if self._encoding == "BER":
+            return self._encode_message(
+                template.message(**values), message_type, template.event_type
+            )
+        return template.render(**values)
 
-    def _send_raw(self, message: bytes) -> Tuple[bytes, bytes]:
+    def _send_raw(self, message: bytes) -> None:
         """
         Send the specified raw "message" over the channel to the broker.
-        Return the received byte response.
         """
-        assert self._channel is not None
+        # Requests and heartbeat responses may be sent from different threads.
+        with self._send_lock:
+            assert self._channel is not None
+            try:
+                self._channel.sendall(message)
+            except Exception as e:
+                raise ConnectionError(f"Failed to send message: {e}") from e
 
-        try:
-            self._channel.send(message)
-        except Exception as e:
-            raise ConnectionError(f"Failed to send message: {e}") from e
+    def _receive_event(
+        self,
+    ) -> Tuple[Union[bytes, memoryview], Union[bytes, memoryview]]:
+        """
+        Return the header and the body of the next event: the oldest event
+        queued by the receiver if it is running, or the next event read from
+        the channel otherwise.
+        """
+        if self._receiver is not None:
+            return self._take_event(None, self._socket_timeout)
+        return self._read_event()
 
-    def _receive_event(self) -> Tuple[bytes, bytes]:
+    def _read_event(self) -> Tuple[memoryview, memoryview]:
         """
-        Read the channel until the next event is received.
+        Read the channel until the next event is received, answering
+        heartbeat requests on the way.
 
-        Return the header and received event contents excluding event header and padding
-        bytes at the end of the message.
+        Return the header and received event contents excluding event header
+        and padding bytes at the end of the message.  Both are views into the
+        receive buffer, valid until the next call.
         """
-        # Process the event header
-        header_bytes = 8
+        assert self._reader is not None
 
         while True:
-            try:
-                # The situation when the event header is not fully received
-                # with one 'recv' call is highly improbable.
-                header = self._channel.recv(header_bytes)
-            except socket.timeout as exc:
-                raise ConnectionError("Timeout while waiting for event header") from exc
-            except Exception as exc:
-                raise ConnectionError(f"Failed to receive event header: {exc}") from exc
-
-            if len(header) != header_bytes:
-                raise ConnectionError(
-                    f"Failed to receive event header from the broker, "
-                    f"expected {header_bytes} bytes, got {len(header)} bytes"
-                )
+            header, body = self._reader.read_event()
 
             event_type = header[4] & 0b00111111
             if not any(event_type == et.value for et in broker.EventType):
@@ -155,53 +281,116 @@ class RawClient:
                     f"Unknown event type: {event_type}, "
                     "expected one of the EventType values"
                 )
-            if event_type == broker.EventType.HEARTBEAT_REQ:
-                if self._verbose:
-                    print("Received heartbeat request.")
-                self._send_raw(self._wrap_heartbeat_res_event())
-            else:
-                if self._verbose:
-                    print(
-                        "Received event with type: ", broker.EventType(event_type).name
-                    )
+            if event_type != broker.EventType.HEARTBEAT_REQ:
                 break
 
-        # Process the event body
+            if self._verbose:
+                print("Received heartbeat request.")
+            self._send_raw(self._wrap_heartbeat_res_event())
 
-        message = bytearray()
+        if self._verbose:
+            print("Received event with type: ", broker.EventType(event_type).name)
 
-        # The first 4 bytes of the message contain message full size in bytes.
-        # See also: bmqp_protocol.h / EventHeader
-        remaining = int.from_bytes(header[:4], "big") - header_bytes
-        while remaining > 0:
-            part = self._channel.recv(remaining)
-            if not part:
-                raise ConnectionError(
-                    "Connection closed by broker while receiving event body."
-                )
-            message += part
-            remaining -= len(part)
-
-        if len(message) < 1:
+        if len(body) < 1:
             raise ConnectionError("Received empty message from the broker")
 
-        try:
-            padding_bytes = message[-1]
-        except IndexError as exc:
-            raise ConnectionError(
-                "Received message too short to contain padding byte"
-            ) from exc
+        return header, body
 
-        # expect correct padding byte value
-        if not 1 <= padding_bytes <= 4:
-            raise ValueError(
-                f"Invalid padding bytes value: {padding_bytes}, "
-                "expected value in range [1, 4]"
-            )
+    def start_receiver(self) -> None:
+        """
+        Start a thread receiving the events of the open channel.  Heartbeat
+        requests are answered as soon as they arrive, so that the session
+        stays connected while idle; other events are queued until taken by
+        'receive', or by the synchronous methods of this client.
+        """
+        assert self._channel is not None and self._receiver is None
+
+        # The receiver waits for events indefinitely; use 'receive' timeouts
+        # to bound waits.
+        self._channel.settimeout(None)
+        self._receiver_error = None
+        self._receiver = threading.Thread(
+            target=self._receive_loop,
+            name=f"rawclient-receiver-{self._channel.getpeername()}",
+            daemon=True,
+        )
+        self._receiver.start()
 
-        body = message[:-padding_bytes]
+    def _receive_loop(self) -> None:
+        while True:
+            try:
+                header, body = self._read_event()
+                self._deliver(bytes(header), bytes(body))
+            except (ConnectionError, OSError, ValueError) as exc:
+                self._on_receiver_exit(exc)
+                return
 
-        return header, body
+    def _deliver(self, header: bytes, body: bytes) -> None:
+        """
+        Queue the event with the specified 'header' and 'body', received by
+        the receiver thread.
+        """
+        rid = None
+        if header[4] & 0b00111111 == broker.EventType.CONTROL:
+            try:
+                rid = self.decode_event_bytes(header, body).get("rId")
+            except ValueError:
+                pass  # e.g. a negotiation message
+
+        with self._received_condition:
+            self._received.append((header, body, rid))
+            self._received_condition.notify_all()
+
+    def _on_receiver_exit(self, error: Exception) -> None:
+        """
+        Record the specified 'error' that stopped the receiver thread.
+        """
+        if self._verbose:
+            print(f"Receiver stopped: {error}")
+        with self._received_condition:
+            self._receiver_error = error
+            self._received_condition.notify_all()
+
+    def _take_event(
+        self, rid: Optional[int], timeout: Optional[float]
+    ) -> Tuple[bytes, bytes]:
+        """
+        Remove and return the header and body of the oldest queued event, or
+        of the oldest queued control message with the specified request id
+        'rid' if it is not 'None', waiting up to 'timeout' seconds (forever if
+        'None') for it to arrive.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._received_condition:
+            while True:
+                for index, (header, body, event_rid) in enumerate(self._received):
+                    if rid is None or event_rid == rid:
+                        del self._received[index]
+                        return header, body
+
+                if self._receiver_error is not None:
+                    raise ConnectionError(f"Receiver stopped: {self._receiver_error}")
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise ConnectionError("Timeout while waiting for event")
+                self._received_condition.wait(remaining)
+
+    def receive(
+        self, rid: Optional[int] = None, timeout: Optional[float] = None
+    ) -> dict:
+        """
+        Return the oldest event queued by the receiver, decoded, or the
+        oldest control message with the specified request id 'rid' if it is
+        not 'None'.  Wait up to 'timeout' seconds (by default, the socket
+        timeout) for it to arrive.  The receiver must be running.
+        """
+        assert self._receiver is not None, "'start_receiver' was not called"
+
+        return self.decode_event_bytes(
+            *self._take_event(rid, self._socket_timeout if timeout is None else timeout)
+        )
 
     def open_channel(self, host: str, port: int) -> None:
         """
@@ -217,20 +406,34 @@ class RawClient:
         sock.settimeout(self._socket_timeout)
 
         self._channel = sock
-
-    def decode_event_bytes(self, response_header: bytes, response_body: bytes) -> dict:
+        self._reader = EventReader(sock)
+
+    def decode_event_bytes(
+        self,
+        response_header: Union[bytes, memoryview],
+        response_body: Union[bytes, memoryview],
+        message_type: Optional[str] = None,
+    ) -> dict:
         """
-        Decode the received event header into a dictionary.
-        This is used to parse the response from the broker.
+        Decode the received event into a dictionary.
+        This is used to parse the response from the broker.  BER bodies are
+        decoded as the specified 'message_type', by default an
+        "AuthenticationMessage" for authentication events and a
+        "ControlMessage" otherwise.
         """
-        # The response is expected to be in JSON format
         type_specific = response_header[6]  # 7th byte is typeSpecific
 
         if type_specific == broker.TypeSpecific.ENCODING_JSON:
-            return json.loads(response_body.decode("utf-8"))
+            return fastjson.loads(response_body)
         if type_specific == broker.TypeSpecific.ENCODING_BER:
-            print("BER encoding is not supported in open source Python.")
-            raise ValueError("Not supported encoding in response")
+            if message_type is None:
+                event_type = response_header[4] & 0b00111111
+                message_type = (
+                    "AuthenticationMessage"
+                    if event_type == broker.EventType.AUTHENTICATION
+                    else "ControlMessage"
+                )
+            return ber.decode(message_type, response_body)
 
         print(f"Unknown encoding type: {type_specific}")
         raise ValueError("Unknown encoding in response")
@@ -253,19 +456,19 @@ class RawClient:
         """
         assert self._channel is not None
 
-        auth_request = broker.AUTHENTICATION_REQUEST_SCHEMA
-
         if isinstance(auth_data, str):
             raw_bytes = auth_data.encode("utf-8")
         else:
             raw_bytes = auth_data  # already bytes
 
-        auth_request["authenticationRequest"]["mechanism"] = auth_mechanism
-        auth_request["authenticationRequest"]["data"] = base64.b64encode(
-            raw_bytes
-        ).decode("ascii")
-
-        self._send_raw(self._wrap_authentication_event(auth_request))
+        self._send_raw(
+            self.render(
+                AUTHENTICATION_REQUEST_TEMPLATE,
+                "AuthenticationMessage",
+                mechanism=auth_mechanism,
+                data=base64.b64encode(raw_bytes).decode("ascii"),
+            )
+        )
 
     def _receive_authentication_response(self) -> dict:
         """
@@ -291,22 +494,36 @@ class RawClient:
         """
         assert self._channel is not None
 
-        raw_client_identity = broker.CLIENT_IDENTITY_SCHEMA
-        raw_client_identity["clientIdentity"]["clientType"] = "E_TCPCLIENT"
-
-        self._send_raw(self._wrap_control_event(raw_client_identity))
+        self._send_raw(
+            self.render(
+                CLIENT_IDENTITY_TEMPLATE,
+                "NegotiationMessage",
+                client_type="E_TCPCLIENT",
+                features=f"PROTOCOL_ENCODING:{self._encoding}",
+            )
+        )
 
     def _receive_negotiation_response(self) -> dict:
         """
         Receive a negotiation response from the broker.
         """
-        _, response_body = self._receive_event()
-        return json.loads(response_body)
+        return self.decode_event_bytes(*self._receive_event(), "NegotiationMessage")
 
     def stop(self) -> None:
         """
-        Disconnect from the broker.
+        Disconnect from the broker, and wait for the receiver thread, if any,
+        to exit.
         """
+        if self._receiver is not None:
+            try:
+                self._channel.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._receiver.join()
+            self._receiver = None
+            self._received.clear()
+
         if self._channel is not None:
             self._channel.close()
             self._channel = None
+            self._reader = None
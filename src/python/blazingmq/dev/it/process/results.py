@@ -0,0 +1,255 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+blazingmq.dev.it.process.results
+
+
+PURPOSE: Provide typed results of broker admin commands.
+
+TYPES:
+    CommandError: raised when a broker reports that a command failed
+    StorageQueueInfo: storage of one queue, as listed by 'STORAGE SUMMARY'
+    PartitionSummary: state and queues of one partition
+    StorageSummary: result of 'CLUSTERS CLUSTER <name> STORAGE SUMMARY'
+    QueueInternals: result of 'DOMAINS DOMAIN <d> QUEUE <q> INTERNALS'
+    NodeStatus: status of a cluster node, as seen by another node
+    ClusterStatus: result of 'CLUSTERS CLUSTER <name> STATUS'
+
+FUNCTIONS:
+    unwrap: return the result of a given type from a decoded JSON response
+
+The types are built from the responses to admin commands sent with
+'ENCODING JSON_COMPACT' (see 'mqbcmd.xsd' for the complete schemas).  Only the
+fields needed by the tests are extracted, as plain Python values; the decoded
+JSON is kept in the 'raw' attribute for everything else.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+class CommandError(RuntimeError):
+    """
+    The broker reported an error in response to an admin command.
+    """
+
+
+def unwrap(response: Dict[str, Any], result_type: str) -> Dict[str, Any]:
+    """
+    Return the value of the specified 'result_type' choice in the specified
+    decoded admin command 'response'.  Raise 'CommandError' if the response is
+    an error, or holds a result of another type.
+    """
+
+    if "error" in response:
+        raise CommandError(response["error"].get("message", ""))
+
+    try:
+        return response[result_type]
+    except KeyError:
+        raise CommandError(
+            f"expected '{result_type}' result, got {list(response)}"
+        ) from None
+
+
+@dataclass(frozen=True)
+class StorageQueueInfo:
+    uri: str
+    key: str
+    partition_id: int
+    num_messages: int
+    num_bytes: int
+    is_persistent: bool
+
+    @classmethod
+    def from_json(cls, obj: Dict[str, Any]) -> "StorageQueueInfo":
+        return cls(
+            uri=obj["queueUri"],
+            key=obj["queueKey"],
+            partition_id=int(obj["partitionId"]),
+            num_messages=int(obj["numMessages"]),
+            num_bytes=int(obj["numBytes"]),
+            is_persistent=bool(obj.get("isPersistent", False)),
+        )
+
+
+def _storages(obj: Optional[Dict[str, Any]]) -> Dict[str, StorageQueueInfo]:
+    """
+    Return the queues of the specified 'StorageContent' JSON 'obj', keyed by
+    URI.
+    """
+
+    queues = (
+        StorageQueueInfo.from_json(info) for info in (obj or {}).get("storages", ())
+    )
+    return {queue.uri: queue for queue in queues}
+
+
+@dataclass(frozen=True)
+class PartitionSummary:
+    partition_id: int
+    state: str
+    primary_node: str
+    primary_lease_id: int
+    sequence_number: int
+    is_available: bool
+    num_outstanding_records: int
+    num_unreceipted_messages: int
+    queues: Dict[str, StorageQueueInfo]
+    raw: Dict[str, Any] = field(repr=False, compare=False)
+
+    @classmethod
+    def from_json(cls, obj: Dict[str, Any]) -> "PartitionSummary":
+        summary = obj.get("summary", {})
+        return cls(
+            partition_id=int(obj["partitionId"]),
+            state=obj.get("state", ""),
+            primary_node=summary.get("primaryNodeDescription", ""),
+            primary_lease_id=int(summary.get("primaryLeaseId", 0)),
+            sequence_number=int(summary.get("sequenceNum", 0)),
+            is_available=bool(summary.get("isAvailable", False)),
+            num_outstanding_records=int(summary.get("numOutstandingRecords", 0)),
+            num_unreceipted_messages=int(summary.get("numUnreceiptedMessages", 0)),
+            queues=_storages(summary.get("storageContent")),
+            raw=obj,
+        )
+
+
+@dataclass(frozen=True)
+class StorageSummary:
+    location: str
+    partitions: Dict[int, PartitionSummary]
+    raw: Dict[str, Any] = field(repr=False, compare=False)
+
+    @classmethod
+    def from_json(cls, obj: Dict[str, Any]) -> "StorageSummary":
+        partitions = (
+            PartitionSummary.from_json(fs) for fs in obj.get("fileStores", ())
+        )
+        return cls(
+            location=obj.get("clusterFileStoreLocation", ""),
+            partitions={partition.partition_id: partition for partition in partitions},
+            raw=obj,
+        )
+
+    def queue(self, uri: str) -> Optional[StorageQueueInfo]:
+        """
+        Return the storage of the queue with the specified 'uri', or 'None'
+        if it is not in any partition.
+        """
+
+        for partition in self.partitions.values():
+            info = partition.queues.get(uri)
+            if info is not None:
+                return info
+
+        return None
+
+
+@dataclass(frozen=True)
+class QueueInternals:
+    uri: str
+    key: str
+    id: int
+    partition_id: int
+    kind: str
+    num_messages: int
+    num_bytes: int
+    app_num_messages: Dict[str, int]
+    handles: List[str]
+    raw: Dict[str, Any] = field(repr=False, compare=False)
+
+    @classmethod
+    def from_json(cls, obj: Dict[str, Any]) -> "QueueInternals":
+        state = obj["state"]
+        storage = state.get("storage", {})
+        return cls(
+            uri=state["uri"],
+            key=state.get("key", ""),
+            id=int(state.get("id", 0)),
+            partition_id=int(state.get("partitionId", -1)),
+            kind=next(iter(obj.get("queue", {})), ""),
+            num_messages=int(storage.get("numMessages", 0)),
+            num_bytes=int(storage.get("numBytes", 0)),
+            app_num_messages={
+                vs["appId"]: int(vs["numMessages"])
+                for vs in storage.get("virtualStorages", ())
+            },
+            handles=[
+                handle["clientDescription"] for handle in state.get("handles", ())
+            ],
+            raw=obj,
+        )
+
+
+@dataclass(frozen=True)
+class NodeStatus:
+    description: str
+    status: str
+    is_available: Optional[bool]
+    primary_for_partitions: List[int]
+
+    @classmethod
+    def from_json(cls, obj: Dict[str, Any]) -> "NodeStatus":
+        return cls(
+            description=obj["description"],
+            status=obj.get("status", ""),
+            is_available=obj.get("isAvailable"),
+            primary_for_partitions=[
+                int(partition_id)
+                for partition_id in obj.get("primaryForPartitionIds", ())
+            ],
+        )
+
+
+@dataclass(frozen=True)
+class ClusterStatus:
+    name: str
+    self_node: str
+    is_healthy: bool
+    elector_state: str
+    leader_node: str
+    leader_status: str
+    nodes: List[NodeStatus]
+    queues: Dict[str, StorageQueueInfo]
+    storage: Optional[StorageSummary]
+    raw: Dict[str, Any] = field(repr=False, compare=False)
+
+    @classmethod
+    def from_json(cls, obj: Dict[str, Any]) -> "ClusterStatus":
+        """
+        Return the status described by the specified 'obj', which is either a
+        'ClusterStatus' (on cluster nodes) or a 'ClusterProxyStatus' (on
+        proxies, where elector and storage fields are empty).
+        """
+
+        elector = obj.get("electorInfo", {})
+        storage = obj.get("clusterStorageSummary")
+        return cls(
+            name=obj.get("name", ""),
+            self_node=obj.get("selfNodeDescription", ""),
+            is_healthy=bool(obj.get("isHealthy", False)),
+            elector_state=elector.get("electorState", ""),
+            leader_node=elector.get("leaderNode", obj.get("activeNodeDescription", "")),
+            leader_status=elector.get("leaderStatus", ""),
+            nodes=[
+                NodeStatus.from_json(node)
+                for node in obj.get("nodeStatuses", {}).get("nodes", ())
+            ],
+            queues=_storages(obj.get("queuesInfo")),
+            storage=None if storage is None else StorageSummary.from_json(storage),
+            raw=obj,
+        )
@@ -0,0 +1,380 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+blazingmq.dev.it.process.stress
+
+
+PURPOSE: Provide a driver opening many concurrent raw sessions to a broker.
+
+TYPES:
+    Step: a step of the handshake run on each connection
+    StepFailure: raised when the broker answers a step with a failure
+    StressReport: setup rate, latencies and failures of a stress run
+    StressDriver: run a scripted handshake on many connections
+
+'StressDriver' opens thousands of connections from a single asyncio event
+loop, without starting any 'bmqtool.tsk' process, and runs the same script
+on each of them, e.g. authenticate, negotiate, open a queue and disconnect.
+Messages are built from the same templates as 'RawClient', in JSON or BER.
+The report holds the latency of each step and of the whole handshake (as
+'LatencyHistogram's, in nanoseconds), the rate at which handshakes completed,
+and the failures, counted by step and reason (the status category returned
+by the broker, or the exception raised by the connection).
+
+Usage
+-----
+
+```
+from blazingmq.dev.it.process.stress import Step, StressDriver
+
+def test_session_accept_rate(single_node, domain_urls):
+    driver = StressDriver(
+        *single_node.admin_endpoint,
+        uri=domain_urls.uri_priority,
+    )
+    report = driver.run(connections=2000, concurrency=500)
+    assert not report.failures, report.failures
+    print(report.summary())
+```
+
+Each connection uses a file descriptor: raise the limit on open files
+('ulimit -n') before opening thousands of connections at the same time.
+"""
+
+import asyncio
+import base64
+import enum
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from blazingmq.dev.it.latency import LatencyHistogram
+from blazingmq.schemas import broker, protocol
+from blazingmq.schemas.protocol import EVENT_HEADER_SIZE
+from .rawclient import (
+    AUTHENTICATION_REQUEST_TEMPLATE,
+    CLIENT_IDENTITY_TEMPLATE,
+    RawClient,
+)
+
+OPEN_QUEUE_TEMPLATE = protocol.ControlTemplate(
+    broker.OPEN_QUEUE_SCHEMA,
+    rid=("rId",),
+    uri=("openQueue", "handleParameters", "uri"),
+)
+
+CLOSE_QUEUE_TEMPLATE = protocol.ControlTemplate(
+    broker.CLOSE_QUEUE_SCHEMA,
+    rid=("rId",),
+    uri=("closeQueue", "handleParameters", "uri"),
+)
+
+DISCONNECT_TEMPLATE = protocol.ControlTemplate(broker.DISCONNECT_SCHEMA, rid=("rId",))
+
+
+class Step(enum.Enum):
+    CONNECT = "connect"
+    AUTHENTICATE = "authenticate"
+    NEGOTIATE = "negotiate"
+    OPEN_QUEUE = "openQueue"
+    CLOSE_QUEUE = "closeQueue"
+    DISCONNECT = "disconnect"
+
+
+DEFAULT_SCRIPT = (Step.NEGOTIATE, Step.OPEN_QUEUE, Step.DISCONNECT)
+
+
+class StepFailure(Exception):
+    """
+    The broker answered a step of the script with a failure.
+    """
+
+    def __init__(self, step: Step, reason: str, response: Any = None):
+        super().__init__(f"{step.value}: {reason}")
+        self.step = step
+        self.reason = reason
+        self.response = response
+
+
+@dataclass
+class StressReport:
+    connections: int
+    duration: float  # seconds
+    latencies: Dict[Step, LatencyHistogram]
+    handshake: LatencyHistogram
+    failures: Counter = field(default_factory=Counter)  # (Step, reason) -> count
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> int:
+        return self.handshake.count
+
+    @property
+    def handshakes_per_sec(self) -> float:
+        return self.succeeded / self.duration if self.duration else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Return the report as a JSON serializable dictionary.
+        """
+        return {
+            "connections": self.connections,
+            "succeeded": self.succeeded,
+            "duration": self.duration,
+            "handshakesPerSec": self.handshakes_per_sec,
+            "handshake": self.handshake.summary() if self.handshake.count else {},
+            "steps": {
+                step.value: histogram.summary()
+                for step, histogram in self.latencies.items()
+                if histogram.count
+            },
+            "failures": {
+                f"{step.value}: {reason}": count
+                for (step, reason), count in self.failures.items()
+            },
+        }
+
+
+class _Connection:
+    """
+    One raw session to the broker, driven by asyncio streams.
+    """
+
+    def __init__(
+        self,
+        codec: RawClient,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ):
+        self._codec = codec
+        self._reader = reader
+        self._writer = writer
+        self._rid = 0
+
+    def next_rid(self) -> int:
+        self._rid += 1
+        return self._rid
+
+    async def request(
+        self,
+        template: protocol.ControlTemplate,
+        message_type: str,
+        **values,
+    ) -> dict:
+        """
+        Send the message of the specified 'template' and return the decoded
+        response, answering heartbeats while waiting.
+        """
+        self._writer.write(self._codec.render(template, message_type, **values))
+        await self._writer.drain()
+
+        while True:
+            header = await self._reader.readexactly(EVENT_HEADER_SIZE)
+            event = protocol.decode_event_header(header)
+            body = await self._reader.readexactly(event.length - EVENT_HEADER_SIZE)
+            if event.type == broker.EventType.HEARTBEAT_REQ:
+                self._writer.write(self._codec.heartbeat_response())
+                continue
+            # Responses are messages of the same type as their request.
+            return self._codec.decode_event_bytes(
+                header, protocol.strip_padding(body), message_type
+            )
+
+    async def close(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except OSError:
+            pass
+
+
+def _status_failure(step: Step, status: Optional[dict], response: dict) -> None:
+    """
+    Raise 'StepFailure' if the specified 'status' is not a success.
+    """
+    if status is None:
+        raise StepFailure(step, f"unexpected response {list(response)}", response)
+    category = status.get("category", "")
+    if category != "E_SUCCESS":
+        raise StepFailure(step, category or "no status category", response)
+
+
+class StressDriver:
+    """
+    Run a scripted handshake on many concurrent connections to a broker.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        script: Sequence[Step] = DEFAULT_SCRIPT,
+        uri: str = broker.OPEN_QUEUE_SCHEMA["openQueue"]["handleParameters"]["uri"],
+        credentials: Optional[Callable[[int], Tuple[str, Union[str, bytes]]]] = None,
+        encoding: str = "JSON",
+        timeout: float = 10.0,
+        hold: bool = False,
+    ):
+        """
+        Create a driver connecting to the specified 'host' / 'port' and
+        running the specified 'script' on each connection.  'credentials'
+        returns the authentication mechanism and data of the connection with
+        the specified index, and is required if 'script' contains
+        'AUTHENTICATE'.  Queues are opened with the specified 'uri'.  If
+        'hold' is True, connections are closed only once all the scripts
+        have run, so that the broker sees all the sessions at the same time.
+        """
+        if Step.AUTHENTICATE in script and credentials is None:
+            raise ValueError("'credentials' are required to authenticate")
+        self._address = (host, port)
+        self._script = tuple(script)
+        self._uri = uri
+        self._credentials = credentials
+        self._codec = RawClient(encoding=encoding)
+        self._encoding = encoding
+        self._timeout = timeout
+        self._hold = hold
+
+    def run(self, connections: int, concurrency: int = 1000) -> StressReport:
+        """
+        Run the script on the specified number of 'connections', with at most
+        'concurrency' of them being set up at the same time, and return the
+        report.
+        """
+        return asyncio.run(self.run_async(connections, concurrency))
+
+    async def run_async(
+        self, connections: int, concurrency: int = 1000
+    ) -> StressReport:
+        """
+        Coroutine version of 'run', for use in a running event loop.
+        """
+        report = StressReport(
+            connections=connections,
+            duration=0.0,
+            latencies={
+                step: LatencyHistogram() for step in (Step.CONNECT,) + self._script
+            },
+            handshake=LatencyHistogram(),
+        )
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(index: int) -> Optional[_Connection]:
+            async with semaphore:
+                return await self._run_connection(index, report)
+
+        start = time.perf_counter()
+        opened = await asyncio.gather(*(run_one(i) for i in range(connections)))
+        report.duration = time.perf_counter() - start
+        await asyncio.gather(
+            *(connection.close() for connection in opened if connection is not None)
+        )
+        return report
+
+    async def _run_connection(
+        self, index: int, report: StressReport
+    ) -> Optional[_Connection]:
+        """
+        Run the script on a new connection, record its latencies and failures
+        in the specified 'report', and return the connection if it must be
+        held open.
+        """
+        step = Step.CONNECT
+        connection = None
+        held = None
+        handshake_start = time.perf_counter_ns()
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(*self._address), self._timeout
+            )
+            connection = _Connection(self._codec, reader, writer)
+            report.latencies[step].record(time.perf_counter_ns() - handshake_start)
+
+            for step in self._script:
+                step_start = time.perf_counter_ns()
+                await asyncio.wait_for(
+                    self._run_step(connection, step, index), self._timeout
+                )
+                report.latencies[step].record(time.perf_counter_ns() - step_start)
+        except StepFailure as failure:
+            report.failures[(failure.step, failure.reason)] += 1
+            report.errors.append(f"connection {index}: {failure}")
+        except (
+            asyncio.TimeoutError,
+            asyncio.IncompleteReadError,
+            OSError,
+            ValueError,  # e.g. 'ber.BerError', for an undecodable response
+        ) as exc:
+            reason = (
+                "timeout"
+                if isinstance(exc, asyncio.TimeoutError)
+                else type(exc).__name__
+            )
+            report.failures[(step, reason)] += 1
+            report.errors.append(f"connection {index}: {step.value}: {exc!r}")
+        else:
+            report.handshake.record(time.perf_counter_ns() - handshake_start)
+            if self._hold:
+                held = connection
+        finally:
+            if connection is not None and held is None:
+                await connection.close()
+        return held
+
+    async def _run_step(self, connection: _Connection, step: Step, index: int) -> None:
+        """
+        Run the specified 'step' of the script of the connection with the
+        specified 'index'.  Raise 'StepFailure' if the broker reports a
+        failure.
+        """
+        if step is Step.AUTHENTICATE:
+            mechanism, data = self._credentials(index)
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            response = await connection.request(
+                AUTHENTICATION_REQUEST_TEMPLATE,
+                "AuthenticationMessage",
+                mechanism=mechanism,
+                data=base64.b64encode(data).decode("ascii"),
+            )
+            auth = response.get("authenticationResponse", {})
+            _status_failure(step, auth.get("status"), response)
+        elif step is Step.NEGOTIATE:
+            response = await connection.request(
+                CLIENT_IDENTITY_TEMPLATE,
+                "NegotiationMessage",
+                client_type="E_TCPCLIENT",
+                features=f"PROTOCOL_ENCODING:{self._encoding}",
+            )
+            result = response.get("brokerResponse", {}).get("result")
+            _status_failure(step, result, response)
+        elif step in (Step.OPEN_QUEUE, Step.CLOSE_QUEUE):
+            template = (
+                OPEN_QUEUE_TEMPLATE if step is Step.OPEN_QUEUE else CLOSE_QUEUE_TEMPLATE
+            )
+            response = await connection.request(
+                template, "ControlMessage", rid=connection.next_rid(), uri=self._uri
+            )
+            if f"{step.value}Response" not in response:
+                _status_failure(step, response.get("status"), response)
+        elif step is Step.DISCONNECT:
+            response = await connection.request(
+                DISCONNECT_TEMPLATE, "ControlMessage", rid=connection.next_rid()
+            )
+            if "disconnectResponse" not in response:
+                _status_failure(step, response.get("status"), response)
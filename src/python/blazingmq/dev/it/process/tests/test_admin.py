@@ -0,0 +1,164 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# pylint: disable=protected-access; faking the broker side of admin sessions
+
+import copy
+import json
+import socket
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from blazingmq.dev.it.process.admin import AdminClient, AdminSession
+from blazingmq.dev.it.process.rawclient import EventReader
+from blazingmq.schemas import ber, broker, protocol
+from blazingmq.schemas.broker import EventType
+
+
+class _FakeBroker:
+    """
+    Accept one admin session, send a heartbeat request, then answer the
+    admin commands in batches of 'batch' commands, in reverse order.
+    """
+
+    def __init__(self, batch: int):
+        self._server = socket.create_server(("localhost", 0))
+        self.port = self._server.getsockname()[1]
+        self.heartbeat_answered = threading.Event()
+        self._batch = batch
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        connection, _ = self._server.accept()
+        with connection, self._server:
+            reader = EventReader(connection)
+            events = iter(reader)
+            next(events)  # client identity
+            connection.sendall(protocol.encode_control_event({"brokerResponse": {}}))
+
+            connection.sendall(protocol.encode_event(EventType.HEARTBEAT_REQ))
+            header, _ = next(events)
+            assert header[4] & 0x3F == EventType.HEARTBEAT_RSP
+            self.heartbeat_answered.set()
+
+            while True:
+                requests = []
+                for _ in range(self._batch):
+                    try:
+                        _, body = next(events)
+                    except ConnectionError:
+                        return
+                    requests.append(json.loads(str(body, "utf-8")))
+                for request in reversed(requests):
+                    connection.sendall(
+                        protocol.encode_control_event(
+                            {
+                                "rId": request["rId"],
+                                "adminCommandResponse": {
+                                    "text": request["adminCommand"]["command"].lower()
+                                },
+                            }
+                        )
+                    )
+
+
+def test_admin_session_multiplexes_requests():
+    broker = _FakeBroker(batch=3)
+    session = AdminSession(socket_timeout=5)
+    session.connect("localhost", broker.port)
+    try:
+        assert broker.heartbeat_answered.wait(5)
+        futures = [session.request(f"CMD {i}") for i in range(3)]
+        assert [future.result(5) for future in futures] == ["cmd 0", "cmd 1", "cmd 2"]
+
+        results = {}
+
+        def send(i):
+            results[i] = session.send_admin(f"THREAD {i}")
+
+        threads = [threading.Thread(target=send, args=(i,)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == {i: f"thread {i}" for i in range(3)}
+        assert session.is_connected
+    finally:
+        session.stop()
+
+    assert not session.is_connected
+    with pytest.raises(ConnectionError):
+        session.request("HELP")
+
+
+def test_admin_session_fails_pending_requests_on_disconnect():
+    broker = _FakeBroker(batch=2)
+    session = AdminSession(socket_timeout=5)
+    session.connect("localhost", broker.port)
+    try:
+        future = session.request("HELP")
+        session._channel.shutdown(socket.SHUT_RDWR)
+        with pytest.raises(ConnectionError, match="closed"):
+            future.result(5)
+    finally:
+        session.stop()
+
+
+@pytest.mark.parametrize("encoding", ["JSON", "BER"])
+def test_admin_command_does_not_modify_schema(encoding):
+    schema = copy.deepcopy(broker.ADMIN_COMMAND_SCHEMA)
+    client = AdminClient(encoding=encoding)
+    [(_, body)] = protocol.iter_events(client._make_admin_command("STATS", 42))
+    body = protocol.strip_padding(body)
+    if encoding == "BER":
+        command = ber.decode("ControlMessage", body)
+    else:
+        command = json.loads(bytes(body))
+    assert command == {"rId": 42, "adminCommand": {"command": "STATS"}}
+    assert broker.ADMIN_COMMAND_SCHEMA == schema
+
+
+def test_admin_session_fails_requests_on_unexpected_responses():
+    session = AdminSession()
+    futures = {rid: Future() for rid in (1, 2, 3, 4)}
+    session._pending.update(futures)
+
+    def deliver(payload: bytes) -> None:
+        sender, receiver = socket.socketpair()
+        with sender, receiver:
+            sender.sendall(protocol.encode_control_event(payload))
+            header, body = EventReader(receiver).read_event()
+            session._deliver(bytes(header), bytes(body))
+
+    deliver({"rId": 5, "adminCommandResponse": {"text": "late"}})
+    assert not any(future.done() for future in futures.values())
+
+    deliver({"rId": 1, "status": {"category": "E_UNKNOWN", "code": -1}})
+    with pytest.raises(RuntimeError, match="Unexpected admin response"):
+        futures[1].result(0)
+
+    deliver(b'{"rId": 2, "adminCommandResponse": ')
+    with pytest.raises(ValueError, match="Failed to decode"):
+        futures[2].result(0)
+    assert set(session._pending) == {3, 4}
+
+    deliver(b"{")
+    for rid in (3, 4):
+        with pytest.raises(ValueError, match="Failed to decode"):
+            futures[rid].result(0)
+    assert not session._pending
@@ -13,7 +13,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from blazingmq.dev.it.process.client import _bool_lower, _build_command
+import collections
+import struct
+import sys
+import tracemalloc
+
+import pytest
+
+from blazingmq.dev.it.process.client import (
+    ClientPool,
+    ITError,
+    Message,
+    MessageBuffer,
+    _bool_lower,
+    _build_command,
+)
 
 
 def test_bool_lower():
@@ -39,3 +53,145 @@ def test_build_command():
         assert False
     except:
         pass
+
+
+class _FakeHost:
+    name = "pool@east1"
+
+    def __init__(self):
+        self.calls = []
+
+    def open(self, uri, _flags, **_kw):
+        self.calls.append(("open", uri))
+        return 0
+
+    def post(self, uri, _payload, **kw):
+        self.calls.append(("post", uri, kw["messageProperties"]))
+        return 0
+
+    def close(self, uri, **_kw):
+        self.calls.append(("close", uri))
+        return 0
+
+    def list(self, *_args, **_kw):
+        return [
+            Message("1", "bmq://d/q1", "0", "a"),
+            Message("2", "bmq://d/q2", "0", "b"),
+        ]
+
+
+def test_pooled_clients():
+    pool = ClientPool(_FakeHost())
+    producer1 = pool.create_client("producer1")
+    producer2 = pool.create_client("producer2")
+    consumer = pool.create_client("consumer")
+
+    producer1.open("bmq://d/q1", flags=["write"])
+    producer2.open("bmq://d/q2", flags=["write"])
+    with pytest.raises(ITError):
+        producer2.post("bmq://d/q1", ["msg"])
+    assert [msg.payload for msg in producer1.list(block=True)] == ["a"]
+    assert [msg.payload for msg in producer2.list(block=True)] == ["b"]
+
+    # Many producers on one queue share the handle of the host.
+    assert producer2.open("bmq://d/q1", flags=["write"], block=True) == 0
+    assert pool.host.calls.count(("open", "bmq://d/q1")) == 1
+    with pytest.raises(ITError):
+        producer2.open("bmq://d/q1", flags=["write"])
+    with pytest.raises(ITError):
+        consumer.open("bmq://d/q1", flags=["read"])
+    assert [msg.payload for msg in producer2.list(block=True)] == ["a", "b"]
+
+    # Posts carry the identity of the logical client.
+    producer2.post(
+        "bmq://d/q1",
+        ["msg"],
+        messageProperties=[{"name": "x", "value": "1", "type": "E_INT"}],
+    )
+    assert pool.host.calls[-1] == (
+        "post",
+        "bmq://d/q1",
+        [
+            {"name": "x", "value": "1", "type": "E_INT"},
+            {"name": "pooledClient", "value": "producer2", "type": "E_STRING"},
+        ],
+    )
+
+    # The handle is closed with its last user.
+    producer1.stop_session()
+    assert pool.uris(producer1) == set()
+    assert ("close", "bmq://d/q1") not in pool.host.calls
+    producer2.close("bmq://d/q1")
+    assert pool.host.calls[-1] == ("close", "bmq://d/q1")
+    consumer.open("bmq://d/q1", flags=["read"])
+    assert pool.host.calls[-1] == ("open", "bmq://d/q1")
+
+
+GUID = "00000000010EA8F9515DCACE04742D2E"
+
+
+def test_message():
+    msg = Message(GUID, "bmq://d/q", "0", "héllo")
+    assert msg.guid == GUID
+    assert msg.uri == "bmq://d/q"
+    assert msg.correlationId == "0"
+    assert msg.payload == "héllo"
+    assert msg[3] == msg.payload
+    guid, uri, correlationId, payload = msg
+    assert (guid, uri, correlationId, payload) == msg
+    assert msg == Message(GUID, "bmq://d/q", "0", "héllo")
+    assert msg != Message(GUID.lower(), "bmq://d/q", "0", "héllo")
+    assert Message(GUID.lower(), "u", "0", "").guid == GUID.lower()
+    assert Message("1", "u", "0", "").guid == "1"
+
+
+def _listing_lines(count: int, payload_size: int):
+    # Mimic the strings captured from the output of 'bmqtool.tsk': every
+    # field of every message is a distinct string object.
+    for i in range(count):
+        yield (
+            f"{i:032X}",
+            "".join(["bmq://bmq.test.mem.priority/", "q"]),
+            str(0),
+            f"{i:0{payload_size}}",
+        )
+
+
+@pytest.mark.parametrize("payload_size", [16, 1024])
+def test_message_buffer_memory(payload_size):
+    count = 10_000
+    OldMessage = collections.namedtuple("Message", "guid, uri, correlationId, payload")
+
+    def measure(make_listing):
+        tracemalloc.start()
+        try:
+            listing = make_listing()
+            return listing, tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    old, old_size = measure(
+        lambda: [OldMessage(*line) for line in _listing_lines(count, payload_size)]
+    )
+
+    def make_listing():
+        buffer = MessageBuffer()
+        return [buffer.append(*line) for line in _listing_lines(count, payload_size)]
+
+    new, new_size = measure(make_listing)
+
+    assert [tuple(msg) for msg in new] == [tuple(msg) for msg in old]
+    assert new_size < old_size
+    # With '__slots__', a message is one small object (no '__dict__') holding
+    # its index, and the list holds a pointer to it.  The buffer holds the
+    # 16 bytes of its GUID, its payload and the 8-byte offset of its end.
+    # Allow 25% for the over-allocation of the list and of the buffers.
+    per_message = (
+        sys.getsizeof(new[0])
+        + sys.getsizeof(count)
+        + struct.calcsize("P")
+        + 16
+        + payload_size
+        + 8
+    )
+    assert new_size < count * per_message * 1.25
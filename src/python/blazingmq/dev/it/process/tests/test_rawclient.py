@@ -0,0 +1,162 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# pylint: disable=protected-access; driving the client over a socket pair
+
+import json
+import socket
+
+import pytest
+
+from blazingmq.dev.it.process.rawclient import EventReader, RawClient
+from blazingmq.schemas import ber, broker, protocol
+
+
+class _ChunkedSocket:
+    """Serve the specified 'data' in chunks of at most 'chunk_size' bytes."""
+
+    def __init__(self, data: bytes, chunk_size: int):
+        self._data = memoryview(data)
+        self._chunk_size = chunk_size
+        self.calls = 0
+
+    def recv_into(self, buffer) -> int:
+        self.calls += 1
+        size = min(len(buffer), self._chunk_size, len(self._data))
+        buffer[:size] = self._data[:size]
+        self._data = self._data[size:]
+        return size
+
+
+def _events(*payloads):
+    return [RawClient._wrap_control_event(payload) for payload in payloads]
+
+
+@pytest.mark.parametrize("buffer_size", [16, 64 * 1024])
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 1 << 20])
+def test_event_reader_partial_reads(chunk_size, buffer_size):
+    payloads = ["a", "bcd", "x" * 1000, json.dumps({"k": "v"}), "efgh", "ij"]
+    reader = EventReader(
+        _ChunkedSocket(b"".join(_events(*payloads)), chunk_size), buffer_size
+    )
+
+    for payload in payloads:
+        header, body = reader.read_event()
+        assert isinstance(body, memoryview)
+        assert header[4] == 0x40 + broker.EventType.CONTROL
+        assert str(body, "ascii") == payload
+
+    with pytest.raises(ConnectionError, match="closed"):
+        reader.read_event()
+
+
+def test_event_reader_several_events_per_recv():
+    data = b"".join(_events(*[str(i) for i in range(100)]))
+    sock = _ChunkedSocket(data, len(data))
+    reader = EventReader(sock)
+    assert [bytes(body) for _, body in (reader.read_event() for _ in range(100))] == [
+        str(i).encode() for i in range(100)
+    ]
+    assert sock.calls == 1
+
+
+def test_event_reader_grows_buffer():
+    payloads = ["x" * 100, "y" * 5000, "z" * 30]
+    reader = EventReader(_ChunkedSocket(b"".join(_events(*payloads)), 512), 64)
+    _, first = reader.read_event()
+    assert bytes(first) == b"x" * 100
+    assert [bytes(reader.read_event()[1]) for _ in payloads[1:]] == [
+        b"y" * 5000,
+        b"z" * 30,
+    ]
+
+
+def test_event_reader_invalid_padding():
+    event = bytearray(_events("abc")[0])
+    event[-1] = 0
+    with pytest.raises(ValueError, match="padding"):
+        EventReader(_ChunkedSocket(bytes(event), 16)).read_event()
+
+
+def test_receive_event_answers_heartbeats():
+    local, remote = socket.socketpair()
+    with local, remote:
+        client = RawClient()
+        client._channel = local
+        client._reader = EventReader(local)
+
+        heartbeat = (8).to_bytes(4, "big") + bytes(
+            [0x40 + broker.EventType.HEARTBEAT_REQ, 0x02, 0, 0]
+        )
+        remote.sendall(heartbeat + _events({"k": "v"})[0])
+
+        header, body = client._receive_event()
+        assert client.decode_event_bytes(header, body) == {"k": "v"}
+        assert remote.recv(64) == RawClient.heartbeat_response()
+
+
+def test_ber_negotiation():
+    local, remote = socket.socketpair()
+    with local, remote:
+        client = RawClient(encoding="BER")
+        client._channel = local
+        client._reader = EventReader(local)
+
+        client._send_negotiation_request()
+        [(header, body)] = list(protocol.iter_events(remote.recv(1024)))
+        assert header.type_specific == broker.TypeSpecific.ENCODING_BER
+        identity = ber.decode("NegotiationMessage", protocol.strip_padding(body))
+        assert identity["clientIdentity"]["features"] == "PROTOCOL_ENCODING:BER"
+
+        response = {"brokerResponse": {"result": {"category": "E_SUCCESS"}}}
+        remote.sendall(
+            protocol.encode_event(
+                broker.EventType.CONTROL,
+                ber.encode("NegotiationMessage", response),
+                broker.TypeSpecific.ENCODING_BER,
+                add_padding=True,
+            )
+        )
+        assert client._receive_negotiation_response() == response
+
+
+def test_unknown_encoding():
+    with pytest.raises(ValueError, match="Unknown encoding"):
+        RawClient(encoding="XML")
+
+
+def test_receiver_answers_heartbeats_and_filters_by_rid():
+    local, remote = socket.socketpair()
+    with remote:
+        client = RawClient(socket_timeout=5)
+        client._channel = local
+        client._reader = EventReader(local)
+        client.start_receiver()
+
+        # The heartbeat is answered while nobody is waiting for an event.
+        remote.sendall(protocol.encode_event(broker.EventType.HEARTBEAT_REQ))
+        assert remote.recv(64) == RawClient.heartbeat_response()
+
+        remote.sendall(b"".join(_events({"rId": 1, "a": 1}, {"rId": 2, "b": 2})))
+        assert client.receive(rid=2) == {"rId": 2, "b": 2}
+        assert client.receive() == {"rId": 1, "a": 1}
+        with pytest.raises(ConnectionError, match="Timeout"):
+            client.receive(rid=3, timeout=0.05)
+
+        remote.shutdown(socket.SHUT_RDWR)
+        with pytest.raises(ConnectionError, match="Receiver stopped"):
+            client.receive(timeout=5)
+        client.stop()
+        assert client._channel is None
@@ -0,0 +1,192 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+
+from blazingmq.dev.it.process.results import (
+    ClusterStatus,
+    CommandError,
+    QueueInternals,
+    StorageSummary,
+    unwrap,
+)
+
+URI = "bmq://bmq.test.mmap.priority/qqq"
+
+STORAGE_CONTENT = {
+    "storages": [
+        {
+            "queueUri": URI,
+            "queueKey": "C1E2A44527",
+            "partitionId": 0,
+            "numMessages": 3,
+            "numBytes": 204,
+            "isPersistent": True,
+            "internalQueueId": 1,
+        }
+    ]
+}
+
+STORAGE_SUMMARY = json.dumps(
+    {
+        "clusterStorageSummary": {
+            "clusterFileStoreLocation": "/tmp/storage",
+            "fileStores": [
+                {
+                    "partitionId": 0,
+                    "state": "open",
+                    "summary": {
+                        "primaryNodeDescription": "[east1, 1]",
+                        "primaryLeaseId": 2,
+                        "sequenceNum": 42,
+                        "isAvailable": True,
+                        "totalMappedBytes": 1024,
+                        "numOutstandingRecords": 3,
+                        "numUnreceiptedMessages": 0,
+                        "naglePacketCount": 0,
+                        "storageContent": STORAGE_CONTENT,
+                    },
+                },
+                {"partitionId": 1, "state": "open", "summary": {}},
+            ],
+        }
+    }
+)
+
+
+def test_storage_summary():
+    summary = StorageSummary.from_json(
+        unwrap(json.loads(STORAGE_SUMMARY), "clusterStorageSummary")
+    )
+
+    assert summary.location == "/tmp/storage"
+    assert sorted(summary.partitions) == [0, 1]
+
+    partition = summary.partitions[0]
+    assert partition.primary_node == "[east1, 1]"
+    assert partition.primary_lease_id == 2
+    assert partition.sequence_number == 42
+    assert partition.is_available
+    assert partition.queues[URI].num_messages == 3
+    assert partition.queues[URI].key == "C1E2A44527"
+
+    assert not summary.partitions[1].queues
+    assert summary.queue(URI) is partition.queues[URI]
+    assert summary.queue("bmq://bmq.test.mmap.priority/other") is None
+
+
+def test_unwrap_errors():
+    with pytest.raises(CommandError, match="Too high partitionId"):
+        unwrap({"error": {"message": "Too high partitionId value: '8'"}}, "x")
+
+    with pytest.raises(CommandError, match="expected 'queueInternals'"):
+        unwrap({"success": {}}, "queueInternals")
+
+
+def test_queue_internals():
+    internals = QueueInternals.from_json(
+        {
+            "state": {
+                "uri": URI,
+                "handleParametersJson": "{}",
+                "streamParametersJson": "{}",
+                "id": 0,
+                "key": "C1E2A44527",
+                "partitionId": 0,
+                "storage": {
+                    "numMessages": 2,
+                    "numBytes": 136,
+                    "virtualStorages": [
+                        {"appId": "foo", "appKey": "A", "numMessages": 2},
+                        {"appId": "bar", "appKey": "B", "numMessages": 0},
+                    ],
+                },
+                "handles": [
+                    {
+                        "clientDescription": "consumer",
+                        "parametersJson": "{}",
+                        "isClientClusterMember": False,
+                    }
+                ],
+            },
+            "queue": {"localQueue": {"queueEngine": {}}},
+        }
+    )
+
+    assert internals.uri == URI
+    assert internals.kind == "localQueue"
+    assert internals.num_messages == 2
+    assert internals.app_num_messages == {"foo": 2, "bar": 0}
+    assert internals.handles == ["consumer"]
+
+
+def test_cluster_status():
+    status = ClusterStatus.from_json(
+        {
+            "name": "itCluster",
+            "description": "Cluster (itCluster)",
+            "selfNodeDescription": "[east1, 1]",
+            "isHealthy": True,
+            "nodeStatuses": {
+                "nodes": [
+                    {
+                        "description": "[east1, 1]",
+                        "isAvailable": True,
+                        "status": "E_AVAILABLE",
+                        "primaryForPartitionIds": [0, 2],
+                    },
+                    {"description": "[east2, 2]", "status": "E_UNAVAILABLE"},
+                ]
+            },
+            "electorInfo": {
+                "electorState": "LEADER",
+                "leaderNode": "[east1, 1]",
+                "leaderMessageSequence": {"electorTerm": 1, "sequenceNumber": 4},
+                "leaderStatus": "ACTIVE",
+            },
+            "partitionsInfo": {},
+            "queuesInfo": STORAGE_CONTENT,
+            "clusterStorageSummary": json.loads(STORAGE_SUMMARY)[
+                "clusterStorageSummary"
+            ],
+        }
+    )
+
+    assert status.is_healthy
+    assert status.leader_node == "[east1, 1]"
+    assert status.leader_status == "ACTIVE"
+    assert status.nodes[0].primary_for_partitions == [0, 2]
+    assert status.nodes[1].is_available is None
+    assert status.queues[URI].num_bytes == 204
+    assert status.storage.partitions[0].queues[URI].num_messages == 3
+
+
+def test_cluster_proxy_status():
+    status = ClusterStatus.from_json(
+        {
+            "description": "Proxy (itCluster)",
+            "activeNodeDescription": "[east1, 1]",
+            "isHealthy": False,
+            "nodeStatuses": {},
+            "queuesInfo": {},
+        }
+    )
+
+    assert not status.is_healthy
+    assert status.leader_node == "[east1, 1]"
+    assert status.storage is None
+    assert not status.queues
@@ -0,0 +1,158 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import base64
+import json
+import socket
+
+import pytest
+
+from blazingmq.dev.it.process.stress import Step, StressDriver
+from blazingmq.schemas import protocol
+from blazingmq.schemas.broker import EventType
+from blazingmq.schemas.protocol import EVENT_HEADER_SIZE
+
+SUCCESS = {"category": "E_SUCCESS", "code": 0, "message": ""}
+
+
+class _FakeBroker:
+    """
+    Answer the handshakes of 'StressDriver' in JSON, sending a heartbeat
+    request before each response.  Authentication fails for users other than
+    "good", queues with a URI ending with "bad" cannot be opened, and the
+    responses to opening queues with a URI ending with "garbage" are not
+    valid JSON.
+    """
+
+    def __init__(self):
+        self.sessions = 0
+        self.max_sessions = 0
+
+    async def serve(self, reader, writer):
+        self.sessions += 1
+        self.max_sessions = max(self.max_sessions, self.sessions)
+        try:
+            while True:
+                header = await reader.readexactly(EVENT_HEADER_SIZE)
+                event = protocol.decode_event_header(header)
+                body = await reader.readexactly(event.length - EVENT_HEADER_SIZE)
+                if event.type == EventType.HEARTBEAT_RSP:
+                    continue
+                request = json.loads(bytes(protocol.strip_padding(body)))
+                writer.write(protocol.encode_event(EventType.HEARTBEAT_REQ))
+                writer.write(
+                    protocol.encode_control_event(self.respond(request), event.type)
+                )
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    @staticmethod
+    def respond(request):
+        if "authenticationRequest" in request:
+            data = base64.b64decode(request["authenticationRequest"]["data"])
+            status = dict(SUCCESS)
+            if data != b"good":
+                status["category"] = "E_NOT_SUPPORTED"
+            return {"authenticationResponse": {"status": status}}
+        if "clientIdentity" in request:
+            return {"brokerResponse": {"result": SUCCESS}}
+        if "openQueue" in request:
+            if request["openQueue"]["handleParameters"]["uri"].endswith("garbage"):
+                return '{"rId": '
+            if request["openQueue"]["handleParameters"]["uri"].endswith("bad"):
+                return {"rId": request["rId"], "status": {"category": "E_REFUSED"}}
+            return {"rId": request["rId"], "openQueueResponse": {}}
+        if "disconnect" in request:
+            return {"rId": request["rId"], "disconnectResponse": {}}
+        raise AssertionError(request)
+
+
+def _run(fake, connections, **kwargs):
+    async def main():
+        server = await asyncio.start_server(fake.serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            driver = StressDriver("127.0.0.1", port, timeout=5, **kwargs)
+            return await driver.run_async(connections, concurrency=20)
+
+    return asyncio.run(main())
+
+
+def test_stress_handshakes():
+    fake = _FakeBroker()
+    report = _run(
+        fake,
+        50,
+        script=(Step.AUTHENTICATE, Step.NEGOTIATE, Step.OPEN_QUEUE, Step.DISCONNECT),
+        credentials=lambda index: ("Basic", "good" if index % 5 else "bad"),
+    )
+
+    assert report.succeeded == 40
+    assert report.failures == {(Step.AUTHENTICATE, "E_NOT_SUPPORTED"): 10}
+    assert report.latencies[Step.CONNECT].count == 50
+    assert report.latencies[Step.DISCONNECT].count == 40
+    assert fake.max_sessions <= 20
+
+    summary = report.summary()
+    assert summary["failures"] == {"authenticate: E_NOT_SUPPORTED": 10}
+    assert set(summary["steps"]) == {
+        "connect",
+        "authenticate",
+        "negotiate",
+        "openQueue",
+        "disconnect",
+    }
+    assert summary["handshakesPerSec"] > 0
+
+
+def test_stress_hold_and_queue_failures():
+    fake = _FakeBroker()
+    report = _run(fake, 30, script=(Step.NEGOTIATE, Step.OPEN_QUEUE), uri="bmq://d/bad")
+
+    assert report.succeeded == 0
+    assert report.failures == {(Step.OPEN_QUEUE, "E_REFUSED"): 30}
+
+    report = _run(
+        fake, 30, script=(Step.NEGOTIATE, Step.OPEN_QUEUE), uri="bmq://d/garbage"
+    )
+    assert report.succeeded == 0
+    # The reason is the name of the decoding error of the JSON backend.
+    [((step, _), count)] = report.failures.items()
+    assert (step, count) == (Step.OPEN_QUEUE, 30)
+
+    fake = _FakeBroker()
+    report = _run(fake, 30, script=(Step.NEGOTIATE,), hold=True)
+    assert report.succeeded == 30
+    assert fake.max_sessions == 30
+
+
+def test_stress_connection_refused():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    report = StressDriver("127.0.0.1", port, timeout=5).run(3)
+    assert report.succeeded == 0
+    assert report.failures == {(Step.CONNECT, "ConnectionRefusedError"): 3}
+
+
+def test_stress_requires_credentials():
+    with pytest.raises(ValueError, match="credentials"):
+        StressDriver("127.0.0.1", 1, script=(Step.AUTHENTICATE,))
@@ -0,0 +1,95 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import concurrent.futures
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from blazingmq.dev.it.cluster import Cluster
+
+
+class _LazyFuture(concurrent.futures.Future):
+    """A future resolved when first awaited, by the specified 'resolve'."""
+
+    def __init__(self, resolve):
+        super().__init__()
+        self._resolve = resolve
+
+    def result(self, timeout=None):
+        if not self.done() and self._resolve is not None:
+            self.set_result(self._resolve())
+        return super().result(timeout)
+
+
+class _FakeSession:
+    def __init__(self, name, log, resolve=None):
+        self.name = name
+        self.log = log
+        self.resolve = resolve
+
+    def request(self, command):
+        self.log.append((self.name, command))
+        return _LazyFuture(self.resolve)
+
+
+class _FakeBroker:
+    def __init__(self, name, log, resolve=None):
+        self.name = name
+        self.session = _FakeSession(name, log, resolve)
+
+    def admin_session(self):
+        return self.session
+
+
+def _make_cluster():
+    return Cluster(MagicMock(), MagicMock(), Path("."))
+
+
+def test_admin_all_sends_before_waiting():
+    log = []
+    brokers = []
+
+    def make_resolve(name):
+        def resolve():
+            # Every request must be sent before the first response is awaited.
+            assert len(log) == len(brokers)
+            return json.dumps({"node": name})
+
+        return resolve
+
+    for i in range(3):
+        brokers.append(_FakeBroker(f"node{i}", log, make_resolve(f"node{i}")))
+
+    results = _make_cluster().admin_all("BROKERCONFIG DUMP", brokers)
+
+    assert results == {f"node{i}": {"node": f"node{i}"} for i in range(3)}
+    assert log == [
+        (f"node{i}", "ENCODING JSON_COMPACT BROKERCONFIG DUMP") for i in range(3)
+    ]
+
+
+def test_admin_all_rejects_non_json():
+    broker = _FakeBroker("node", [], lambda: "Unknown command")
+    with pytest.raises(RuntimeError, match="node: non-JSON response"):
+        _make_cluster().admin_all("FOO", [broker])
+
+
+def test_admin_all_timeout():
+    broker = _FakeBroker("node", [])
+    with pytest.raises(concurrent.futures.TimeoutError):
+        _make_cluster().admin_all("HELP", [broker], timeout=0.01)
@@ -0,0 +1,69 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+
+from blazingmq.dev.it.latency import LatencyHistogram, assert_latency_below
+
+REPORT = {
+    "origin": "end2end",
+    "min": 100,
+    "max": 5000,
+    "avg": 192,
+    "median": 100,
+    "95percentile": 200,
+    "99percentile": 200,
+    "dataPoints": {"100": 50, "200": 40},
+}
+
+
+def test_record_rounds_like_bmqtool():
+    histogram = LatencyHistogram()
+    for latency in (0, 999, 1000, 1001, 123456, 987654321):
+        histogram.record(latency)
+    assert histogram == LatencyHistogram(
+        {0: 1, 999: 1, 1000: 2, 123000: 1, 987000000: 1}
+    )
+
+
+def test_from_report_and_merge(tmp_path):
+    path = tmp_path / "report.json"
+    path.write_text(json.dumps(REPORT))
+    histogram = LatencyHistogram.from_report(path) + LatencyHistogram({200: 9, 5000: 1})
+
+    assert histogram.count == 100
+    assert histogram.min == 100
+    assert histogram.max == 5000
+    assert histogram.mean == pytest.approx(198)
+    assert histogram.p50 == 100
+    assert histogram.p90 == 200
+    assert histogram.p99 == 200
+    assert histogram.p999 == 5000
+    assert histogram.summary()["p99.9"] == 5000
+
+    assert LatencyHistogram.merged([]).summary() == {"count": 0}
+    assert LatencyHistogram.merged([histogram, histogram]).count == 200
+
+
+def test_assert_latency_below():
+    histogram = LatencyHistogram.from_report(REPORT)
+    assert_latency_below(histogram, p50=101, p99=201, max=1000)
+
+    with pytest.raises(AssertionError, match="p99 = 200ns >= 200ns"):
+        assert_latency_below(histogram, p50=1000, p99=200)
+    with pytest.raises(AssertionError, match="at least 1 latency samples"):
+        assert_latency_below(LatencyHistogram(), p99=1)
@@ -0,0 +1,101 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# pylint: disable=protected-access; testing the message logs of 'run_steps'
+
+import pytest
+
+from blazingmq.dev.it import loadgen
+
+
+def test_ramp():
+    assert loadgen.ramp(100, 400, steps=4, step_duration=2) == [
+        loadgen.Step(100, 2),
+        loadgen.Step(200, 2),
+        loadgen.Step(300, 2),
+        loadgen.Step(400, 2),
+    ]
+
+
+def test_burst():
+    profile = loadgen.burst(10, 1000, period=5, burst_duration=1, duration=12)
+    assert profile == [
+        loadgen.Step(1000, 1),
+        loadgen.Step(10, 4),
+        loadgen.Step(1000, 1),
+        loadgen.Step(10, 4),
+        loadgen.Step(1000, 1),
+        loadgen.Step(10, 1),
+    ]
+
+
+def test_poisson():
+    profile = loadgen.poisson(200, duration=50, seed=42)
+    assert profile == loadgen.poisson(200, duration=50, seed=42)
+    assert sum(step.duration for step in profile) == pytest.approx(50)
+    mean = sum(step.rate * step.duration for step in profile) / 50
+    assert mean == pytest.approx(200, rel=0.05)
+
+
+@pytest.mark.parametrize("rate", [0.5, 1, 30, 100, 1234, 50000])
+def test_pacing(rate):
+    post_interval, post_rate = loadgen.pacing(rate)
+    assert post_interval >= loadgen.MIN_POST_INTERVAL
+    assert post_rate / post_interval == pytest.approx(rate, rel=0.05)
+
+
+def test_message_log(tmp_path):
+    path = tmp_path / "consumer.log"
+    log = loadgen._MessageLog(path, "PUSH")
+    assert log.update() == 0
+
+    def record(category, fields):
+        return f"\n19OCT2026_12:00:00.000 42:7 INFO {category} {fields}".encode()
+
+    with path.open("ab") as file:
+        file.write(record("SESSION", "CONNECTED|"))
+        file.write(record("PUSH", "bmq://d/q|0001|payload"))
+        file.write(record("PUSH", "bmq://d/q|0002|pay")[:-3])
+    assert log.update() == 2
+    with path.open("ab") as file:
+        file.write(b"load")
+        file.write(record("CONFIRM", "bmq://d/q|0001|"))
+        file.write(record("PUSH", "bmq://d/q|0003|payload"))
+    assert log.update() == 3
+    assert log.update() == 3
+    assert log.failed == 0
+
+
+def test_message_log_nacks(tmp_path):
+    path = tmp_path / "producer.log"
+    log = loadgen._MessageLog(path, "ACK")
+
+    def record(guid, status):
+        return (
+            "\n19OCT2026_12:00:00.000 42:7 INFO ACK"
+            f" bmq://d/q|[ autoValue = 1 ]|{guid}|{status}|"
+        ).encode()
+
+    with path.open("ab") as file:
+        file.write(record("0001", "SUCCESS"))
+        file.write(record("0002", "LIMIT_MESSAGES"))
+        file.write(record("0003", "SUCCESS"))
+        file.write(record("0004", "LIMIT_BYTES")[:-8])
+    assert log.update() == 4
+    assert log.failed == 1
+    with path.open("ab") as file:
+        file.write(b"T_BYTES|")
+    assert log.update() == 4
+    assert log.failed == 2
@@ -0,0 +1,483 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+BER codec for the BlazingMQ control message schemas.
+
+The broker encodes control messages (see 'bmqp_ctrlmsg.xsd') either in JSON or
+with the Basic Encoding Rules as implemented by 'balber', and prefers BER.
+This module encodes and decodes BER using the element ids of the XSD, from and
+to the same dictionaries as the JSON encoding (e.g. 'broker.OPEN_QUEUE_SCHEMA'):
+enumerators are names, binary fields are base64 strings, and anonymous choices
+are flattened into their parent sequence.
+
+The 'balber' conventions followed are:
+o the top-level value is a universal SEQUENCE, whether it is a sequence or a
+  choice;
+o the elements of a sequence, and the selection of a choice, are tagged with
+  their context-specific id (the 'bdem:id' of the element, or its position);
+o an anonymous choice is an element of its sequence, with the id following the
+  preceding elements;
+o constructed values are encoded with an indefinite length, primitive values
+  with a definite length, integers and enumerators as minimal two's
+  complement;
+o the items of an array are tagged with their universal type;
+o null elements are omitted.
+The decoder accepts both definite and indefinite lengths, and skips unknown
+elements.
+
+Public types:
+o 'Schema': the types of an XSD, with 'encode' and 'decode' methods.
+
+Public constants:
+o 'CONTROL_XSD': the path of 'bmqp_ctrlmsg.xsd' in this repository.
+
+Public functions:
+o 'control_schema': the schema of 'bmqp_ctrlmsg.xsd', loaded once.
+o 'encode', 'decode': encode or decode a message of 'control_schema'.
+
+See also: bmqp_ctrlmsg.xsd, balber_berencoder.h
+"""
+
+import base64
+import functools
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+XSD_NAMESPACE = "{http://www.w3.org/2001/XMLSchema}"
+BDEM_ID = "{http://bloomberg.com/schemas/bdem}id"
+
+# Tag classes and universal tag numbers (see X.690).
+CONTEXT_SPECIFIC = 0x80
+CONSTRUCTED = 0x20
+UNIVERSAL_BOOLEAN = 1
+UNIVERSAL_INTEGER = 2
+UNIVERSAL_OCTET_STRING = 4
+UNIVERSAL_ENUMERATED = 10
+UNIVERSAL_UTF8_STRING = 12
+UNIVERSAL_SEQUENCE = 16
+
+INTEGER_TYPES = {"int", "long", "short", "byte"}
+UNSIGNED_TYPES = {"unsignedInt", "unsignedLong", "unsignedShort", "unsignedByte"}
+BINARY_TYPES = {"hexBinary", "base64Binary"}
+
+END_OF_CONTENTS = b"\x00\x00"
+
+
+class BerError(ValueError):
+    """
+    Raised when a value cannot be encoded, or BER data cannot be decoded.
+    """
+
+
+# =============================================================================
+#                                   SCHEMA
+# =============================================================================
+
+
+class Element(NamedTuple):
+    """An element of a sequence or a selection of a choice."""
+
+    id: int
+    name: str  # empty for an anonymous choice
+    type: str
+    is_array: bool
+    is_optional: bool = False
+    default: Optional[str] = None
+
+
+class ComplexType(NamedTuple):
+    name: str
+    is_choice: bool
+    elements: List[Element]
+    by_id: Dict[int, Element]
+
+
+class EnumType(NamedTuple):
+    name: str
+    ids: Dict[str, int]
+    names: Dict[int, str]
+
+
+def _local_name(type_name: str) -> str:
+    return type_name.split(":", 1)[-1]
+
+
+class Schema:
+    """
+    The complex and enumeration types of an XSD, and their BER codec.
+    """
+
+    def __init__(self) -> None:
+        self.complex_types: Dict[str, ComplexType] = {}
+        self.enum_types: Dict[str, EnumType] = {}
+
+    @classmethod
+    def from_xsd(cls, path: Union[str, Path]) -> "Schema":
+        """Return the schema of the XSD file at the specified 'path'."""
+
+        schema = cls()
+        root = ET.parse(path).getroot()
+
+        for simple in root.iter(f"{XSD_NAMESPACE}simpleType"):
+            ids: Dict[str, int] = {}
+            next_id = 0
+            for enumeration in simple.iter(f"{XSD_NAMESPACE}enumeration"):
+                next_id = int(enumeration.get(BDEM_ID, next_id))
+                ids[enumeration.get("value")] = next_id
+                next_id += 1
+            name = simple.get("name")
+            schema.enum_types[name] = EnumType(
+                name, ids, {id: value for value, id in ids.items()}
+            )
+
+        for complex_ in root.iter(f"{XSD_NAMESPACE}complexType"):
+            name = complex_.get("name")
+            for child in complex_:
+                if child.tag == f"{XSD_NAMESPACE}sequence":
+                    schema._add_complex(name, child, is_choice=False)
+                elif child.tag == f"{XSD_NAMESPACE}choice":
+                    schema._add_complex(name, child, is_choice=True)
+            if name not in schema.complex_types:
+                # A type without content, e.g. 'FollowerLSNRequest'.
+                schema._add_complex(name, ET.Element("sequence"), is_choice=False)
+
+        return schema
+
+    def _add_complex(self, name: str, node: ET.Element, is_choice: bool) -> None:
+        elements = []
+        next_id = 0
+        for child in node:
+            next_id = int(child.get(BDEM_ID, next_id))
+            if child.tag == f"{XSD_NAMESPACE}element":
+                elements.append(
+                    Element(
+                        next_id,
+                        child.get("name"),
+                        _local_name(child.get("type")),
+                        child.get("maxOccurs", "1") != "1",
+                        child.get("minOccurs", "1") == "0",
+                        child.get("default"),
+                    )
+                )
+            elif child.tag == f"{XSD_NAMESPACE}choice":
+                # An anonymous choice is an element of the sequence, holding
+                # a choice type of its own.
+                choice_name = f"{name}Choice"
+                self._add_complex(choice_name, child, is_choice=True)
+                elements.append(Element(next_id, "", choice_name, False))
+            else:
+                continue
+            next_id += 1
+
+        self.complex_types[name] = ComplexType(
+            name, is_choice, elements, {element.id: element for element in elements}
+        )
+
+    # ENCODING
+
+    def encode(self, type_name: str, value: Dict[str, Any]) -> bytes:
+        """
+        Return the BER encoding of the specified 'value' of the complex type
+        with the specified 'type_name'.
+        """
+
+        out = bytearray()
+        _put_identifier(out, CONSTRUCTED, UNIVERSAL_SEQUENCE)
+        out.append(0x80)
+        self._encode_content(out, self.complex_types[type_name], value)
+        out += END_OF_CONTENTS
+        return bytes(out)
+
+    def _encode_content(
+        self, out: bytearray, complex_: ComplexType, value: Dict[str, Any]
+    ) -> None:
+        if complex_.is_choice:
+            selected = [e for e in complex_.elements if e.name in value]
+            if len(selected) != 1:
+                raise BerError(
+                    f"{complex_.name}: expected one selection, got {list(value)}"
+                )
+            element = selected[0]
+            self._encode_element(out, element, value[element.name])
+            return
+
+        for element in complex_.elements:
+            if not element.name:
+                choice = self.complex_types[element.type]
+                if any(e.name in value for e in choice.elements):
+                    _put_identifier(out, CONTEXT_SPECIFIC | CONSTRUCTED, element.id)
+                    out.append(0x80)
+                    self._encode_content(out, choice, value)
+                    out += END_OF_CONTENTS
+            elif value.get(element.name) is not None:
+                self._encode_element(out, element, value[element.name])
+
+    def _encode_element(self, out: bytearray, element: Element, value: Any) -> None:
+        if element.is_array:
+            _put_identifier(out, CONTEXT_SPECIFIC | CONSTRUCTED, element.id)
+            out.append(0x80)
+            for item in value:
+                self._encode_value(out, element.type, item, None)
+            out += END_OF_CONTENTS
+        else:
+            self._encode_value(out, element.type, value, element.id)
+
+    def _encode_value(
+        self, out: bytearray, type_name: str, value: Any, tag: Optional[int]
+    ) -> None:
+        """
+        Encode the specified 'value' of the specified 'type_name' with the
+        specified context-specific 'tag', or with its universal tag if 'tag'
+        is 'None'.
+        """
+
+        complex_ = self.complex_types.get(type_name)
+        if complex_ is not None:
+            if tag is None:
+                _put_identifier(out, CONSTRUCTED, UNIVERSAL_SEQUENCE)
+            else:
+                _put_identifier(out, CONTEXT_SPECIFIC | CONSTRUCTED, tag)
+            out.append(0x80)
+            self._encode_content(out, complex_, value)
+            out += END_OF_CONTENTS
+            return
+
+        universal, content = self._encode_primitive(type_name, value)
+        if tag is None:
+            _put_identifier(out, 0, universal)
+        else:
+            _put_identifier(out, CONTEXT_SPECIFIC, tag)
+        _put_length(out, len(content))
+        out += content
+
+    def _encode_primitive(self, type_name: str, value: Any) -> Tuple[int, bytes]:
+        if type_name in INTEGER_TYPES or type_name in UNSIGNED_TYPES:
+            return UNIVERSAL_INTEGER, _integer_content(int(value))
+        if type_name == "boolean":
+            return UNIVERSAL_BOOLEAN, b"\x01" if value else b"\x00"
+        if type_name == "string":
+            return UNIVERSAL_UTF8_STRING, value.encode("utf-8")
+        if type_name in BINARY_TYPES:
+            if isinstance(value, str):
+                value = base64.b64decode(value)
+            return UNIVERSAL_OCTET_STRING, bytes(value)
+        enum = self.enum_types.get(type_name)
+        if enum is not None:
+            try:
+                enum_id = enum.ids[value] if isinstance(value, str) else int(value)
+            except KeyError:
+                raise BerError(f"{type_name}: unknown enumerator {value!r}") from None
+            return UNIVERSAL_ENUMERATED, _integer_content(enum_id)
+        raise BerError(f"unsupported type '{type_name}'")
+
+    # DECODING
+
+    def decode(self, type_name: str, data: Buffer) -> Dict[str, Any]:
+        """
+        Return the value of the complex type with the specified 'type_name'
+        decoded from the specified BER 'data'.
+        """
+
+        data = memoryview(data)
+        _, constructed, start, end, _ = _read_tlv(data, 0)
+        if not constructed:
+            raise BerError(f"{type_name}: expected a constructed value")
+        return self._decode_content(self.complex_types[type_name], data, start, end)
+
+    def _decode_content(
+        self, complex_: ComplexType, data: memoryview, start: int, end: int
+    ) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        pos = start
+        while pos < end:
+            tag, _, child_start, child_end, pos = _read_tlv(data, pos)
+            element = complex_.by_id.get(tag)
+            if element is None:
+                continue
+            if not element.name:
+                choice = self.complex_types[element.type]
+                result.update(
+                    self._decode_content(choice, data, child_start, child_end)
+                )
+            elif element.is_array:
+                items = []
+                item_pos = child_start
+                while item_pos < child_end:
+                    _, _, item_start, item_end, item_pos = _read_tlv(data, item_pos)
+                    items.append(
+                        self._decode_value(element.type, data, item_start, item_end)
+                    )
+                result[element.name] = items
+            else:
+                result[element.name] = self._decode_value(
+                    element.type, data, child_start, child_end
+                )
+            if complex_.is_choice:
+                break
+        return result
+
+    def _decode_value(
+        self, type_name: str, data: memoryview, start: int, end: int
+    ) -> Any:
+        complex_ = self.complex_types.get(type_name)
+        if complex_ is not None:
+            return self._decode_content(complex_, data, start, end)
+
+        content = data[start:end]
+        if type_name in INTEGER_TYPES:
+            return int.from_bytes(content, "big", signed=True)
+        if type_name in UNSIGNED_TYPES:
+            return int.from_bytes(content, "big", signed=False)
+        if type_name == "boolean":
+            return any(content)
+        if type_name == "string":
+            return str(content, "utf-8")
+        if type_name in BINARY_TYPES:
+            return base64.b64encode(content).decode("ascii")
+        enum = self.enum_types.get(type_name)
+        if enum is not None:
+            enum_id = int.from_bytes(content, "big", signed=True)
+            return enum.names.get(enum_id, enum_id)
+        raise BerError(f"unsupported type '{type_name}'")
+
+
+# =============================================================================
+#                                 PRIMITIVES
+# =============================================================================
+
+
+def _put_identifier(out: bytearray, flags: int, number: int) -> None:
+    if number < 31:
+        out.append(flags | number)
+        return
+    out.append(flags | 0x1F)
+    octets = [number & 0x7F]
+    number >>= 7
+    while number:
+        octets.append(0x80 | (number & 0x7F))
+        number >>= 7
+    out += bytes(reversed(octets))
+
+
+def _put_length(out: bytearray, length: int) -> None:
+    if length < 0x80:
+        out.append(length)
+        return
+    octets = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    out.append(0x80 | len(octets))
+    out += octets
+
+
+def _integer_content(value: int) -> bytes:
+    """
+    Return the minimal two's complement representation of 'value'.  Unsigned
+    values with their high bit set get a leading zero octet.
+    """
+
+    size = (value.bit_length() if value >= 0 else (~value).bit_length()) // 8 + 1
+    return value.to_bytes(size, "big", signed=True)
+
+
+def _read_tlv(data: memoryview, pos: int) -> Tuple[int, bool, int, int, int]:
+    """
+    Read the value at the specified 'pos' in 'data', and return its tag
+    number, whether it is constructed, the start and end of its contents, and
+    the position following it.
+    """
+
+    try:
+        identifier = data[pos]
+        pos += 1
+        number = identifier & 0x1F
+        if number == 0x1F:
+            number = 0
+            while True:
+                octet = data[pos]
+                pos += 1
+                number = (number << 7) | (octet & 0x7F)
+                if not octet & 0x80:
+                    break
+        constructed = bool(identifier & CONSTRUCTED)
+
+        length = data[pos]
+        pos += 1
+        if length == 0x80:
+            if not constructed:
+                raise BerError("indefinite length for a primitive value")
+            # Skip the nested values up to the end-of-contents octets.
+            end = pos
+            while data[end] != 0 or data[end + 1] != 0:
+                end = _read_tlv(data, end)[4]
+            return number, constructed, pos, end, end + 2
+        if length & 0x80:
+            num_octets = length & 0x7F
+            length = int.from_bytes(data[pos : pos + num_octets], "big")
+            pos += num_octets
+    except IndexError:
+        raise BerError("truncated BER data") from None
+
+    if pos + length > len(data):
+        raise BerError("truncated BER data")
+    return number, constructed, pos, pos + length, pos + length
+
+
+# =============================================================================
+#                           CONTROL MESSAGE SCHEMA
+# =============================================================================
+
+
+CONTROL_XSD = (
+    Path(__file__).resolve().parents[4]
+    / "src"
+    / "groups"
+    / "bmq"
+    / "bmqp"
+    / "bmqp_ctrlmsg.xsd"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def control_schema(xsd: Path = CONTROL_XSD) -> Schema:
+    """
+    Return the schema of the control messages read from the specified 'xsd',
+    by default the 'bmqp_ctrlmsg.xsd' of the repository containing this
+    module.
+    """
+
+    return Schema.from_xsd(xsd)
+
+
+def encode(type_name: str, value: Dict[str, Any]) -> bytes:
+    """
+    Return the BER encoding of the specified 'value', a 'ControlMessage',
+    'NegotiationMessage' or 'AuthenticationMessage' as specified by
+    'type_name'.
+    """
+
+    return control_schema().encode(type_name, value)
+
+
+def decode(type_name: str, data: Buffer) -> Dict[str, Any]:
+    """
+    Return the 'ControlMessage', 'NegotiationMessage' or
+    'AuthenticationMessage' (as specified by 'type_name') decoded from the
+    specified BER 'data'.
+    """
+
+    return control_schema().decode(type_name, data)
@@ -80,6 +80,27 @@ class PutHeaderFlags(IntFlag):
     MESSAGE_PROPERTIES = 0x01 << 1
 
 
+class StorageMessageType(IntEnum):
+    """
+    See also: bmqp::StorageMessageType
+    """
+
+    DATA = 1
+    QLIST = 2
+    CONFIRM = 3
+    DELETION = 4
+    JOURNAL_OP = 5
+    QUEUE_OP = 6
+
+
+class StorageHeaderFlags(IntFlag):
+    """
+    See also: bmqp::StorageHeaderFlags
+    """
+
+    RECEIPT_REQUESTED = 0x01 << 0
+
+
 # =============================================================================
 #                    BLAZINGMQ BROKER CONTROL MESSAGE SCHEMAS
 # =============================================================================
@@ -0,0 +1,757 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+BlazingMQ binary wire protocol codecs.
+
+Encoders and decoders for the event framing and the message headers of the
+broker protocol, built on precompiled 'struct.Struct' layouts.  All integers
+are big-endian, and all sizes expressed in words are multiples of 4 bytes.
+
+Public types:
+o 'EventHeader', 'PutHeader', 'PushHeader', 'AckMessage', 'ConfirmMessage',
+  'PutMessage', 'PushMessage', 'MessageProperty': decoded representations.
+o 'ControlTemplate': a pre-serialized JSON control event with variable fields.
+
+Public functions:
+o 'encode_event', 'encode_control_event': frame a body as an event.
+o 'event_descriptor': the size-independent part of an event header.
+o 'decode_event_header', 'iter_events': parse event framing.
+o 'encode_put_event', 'decode_put_event', 'decode_push_event',
+  'encode_push_event': batch codecs for PUT and PUSH events.
+o 'encode_ack_event', 'decode_ack_event', 'encode_confirm_event',
+  'decode_confirm_event': batch codecs for ACK and CONFIRM events.
+o 'encode_message_properties', 'decode_message_properties': codecs for the
+  message properties area.
+o 'encode_option': encode an option of a PUT or PUSH message.
+
+See also: bmqp_protocol.h, bmqp::MessageProperties
+"""
+
+import copy
+import json
+import struct
+from enum import IntEnum, IntFlag
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import crc32c
+
+from blazingmq.schemas.broker import EventType, TypeSpecific
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+# =============================================================================
+#                                  CONSTANTS
+# =============================================================================
+
+
+WORD_SIZE = 4
+PROTOCOL_VERSION = 1
+NULL_GUID = bytes(16)
+
+
+class PropertyType(IntEnum):
+    """
+    See also: bmqt::PropertyType
+    """
+
+    BOOL = 1
+    CHAR = 2
+    SHORT = 3
+    INT32 = 4
+    INT64 = 5
+    STRING = 6
+    BINARY = 7
+
+
+class OptionType(IntEnum):
+    """
+    See also: bmqp::OptionType
+    """
+
+    UNDEFINED = 0
+    SUB_QUEUE_IDS_OLD = 1
+    MSG_GROUP_ID = 2
+    SUB_QUEUE_INFOS = 3
+
+
+class PushHeaderFlags(IntFlag):
+    """
+    See also: bmqp::PushHeaderFlags
+    """
+
+    IMPLICIT_PAYLOAD = 0x01 << 0
+    MESSAGE_PROPERTIES = 0x01 << 1
+    OUT_OF_ORDER = 0x01 << 2
+
+
+# Precompiled layouts, without the bit-packed fields split.
+_EVENT_HEADER = struct.Struct(">IBBBx")  # length, PV|type, HW, typeSpecific
+_PUT_HEADER = struct.Struct(">IIi16sIH2x")  # flags|words, options|CAT|HW, qId,
+#                                             GUID, CRC32-C, schemaId
+_PUSH_HEADER = struct.Struct(">IIi16sH2x")  # flags|words, options|CAT|HW, qId,
+#                                             GUID, schemaId
+_ACK_HEADER = struct.Struct(">BBxx")  # HW|PMW, flags
+_ACK_MESSAGE = struct.Struct(">I16si")  # status|correlationId, GUID, qId
+_CONFIRM_HEADER = struct.Struct(">Bxxx")  # HW|PMW
+_CONFIRM_MESSAGE = struct.Struct(">i16si")  # qId, GUID, subQueueId
+_PROPERTIES_HEADER = struct.Struct(">BBHxB")  # sizes, area words, count
+_PROPERTY_HEADER = struct.Struct(">HHH")  # type|value length, name length
+_OPTION_HEADER = struct.Struct(">I")  # type|packed|typeSpecific|words
+
+EVENT_HEADER_SIZE = _EVENT_HEADER.size
+PUT_HEADER_SIZE = _PUT_HEADER.size
+PUSH_HEADER_SIZE = _PUSH_HEADER.size
+ACK_HEADER_SIZE = _ACK_HEADER.size
+ACK_MESSAGE_SIZE = _ACK_MESSAGE.size
+CONFIRM_HEADER_SIZE = _CONFIRM_HEADER.size
+CONFIRM_MESSAGE_SIZE = _CONFIRM_MESSAGE.size
+PROPERTIES_HEADER_SIZE = _PROPERTIES_HEADER.size
+PROPERTY_HEADER_SIZE = _PROPERTY_HEADER.size
+OPTION_HEADER_SIZE = _OPTION_HEADER.size
+
+_PADDING = [b"", b"\x01", b"\x02\x02", b"\x03\x03\x03", b"\x04\x04\x04\x04"]
+
+_PROPERTY_VALUE_FORMATS = {
+    PropertyType.BOOL: struct.Struct(">?"),
+    PropertyType.CHAR: struct.Struct(">b"),
+    PropertyType.SHORT: struct.Struct(">h"),
+    PropertyType.INT32: struct.Struct(">i"),
+    PropertyType.INT64: struct.Struct(">q"),
+}
+
+# =============================================================================
+#                                DECODED TYPES
+# =============================================================================
+
+
+class EventHeader(NamedTuple):
+    """
+    See also: bmqp::EventHeader
+    """
+
+    length: int
+    type: int
+    type_specific: int = 0
+    header_words: int = EVENT_HEADER_SIZE // WORD_SIZE
+    protocol_version: int = PROTOCOL_VERSION
+    fragment: bool = False
+
+
+class PutHeader(NamedTuple):
+    """
+    See also: bmqp::PutHeader
+    """
+
+    flags: int
+    message_words: int
+    options_words: int
+    compression: int
+    header_words: int
+    queue_id: int
+    guid: bytes
+    crc32c: int
+    schema_id: int
+
+
+class PushHeader(NamedTuple):
+    """
+    See also: bmqp::PushHeader
+    """
+
+    flags: int
+    message_words: int
+    options_words: int
+    compression: int
+    header_words: int
+    queue_id: int
+    guid: bytes
+    schema_id: int
+
+
+class PutMessage(NamedTuple):
+    """A message of a PUT event; 'payload' includes the properties area."""
+
+    queue_id: int
+    payload: Buffer
+    guid: bytes = NULL_GUID
+    flags: int = 0
+    schema_id: int = 0
+    options: Buffer = b""
+
+
+class PushMessage(NamedTuple):
+    """A message of a PUSH event; 'payload' includes the properties area."""
+
+    queue_id: int
+    guid: bytes
+    payload: Buffer = b""
+    flags: int = 0
+    schema_id: int = 0
+    options: Buffer = b""
+
+
+class AckMessage(NamedTuple):
+    """
+    See also: bmqp::AckMessage
+    """
+
+    status: int
+    correlation_id: int
+    guid: bytes
+    queue_id: int
+
+
+class ConfirmMessage(NamedTuple):
+    """
+    See also: bmqp::ConfirmMessage
+    """
+
+    queue_id: int
+    guid: bytes
+    sub_queue_id: int = 0
+
+
+class MessageProperty(NamedTuple):
+    name: str
+    type: PropertyType
+    value: Union[bool, int, str, bytes]
+
+
+# =============================================================================
+#                                EVENT FRAMING
+# =============================================================================
+
+
+def padding(length: int) -> bytes:
+    """
+    Return the padding bytes (between 1 and 4, each holding the number of
+    padding bytes) that align the specified 'length' on a word boundary.
+
+    See also: bmqp::ProtocolUtil::calcNumWordsAndPadding
+    """
+    return _PADDING[WORD_SIZE - length % WORD_SIZE]
+
+
+def _encode_event_header(event: bytearray, event_type: int, type_specific: int) -> None:
+    """Write the header at the start of the specified complete 'event'."""
+    _EVENT_HEADER.pack_into(
+        event,
+        0,
+        len(event),
+        (PROTOCOL_VERSION << 6) | event_type,
+        EVENT_HEADER_SIZE // WORD_SIZE,
+        type_specific,
+    )
+
+
+def event_descriptor(event_type: int, type_specific: int = TypeSpecific.EMPTY) -> bytes:
+    """
+    Return the second word of the header of an event of the specified
+    'event_type' and 'type_specific' byte, which does not depend on the size
+    of the event.
+    """
+    return bytes(
+        [
+            (PROTOCOL_VERSION << 6) | event_type,
+            EVENT_HEADER_SIZE // WORD_SIZE,
+            type_specific,
+            0,
+        ]
+    )
+
+
+def encode_event(
+    event_type: int,
+    body: Buffer = b"",
+    type_specific: int = TypeSpecific.EMPTY,
+    add_padding: bool = False,
+) -> bytes:
+    """
+    Return the event of the specified 'event_type' and 'type_specific' byte
+    holding the specified 'body', padded if 'add_padding' is True.
+    """
+    event = bytearray(EVENT_HEADER_SIZE)
+    event += body
+    if add_padding:
+        event += padding(len(body))
+    _encode_event_header(event, event_type, type_specific)
+    return bytes(event)
+
+
+def encode_control_event(
+    payload: Union[str, bytes, dict], event_type: int = EventType.CONTROL
+) -> bytes:
+    """
+    Return the JSON encoded control event (or event of the specified
+    'event_type', e.g. 'AUTHENTICATION') holding the specified 'payload'.
+    """
+    if isinstance(payload, dict):
+        payload = json.dumps(payload)
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    return encode_event(
+        event_type, payload, TypeSpecific.ENCODING_JSON, add_padding=True
+    )
+
+
+class ControlTemplate:
+    """
+    An immutable control message with variable fields ("slots"), each
+    identified by a name and the path of keys leading to it in the message.
+
+    The JSON text around the slots is serialized once, so that rendering an
+    event only serializes the slot values and concatenates bytes.  Templates
+    hold a private copy of their message and are never modified, so they can
+    be shared between threads.
+
+    Example:
+        template = ControlTemplate(
+            broker.ADMIN_COMMAND_SCHEMA,
+            rid=("rId",),
+            command=("adminCommand", "command"),
+        )
+        event = template.render(rid=1, command="HELP")
+    """
+
+    __slots__ = ("event_type", "_message", "_paths", "_names", "_parts")
+
+    def __init__(
+        self,
+        message: Dict[str, Any],
+        event_type: int = EventType.CONTROL,
+        **slots: Sequence[str],
+    ):
+        self.event_type = event_type
+        self._message = copy.deepcopy(message)
+        self._paths = {name: tuple(path) for name, path in slots.items()}
+
+        # Serialize the message with a unique marker in each slot, then split
+        # the text around the markers.
+        marked = copy.deepcopy(message)
+        markers = {}
+        for name, path in self._paths.items():
+            marker = f"\x00{name}\x00"
+            _set_path(marked, path, marker)
+            markers[json.dumps(marker)] = name
+        text = json.dumps(marked, separators=(",", ":"))
+
+        positions = sorted((text.find(marker), marker) for marker in markers)
+        if any(position < 0 for position, _ in positions):
+            raise ValueError(f"slots {sorted(slots)} not all found in message")
+        self._names: Tuple[str, ...] = tuple(markers[m] for _, m in positions)
+        parts = []
+        start = 0
+        for position, marker in positions:
+            parts.append(text[start:position].encode("utf-8"))
+            start = position + len(marker)
+        parts.append(text[start:].encode("utf-8"))
+        self._parts: Tuple[bytes, ...] = tuple(parts)
+
+    def render(self, **values: Any) -> bytes:
+        """
+        Return the JSON encoded event holding the message with the specified
+        slot 'values'.
+        """
+        body = bytearray(self._parts[0])
+        for name, part in zip(self._names, self._parts[1:]):
+            body += json.dumps(values[name]).encode("utf-8")
+            body += part
+        return encode_event(
+            self.event_type, body, TypeSpecific.ENCODING_JSON, add_padding=True
+        )
+
+    def message(self, **values: Any) -> Dict[str, Any]:
+        """
+        Return a new message with the specified slot 'values', e.g. to encode
+        it with another encoding.
+        """
+        message = copy.deepcopy(self._message)
+        for name, path in self._paths.items():
+            _set_path(message, path, values[name])
+        return message
+
+
+def _set_path(message: Dict[str, Any], path: Sequence[str], value: Any) -> None:
+    for key in path[:-1]:
+        message = message[key]
+    message[path[-1]] = value
+
+
+def decode_event_header(buffer: Buffer, offset: int = 0) -> EventHeader:
+    """
+    Decode the 'EventHeader' at the specified 'offset' of 'buffer'.
+    """
+    length, version_and_type, header_words, type_specific = _EVENT_HEADER.unpack_from(
+        buffer, offset
+    )
+    return EventHeader(
+        length=length & 0x7FFFFFFF,
+        type=version_and_type & 0x3F,
+        type_specific=type_specific,
+        header_words=header_words,
+        protocol_version=version_and_type >> 6,
+        fragment=bool(length >> 31),
+    )
+
+
+def strip_padding(body: Buffer) -> memoryview:
+    """
+    Return a view on the specified padded 'body' without its padding.  Raise
+    'ValueError' if the padding is invalid.
+    """
+    body = memoryview(body)
+    if len(body) == 0 or not 1 <= body[-1] <= min(WORD_SIZE, len(body)):
+        raise ValueError("Invalid padding")
+    return body[: -body[-1]]
+
+
+def iter_events(buffer: Buffer) -> Iterator[Tuple[EventHeader, memoryview]]:
+    """
+    Iterate over the events of the specified 'buffer', which must hold
+    complete events, yielding each header and a view on its body (after the
+    header, including any padding).
+    """
+    view = memoryview(buffer)
+    offset = 0
+    while offset < len(view):
+        header = decode_event_header(view, offset)
+        if header.length < EVENT_HEADER_SIZE or offset + header.length > len(view):
+            raise ValueError(f"Invalid event length {header.length} at {offset}")
+        start = offset + header.header_words * WORD_SIZE
+        offset += header.length
+        yield header, view[start:offset]
+
+
+# =============================================================================
+#                                PUT AND PUSH
+# =============================================================================
+
+
+def encode_put_event(messages: Iterable[PutMessage]) -> bytes:
+    """
+    Return a PUT event holding the specified 'messages'.  The application
+    data of each message is checksummed and padded.
+
+    See also: bmqp::PutEventBuilder
+    """
+    event = bytearray(EVENT_HEADER_SIZE)
+    for message in messages:
+        offset = len(event)
+        event += bytes(PUT_HEADER_SIZE)
+        event += message.options
+        event += message.payload
+        event += padding(len(message.payload))
+        _PUT_HEADER.pack_into(
+            event,
+            offset,
+            (message.flags << 28) | ((len(event) - offset) // WORD_SIZE),
+            ((len(message.options) // WORD_SIZE) << 8) | (PUT_HEADER_SIZE // WORD_SIZE),
+            message.queue_id,
+            message.guid,
+            crc32c.crc32c(message.payload),
+            message.schema_id,
+        )
+    _encode_event_header(event, EventType.PUT, TypeSpecific.EMPTY)
+    return bytes(event)
+
+
+def encode_option(
+    option_type: int,
+    content: Buffer = b"",
+    type_specific: int = 0,
+    add_padding: bool = False,
+) -> bytes:
+    """
+    Return the option of the specified 'option_type' and 'type_specific'
+    bits holding the specified 'content', padded if 'add_padding' is True
+    (e.g. for a message group id).  'content' must be word aligned
+    otherwise.
+
+    See also: bmqp::OptionUtil::OptionsBox::add
+    """
+    option = bytearray(OPTION_HEADER_SIZE)
+    option += content
+    if add_padding:
+        option += padding(len(content))
+    _OPTION_HEADER.pack_into(
+        option,
+        0,
+        (option_type << 26) | (type_specific << 21) | (len(option) // WORD_SIZE),
+    )
+    return bytes(option)
+
+
+def _decode_header_words(word0: int, word1: int) -> Tuple[int, int, int, int, int]:
+    return (
+        word0 >> 28,
+        word0 & 0x0FFFFFFF,
+        word1 >> 8,
+        (word1 >> 5) & 0x07,
+        word1 & 0x1F,
+    )
+
+
+def _iter_messages(body: Buffer, layout: struct.Struct):
+    view = memoryview(body)
+    offset = 0
+    while offset < len(view):
+        fields = layout.unpack_from(view, offset)
+        decoded = _decode_header_words(fields[0], fields[1]) + fields[2:]
+        message_words, options_words, header_words = decoded[1], decoded[2], decoded[4]
+        end = offset + message_words * WORD_SIZE
+        if message_words < header_words or end > len(view):
+            raise ValueError(f"Invalid message size at {offset}")
+        options_start = offset + header_words * WORD_SIZE
+        data_start = options_start + options_words * WORD_SIZE
+        yield decoded, view[options_start:data_start], view[data_start:end]
+        offset = end
+
+
+def decode_put_event(
+    body: Buffer,
+) -> Iterator[Tuple[PutHeader, memoryview, memoryview]]:
+    """
+    Iterate over the messages of the specified PUT event 'body', yielding
+    the header, a view on the options and a view on the padded application
+    data of each one.
+    """
+    for fields, options, data in _iter_messages(body, _PUT_HEADER):
+        yield PutHeader(*fields), options, data
+
+
+def encode_push_event(messages: Iterable[PushMessage]) -> bytes:
+    """
+    Return a PUSH event holding the specified 'messages'.
+
+    See also: bmqp::PushEventBuilder
+    """
+    event = bytearray(EVENT_HEADER_SIZE)
+    for message in messages:
+        offset = len(event)
+        event += bytes(PUSH_HEADER_SIZE)
+        event += message.options
+        if not message.flags & PushHeaderFlags.IMPLICIT_PAYLOAD:
+            event += message.payload
+            event += padding(len(message.payload))
+        _PUSH_HEADER.pack_into(
+            event,
+            offset,
+            (message.flags << 28) | ((len(event) - offset) // WORD_SIZE),
+            ((len(message.options) // WORD_SIZE) << 8)
+            | (PUSH_HEADER_SIZE // WORD_SIZE),
+            message.queue_id,
+            message.guid,
+            message.schema_id,
+        )
+    _encode_event_header(event, EventType.PUSH, TypeSpecific.EMPTY)
+    return bytes(event)
+
+
+def decode_push_event(
+    body: Buffer,
+) -> Iterator[Tuple[PushHeader, memoryview, memoryview]]:
+    """
+    Iterate over the messages of the specified PUSH event 'body', yielding
+    the header, a view on the options and a view on the padded payload of
+    each one.
+    """
+    for fields, options, data in _iter_messages(body, _PUSH_HEADER):
+        yield PushHeader(*fields), options, data
+
+
+# =============================================================================
+#                                ACK AND CONFIRM
+# =============================================================================
+
+
+def encode_ack_event(acks: Sequence[AckMessage], flags: int = 0) -> bytes:
+    """
+    Return an ACK event holding the specified 'acks'.
+    """
+    event = bytearray(EVENT_HEADER_SIZE)
+    event += _ACK_HEADER.pack(
+        ((ACK_HEADER_SIZE // WORD_SIZE) << 4) | (ACK_MESSAGE_SIZE // WORD_SIZE),
+        flags,
+    )
+    for ack in acks:
+        event += _ACK_MESSAGE.pack(
+            (ack.status << 24) | (ack.correlation_id & 0xFFFFFF),
+            ack.guid,
+            ack.queue_id,
+        )
+    _encode_event_header(event, EventType.ACK, TypeSpecific.EMPTY)
+    return bytes(event)
+
+
+def _decode_array(body: Buffer, layout: struct.Struct) -> Iterator[tuple]:
+    view = memoryview(body)
+    words = view[0]
+    header_size = (words >> 4) * WORD_SIZE
+    message_size = (words & 0x0F) * WORD_SIZE
+    if message_size == layout.size:
+        return layout.iter_unpack(view[header_size:])
+    # A peer using larger per-message structures: skip the extra bytes.
+    return (
+        layout.unpack_from(view, offset)
+        for offset in range(header_size, len(view), message_size)
+    )
+
+
+def decode_ack_event(body: Buffer) -> List[AckMessage]:
+    """
+    Return the messages of the specified ACK event 'body'.
+    """
+    return [
+        AckMessage(word >> 24 & 0x0F, word & 0xFFFFFF, guid, queue_id)
+        for word, guid, queue_id in _decode_array(body, _ACK_MESSAGE)
+    ]
+
+
+def encode_confirm_event(confirms: Sequence[ConfirmMessage]) -> bytes:
+    """
+    Return a CONFIRM event holding the specified 'confirms'.
+    """
+    event = bytearray(EVENT_HEADER_SIZE)
+    event += _CONFIRM_HEADER.pack(
+        ((CONFIRM_HEADER_SIZE // WORD_SIZE) << 4) | (CONFIRM_MESSAGE_SIZE // WORD_SIZE)
+    )
+    for confirm in confirms:
+        event += _CONFIRM_MESSAGE.pack(*confirm)
+    _encode_event_header(event, EventType.CONFIRM, TypeSpecific.EMPTY)
+    return bytes(event)
+
+
+def decode_confirm_event(body: Buffer) -> List[ConfirmMessage]:
+    """
+    Return the messages of the specified CONFIRM event 'body'.
+    """
+    return [ConfirmMessage(*fields) for fields in _decode_array(body, _CONFIRM_MESSAGE)]
+
+
+# =============================================================================
+#                              MESSAGE PROPERTIES
+# =============================================================================
+
+
+def _encode_property_value(property_type: int, value) -> bytes:
+    layout = _PROPERTY_VALUE_FORMATS.get(property_type)
+    if layout is not None:
+        return layout.pack(value)
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    return bytes(value)
+
+
+def _decode_property_value(property_type: int, value: memoryview):
+    layout = _PROPERTY_VALUE_FORMATS.get(property_type)
+    if layout is not None:
+        return layout.unpack(value)[0]
+    if property_type == PropertyType.STRING:
+        return str(value, "utf-8")
+    return bytes(value)
+
+
+def encode_message_properties(
+    properties: Iterable[MessageProperty], offsets: bool = False
+) -> bytes:
+    """
+    Return the padded message properties area holding the specified
+    'properties'.  If 'offsets' is True, encode the offset of each property
+    instead of its value length, as done when a schema is used.
+
+    See also: bmqp::MessageProperties::streamOut
+    """
+    headers = bytearray()
+    data = bytearray()
+    count = 0
+    for name, property_type, value in properties:
+        name_bytes = name.encode("utf-8")
+        value_bytes = _encode_property_value(property_type, value)
+        length = len(data) if offsets else len(value_bytes)
+        headers += _PROPERTY_HEADER.pack(
+            (property_type << 10) | (length >> 16 & 0x3FF),
+            length & 0xFFFF,
+            len(name_bytes) & 0x0FFF,
+        )
+        data += name_bytes
+        data += value_bytes
+        count += 1
+
+    size = PROPERTIES_HEADER_SIZE + len(headers) + len(data)
+    area_words = size // WORD_SIZE + 1
+    header = _PROPERTIES_HEADER.pack(
+        ((PROPERTY_HEADER_SIZE // 2) << 3) | (PROPERTIES_HEADER_SIZE // 2),
+        area_words >> 16 & 0xFF,
+        area_words & 0xFFFF,
+        count,
+    )
+    return header + headers + data + padding(size)
+
+
+def decode_message_properties(
+    buffer: Buffer, offsets: bool = False
+) -> Tuple[List[MessageProperty], int]:
+    """
+    Decode the message properties area at the start of the specified
+    'buffer'.  Return the properties and the size of the area, including its
+    padding (i.e. the offset of the payload).  If 'offsets' is True, the
+    property headers hold offsets instead of value lengths.
+    """
+    view = memoryview(buffer)
+    sizes, words_upper, words_lower, count = _PROPERTIES_HEADER.unpack_from(view)
+    header_size = (sizes & 0x07) * 2
+    property_header_size = (sizes >> 3 & 0x07) * 2
+    area_size = ((words_upper << 16) | words_lower) * WORD_SIZE
+    if area_size > len(view):
+        raise ValueError(f"Invalid message properties area size: {area_size}")
+
+    headers = []
+    for index in range(count):
+        upper, lower, name_length = _PROPERTY_HEADER.unpack_from(
+            view, header_size + index * property_header_size
+        )
+        headers.append((upper >> 10 & 0x1F, (upper & 0x3FF) << 16 | lower, name_length))
+
+    data_start = header_size + count * property_header_size
+    data_size = area_size - data_start - view[area_size - 1]
+    properties = []
+    position = data_start
+    for index, (property_type, length, name_length) in enumerate(headers):
+        if offsets:
+            following = headers[index + 1][1] if index + 1 < count else data_size
+            length = following - length - name_length
+        name = str(view[position : position + name_length], "utf-8")
+        position += name_length
+        value = view[position : position + length]
+        position += length
+        properties.append(
+            MessageProperty(
+                name,
+                PropertyType(property_type),
+                _decode_property_value(property_type, value),
+            )
+        )
+    return properties, area_size
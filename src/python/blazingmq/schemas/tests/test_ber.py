@@ -0,0 +1,143 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+
+from blazingmq.schemas import ber, broker, protocol
+from blazingmq.schemas.broker import EventType, TypeSpecific
+
+SCHEMAS = {
+    name: getattr(broker, name) for name in dir(broker) if name.endswith("_SCHEMA")
+}
+
+
+def _message_type(value):
+    if "clientIdentity" in value:
+        return "NegotiationMessage"
+    if "authenticationRequest" in value:
+        return "AuthenticationMessage"
+    return "ControlMessage"
+
+
+@pytest.mark.parametrize("name", sorted(SCHEMAS))
+def test_round_trip(name):
+    value = SCHEMAS[name]
+    data = ber.encode(_message_type(value), value)
+    assert ber.decode(_message_type(value), data) == value
+
+
+def test_encode_disconnect():
+    assert ber.encode("ControlMessage", broker.DISCONNECT_SCHEMA) == bytes.fromhex(
+        "3080"  # ControlMessage
+        "800100"  # rId: 0
+        "a180"  # anonymous choice
+        "a1800000"  # disconnect: {}
+        "0000"
+        "0000"
+    )
+
+
+def test_encode_admin_command():
+    data = ber.encode("ControlMessage", {"rId": 300, "adminCommand": {"command": "h"}})
+    # rId: 300, adminCommand: {command: "h"}
+    assert data == bytes.fromhex("30808002012ca180a780800168000000000000")
+
+
+@pytest.mark.parametrize(
+    "value, content",
+    [
+        (0, "00"),
+        (127, "7f"),
+        (128, "0080"),
+        (-1, "ff"),
+        (-128, "80"),
+        (-129, "ff7f"),
+        ((1 << 63) - 1, "7fffffffffffffff"),
+    ],
+)
+def test_integer(value, content):
+    data = ber.encode("ControlMessage", {"rId": value, "disconnect": {}})
+    # The 'rId' is encoded with a one-octet length and its minimal content.
+    expected = bytes.fromhex(content)
+    assert bytes([len(expected)]) + expected in data
+    assert ber.decode("ControlMessage", data)["rId"] == value
+
+
+def test_unsigned_and_enum():
+    # A 'qId' with the high bit set needs a leading zero octet.
+    config = {"rId": 1, "configureQueueStream": {"qId": 0xFFFFFFFF}}
+    data = ber.encode("ControlMessage", config)
+    assert bytes.fromhex("800500ffffffff") in data
+    assert ber.decode("ControlMessage", data) == config
+
+    assert ber.control_schema().enum_types["ClientType"].ids["E_TCPADMIN"] == 3
+    identity = {"clientIdentity": {"clientType": "E_TCPADMIN"}}
+    data = ber.encode("NegotiationMessage", identity)
+    assert bytes.fromhex("820103") in data  # clientType: 3
+    assert ber.decode("NegotiationMessage", data) == identity
+
+
+def test_decode_definite_length_and_unknown_elements():
+    data = bytes.fromhex(
+        # ControlMessage, definite length
+        "3010"
+        # rId: 5
+        "800105"
+        # unknown constructed [31], in high tag number form
+        "bf1f03020101"
+        # adminCommand: {command: "x"}
+        "a105a703800178"
+    )
+    assert ber.decode("ControlMessage", data) == {
+        "rId": 5,
+        "adminCommand": {"command": "x"},
+    }
+
+
+def test_decode_truncated():
+    data = ber.encode("ControlMessage", broker.ADMIN_COMMAND_SCHEMA)
+    with pytest.raises(ber.BerError, match="truncated"):
+        ber.decode("ControlMessage", data[:-3])
+
+
+def test_encode_invalid():
+    with pytest.raises(ber.BerError, match="unknown enumerator"):
+        ber.encode("NegotiationMessage", {"clientIdentity": {"clientType": "E_NONE"}})
+    with pytest.raises(ber.BerError, match="one selection"):
+        ber.encode("AuthenticationMessage", {})
+
+
+def test_encoding_sizes():
+    """
+    Check that the control schemas make smaller events in BER than in JSON.
+    """
+
+    json_size = sum(
+        len(protocol.encode_control_event(value)) for value in SCHEMAS.values()
+    )
+    ber_size = sum(
+        len(
+            protocol.encode_event(
+                EventType.CONTROL,
+                ber.encode(_message_type(value), value),
+                TypeSpecific.ENCODING_BER,
+                add_padding=True,
+            )
+        )
+        for value in SCHEMAS.values()
+    )
+
+    assert ber_size < json_size
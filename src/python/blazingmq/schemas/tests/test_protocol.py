@@ -0,0 +1,227 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import crc32c
+import pytest
+
+from blazingmq.schemas import protocol
+from blazingmq.schemas.broker import EventType, PutHeaderFlags, TypeSpecific
+from blazingmq.schemas.protocol import (
+    AckMessage,
+    ConfirmMessage,
+    MessageProperty,
+    OptionType,
+    PropertyType,
+    PushMessage,
+    PutMessage,
+)
+
+GUID = bytes.fromhex("0000000005788DAED4B8CA12AEF32DCE")
+
+PROPERTIES = [
+    MessageProperty("key", PropertyType.STRING, "val"),
+    MessageProperty("id", PropertyType.INT32, 42),
+    MessageProperty("flag", PropertyType.BOOL, True),
+    MessageProperty("big", PropertyType.INT64, -(1 << 40)),
+    MessageProperty("blob", PropertyType.BINARY, b"\x00\x01"),
+]
+
+
+@pytest.mark.parametrize("length", range(9))
+def test_padding(length):
+    padding = protocol.padding(length)
+    assert (length + len(padding)) % 4 == 0
+    assert padding == bytes([len(padding)]) * len(padding)
+    assert protocol.strip_padding(b"x" * length + padding) == b"x" * length
+
+
+def test_control_event():
+    event = protocol.encode_control_event('{"a":1}')
+    assert event == b'\x00\x00\x00\x10\x41\x02\x20\x00{"a":1}\x01'
+    assert protocol.encode_control_event({"a": 1})[8:] == b'{"a": 1}\x04\x04\x04\x04'
+
+    [(header, body)] = protocol.iter_events(event)
+    assert header == protocol.EventHeader(
+        len(event), EventType.CONTROL, TypeSpecific.ENCODING_JSON
+    )
+    assert protocol.strip_padding(body) == b'{"a":1}'
+
+
+def test_iter_events():
+    events = [
+        protocol.encode_event(EventType.HEARTBEAT_REQ),
+        protocol.encode_control_event("x", EventType.AUTHENTICATION),
+        protocol.encode_event(EventType.HEARTBEAT_RSP),
+    ]
+    assert [
+        (header.type, bytes(body))
+        for header, body in protocol.iter_events(b"".join(events))
+    ] == [
+        (EventType.HEARTBEAT_REQ, b""),
+        (EventType.AUTHENTICATION, b"x\x03\x03\x03"),
+        (EventType.HEARTBEAT_RSP, b""),
+    ]
+    with pytest.raises(ValueError):
+        list(protocol.iter_events(events[1][:-1]))
+
+
+def test_put_event():
+    properties = protocol.encode_message_properties(PROPERTIES)
+    messages = [
+        PutMessage(3, b"hello", GUID, PutHeaderFlags.ACK_REQUESTED),
+        PutMessage(4, properties + b"world!", flags=PutHeaderFlags.MESSAGE_PROPERTIES),
+        PutMessage(5, b""),
+    ]
+    event = protocol.encode_put_event(messages)
+    [(header, body)] = protocol.iter_events(event)
+    assert header.type == EventType.PUT
+
+    decoded = list(protocol.decode_put_event(body))
+    assert [put.queue_id for put, _, _ in decoded] == [3, 4, 5]
+    assert [put.flags for put, _, _ in decoded] == [
+        message.flags for message in messages
+    ]
+    assert decoded[0][0].guid == GUID
+    assert decoded[0][0].header_words == 9
+    for (put, options, data), message in zip(decoded, messages):
+        assert len(options) == 0
+        assert protocol.strip_padding(data) == message.payload
+        assert put.crc32c == crc32c.crc32c(message.payload)
+
+    data = protocol.strip_padding(decoded[1][2])
+    assert protocol.decode_message_properties(data) == (PROPERTIES, len(properties))
+    assert data[len(properties) :] == b"world!"
+
+
+def test_put_event_options():
+    group_id = protocol.encode_option(OptionType.MSG_GROUP_ID, b"gid", add_padding=True)
+    assert group_id == bytes.fromhex("08000002") + b"gid\x01"
+    sub_queue_ids = protocol.encode_option(
+        OptionType.SUB_QUEUE_IDS_OLD, bytes(8), type_specific=2
+    )
+    assert sub_queue_ids == bytes.fromhex("04400003") + bytes(8)
+
+    event = protocol.encode_put_event(
+        [PutMessage(1, b"data", options=group_id + sub_queue_ids)]
+    )
+    [(_, body)] = protocol.iter_events(event)
+    [(put, options, data)] = protocol.decode_put_event(body)
+    assert put.options_words == 5
+    assert bytes(options) == group_id + sub_queue_ids
+    assert protocol.strip_padding(data) == b"data"
+
+
+def test_push_event():
+    messages = [
+        PushMessage(1, GUID, b"payload"),
+        PushMessage(2, GUID, flags=protocol.PushHeaderFlags.IMPLICIT_PAYLOAD),
+    ]
+    [(_, body)] = protocol.iter_events(protocol.encode_push_event(messages))
+    decoded = list(protocol.decode_push_event(body))
+    assert [(push.queue_id, push.guid) for push, _, _ in decoded] == [
+        (1, GUID),
+        (2, GUID),
+    ]
+    assert protocol.strip_padding(decoded[0][2]) == b"payload"
+    assert len(decoded[1][2]) == 0
+
+
+def test_ack_and_confirm_events():
+    acks = [
+        AckMessage(status % 16, 1000 + status, GUID, status) for status in range(40)
+    ]
+    [(header, body)] = protocol.iter_events(protocol.encode_ack_event(acks))
+    assert header.type == EventType.ACK
+    assert protocol.decode_ack_event(body) == acks
+
+    confirms = [ConfirmMessage(qid, GUID, -1) for qid in range(40)]
+    [(header, body)] = protocol.iter_events(protocol.encode_confirm_event(confirms))
+    assert header.type == EventType.CONFIRM
+    assert body[0] == 0x16
+    assert protocol.decode_confirm_event(body) == confirms
+
+
+@pytest.mark.parametrize("offsets", [False, True])
+def test_message_properties(offsets):
+    area = protocol.encode_message_properties(PROPERTIES, offsets=offsets)
+    assert len(area) % 4 == 0
+    properties, size = protocol.decode_message_properties(
+        area + b"payload", offsets=offsets
+    )
+    assert properties == PROPERTIES
+    assert size == len(area)
+
+
+def test_matches_fuzz_builders():
+    boofuzz = pytest.importorskip("boofuzz")
+    from blazingmq.dev import fuzztest
+    from blazingmq.dev.fuzztest import put_message_properties
+
+    guid = bytes.fromhex("0000000005788DAED4B8CA12AEF32DCE")
+    assert boofuzz.Request(
+        "Put", children=fuzztest.make_put_message()
+    ).render() == protocol.encode_put_event(
+        [PutMessage(0, b"AppData", guid, PutHeaderFlags.ACK_REQUESTED)]
+    )
+    assert boofuzz.Request(
+        "Confirm", children=fuzztest.make_confirm_message()
+    ).render() == protocol.encode_confirm_event([ConfirmMessage(0, guid)])
+
+    # The fuzzed area leaves the padding to the enclosing block.
+    assert (
+        put_message_properties.make_message_properties_area().render()
+        == (protocol.encode_message_properties(PROPERTIES[:2])[:-2])
+    )
+
+
+def test_control_template():
+    message = {"rId": 0, "adminCommand": {"command": "help"}}
+    template = protocol.ControlTemplate(
+        message, rid=("rId",), command=("adminCommand", "command")
+    )
+    message["adminCommand"]["command"] = "changed"
+
+    command = 'DOMAINS DOMAIN "d" INFOS\n'
+    expected = {"rId": 7, "adminCommand": {"command": command}}
+    event = template.render(rid=7, command=command)
+    [(header, body)] = protocol.iter_events(event)
+    assert header.type == EventType.CONTROL
+    assert header.type_specific == TypeSpecific.ENCODING_JSON
+    assert json.loads(bytes(protocol.strip_padding(body))) == expected
+    assert template.message(rid=7, command=command) == expected
+    assert template.message(rid=0, command="help") == {
+        "rId": 0,
+        "adminCommand": {"command": "help"},
+    }
+
+
+def test_control_template_event_type():
+    template = protocol.ControlTemplate(
+        {"authenticationRequest": {"mechanism": "", "data": ""}},
+        EventType.AUTHENTICATION,
+        data=("authenticationRequest", "data"),
+    )
+    [(header, body)] = protocol.iter_events(template.render(data="eA=="))
+    assert header.type == EventType.AUTHENTICATION
+    assert json.loads(bytes(protocol.strip_padding(body))) == {
+        "authenticationRequest": {"mechanism": "", "data": "eA=="}
+    }
+
+
+def test_control_template_unknown_slot():
+    with pytest.raises(KeyError):
+        protocol.ControlTemplate({"rId": 0}, command=("adminCommand", "command"))
@@ -0,0 +1,73 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Readers of the files written by the BlazingMQ broker: the JOURNAL and DATA
+files of the partitions of a file store, and the cluster state ledger.
+
+Files are memory-mapped, and their records decoded lazily, so that tests and
+scripts can scan large files without running 'bmqstoragetool' and parsing its
+output.
+
+    from blazingmq.storage import DataFile, JournalFile, RecordType
+
+    with JournalFile(journal_path) as journal, DataFile(data_path) as data:
+        for record in journal.records():
+            if record.header.record_type == RecordType.MESSAGE:
+                payload = data.message(record.message_offset_dwords)
+"""
+
+from blazingmq.storage.csl import CslFile, CslRecord, CslRecordType
+from blazingmq.storage.data import DataFile, DataMessage
+from blazingmq.storage.journal import (
+    ConfirmRecord,
+    DeletionRecord,
+    JournalDivergence,
+    JournalFile,
+    JournalOpRecord,
+    JournalOpType,
+    MessageRecord,
+    QueueOpRecord,
+    QueueOpType,
+    RecordHeader,
+    RecordType,
+    SyncPointType,
+    compare_journals,
+)
+from blazingmq.storage.mapped_file import FileHeader, FileType, StorageError
+
+__all__ = [
+    "ConfirmRecord",
+    "CslFile",
+    "CslRecord",
+    "CslRecordType",
+    "DataFile",
+    "DataMessage",
+    "DeletionRecord",
+    "FileHeader",
+    "FileType",
+    "JournalDivergence",
+    "JournalFile",
+    "JournalOpRecord",
+    "JournalOpType",
+    "MessageRecord",
+    "QueueOpRecord",
+    "QueueOpType",
+    "RecordHeader",
+    "RecordType",
+    "StorageError",
+    "SyncPointType",
+    "compare_journals",
+]
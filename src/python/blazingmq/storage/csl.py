@@ -0,0 +1,154 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Reader of the cluster state ledger files ('.bmq_csl') of a BlazingMQ cluster.
+
+A ledger file is a 'ClusterStateFileHeader', followed by records made of a
+'ClusterStateRecordHeader', a BER-encoded 'ClusterMessage' (the leader
+advisory) with its padding, and a CRC32-C of the header and the padded
+message.  Messages are decoded only when asked for, with the control message
+schema of 'blazingmq.schemas.ber'.
+
+Public types:
+o 'CslRecordType': the type of a record.
+o 'CslRecord': a record of a ledger file.
+o 'CslFile': a memory-mapped ledger file.
+
+See also: mqbc_clusterstateledgerprotocol.h
+"""
+
+import struct
+from enum import IntEnum
+from pathlib import Path
+from typing import Any, Dict, Iterator, NamedTuple, Union
+
+import crc32c
+
+from blazingmq.schemas import ber
+from blazingmq.schemas.protocol import strip_padding
+from blazingmq.storage.mapped_file import (
+    WORD_SIZE,
+    MappedFile,
+    StorageError,
+    key_hex,
+)
+
+# =============================================================================
+#                                  CONSTANTS
+# =============================================================================
+
+
+class CslRecordType(IntEnum):
+    """
+    See also: mqbc::ClusterStateRecordType
+    """
+
+    UNDEFINED = 0
+    SNAPSHOT = 1
+    UPDATE = 2
+    COMMIT = 3
+    ACK = 4
+
+
+_FILE_HEADER = struct.Struct(">B5s2x")
+_RECORD_HEADER = struct.Struct(">B3xIIIIIII")
+_CRC32C = struct.Struct(">I")
+_LEADER_ADVISORY_WORDS_MASK = (1 << 28) - 1
+
+
+# =============================================================================
+#                                    FILE
+# =============================================================================
+
+
+class CslRecord(NamedTuple):
+    offset: int  # in bytes, from the start of the file
+    record_type: int
+    header_words: int
+    elector_term: int
+    sequence_number: int
+    timestamp: int  # seconds since the epoch
+    advisory: bytes  # BER-encoded 'ClusterMessage', with its padding
+    crc32c: int
+
+    def message(self) -> Dict[str, Any]:
+        """Return the 'ClusterMessage' of this record, decoded."""
+
+        return ber.decode("ClusterMessage", strip_padding(self.advisory))
+
+
+class CslFile(MappedFile):
+    """
+    Memory-mapped cluster state ledger file at the specified 'path'.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        super().__init__(path)
+        try:
+            pv_hw, file_key = self.unpack(_FILE_HEADER, 0)
+        except StorageError:
+            self.close()
+            raise
+        self.protocol_version = pv_hw >> 6
+        self.header_words = pv_hw & 0x3F
+        self.file_key = key_hex(file_key)
+        self.records_offset = self.header_words * WORD_SIZE
+
+    def records(self, verify: bool = False) -> Iterator[CslRecord]:
+        """
+        Yield each record, until the end of the file or the first empty
+        (zero-filled) record header.  If the specified 'verify' is 'True',
+        raise 'StorageError' on a record whose CRC32-C does not match.
+        """
+
+        offset = self.records_offset
+        while offset + _RECORD_HEADER.size <= len(self):
+            (
+                hw_type,
+                advisory_words,
+                term_upper,
+                term_lower,
+                seq_upper,
+                seq_lower,
+                ts_upper,
+                ts_lower,
+            ) = _RECORD_HEADER.unpack_from(self._map, offset)
+            if hw_type == 0:
+                return
+            header_size = (hw_type >> 4) * WORD_SIZE
+            size = (advisory_words & _LEADER_ADVISORY_WORDS_MASK) * WORD_SIZE
+            if size <= _CRC32C.size:
+                raise StorageError(f"{self.path}: invalid record at offset {offset}")
+            crc_offset = offset + header_size + size - _CRC32C.size
+            (crc,) = self.unpack(_CRC32C, crc_offset)
+            if verify and crc32c.crc32c(self.read(offset, crc_offset - offset)) != crc:
+                raise StorageError(f"{self.path}: CRC mismatch at offset {offset}")
+            record_type = hw_type & 0x0F
+            try:
+                record_type = CslRecordType(record_type)
+            except ValueError:
+                pass
+            yield CslRecord(
+                offset=offset,
+                record_type=record_type,
+                header_words=hw_type >> 4,
+                elector_term=(term_upper << 32) | term_lower,
+                sequence_number=(seq_upper << 32) | seq_lower,
+                timestamp=(ts_upper << 32) | ts_lower,
+                advisory=self.read(offset + header_size, size - _CRC32C.size),
+                crc32c=crc,
+            )
+            offset = crc_offset + _CRC32C.size
@@ -0,0 +1,143 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Reader of the DATA files ('.bmq_data') of a BlazingMQ file store.
+
+A data file is a 'FileHeader' and a 'DataFileHeader', followed by messages,
+each made of a 'DataHeader', its options, and the application data (message
+properties and payload) padded to a DWORD boundary.  Journal
+'MessageRecord's locate their message by its offset in DWORDs.
+
+Public types:
+o 'DataMessage': a message of a data file.
+o 'DataFile': a memory-mapped data file.
+
+See also: mqbs::DataFileIterator, mqbs_filestoreprotocol.h
+"""
+
+import struct
+from pathlib import Path
+from typing import Iterator, NamedTuple, Union
+
+from blazingmq.storage.mapped_file import (
+    DWORD_SIZE,
+    WORD_SIZE,
+    FileHeader,
+    FileType,
+    MappedFile,
+    StorageError,
+    key_hex,
+    read_file_header,
+)
+
+# =============================================================================
+#                                  CONSTANTS
+# =============================================================================
+
+
+_DATA_FILE_HEADER = struct.Struct(">Bx5sx")
+_DATA_HEADER = struct.Struct(">II")
+_SCHEMA_ID = struct.Struct(">H2x")
+_HEADER_WORDS_NUM_BITS = 3
+_MESSAGE_WORDS_MASK = (1 << 29) - 1
+
+
+# =============================================================================
+#                                    FILE
+# =============================================================================
+
+
+class DataMessage(NamedTuple):
+    offset: int  # in bytes, from the start of the file
+    header_words: int
+    message_words: int  # header, options and padded application data
+    options_words: int
+    flags: int
+    schema_id: int
+    options: bytes
+    application_data: bytes  # properties and payload, without padding
+
+
+class DataFile(MappedFile):
+    """
+    Memory-mapped DATA file at the specified 'path'.  Raise 'StorageError'
+    if it is not a data file.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        super().__init__(path)
+        try:
+            self.header: FileHeader = read_file_header(self, FileType.DATA)
+            offset = self.header.header_words * WORD_SIZE
+            header_words, file_key = self.unpack(_DATA_FILE_HEADER, offset)
+        except StorageError:
+            self.close()
+            raise
+        self.file_key = key_hex(file_key)
+        self.messages_offset = offset + header_words * WORD_SIZE
+
+    def message(self, offset_dwords: int) -> DataMessage:
+        """
+        Return the message at the specified 'offset_dwords', as recorded in
+        a journal 'MessageRecord'.  Raise 'StorageError' if there is no valid
+        message there.
+        """
+
+        return self._message(offset_dwords * DWORD_SIZE)
+
+    def _message(self, offset: int) -> DataMessage:
+        word0, word1 = self.unpack(_DATA_HEADER, offset)
+        header_words = word0 >> (32 - _HEADER_WORDS_NUM_BITS)
+        message_words = word0 & _MESSAGE_WORDS_MASK
+        options_words = word1 >> 8
+        schema_id = 0
+        if header_words * WORD_SIZE >= _DATA_HEADER.size + _SCHEMA_ID.size:
+            (schema_id,) = self.unpack(_SCHEMA_ID, offset + _DATA_HEADER.size)
+
+        options_offset = offset + header_words * WORD_SIZE
+        data_offset = options_offset + options_words * WORD_SIZE
+        data_size = offset + message_words * WORD_SIZE - data_offset
+        if header_words == 0 or data_size <= 0:
+            raise StorageError(f"{self.path}: no message at offset {offset}")
+        data = self.read(data_offset, data_size)
+        # Between 1 and 8 bytes, each holding the number of padding bytes.
+        if not 1 <= data[-1] <= min(DWORD_SIZE, data_size):
+            raise StorageError(f"{self.path}: invalid padding at offset {offset}")
+        return DataMessage(
+            offset=offset,
+            header_words=header_words,
+            message_words=message_words,
+            options_words=options_words,
+            flags=word1 & 0xFF,
+            schema_id=schema_id,
+            options=self.read(options_offset, options_words * WORD_SIZE),
+            application_data=data[: -data[-1]],
+        )
+
+    def messages(self) -> Iterator[DataMessage]:
+        """
+        Yield each message, until the end of the file or the first empty
+        (zero-filled) message header.
+        """
+
+        offset = self.messages_offset
+        while offset + _DATA_HEADER.size <= len(self):
+            (word0,) = struct.unpack_from(">I", self._map, offset)
+            if word0 & _MESSAGE_WORDS_MASK == 0:
+                return
+            message = self._message(offset)
+            yield message
+            offset += message.message_words * WORD_SIZE
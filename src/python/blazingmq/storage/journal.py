@@ -0,0 +1,494 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Reader of the JOURNAL files ('.bmq_journal') of a BlazingMQ file store.
+
+A journal is a 'FileHeader' and a 'JournalFileHeader', followed by records
+of a fixed size, each starting with a 'RecordHeader' and ending with a magic
+word.  As journal files are preallocated, the records end at the first one
+whose type is undefined (zero-filled) or whose magic word is missing.
+
+Synopsis:
+
+    from blazingmq.storage import JournalFile, RecordType
+
+    with JournalFile(path) as journal:
+        for record in journal.records():
+            if record.header.record_type == RecordType.MESSAGE:
+                print(record.guid, record.queue_key)
+
+        # With numpy installed, one array of all the records:
+        array = journal.to_numpy()
+        print((array["type_and_flags"] >> 12 == RecordType.MESSAGE).sum())
+        del array
+
+Public types:
+o 'RecordType', 'QueueOpType', 'JournalOpType', 'SyncPointType': the types
+  of records and of their operations.
+o 'RecordHeader': the header of a record, with its offset in the file.
+o 'MessageRecord', 'ConfirmRecord', 'DeletionRecord', 'QueueOpRecord',
+  'JournalOpRecord': decoded records.
+o 'JournalFile': a memory-mapped journal file.
+o 'JournalDivergence': where the journals of two replicas diverge.
+
+Public functions:
+o 'compare_journals': return where the journal of a replica diverges from
+  the journal of the leader, if it does.
+
+Public constants:
+o 'RECORD_DTYPE': the numpy dtype of a record, or None if numpy is not
+  installed.
+
+See also: mqbs::JournalFileIterator, mqbs_filestoreprotocol.h
+"""
+
+import struct
+from enum import IntEnum
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional, Tuple, Union
+
+from blazingmq.storage.mapped_file import (
+    WORD_SIZE,
+    FileHeader,
+    FileType,
+    MappedFile,
+    StorageError,
+    key_hex,
+    read_file_header,
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# =============================================================================
+#                                  CONSTANTS
+# =============================================================================
+
+
+RECORD_MAGIC = 0x2A724563  # *rEc
+RECORD_SIZE = 60  # bytes
+FLAGS_NUM_BITS = 12
+
+
+class RecordType(IntEnum):
+    """
+    See also: mqbs::RecordType
+    """
+
+    UNDEFINED = 0
+    MESSAGE = 1
+    CONFIRM = 2
+    DELETION = 3
+    QUEUE_OP = 4
+    JOURNAL_OP = 5
+
+
+class QueueOpType(IntEnum):
+    """
+    See also: mqbs::QueueOpType
+    """
+
+    UNDEFINED = 0
+    PURGE = 1
+    CREATION = 2
+    DELETION = 3
+    ADDITION = 4
+
+
+class JournalOpType(IntEnum):
+    """
+    See also: mqbs::JournalOpType
+    """
+
+    UNDEFINED = 0
+    UNUSED = 1
+    SYNCPOINT = 2
+
+
+class SyncPointType(IntEnum):
+    """
+    See also: mqbs::SyncPointType
+    """
+
+    UNDEFINED = 0
+    REGULAR = 1
+    ROLLOVER = 2
+
+
+_JOURNAL_FILE_HEADER = struct.Struct(">BB2xII")
+_RECORD_HEADER = struct.Struct(">HHIIII")
+_WORD = struct.Struct(">I")
+
+# The fields after the 'RecordHeader', magic word included.
+_MESSAGE = struct.Struct(">BB5s5sI16sII")
+_CONFIRM = struct.Struct(">2x5s5s16s8xI")
+_DELETION = struct.Struct(">3x5s16s12xI")
+_QUEUE_OP = struct.Struct(">2x5s5siIIII4xI")
+_JOURNAL_OP = struct.Struct(">3xBiIIiIII4xI")
+
+if numpy is not None:
+    RECORD_DTYPE = numpy.dtype(
+        [
+            ("type_and_flags", ">u2"),
+            ("sequence_number_upper", ">u2"),
+            ("sequence_number_lower", ">u4"),
+            ("primary_lease_id", ">u4"),
+            ("timestamp_upper", ">u4"),
+            ("timestamp_lower", ">u4"),
+            ("body", "V36"),
+            ("magic", ">u4"),
+        ]
+    )
+else:
+    RECORD_DTYPE = None
+
+
+# =============================================================================
+#                                   RECORDS
+# =============================================================================
+
+
+class RecordHeader(NamedTuple):
+    offset: int  # in bytes, from the start of the file
+    record_type: int
+    flags: int  # record-specific, e.g. the low bits of the reference count
+    primary_lease_id: int
+    sequence_number: int
+    timestamp: int  # seconds since the epoch
+
+
+class MessageRecord(NamedTuple):
+    header: RecordHeader
+    ref_count: int
+    compression: int
+    queue_key: str
+    file_key: str
+    message_offset_dwords: int  # in the DATA file
+    guid: str
+    crc32c: int
+
+
+class ConfirmRecord(NamedTuple):
+    header: RecordHeader  # 'flags' is the confirm reason
+    queue_key: str
+    app_key: str
+    guid: str
+
+
+class DeletionRecord(NamedTuple):
+    header: RecordHeader  # 'flags' is the deletion record flag
+    queue_key: str
+    guid: str
+
+
+class QueueOpRecord(NamedTuple):
+    header: RecordHeader
+    queue_key: str
+    app_key: str
+    queue_op_type: int
+    queue_uri_record_offset_words: int  # in the QLIST file
+    # The oldest message purged, for 'QueueOpType.PURGE' only.
+    start_primary_lease_id: int
+    start_sequence_number: int
+
+
+class JournalOpRecord(NamedTuple):
+    header: RecordHeader
+    journal_op_type: int
+    # The fields below are valid for 'JournalOpType.SYNCPOINT' only.
+    sync_point_type: int
+    primary_lease_id: int
+    sequence_number: int
+    primary_node_id: int
+    data_file_offset_dwords: int
+    qlist_file_offset_words: int
+
+
+JournalRecord = Union[
+    MessageRecord, ConfirmRecord, DeletionRecord, QueueOpRecord, JournalOpRecord
+]
+
+
+# =============================================================================
+#                                    FILE
+# =============================================================================
+
+
+class JournalFile(MappedFile):
+    """
+    Memory-mapped JOURNAL file at the specified 'path'.  Raise
+    'StorageError' if it is not a journal.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        super().__init__(path)
+        try:
+            self.header: FileHeader = read_file_header(self, FileType.JOURNAL)
+            offset = self.header.header_words * WORD_SIZE
+            header_words, record_words, sync_upper, sync_lower = self.unpack(
+                _JOURNAL_FILE_HEADER, offset
+            )
+        except StorageError:
+            self.close()
+            raise
+        self.first_sync_point_offset = ((sync_upper << 32) | sync_lower) * WORD_SIZE
+        self.record_size = record_words * WORD_SIZE
+        self.records_offset = offset + header_words * WORD_SIZE
+        if self.record_size != RECORD_SIZE:
+            self.close()
+            raise StorageError(
+                f"{self.path}: {self.record_size}-byte records are not supported"
+            )
+
+    def _offsets(self) -> Iterator[int]:
+        """
+        Yield the offset of each record, until the first record of undefined
+        type, without magic word, or truncated.
+        """
+
+        end = len(self) - self.record_size
+        magic_offset = self.record_size - _WORD.size
+        offset = self.records_offset
+        while offset <= end:
+            (first_word,) = _WORD.unpack_from(self._map, offset)
+            if first_word >> (32 - 4) == RecordType.UNDEFINED:
+                return
+            (magic,) = _WORD.unpack_from(self._map, offset + magic_offset)
+            if magic != RECORD_MAGIC:
+                return
+            yield offset
+            offset += self.record_size
+
+    def raw_records(self) -> Iterator[Tuple[int, bytes]]:
+        """
+        Yield the offset and a copy of the bytes of each record, e.g. to
+        compare records without decoding them.
+        """
+
+        for offset in self._offsets():
+            yield offset, self._map[offset : offset + self.record_size]
+
+    def headers(self) -> Iterator[RecordHeader]:
+        """Yield the header of each record, without decoding the rest."""
+
+        for offset in self._offsets():
+            yield self.record_header(offset)
+
+    def record_header(self, offset: int) -> RecordHeader:
+        """Return the header of the record at the specified 'offset'."""
+
+        type_and_flags, seq_upper, seq_lower, lease_id, ts_upper, ts_lower = (
+            _RECORD_HEADER.unpack_from(self._map, offset)
+        )
+        record_type = type_and_flags >> FLAGS_NUM_BITS
+        try:
+            record_type = RecordType(record_type)
+        except ValueError:
+            pass
+        return RecordHeader(
+            offset=offset,
+            record_type=record_type,
+            flags=type_and_flags & ((1 << FLAGS_NUM_BITS) - 1),
+            primary_lease_id=lease_id,
+            sequence_number=(seq_upper << 32) | seq_lower,
+            timestamp=(ts_upper << 32) | ts_lower,
+        )
+
+    def records(self) -> Iterator[JournalRecord]:
+        """
+        Yield each record, decoded.  Raise 'StorageError' on a record of
+        unknown type.
+        """
+
+        for offset in self._offsets():
+            yield self.record(offset)
+
+    def record(self, offset: int) -> JournalRecord:
+        """
+        Return the record at the specified 'offset', decoded.  Raise
+        'StorageError' if there is no valid record at 'offset'.
+        """
+
+        header = self.record_header(offset)
+        body_offset = offset + _RECORD_HEADER.size
+        if header.record_type == RecordType.MESSAGE:
+            high_bits, cat, queue_key, file_key, offset_dwords, guid, crc, magic = (
+                self.unpack(_MESSAGE, body_offset)
+            )
+            record: JournalRecord = MessageRecord(
+                header=header,
+                ref_count=(high_bits << FLAGS_NUM_BITS) + header.flags,
+                compression=cat & 0x07,
+                queue_key=key_hex(queue_key),
+                file_key=key_hex(file_key),
+                message_offset_dwords=offset_dwords,
+                guid=key_hex(guid),
+                crc32c=crc,
+            )
+        elif header.record_type == RecordType.CONFIRM:
+            queue_key, app_key, guid, magic = self.unpack(_CONFIRM, body_offset)
+            record = ConfirmRecord(
+                header, key_hex(queue_key), key_hex(app_key), key_hex(guid)
+            )
+        elif header.record_type == RecordType.DELETION:
+            queue_key, guid, magic = self.unpack(_DELETION, body_offset)
+            record = DeletionRecord(header, key_hex(queue_key), key_hex(guid))
+        elif header.record_type == RecordType.QUEUE_OP:
+            (
+                queue_key,
+                app_key,
+                op_type,
+                uri_offset,
+                seq_upper,
+                seq_lower,
+                lease_id,
+                magic,
+            ) = self.unpack(_QUEUE_OP, body_offset)
+            record = QueueOpRecord(
+                header=header,
+                queue_key=key_hex(queue_key),
+                app_key=key_hex(app_key),
+                queue_op_type=op_type,
+                queue_uri_record_offset_words=uri_offset,
+                start_primary_lease_id=lease_id,
+                start_sequence_number=(seq_upper << 32) | seq_lower,
+            )
+        elif header.record_type == RecordType.JOURNAL_OP:
+            (
+                sync_point_type,
+                op_type,
+                seq_upper,
+                seq_lower,
+                node_id,
+                lease_id,
+                data_offset,
+                qlist_offset,
+                magic,
+            ) = self.unpack(_JOURNAL_OP, body_offset)
+            record = JournalOpRecord(
+                header=header,
+                journal_op_type=op_type,
+                sync_point_type=sync_point_type,
+                primary_lease_id=lease_id,
+                sequence_number=(seq_upper << 32) | seq_lower,
+                primary_node_id=node_id,
+                data_file_offset_dwords=data_offset,
+                qlist_file_offset_words=qlist_offset,
+            )
+        else:
+            raise StorageError(
+                f"{self.path}: record of unknown type {header.record_type}"
+                f" at offset {offset}"
+            )
+        if magic != RECORD_MAGIC:
+            raise StorageError(f"{self.path}: no record at offset {offset}")
+        return record
+
+    def to_numpy(self) -> "numpy.ndarray":
+        """
+        Return the records as an array of 'RECORD_DTYPE', a view on the file
+        which must be deleted before the file is closed.  Raise 'ImportError'
+        if numpy is not installed.
+        """
+
+        if numpy is None:
+            raise ImportError("'numpy' is required by 'JournalFile.to_numpy'")
+        count = (len(self) - self.records_offset) // self.record_size
+        array = numpy.frombuffer(
+            self._map, dtype=RECORD_DTYPE, count=count, offset=self.records_offset
+        )
+        invalid = (array["type_and_flags"] >> FLAGS_NUM_BITS == 0) | (
+            array["magic"] != RECORD_MAGIC
+        )
+        return array[: invalid.argmax()] if invalid.any() else array
+
+
+# =============================================================================
+#                                 COMPARISON
+# =============================================================================
+
+
+# The bytes of a record which differ between replicas of the same record.
+_TIMESTAMP = slice(12, _RECORD_HEADER.size)
+
+
+class JournalDivergence(NamedTuple):
+    offset: int  # of the first record, or byte of the headers, which differs
+    reason: str
+    # The header of the first record which differs, on either side, if any.
+    leader: Optional[RecordHeader] = None
+    replica: Optional[RecordHeader] = None
+
+    def __str__(self) -> str:
+        text = f"{self.reason} at offset {self.offset}"
+        for side in ("leader", "replica"):
+            header = getattr(self, side)
+            if header is not None:
+                record_type = getattr(header.record_type, "name", header.record_type)
+                text += (
+                    f"; {side}: {record_type} record, sequence number"
+                    f" {header.primary_lease_id}:{header.sequence_number}"
+                )
+        return text
+
+
+def compare_journals(
+    leader_path: Union[str, Path], replica_path: Union[str, Path]
+) -> Optional[JournalDivergence]:
+    """
+    Return where the journal at the specified 'replica_path' first diverges
+    from the one at 'leader_path', or 'None' if they hold the same records.
+    Records are compared byte for byte, except for their timestamp, which
+    each node sets when writing them.  The journals are read together, one
+    record at a time, so that this takes linear time and constant memory.
+    """
+
+    with JournalFile(leader_path) as leader, JournalFile(replica_path) as replica:
+        size = leader.records_offset
+        expected, actual = leader.read(0, size), replica.read(0, size)
+        if expected != actual:
+            offset = next(i for i, (a, b) in enumerate(zip(expected, actual)) if a != b)
+            return JournalDivergence(offset, "file headers differ")
+
+        leader_records = leader.raw_records()
+        replica_records = replica.raw_records()
+        while True:
+            offset, expected = next(leader_records, (None, b""))
+            replica_offset, actual = next(replica_records, (None, b""))
+            if offset is None:
+                if replica_offset is None:
+                    return None
+                return JournalDivergence(
+                    replica_offset,
+                    "leader journal ends",
+                    replica=replica.record_header(replica_offset),
+                )
+            if replica_offset is None:
+                return JournalDivergence(
+                    offset, "replica journal ends", leader.record_header(offset)
+                )
+            if (
+                expected[: _TIMESTAMP.start] != actual[: _TIMESTAMP.start]
+                or expected[_TIMESTAMP.stop :] != actual[_TIMESTAMP.stop :]
+            ):
+                return JournalDivergence(
+                    offset,
+                    "records differ",
+                    leader.record_header(offset),
+                    replica.record_header(offset),
+                )
@@ -0,0 +1,174 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Read-only memory maps of the files of a BlazingMQ file store.
+
+Files are mapped rather than read, so that scanning a multi-GB journal only
+touches the pages holding the records visited, and leaves caching to the
+kernel.  Fields are decoded with precompiled 'struct.Struct' layouts straight
+from the map; all integers are big-endian.
+
+Public types:
+o 'StorageError': raised on a file which is not of the expected format.
+o 'FileType': the type of a file, in its 'FileHeader'.
+o 'FileHeader': the header common to the DATA, JOURNAL and QLIST files.
+o 'MappedFile': a read-only memory map of a file.
+
+Public functions:
+o 'read_file_header': decode and check the 'FileHeader' of a file.
+o 'key_hex': format a queue, app or file key as printed by the broker.
+
+See also: mqbs_filestoreprotocol.h
+"""
+
+import mmap
+import os
+import struct
+from enum import IntEnum
+from pathlib import Path
+from typing import NamedTuple, Tuple, Union
+
+# =============================================================================
+#                                  CONSTANTS
+# =============================================================================
+
+
+WORD_SIZE = 4
+DWORD_SIZE = 8
+
+FILE_MAGIC1 = 0x21626D71  # !bmq
+FILE_MAGIC2 = 0x424D5121  # BMQ!
+
+
+class StorageError(ValueError):
+    pass
+
+
+class FileType(IntEnum):
+    """
+    See also: mqbs::FileType
+    """
+
+    UNDEFINED = 0
+    DATA = 1
+    JOURNAL = 2
+    QLIST = 3
+
+
+# =============================================================================
+#                                    FILES
+# =============================================================================
+
+
+class MappedFile:
+    """
+    Read-only memory map of the file at the specified 'path', to be closed,
+    or used as a context manager.  As the map is read sequentially by the
+    readers, the kernel is advised to read ahead.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                raise StorageError(f"{self.path}: empty file")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            self._map.madvise(mmap.MADV_SEQUENTIAL)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+    def close(self) -> None:
+        """
+        Unmap the file.  Raise 'BufferError' if a view on the map, e.g. an
+        array returned by a reader, is still alive.
+        """
+        self._map.close()
+
+    def unpack(self, layout: struct.Struct, offset: int) -> Tuple:
+        """
+        Return the fields of the specified 'layout' at the specified 'offset'.
+        Raise 'StorageError' if the file ends before the layout.
+        """
+        if offset + layout.size > len(self._map):
+            raise StorageError(
+                f"{self.path}: truncated at offset {offset}"
+                f" ({layout.size} bytes expected)"
+            )
+        return layout.unpack_from(self._map, offset)
+
+    def read(self, offset: int, size: int) -> bytes:
+        """
+        Return a copy of the specified 'size' bytes at the specified 'offset'.
+        Raise 'StorageError' if the file ends before.
+        """
+        if offset + size > len(self._map):
+            raise StorageError(
+                f"{self.path}: truncated at offset {offset} ({size} bytes expected)"
+            )
+        return self._map[offset : offset + size]
+
+
+# =============================================================================
+#                                   HEADERS
+# =============================================================================
+
+
+class FileHeader(NamedTuple):
+    protocol_version: int
+    header_words: int
+    bitness: int
+    file_type: int
+    partition_id: int
+
+
+_FILE_HEADER = struct.Struct(">IIBB10xi8x")
+
+
+def read_file_header(file: MappedFile, expected: FileType) -> FileHeader:
+    """
+    Return the 'FileHeader' at the start of the specified 'file'.  Raise
+    'StorageError' if it is not the header of a file of the 'expected' type.
+    """
+
+    magic1, magic2, pv_hw, bitness_type, partition_id = file.unpack(_FILE_HEADER, 0)
+    if (magic1, magic2) != (FILE_MAGIC1, FILE_MAGIC2):
+        raise StorageError(f"{file.path}: not a BlazingMQ file store file")
+    header = FileHeader(
+        protocol_version=pv_hw >> 6,
+        header_words=pv_hw & 0x3F,
+        bitness=bitness_type >> 7,
+        file_type=bitness_type & 0x7F,
+        partition_id=partition_id,
+    )
+    if header.file_type != expected:
+        raise StorageError(
+            f"{file.path}: file type {header.file_type}, expected {expected.name}"
+        )
+    return header
+
+
+def key_hex(key: bytes) -> str:
+    """Return the specified 'key' in hexadecimal, as printed by the broker."""
+
+    return key.hex().upper()
@@ -0,0 +1,54 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from blazingmq.dev.paths import paths
+from blazingmq.storage import CslFile, CslRecordType, StorageError
+
+DATA = paths.repository / "src/applications/bmqstoragetool/integration-tests/data"
+
+
+def test_csl_records():
+    with CslFile(DATA / "test.bmq_csl") as csl:
+        assert csl.file_key == "87EDF15DC0"
+        records = list(csl.records(verify=True))
+
+    assert [record.offset for record in records] == [8, 88, 160, 316, 388, 540]
+    snapshot = records[4]
+    assert snapshot.record_type == CslRecordType.SNAPSHOT
+    assert (snapshot.elector_term, snapshot.sequence_number) == (1, 1)
+    assert snapshot.timestamp == 1730210574
+    advisory = snapshot.message()["leaderAdvisory"]
+    assert advisory["partitions"] == [
+        {"partitionId": 0, "primaryNodeId": 0, "primaryLeaseId": 2}
+    ]
+    assert advisory["queues"][0]["uri"] == (
+        "bmq://bmq.test.persistent.priority/my-first-queue"
+    )
+    commit = records[5].message()["leaderAdvisoryCommit"]
+    assert commit["sequenceNumberCommitted"] == {"electorTerm": 1, "sequenceNumber": 1}
+
+
+def test_csl_crc_mismatch(tmp_path):
+    data = bytearray((DATA / "test.bmq_csl").read_bytes())
+    data[100] ^= 0xFF
+    path = tmp_path / "0.bmq_csl"
+    path.write_bytes(data)
+
+    with CslFile(path) as csl:
+        assert len(list(csl.records())) == 6
+        with pytest.raises(StorageError, match="CRC"):
+            list(csl.records(verify=True))
@@ -0,0 +1,171 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import shutil
+
+import pytest
+
+from blazingmq.dev.paths import paths
+from blazingmq.storage import (
+    DataFile,
+    JournalFile,
+    JournalOpType,
+    MessageRecord,
+    QueueOpType,
+    RecordType,
+    StorageError,
+    compare_journals,
+)
+
+DATA = paths.repository / "src/applications/bmqstoragetool/integration-tests/data"
+
+
+def test_journal_records():
+    with JournalFile(DATA / "test.bmq_journal") as journal:
+        assert journal.header.partition_id == 0
+        records = list(journal.records())
+        headers = list(journal.headers())
+
+    assert [record.header for record in records] == headers
+    assert len(records) == 13
+    assert [h.offset for h in headers] == [44 + 60 * i for i in range(13)]
+    assert [h.record_type for h in headers].count(RecordType.JOURNAL_OP) == 8
+
+    # As printed by 'bmqstoragetool --details' for these files.
+    message = records[3]
+    assert isinstance(message, MessageRecord)
+    assert message.header.offset == 224
+    assert message.header.primary_lease_id == 1
+    assert message.header.sequence_number == 4
+    assert message.header.timestamp == 1730210484
+    assert message.queue_key == "26DACDC974"
+    assert message.ref_count == 1
+    assert message.message_offset_dwords == 5
+    assert message.guid == "400000000002B471F5B3AC11AA7D7DAB"
+    assert message.crc32c == 3381945770
+
+    assert records[1].queue_op_type == QueueOpType.CREATION
+    assert records[5].app_key == "3000000000"
+    assert records[6].guid == message.guid
+    sync_point = records[-1]
+    assert sync_point.journal_op_type == JournalOpType.SYNCPOINT
+    assert (sync_point.primary_lease_id, sync_point.sequence_number) == (2, 4)
+    assert sync_point.data_file_offset_dwords == 11
+
+
+def test_message_payloads():
+    with (
+        JournalFile(DATA / "test.bmq_journal") as journal,
+        DataFile(DATA / "test.bmq_data") as data,
+    ):
+        offsets = [
+            record.message_offset_dwords
+            for record in journal.records()
+            if record.header.record_type == RecordType.MESSAGE
+        ]
+        payloads = [data.message(offset).application_data for offset in offsets]
+        messages = list(data.messages())
+
+    assert offsets == [5, 8]
+    assert payloads == [b"hello world"] * 2
+    assert [message.offset for message in messages] == [40, 64]
+
+
+def test_records_end_at_first_invalid_record(tmp_path):
+    path = tmp_path / "0.bmq_journal"
+    shutil.copy(DATA / "test.bmq_journal", path)
+    with path.open("r+b") as file:
+        # Preallocated space, then a record without magic word.
+        file.seek(0, 2)
+        file.write(bytes(120))
+        file.seek(44 + 60 * 5 + 56)
+        file.write(bytes(4))
+
+    with JournalFile(path) as journal:
+        assert len(list(journal.raw_records())) == 5
+        with pytest.raises(StorageError):
+            journal.record(44 + 60 * 5)
+
+
+def test_not_a_journal(tmp_path):
+    with pytest.raises(StorageError):
+        JournalFile(DATA / "test.bmq_data")
+    (tmp_path / "empty").touch()
+    with pytest.raises(StorageError):
+        JournalFile(tmp_path / "empty")
+
+
+def test_to_numpy():
+    numpy = pytest.importorskip("numpy")
+
+    with JournalFile(DATA / "test.bmq_journal") as journal:
+        array = journal.to_numpy()
+        assert len(array) == 13
+        types = array["type_and_flags"] >> 12
+        assert numpy.count_nonzero(types == RecordType.MESSAGE) == 2
+        assert list(array["sequence_number_lower"][:3]) == [1, 2, 3]
+        del array, types
+
+
+def _replica(tmp_path, name, edit=None):
+    data = bytearray((DATA / "test.bmq_journal").read_bytes())
+    if edit is not None:
+        edit(data)
+    path = tmp_path / name
+    path.write_bytes(data)
+    return path
+
+
+def test_compare_journals_ignores_timestamps(tmp_path):
+    def touch(data):
+        # The lower timestamp bits of each record.
+        for offset in range(44, len(data), 60):
+            data[offset + 19] ^= 0xFF
+
+    replica = _replica(tmp_path, "replica", touch)
+    assert compare_journals(DATA / "test.bmq_journal", replica) is None
+
+
+def test_compare_journals_reports_first_divergence(tmp_path):
+    def corrupt(data):
+        # The GUIDs of the first message record and of its confirmation.
+        data[224 + 36] ^= 0x01
+        data[344 + 32] ^= 0x01
+
+    replica = _replica(tmp_path, "replica", corrupt)
+    divergence = compare_journals(DATA / "test.bmq_journal", replica)
+
+    assert divergence.offset == 224
+    assert divergence.reason == "records differ"
+    leader = divergence.leader
+    assert leader.record_type == RecordType.MESSAGE
+    assert (leader.primary_lease_id, leader.sequence_number) == (1, 4)
+    assert "MESSAGE record, sequence number 1:4" in str(divergence)
+
+
+def test_compare_journals_reports_missing_records(tmp_path):
+    short = _replica(tmp_path, "short", lambda data: data.__delitem__(slice(644, None)))
+
+    divergence = compare_journals(DATA / "test.bmq_journal", short)
+    assert (divergence.offset, divergence.reason) == (644, "replica journal ends")
+    assert divergence.replica is None
+
+    divergence = compare_journals(short, DATA / "test.bmq_journal")
+    assert (divergence.offset, divergence.reason) == (644, "leader journal ends")
+    assert divergence.replica.sequence_number == 2
+
+    other = _replica(tmp_path, "other", lambda data: data.__setitem__(31, 1))
+    divergence = compare_journals(DATA / "test.bmq_journal", other)
+    assert (divergence.offset, divergence.reason) == (31, "file headers differ")
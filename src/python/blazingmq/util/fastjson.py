@@ -0,0 +1,121 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Provide JSON encoding and decoding using the fastest available library.
+
+The backend is the first of 'orjson', 'msgspec' and the standard 'json' module
+that can be imported, unless the 'BLAZINGMQ_JSON_BACKEND' environment variable
+names another one.  All backends accept 'str', 'bytes', 'bytearray' and
+'memoryview' input, so that payloads received from a socket can be decoded
+without first being copied into a 'str'.
+
+Synopsis:
+
+    from blazingmq.util import fastjson
+
+    config = fastjson.loads(memoryview(payload))
+    payload = fastjson.dumps({"help": {}})
+
+The module contains the following public functions:
+
+    - loads -- Decode a JSON document; raise 'ValueError' if it is invalid.
+
+    - dumps -- Encode an object as a compact UTF-8 JSON document.
+
+    - set_backend -- Select the backend by name.
+
+The module contains the following public attributes:
+
+    - BACKEND -- The name of the backend in use.
+
+    - AVAILABLE_BACKENDS -- The names of the backends that can be used.
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+Buffer = Union[str, bytes, bytearray, memoryview]
+
+
+def _json_loads(data: Buffer) -> Any:
+    # 'json.loads' detects the encoding of 'bytes' and 'bytearray', but does
+    # not accept 'memoryview'.
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+_BACKENDS: Dict[str, Tuple[Callable[[Buffer], Any], Callable[[Any], bytes]]] = {
+    "json": (_json_loads, _json_dumps)
+}
+
+if msgspec is not None:
+
+    def _msgspec_loads(data: Buffer) -> Any:
+        # Like the other backends, raise 'ValueError' on invalid documents.
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as exc:
+            raise ValueError(str(exc)) from exc
+
+    _BACKENDS["msgspec"] = (_msgspec_loads, msgspec.json.encode)
+
+if orjson is not None:
+    _BACKENDS["orjson"] = (orjson.loads, orjson.dumps)  # pylint: disable=no-member
+
+AVAILABLE_BACKENDS: Tuple[str, ...] = tuple(sorted(_BACKENDS))
+
+BACKEND = ""
+loads: Callable[[Buffer], Any] = _json_loads
+dumps: Callable[[Any], bytes] = _json_dumps
+
+
+def set_backend(name: str) -> None:
+    """
+    Use the backend with the specified 'name' ("orjson", "msgspec" or
+    "json").  Raise 'ValueError' if it is not available.
+    """
+
+    global BACKEND, loads, dumps  # pylint: disable=global-statement
+
+    if name not in _BACKENDS:
+        raise ValueError(
+            f"JSON backend '{name}' is not available (available: {sorted(_BACKENDS)})"
+        )
+
+    BACKEND = name
+    loads, dumps = _BACKENDS[name]
+
+
+set_backend(
+    os.environ.get("BLAZINGMQ_JSON_BACKEND")
+    or next(name for name in ("orjson", "msgspec", "json") if name in _BACKENDS)
+)
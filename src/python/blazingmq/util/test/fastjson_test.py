@@ -0,0 +1,119 @@
+# Copyright 2026 Bloomberg Finance L.P.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test suite for blazingmq.util.fastjson."""
+
+import json
+import timeit
+
+import pytest
+
+from blazingmq.dev.it.data import data_metrics
+from blazingmq.util import fastjson
+
+BACKENDS = fastjson.AVAILABLE_BACKENDS
+
+
+@pytest.fixture
+def backend(request):
+    previous = fastjson.BACKEND
+    fastjson.set_backend(request.param)
+    yield request.param
+    fastjson.set_backend(previous)
+
+
+def make_stats_response(num_domains: int, num_queues: int) -> bytes:
+    """
+    Return a 'STAT SHOW' admin response with the specified 'num_domains'
+    domains of 'num_queues' fanout queues each, encoded like the broker does:
+    the stats are a JSON document embedded as a string in another one.
+    """
+    queue_stats = data_metrics.TEST_QUEUE_STATS_AFTER_POST
+    stats = {
+        "domainQueues": {
+            "domains": {
+                f"bmq.test.domain{d}": {
+                    f"bmq://bmq.test.domain{d}/queue{q}": queue_stats
+                    for q in range(num_queues)
+                }
+                for d in range(num_domains)
+            }
+        }
+    }
+    # Replace the value constraints (e.g. time intervals) with plain numbers.
+    stats = json.dumps(stats, default=lambda constraint: 123456789)
+    return json.dumps({"stats": stats}).encode("utf-8")
+
+
+@pytest.mark.parametrize("backend", BACKENDS, indirect=True)
+@pytest.mark.usefixtures("backend")
+@pytest.mark.parametrize("convert", [bytes, bytearray, memoryview, bytes.decode])
+def test_loads(convert):
+    document = {"domainInfo": {"name": "d", "configJson": '{"a": [1, 2.5, null]}'}}
+    data = convert(json.dumps(document).encode("utf-8"))
+
+    assert fastjson.loads(data) == document
+    assert fastjson.loads(fastjson.loads(data)["domainInfo"]["configJson"]) == {
+        "a": [1, 2.5, None]
+    }
+
+
+@pytest.mark.parametrize("backend", BACKENDS, indirect=True)
+@pytest.mark.usefixtures("backend")
+def test_dumps():
+    encoded = fastjson.dumps({"help": {}, "encoding": "JSON_COMPACT"})
+
+    assert isinstance(encoded, bytes)
+    assert encoded == b'{"help":{},"encoding":"JSON_COMPACT"}'
+
+
+@pytest.mark.parametrize("backend", BACKENDS, indirect=True)
+@pytest.mark.usefixtures("backend")
+def test_loads_invalid():
+    with pytest.raises(ValueError):
+        fastjson.loads(b'{"rId": 1, ')
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="not available"):
+        fastjson.set_backend("simdjson")
+
+
+def test_stats_benchmark():
+    """
+    Compare the time to decode a large stats response with each backend, and
+    check that the selected backend is not slower than the standard library.
+    """
+    response = make_stats_response(num_domains=10, num_queues=20)
+    expected = json.loads(json.loads(response)["stats"])
+
+    def decode():
+        return fastjson.loads(fastjson.loads(response)["stats"])
+
+    timings = {}
+    previous = fastjson.BACKEND
+    try:
+        for name in BACKENDS:
+            fastjson.set_backend(name)
+            assert decode() == expected
+            timings[name] = min(timeit.repeat(decode, number=5, repeat=5))
+    finally:
+        fastjson.set_backend(previous)
+
+    print(
+        f"decoding {len(response)} bytes of stats: "
+        + ", ".join(f"{name} {t / 5 * 1000:.2f}ms" for name, t in timings.items())
+    )
+    assert timings[fastjson.BACKEND] <= timings["json"] * 1.2
@@ -0,0 +1,125 @@
+// Copyright 2026 Bloomberg Finance L.P.
+// SPDX-License-Identifier: Apache-2.0
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+// Edge coverage runtime for coverage-guided protocol fuzzing of the broker.
+//
+// Linked into 'bmqbrkr.tsk' when configured with '-DBMQ_FUZZ_COVERAGE=ON'
+// and built with '-fsanitize-coverage=trace-pc-guard' (see
+// 'bin/build-fuzz.sh --broker-coverage').  Each edge hit by the broker
+// increments a byte of a bitmap, indexed by the pair (previous block, current
+// block).  The bitmap is a POSIX shared memory object, created by the fuzzer
+// ('blazingmq.dev.fuzztest.coverage'), whose name and size are passed in the
+// 'BMQ_FUZZ_COVERAGE_SHM' and 'BMQ_FUZZ_COVERAGE_SIZE' environment variables.
+// If 'BMQ_FUZZ_COVERAGE_SHM' is not set, edges are counted in a private
+// bitmap, and the broker runs as usual.
+//
+// This file must not be instrumented itself.
+
+#include <fcntl.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/mman.h>
+#include <unistd.h>
+
+#define BMQFUZZ_NO_COVERAGE __attribute__((no_sanitize("coverage")))
+
+namespace {
+
+const size_t k_DEFAULT_MAP_SIZE = 1 << 16;
+
+uint8_t  s_privateMap[k_DEFAULT_MAP_SIZE];
+uint8_t* s_map     = s_privateMap;
+uint32_t s_mapMask = k_DEFAULT_MAP_SIZE - 1;
+uint32_t s_nextId  = 1;
+
+// Block id of the previous edge, per thread, so that the edges of the broker
+// threads are not mixed up.
+__thread uint32_t t_previous = 0;
+
+BMQFUZZ_NO_COVERAGE void attachSharedMap()
+{
+    const char* name = getenv("BMQ_FUZZ_COVERAGE_SHM");
+    if (!name || !*name) {
+        return;  // RETURN
+    }
+
+    size_t      size    = k_DEFAULT_MAP_SIZE;
+    const char* sizeStr = getenv("BMQ_FUZZ_COVERAGE_SIZE");
+    if (sizeStr && *sizeStr) {
+        size = strtoul(sizeStr, 0, 10);
+    }
+    if (size == 0 || (size & (size - 1)) != 0) {
+        fprintf(stderr,
+                "s_bmqfuzz_coverage: BMQ_FUZZ_COVERAGE_SIZE must be a power "
+                "of 2, got '%s'\n",
+                sizeStr);
+        abort();
+    }
+
+    // Python's 'multiprocessing.shared_memory' reports names without the
+    // leading slash.
+    char path[256];
+    snprintf(path, sizeof(path), "%s%s", name[0] == '/' ? "" : "/", name);
+
+    int fd = shm_open(path, O_RDWR, 0);
+    if (fd < 0) {
+        perror("s_bmqfuzz_coverage: shm_open");
+        abort();
+    }
+    void* map = mmap(0, size, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+    close(fd);
+    if (map == MAP_FAILED) {
+        perror("s_bmqfuzz_coverage: mmap");
+        abort();
+    }
+
+    s_map     = static_cast<uint8_t*>(map);
+    s_mapMask = static_cast<uint32_t>(size - 1);
+}
+
+}  // close unnamed namespace
+
+extern "C" BMQFUZZ_NO_COVERAGE void
+__sanitizer_cov_trace_pc_guard_init(uint32_t* start, uint32_t* stop)
+{
+    // Called once per instrumented module, from its static initializers.
+    if (start == stop || *start) {
+        return;  // RETURN
+    }
+    if (s_nextId == 1) {
+        attachSharedMap();
+    }
+    for (uint32_t* guard = start; guard < stop; ++guard) {
+        // Spread the ids so that 'id ^ (previous >> 1)' covers the map.
+        *guard = (s_nextId++ * 2654435761u) | 1;
+    }
+}
+
+extern "C" BMQFUZZ_NO_COVERAGE void __sanitizer_cov_trace_pc_guard(
+                                                              uint32_t* guard)
+{
+    const uint32_t current = *guard;
+    if (!current) {
+        return;  // RETURN
+    }
+    uint8_t& counter = s_map[(current ^ t_previous) & s_mapMask];
+    // Saturate rather than wrap, so that a hot edge is never seen as unhit.
+    if (counter != 0xff) {
+        ++counter;
+    }
+    t_previous = current >> 1;
+}